@@ -0,0 +1,533 @@
+import time
+import json
+import asyncio
+from typing import Dict, Any, Optional, List
+import aiohttp
+
+from bot import (BasicBot, BATCH_ORDERS_MAX, BATCH_CANCEL_MAX, ORDER_NOT_FOUND_CODE, CANCEL_UNKNOWN_ORDER_CODES,
+                 batch_order_params, chunked, new_client_order_id, is_transient_error, retry_delay,
+                 binance_exception)
+from config import Config
+from exchange_filters import ExchangeFilterCache, REFRESH_RETRY_DELAY
+from metrics import Metrics, InstrumentedClient
+
+class AsyncBasicBot:
+    """Asyncio Trading Bot for Binance Futures Testnet
+
+    Mirrors the ``BasicBot`` method surface, but every call is a coroutine
+    sharing one ``AsyncClient`` session, so many orders, cancels and status
+    polls can be in flight at once. Use ``AsyncBasicBot.create(...)`` (or
+    ``async with``) to construct it.
+    """
+
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = True,
+                 max_connections: int = Config.ASYNC_MAX_CONNECTIONS,
+                 client: Optional[Any] = None):
+        """Initialize the trading bot (call ``start()`` before use)"""
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.testnet = testnet
+        self.max_connections = max_connections
+        self.client = client
+        self.filters: Optional[ExchangeFilterCache] = None
+        self.order_store = None
+        self.price_stream = None
+        self.metrics = Metrics() if Config.METRICS_ENABLED else None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._filters_lock: Optional[asyncio.Lock] = None
+        self._filters_retry_at = 0.0
+
+        # Setup logging
+        self.logger = self._setup_logging()
+
+    # Logging and validation are shared with the synchronous bot
+    _setup_logging = BasicBot._setup_logging
+    _validate_order_params = BasicBot._validate_order_params
+    _apply_exchange_filters = BasicBot._apply_exchange_filters
+    get_latency_stats = BasicBot.get_latency_stats
+
+    @classmethod
+    async def create(cls, api_key: str, api_secret: str, testnet: bool = True,
+                     max_connections: int = Config.ASYNC_MAX_CONNECTIONS,
+                     client: Optional[Any] = None) -> 'AsyncBasicBot':
+        """Create and start a bot"""
+        bot = cls(api_key, api_secret, testnet, max_connections, client)
+        await bot.start()
+        return bot
+
+    async def start(self) -> None:
+        """Open the shared connection pool and test the connection"""
+        try:
+            # Bound in-flight requests to the size of the connection pool
+            self._semaphore = asyncio.Semaphore(self.max_connections)
+            self._filters_lock = asyncio.Lock()
+
+            if self.client is None:
+                from binance import AsyncClient
+                connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+                self.client = await AsyncClient.create(
+                    api_key=self.api_key,
+                    api_secret=self.api_secret,
+                    testnet=self.testnet,
+                    session_params={'connector': connector}
+                )
+            if self.metrics is not None:
+                self.client = InstrumentedClient(self.client, self.metrics)
+
+            await self._test_connection()
+
+            if Config.EXCHANGE_FILTERS_ENABLED:
+                self.filters = ExchangeFilterCache()
+                await self.refresh_exchange_filters()
+
+            self.logger.info("Async bot initialized successfully")
+            print("✅ Async bot initialized successfully")
+
+        except Exception as e:
+            self.logger.error(f"Failed to initialize async bot: {str(e)}")
+            print(f"❌ Failed to initialize async bot: {str(e)}")
+            raise
+
+    async def close(self) -> None:
+        """Close the shared connection pool"""
+        if self.client is not None:
+            await self.client.close_connection()
+
+    async def __aenter__(self) -> 'AsyncBasicBot':
+        if self._semaphore is None:
+            await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def refresh_exchange_filters(self) -> None:
+        """Reload the exchange filter cache now"""
+        try:
+            self.filters.load(await self._call('futures_exchange_info'))
+        except Exception as e:
+            # Keep serving the previous index rather than retrying on every order
+            self._filters_retry_at = time.monotonic() + REFRESH_RETRY_DELAY
+            self.logger.error(f"Error loading exchange filters: {e}")
+
+    async def _refresh_stale_filters(self) -> None:
+        """Reload the filter cache once it is older than Config.EXCHANGE_INFO_TTL
+
+        The cache has no client of its own here, so ``ExchangeFilterCache.get``
+        cannot refresh it; orders call this before the filters are applied.
+        """
+        if self.filters is None or not self.filters.is_stale() or time.monotonic() < self._filters_retry_at:
+            return
+        async with self._filters_lock:
+            # Another task may have refreshed while we waited
+            if self.filters.is_stale():
+                await self.refresh_exchange_filters()
+
+    async def _call(self, method: str, **params) -> Any:
+        """Run one client call, bounded by the connection pool size"""
+        async with self._semaphore:
+            return await getattr(self.client, method)(**params)
+
+    async def _test_connection(self) -> None:
+        """Test API connection (Config.CONNECTION_PROBE: 'account', 'ping' or 'none')"""
+        if Config.CONNECTION_PROBE == 'none':
+            self.logger.info("Connection probe skipped")
+            return
+
+        try:
+            if Config.CONNECTION_PROBE == 'ping':
+                await self._call('futures_ping')
+            else:
+                await self._call('futures_account')
+            self.logger.info("API connection successful")
+            print("🔗 API connection successful")
+        except Exception as e:
+            self.logger.error(f"API connection failed: {str(e)}")
+            raise Exception(f"API connection failed: {str(e)}")
+
+    async def get_account_info(self) -> Dict[str, Any]:
+        """Get account information"""
+        try:
+            self.logger.info("Fetching account information...")
+            account_info = await self._call('futures_account')
+
+            # Log account balance
+            total_balance = float(account_info['totalWalletBalance'])
+            available_balance = float(account_info['availableBalance'])
+
+            self.logger.info(f"Total Balance: {total_balance} USDT")
+            self.logger.info(f"Available Balance: {available_balance} USDT")
+
+            return account_info
+
+        except binance_exception('BinanceAPIException') as e:
+            self.logger.error(f"API Error getting account info: {e}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Error getting account info: {e}")
+            raise
+
+    async def get_symbol_price(self, symbol: str) -> float:
+        """Get current price for a symbol"""
+        try:
+            ticker = await self._call('futures_symbol_ticker', symbol=symbol)
+            price = float(ticker['price'])
+            self.logger.info(f"Current price for {symbol}: {price}")
+            return price
+        except Exception as e:
+            self.logger.error(f"Error getting price for {symbol}: {e}")
+            raise
+
+    async def _create_order(self, label: str, client_order_id: Optional[str] = None, **params) -> Dict[str, Any]:
+        """Submit an order and log the outcome"""
+        try:
+            order = await self._submit_order(client_order_id, **params)
+            self.logger.info(f"{label} order placed successfully: {order['orderId']}")
+            return order
+
+        except binance_exception('BinanceAPIException') as e:
+            self.logger.error(f"Binance API Error: {e}")
+            raise
+        except binance_exception('BinanceOrderException') as e:
+            self.logger.error(f"Binance Order Error: {e}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Unexpected error placing {label.lower()} order: {e}")
+            raise
+
+    async def _timed_call(self, method: str, **params) -> Any:
+        """``_call`` bounded by Config.ORDER_TIMEOUT"""
+        return await asyncio.wait_for(self._call(method, **params), Config.ORDER_TIMEOUT)
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        return is_transient_error(error) or isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError))
+
+    async def _submit_order(self, client_order_id: Optional[str] = None, **params) -> Dict[str, Any]:
+        """Async counterpart of ``BasicBot._submit_order``"""
+        params['newClientOrderId'] = client_order_id or new_client_order_id()
+
+        attempt = 0
+        while True:
+            try:
+                return await self._timed_call('futures_create_order', **params)
+            except Exception as e:
+                if not self._is_transient(e):
+                    # A resend may be rejected because the first attempt did land
+                    if attempt:
+                        try:
+                            existing = await self._find_order(params['symbol'], params['newClientOrderId'])
+                        except Exception:
+                            existing = None
+                        if existing is not None:
+                            return existing
+                    raise
+                error = e
+                self.logger.warning(f"Transient error submitting {params['newClientOrderId']}: {e!r}")
+                if self.metrics is not None:
+                    self.metrics.increment('retries', 'futures_create_order', params['symbol'])
+
+            # Outcome unknown: find out whether the order exists before resending
+            while True:
+                if attempt >= Config.ORDER_MAX_RETRIES:
+                    self.logger.error(f"Order {params['newClientOrderId']} status unknown after {attempt} retries")
+                    raise error
+                await asyncio.sleep(retry_delay(attempt))
+                attempt += 1
+                try:
+                    existing = await self._find_order(params['symbol'], params['newClientOrderId'])
+                    break
+                except Exception as e:
+                    if not self._is_transient(e):
+                        raise
+                    error = e
+
+            if existing is not None:
+                self.logger.info(f"Order {params['newClientOrderId']} reached the exchange, not resending")
+                return existing
+            self.logger.info(f"Order {params['newClientOrderId']} not on the exchange, resending")
+
+    async def _find_order(self, symbol: str, client_order_id: str) -> Optional[Dict[str, Any]]:
+        """Look an order up by client order id; None if the exchange does not know it"""
+        try:
+            return await self._timed_call('futures_get_order', symbol=symbol, origClientOrderId=client_order_id)
+        except Exception as e:
+            if getattr(e, 'code', None) == ORDER_NOT_FOUND_CODE:
+                return None
+            raise
+
+    async def _submit_batch(self, chunk: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Async counterpart of ``BasicBot._submit_batch``"""
+        results: Dict[str, Dict[str, Any]] = {}
+        to_send = list(chunk)
+        unknown: List[Dict[str, str]] = []
+        error: Optional[Exception] = None
+        attempt = 0
+
+        while to_send or unknown:
+            if to_send:
+                try:
+                    response = await self._timed_call('futures_place_batch_order', batchOrders=to_send)
+                    for order, result in zip(to_send, response):
+                        results[order['newClientOrderId']] = result
+                except Exception as e:
+                    error = e
+                    if self._is_transient(e):
+                        self.logger.warning(f"Transient error placing order batch: {e!r}")
+                        unknown.extend(to_send)
+                        if self.metrics is not None:
+                            self.metrics.increment('retries', 'futures_place_batch_order', to_send[0]['symbol'])
+                    else:
+                        self.logger.error(f"Error placing order batch: {e}")
+                        for order in to_send:
+                            results[order['newClientOrderId']] = {'code': getattr(e, 'code', -1), 'msg': str(e)}
+                to_send = []
+
+            if not unknown:
+                break
+            if attempt >= Config.ORDER_MAX_RETRIES:
+                for order in unknown:
+                    results[order['newClientOrderId']] = {'code': getattr(error, 'code', -1),
+                                                          'msg': f"Order status unknown: {error!r}"}
+                break
+
+            # Outcome unknown: look each order up before resending it
+            await asyncio.sleep(retry_delay(attempt))
+            attempt += 1
+            still_unknown = []
+            for order in unknown:
+                try:
+                    existing = await self._find_order(order['symbol'], order['newClientOrderId'])
+                except Exception as e:
+                    if self._is_transient(e):
+                        still_unknown.append(order)
+                    else:
+                        results[order['newClientOrderId']] = {'code': getattr(e, 'code', -1), 'msg': str(e)}
+                    continue
+                if existing is not None:
+                    results[order['newClientOrderId']] = existing
+                else:
+                    to_send.append(order)
+            unknown = still_unknown
+
+        return [results[order['newClientOrderId']] for order in chunk]
+
+    async def place_market_order(self, symbol: str, side: str, quantity: float,
+                                 client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        """Place a market order"""
+
+        # Validate parameters
+        if not self._validate_order_params(symbol, side, 'MARKET', quantity):
+            raise ValueError("Invalid order parameters")
+        await self._refresh_stale_filters()
+        quantity, _, _ = self._apply_exchange_filters(symbol, 'MARKET', quantity)
+
+        self.logger.info(f"Placing MARKET {side} order: {quantity} {symbol}")
+        return await self._create_order(
+            'Market',
+            client_order_id,
+            symbol=symbol,
+            side=side.upper(),
+            type='MARKET',
+            quantity=quantity
+        )
+
+    async def place_limit_order(self, symbol: str, side: str, quantity: float, price: float,
+                                client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        """Place a limit order"""
+
+        # Validate parameters
+        if not self._validate_order_params(symbol, side, 'LIMIT', quantity, price):
+            raise ValueError("Invalid order parameters")
+        await self._refresh_stale_filters()
+        quantity, price, _ = self._apply_exchange_filters(symbol, 'LIMIT', quantity, price)
+
+        self.logger.info(f"Placing LIMIT {side} order: {quantity} {symbol} at {price}")
+        return await self._create_order(
+            'Limit',
+            client_order_id,
+            symbol=symbol,
+            side=side.upper(),
+            type='LIMIT',
+            timeInForce='GTC',
+            quantity=quantity,
+            price=price
+        )
+
+    async def place_stop_loss_limit_order(self, symbol: str, side: str, quantity: float,
+                                          price: float, stop_price: float,
+                                          client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        """Place a stop-loss limit order"""
+
+        # Validate parameters
+        if not self._validate_order_params(symbol, side, 'STOP_LOSS_LIMIT', quantity, price):
+            raise ValueError("Invalid order parameters")
+        await self._refresh_stale_filters()
+        quantity, price, stop_price = self._apply_exchange_filters(symbol, 'STOP_LOSS_LIMIT', quantity,
+                                                                   price, stop_price)
+
+        self.logger.info(f"Placing STOP_LOSS_LIMIT {side} order: {quantity} {symbol}")
+        self.logger.info(f"Stop Price: {stop_price}, Limit Price: {price}")
+        return await self._create_order(
+            'Stop-loss limit',
+            client_order_id,
+            symbol=symbol,
+            side=side.upper(),
+            type='STOP',
+            timeInForce='GTC',
+            quantity=quantity,
+            price=price,
+            stopPrice=stop_price
+        )
+
+    async def get_open_orders(self, symbol: str = None) -> List[Dict[str, Any]]:
+        """Get open orders"""
+        try:
+            if symbol:
+                orders = await self._call('futures_get_open_orders', symbol=symbol)
+                self.logger.info(f"Retrieved {len(orders)} open orders for {symbol}")
+            else:
+                orders = await self._call('futures_get_open_orders')
+                self.logger.info(f"Retrieved {len(orders)} open orders")
+
+            return orders
+
+        except Exception as e:
+            self.logger.error(f"Error getting open orders: {e}")
+            raise
+
+    async def cancel_order(self, symbol: str, order_id: int) -> Dict[str, Any]:
+        """Cancel an order"""
+        try:
+            self.logger.info(f"Cancelling order {order_id} for {symbol}")
+
+            result = await self._call('futures_cancel_order', symbol=symbol, orderId=order_id)
+
+            self.logger.info(f"Order {order_id} cancelled successfully")
+            return result
+
+        except Exception as e:
+            if getattr(e, 'code', None) in CANCEL_UNKNOWN_ORDER_CODES:
+                # Usually a cancel racing a fill; the caller picks up the final state
+                self.logger.warning(f"Order {order_id} already closed, not cancelled: {e}")
+            else:
+                self.logger.error(f"Error cancelling order {order_id}: {e}")
+            raise
+
+    async def get_order_status(self, symbol: str, order_id: int) -> Dict[str, Any]:
+        """Get order status"""
+        try:
+            order = await self._call('futures_get_order', symbol=symbol, orderId=order_id)
+
+            self.logger.info(f"Order {order_id} status: {order['status']}")
+            return order
+
+        except Exception as e:
+            self.logger.error(f"Error getting order status: {e}")
+            raise
+
+    async def place_orders_batch(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Place many orders through the futures batch-orders endpoint
+
+        Same contract as ``BasicBot.place_orders_batch``; chunks are sent
+        concurrently.
+        """
+        # Validate the whole batch up front
+        for index, order in enumerate(orders):
+            if not self._validate_order_params(order.get('symbol'), order.get('side', ''),
+                                               order.get('type', ''), order.get('quantity', 0),
+                                               order.get('price')):
+                raise ValueError(f"Invalid order parameters at batch index {index}")
+            if order['type'].upper() in ('STOP_LOSS_LIMIT', 'STOP_MARKET') and not order.get('stop_price'):
+                raise ValueError(f"Stop price required at batch index {index}")
+
+        # Exchange filters (and auto-rounding) on copies of the orders
+        await self._refresh_stale_filters()
+        checked = []
+        for index, order in enumerate(orders):
+            order = dict(order)
+            try:
+                order['quantity'], order['price'], order['stop_price'] = self._apply_exchange_filters(
+                    order['symbol'], order['type'], order['quantity'], order.get('price'), order.get('stop_price'))
+            except ValueError as e:
+                raise ValueError(f"{e} at batch index {index}")
+            checked.append(order)
+
+        chunks = chunked([batch_order_params(order) for order in checked], BATCH_ORDERS_MAX)
+        self.logger.info(f"Placing {len(orders)} orders in {len(chunks)} batch requests")
+
+        chunk_results = await asyncio.gather(*[self._submit_batch(chunk) for chunk in chunks])
+        results = [result for chunk in chunk_results for result in chunk]
+
+        failed = sum(1 for result in results if 'orderId' not in result)
+        self.logger.info(f"Batch placed: {len(results) - failed} accepted, {failed} rejected")
+        return results
+
+    async def cancel_orders_batch(self, symbol: str, order_ids: List[int]) -> List[Dict[str, Any]]:
+        """Cancel many orders through the futures cancel-multiple endpoint"""
+        chunks = chunked(list(order_ids), BATCH_CANCEL_MAX)
+        self.logger.info(f"Cancelling {len(order_ids)} orders for {symbol} in {len(chunks)} batch requests")
+
+        async def send(chunk: List[int]) -> List[Dict[str, Any]]:
+            try:
+                return await self._call('futures_cancel_orders', symbol=symbol,
+                                        orderIdList=json.dumps(chunk, separators=(',', ':')))
+            except Exception as e:
+                self.logger.error(f"Error cancelling order batch: {e}")
+                return [{'code': getattr(e, 'code', -1), 'msg': str(e)} for _ in chunk]
+
+        chunk_results = await asyncio.gather(*[send(chunk) for chunk in chunks])
+        results = [result for chunk in chunk_results for result in chunk]
+
+        failed = sum(1 for result in results if 'orderId' not in result)
+        self.logger.info(f"Batch cancel: {len(results) - failed} cancelled, {failed} failed")
+        return results
+
+
+def run_benchmark(num_orders: int = 50, latency: float = 0.02) -> Dict[str, float]:
+    """Compare sequential BasicBot vs concurrent AsyncBasicBot order throughput
+
+    Both bots talk to the in-process fake exchange with the same simulated
+    round-trip latency, so the difference is purely request concurrency.
+    """
+    import logging
+    from fake_exchange import FakeExchange, FakeFuturesClient, FakeAsyncFuturesClient
+
+    exchange = FakeExchange()
+
+    sync_bot = BasicBot('fake', 'fake', client=FakeFuturesClient(exchange, latency))
+    sync_bot.logger.setLevel(logging.WARNING)
+    start = time.perf_counter()
+    for _ in range(num_orders):
+        sync_bot.place_limit_order('BTCUSDT', 'BUY', 0.001, 50000.0)
+    sync_elapsed = time.perf_counter() - start
+
+    async def _run_async() -> float:
+        async with AsyncBasicBot('fake', 'fake', max_connections=num_orders,
+                                 client=FakeAsyncFuturesClient(exchange, latency)) as async_bot:
+            async_bot.logger.setLevel(logging.WARNING)
+            start = time.perf_counter()
+            await asyncio.gather(*[
+                async_bot.place_limit_order('BTCUSDT', 'BUY', 0.001, 50000.0)
+                for _ in range(num_orders)
+            ])
+            return time.perf_counter() - start
+
+    async_elapsed = asyncio.run(_run_async())
+
+    return {
+        'orders': num_orders,
+        'sync_seconds': sync_elapsed,
+        'async_seconds': async_elapsed,
+        'sync_orders_per_second': num_orders / sync_elapsed,
+        'async_orders_per_second': num_orders / async_elapsed,
+        'speedup': sync_elapsed / async_elapsed,
+    }
+
+
+if __name__ == "__main__":
+    for n in (1, 10, 50, 200):
+        result = run_benchmark(num_orders=n)
+        print(f"📊 N={n:<4} sync: {result['sync_orders_per_second']:8.1f} orders/s | "
+              f"async: {result['async_orders_per_second']:8.1f} orders/s | "
+              f"speedup: {result['speedup']:.1f}x")
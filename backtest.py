@@ -0,0 +1,401 @@
+"""
+Backtesting for the order types ``BasicBot`` places.
+
+Two engines share one fill model:
+
+* ``run_vectorized`` takes a target position per bar (decided at the bar's
+  close) and works the order needed to reach it. MARKET orders are fully
+  vectorized; LIMIT (GTC) and STOP (stop-limit) orders rest until filled or
+  replaced by the next target change, found with NumPy scans, so only the
+  per-order bookkeeping is a Python loop.
+* ``EventBacktester`` calls a ``Strategy`` on every bar for path-dependent
+  logic; strategies place and cancel orders with the same method names
+  as ``BasicBot``.
+
+Fill model, for an order placed at the close of bar ``i``:
+
+* MARKET fills at the open of bar ``i + 1`` plus slippage, as taker.
+* LIMIT is active from bar ``i + 1``. If it is marketable at that open it
+  fills there as taker; otherwise it fills at its price (maker) on the
+  first bar that trades through it.
+* STOP triggers on the first bar whose high (buy) / low (sell) reaches the
+  stop price, at that price or the open if it gapped past. If the trigger
+  price is within the limit it fills there plus slippage (capped at the
+  limit) as taker; otherwise the limit rests and fills at its price.
+"""
+
+import time
+from typing import Dict, Any, Optional, List, Tuple
+import numpy as np
+
+from config import Config
+
+
+class BacktestResult:
+    """Equity curve, position path and fills of a backtest"""
+
+    def __init__(self, equity: np.ndarray, position: np.ndarray, fills: Dict[str, np.ndarray],
+                 initial_balance: float, periods_per_year: float):
+        self.equity = equity
+        self.position = position
+        self.fills = fills
+        self.initial_balance = initial_balance
+        self.periods_per_year = periods_per_year
+
+    def stats(self) -> Dict[str, float]:
+        """Summary statistics of the run"""
+        equity = self.equity
+        if not len(equity):
+            return {'bars': 0, 'fills': 0}
+        returns = np.diff(equity, prepend=self.initial_balance) / np.maximum(
+            np.concatenate(([self.initial_balance], equity[:-1])), 1e-12)
+        peak = np.maximum.accumulate(np.maximum(equity, self.initial_balance))
+        std = returns.std()
+        return {
+            'bars': len(equity),
+            'fills': len(self.fills['bar']),
+            'final_equity': float(equity[-1]),
+            'total_return_pct': float((equity[-1] / self.initial_balance - 1) * 100),
+            'max_drawdown_pct': float(((peak - equity) / peak).max() * 100),
+            'sharpe': float(returns.mean() / std * np.sqrt(self.periods_per_year)) if std else 0.0,
+            'fees': float(self.fills['fee'].sum()),
+            'turnover': float(np.abs(self.fills['quantity'] * self.fills['price']).sum()),
+        }
+
+
+def _ohlc(klines: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    return (np.asarray(klines['open'], dtype=np.float64), np.asarray(klines['high'], dtype=np.float64),
+            np.asarray(klines['low'], dtype=np.float64), np.asarray(klines['close'], dtype=np.float64))
+
+
+def _first_touch(values: np.ndarray, start: int, end: int, price: float, below: bool) -> int:
+    """First index in ``[start, end)`` where values <= price (below) or >= price, else -1"""
+    if start >= end:
+        return -1
+    window = values[start:end]
+    hits = window <= price if below else window >= price
+    index = int(hits.argmax())
+    return start + index if hits[index] else -1
+
+
+def _work_resting_order(order_type: str, side: int, price: float, stop_price: float, start: int, end: int,
+                        opens: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+                        slippage: float) -> Optional[Tuple[int, float, bool]]:
+    """Find the fill of a LIMIT or STOP order active on bars ``[start, end)``
+
+    Returns ``(bar, price, is_maker)`` or None if it does not fill.
+    """
+    buy = side > 0
+    if order_type == 'LIMIT':
+        bar = _first_touch(lows if buy else highs, start, end, price, below=buy)
+        if bar < 0:
+            return None
+        if bar == start and (opens[bar] <= price if buy else opens[bar] >= price):
+            return bar, float(opens[bar]), False
+        return bar, price, True
+
+    # STOP: trigger, then behave as a limit order from the trigger bar on
+    bar = _first_touch(highs if buy else lows, start, end, stop_price, below=not buy)
+    if bar < 0:
+        return None
+    trigger = max(opens[bar], stop_price) if buy else min(opens[bar], stop_price)
+    if trigger <= price if buy else trigger >= price:
+        filled = min(trigger * (1 + slippage), price) if buy else max(trigger * (1 - slippage), price)
+        return bar, float(filled), False
+    bar = _first_touch(lows if buy else highs, bar, end, price, below=buy)
+    if bar < 0:
+        return None
+    return bar, price, True
+
+
+def _account(n: int, closes: np.ndarray, bars: np.ndarray, quantities: np.ndarray, prices: np.ndarray,
+             fees: np.ndarray, initial_balance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-bar position and mark-to-close equity from a list of fills"""
+    position_change = np.zeros(n)
+    cash_change = np.zeros(n)
+    np.add.at(position_change, bars, quantities)
+    np.add.at(cash_change, bars, -(quantities * prices) - fees)
+    position = np.cumsum(position_change)
+    equity = initial_balance + np.cumsum(cash_change) + position * closes
+    return equity, position
+
+
+def run_vectorized(klines: Dict[str, np.ndarray], targets: np.ndarray, order_type: str = 'MARKET',
+                   limit_offset_bps: float = 5.0, stop_offset_bps: float = 10.0,
+                   taker_fee: float = Config.BACKTEST_TAKER_FEE, maker_fee: float = Config.BACKTEST_MAKER_FEE,
+                   slippage_bps: float = Config.BACKTEST_SLIPPAGE_BPS,
+                   initial_balance: float = Config.BACKTEST_INITIAL_BALANCE,
+                   periods_per_year: float = 525_600) -> BacktestResult:
+    """Backtest a target-position signal
+
+    ``targets[i]`` is the position (in base units, negative for short)
+    wanted after the close of bar ``i``. Each change sends one order of
+    ``order_type``:
+
+    * LIMIT is priced ``limit_offset_bps`` better than that close.
+    * STOP is a breakout stop ``stop_offset_bps`` beyond the close, with its
+      limit another ``limit_offset_bps`` beyond the stop.
+
+    An unfilled LIMIT/STOP order is replaced at the next change.
+    """
+    opens, highs, lows, closes = _ohlc(klines)
+    targets = np.asarray(targets, dtype=np.float64)
+    n = len(closes)
+    slippage = slippage_bps / 1e4
+    order_type = order_type.upper()
+
+    previous = np.concatenate(([0.0], targets[:-1]))
+    # Orders from the last bar would fill after the data ends
+    placed = np.flatnonzero(targets[:-1] != previous[:-1])
+
+    if order_type == 'MARKET':
+        bars = placed + 1
+        quantities = targets[placed] - previous[placed]
+        prices = opens[bars] * (1 + np.sign(quantities) * slippage)
+        fees = np.abs(quantities * prices) * taker_fee
+    elif order_type in ('LIMIT', 'STOP'):
+        limit_offset = limit_offset_bps / 1e4
+        stop_offset = stop_offset_bps / 1e4
+        # Each order is active until (and including) the bar of the next change
+        ends = np.concatenate((placed[1:] + 1, [n]))
+        fill_bars, fill_quantities, fill_prices, fill_makers = [], [], [], []
+        position = 0.0
+        for placed_bar, end in zip(placed.tolist(), ends.tolist()):
+            quantity = targets[placed_bar] - position
+            if not quantity:
+                continue
+            side = 1 if quantity > 0 else -1
+            if order_type == 'LIMIT':
+                price = closes[placed_bar] * (1 - side * limit_offset)
+                stop_price = 0.0
+            else:
+                stop_price = closes[placed_bar] * (1 + side * stop_offset)
+                price = stop_price * (1 + side * limit_offset)
+            fill = _work_resting_order(order_type, side, price, stop_price, placed_bar + 1, end,
+                                       opens, highs, lows, slippage)
+            if fill is not None:
+                fill_bars.append(fill[0])
+                fill_quantities.append(quantity)
+                fill_prices.append(fill[1])
+                fill_makers.append(fill[2])
+                position += quantity
+        bars = np.array(fill_bars, dtype=np.int64)
+        quantities = np.array(fill_quantities, dtype=np.float64)
+        prices = np.array(fill_prices, dtype=np.float64)
+        fees = np.abs(quantities * prices) * np.where(np.array(fill_makers, dtype=bool), maker_fee, taker_fee)
+    else:
+        raise ValueError(f"Unsupported order type: {order_type}")
+
+    equity, position_path = _account(n, closes, bars, quantities, prices, fees, initial_balance)
+    fills = {'bar': bars, 'quantity': quantities, 'price': prices, 'fee': fees}
+    return BacktestResult(equity, position_path, fills, initial_balance, periods_per_year)
+
+
+class Strategy:
+    """Base class for event-driven strategies"""
+
+    def on_start(self, bt: 'EventBacktester') -> None:
+        pass
+
+    def on_bar(self, bt: 'EventBacktester', i: int) -> None:
+        """Called after the close of bar ``i``; orders placed here are active from bar ``i + 1``"""
+        raise NotImplementedError
+
+    def on_fill(self, bt: 'EventBacktester', order: Dict[str, Any]) -> None:
+        pass
+
+
+class EventBacktester:
+    """Bar-by-bar backtester for path-dependent strategies"""
+
+    def __init__(self, klines: Dict[str, np.ndarray], strategy: Strategy,
+                 taker_fee: float = Config.BACKTEST_TAKER_FEE, maker_fee: float = Config.BACKTEST_MAKER_FEE,
+                 slippage_bps: float = Config.BACKTEST_SLIPPAGE_BPS,
+                 initial_balance: float = Config.BACKTEST_INITIAL_BALANCE,
+                 periods_per_year: float = 525_600):
+        """Initialize the backtester over OHLC columns (e.g. from ``KlineStore.load``)"""
+        self.open, self.high, self.low, self.close = _ohlc(klines)
+        self.strategy = strategy
+        self.taker_fee = taker_fee
+        self.maker_fee = maker_fee
+        self.slippage = slippage_bps / 1e4
+        self.initial_balance = initial_balance
+        self.periods_per_year = periods_per_year
+        self.position = 0.0
+        self.cash = initial_balance
+        self.bar = -1
+        self.orders: Dict[int, Dict[str, Any]] = {}
+        self._next_order_id = 1
+        self._fills: List[Tuple[int, float, float, float]] = []
+
+    def _add_order(self, order_type: str, side: str, quantity: float, price: float = 0.0,
+                   stop_price: float = 0.0) -> Dict[str, Any]:
+        side = side.upper()
+        if side not in ('BUY', 'SELL') or quantity <= 0:
+            raise ValueError("Invalid order parameters")
+        order = {'orderId': self._next_order_id, 'type': order_type, 'side': side, 'quantity': quantity,
+                 'price': price, 'stopPrice': stop_price, 'status': 'NEW', 'placed_bar': self.bar,
+                 'triggered': False}
+        self.orders[order['orderId']] = order
+        self._next_order_id += 1
+        return order
+
+    def place_market_order(self, side: str, quantity: float) -> Dict[str, Any]:
+        return self._add_order('MARKET', side, quantity)
+
+    def place_limit_order(self, side: str, quantity: float, price: float) -> Dict[str, Any]:
+        return self._add_order('LIMIT', side, quantity, price)
+
+    def place_stop_loss_limit_order(self, side: str, quantity: float, price: float,
+                                    stop_price: float) -> Dict[str, Any]:
+        return self._add_order('STOP', side, quantity, price, stop_price)
+
+    def cancel_order(self, order_id: int) -> Dict[str, Any]:
+        order = self.orders.pop(order_id)
+        order['status'] = 'CANCELED'
+        return order
+
+    def get_open_orders(self) -> List[Dict[str, Any]]:
+        return list(self.orders.values())
+
+    def _match(self, order: Dict[str, Any], i: int) -> Optional[Tuple[float, bool]]:
+        """Fill price and maker flag of an active order on bar ``i``, or None"""
+        buy = order['side'] == 'BUY'
+        bar_open, high, low = self.open[i], self.high[i], self.low[i]
+        if order['type'] == 'MARKET':
+            return bar_open * (1 + self.slippage if buy else 1 - self.slippage), False
+
+        price = order['price']
+        first_bar = i == order['placed_bar'] + 1
+        if order['type'] == 'STOP' and not order['triggered']:
+            stop_price = order['stopPrice']
+            if not (high >= stop_price if buy else low <= stop_price):
+                return None
+            order['triggered'] = True
+            trigger = max(bar_open, stop_price) if buy else min(bar_open, stop_price)
+            if trigger <= price if buy else trigger >= price:
+                filled = min(trigger * (1 + self.slippage), price) if buy else max(trigger * (1 - self.slippage), price)
+                return filled, False
+            first_bar = False
+
+        if not (low <= price if buy else high >= price):
+            return None
+        if first_bar and (bar_open <= price if buy else bar_open >= price):
+            return bar_open, False
+        return price, True
+
+    def run(self) -> BacktestResult:
+        """Run the strategy over every bar"""
+        n = len(self.close)
+        equity = np.empty(n)
+        positions = np.empty(n)
+        self.strategy.on_start(self)
+        for i in range(n):
+            self.bar = i
+            for order in list(self.orders.values()):
+                fill = self._match(order, i)
+                if fill is None:
+                    continue
+                price, is_maker = fill
+                quantity = order['quantity'] if order['side'] == 'BUY' else -order['quantity']
+                fee = abs(quantity * price) * (self.maker_fee if is_maker else self.taker_fee)
+                self.position += quantity
+                self.cash -= quantity * price + fee
+                self._fills.append((i, quantity, price, fee))
+                del self.orders[order['orderId']]
+                order.update(status='FILLED', avgPrice=price, fill_bar=i)
+                self.strategy.on_fill(self, order)
+
+            equity[i] = self.cash + self.position * self.close[i]
+            positions[i] = self.position
+            self.strategy.on_bar(self, i)
+
+        columns = list(zip(*self._fills)) if self._fills else [[], [], [], []]
+        fills = {'bar': np.array(columns[0], dtype=np.int64), 'quantity': np.array(columns[1], dtype=np.float64),
+                 'price': np.array(columns[2], dtype=np.float64), 'fee': np.array(columns[3], dtype=np.float64)}
+        return BacktestResult(equity, positions, fills, self.initial_balance, self.periods_per_year)
+
+
+class TargetPositionStrategy(Strategy):
+    """Event-driven equivalent of ``run_vectorized``: work one order toward each new target"""
+
+    def __init__(self, targets: np.ndarray, order_type: str = 'MARKET', limit_offset_bps: float = 5.0,
+                 stop_offset_bps: float = 10.0):
+        self.targets = np.asarray(targets, dtype=np.float64)
+        self.order_type = order_type.upper()
+        self.limit_offset = limit_offset_bps / 1e4
+        self.stop_offset = stop_offset_bps / 1e4
+        self.previous = 0.0
+
+    def on_bar(self, bt: EventBacktester, i: int) -> None:
+        target = self.targets[i]
+        if target == self.previous or i == len(self.targets) - 1:
+            return
+        self.previous = target
+        for order in bt.get_open_orders():
+            bt.cancel_order(order['orderId'])
+        quantity = target - bt.position
+        if not quantity:
+            return
+        side = 'BUY' if quantity > 0 else 'SELL'
+        sign = 1 if quantity > 0 else -1
+        close = bt.close[i]
+        if self.order_type == 'MARKET':
+            bt.place_market_order(side, abs(quantity))
+        elif self.order_type == 'LIMIT':
+            bt.place_limit_order(side, abs(quantity), close * (1 - sign * self.limit_offset))
+        else:
+            stop_price = close * (1 + sign * self.stop_offset)
+            bt.place_stop_loss_limit_order(side, abs(quantity), stop_price * (1 + sign * self.limit_offset),
+                                           stop_price)
+
+
+def synthetic_klines(n: int, start_price: float = 100.0, volatility: float = 0.001,
+                     seed: int = 7) -> Dict[str, np.ndarray]:
+    """Random-walk OHLC columns for tests and benchmarks"""
+    rng = np.random.default_rng(seed)
+    closes = start_price * np.exp(np.cumsum(rng.normal(0, volatility, n)))
+    opens = np.concatenate(([start_price], closes[:-1]))
+    wick = np.abs(rng.normal(0, volatility, n)) * closes
+    return {
+        'open_time': np.arange(n, dtype=np.float64) * 60_000,
+        'open': opens,
+        'high': np.maximum(opens, closes) + wick,
+        'low': np.minimum(opens, closes) - wick,
+        'close': closes,
+    }
+
+
+def moving_average_crossover(closes: np.ndarray, fast: int = 20, slow: int = 100,
+                             quantity: float = 1.0) -> np.ndarray:
+    """Long/short target positions from a simple moving-average crossover"""
+    cumulative = np.concatenate(([0.0], np.cumsum(closes)))
+    fast_ma = np.full(len(closes), np.nan)
+    slow_ma = np.full(len(closes), np.nan)
+    fast_ma[fast - 1:] = (cumulative[fast:] - cumulative[:-fast]) / fast
+    slow_ma[slow - 1:] = (cumulative[slow:] - cumulative[:-slow]) / slow
+    targets = np.where(fast_ma > slow_ma, quantity, -quantity)
+    targets[:slow - 1] = 0.0
+    return targets
+
+
+def run_benchmark(bars: int = 5_000_000, event_bars: int = 200_000) -> Dict[str, float]:
+    """Bars per second of each engine on synthetic data (signal generation excluded)"""
+    klines = synthetic_klines(bars)
+    targets = moving_average_crossover(klines['close'])
+    results = {}
+    for order_type in ('MARKET', 'LIMIT', 'STOP'):
+        start = time.perf_counter()
+        run_vectorized(klines, targets, order_type)
+        results[f"vectorized_{order_type.lower()}_bars_per_s"] = bars / (time.perf_counter() - start)
+
+    small = {name: column[:event_bars] for name, column in klines.items()}
+    start = time.perf_counter()
+    EventBacktester(small, TargetPositionStrategy(targets[:event_bars], 'LIMIT')).run()
+    results['event_limit_bars_per_s'] = event_bars / (time.perf_counter() - start)
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in run_benchmark().items():
+        print(f"📊 {name:32} {value / 1e6:8.2f} M bars/s")
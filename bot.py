@@ -1,292 +1,1019 @@
-import time
-import logging
-from typing import Dict, Any, Optional, List
-from binance import Client
-from binance.enums import *
-from binance.exceptions import BinanceAPIException, BinanceOrderException
-
-class BasicBot:
-    """Enhanced Trading Bot for Binance Futures Testnet"""
-    
-    def __init__(self, api_key: str, api_secret: str, testnet: bool = True):
-        """Initialize the trading bot"""
-        self.api_key = api_key
-        self.api_secret = api_secret
-        self.testnet = testnet
-        
-        # Setup logging
-        self.logger = self._setup_logging()
-        
-        # Initialize Binance client
-        try:
-            self.client = Client(
-                api_key=api_key,
-                api_secret=api_secret,
-                testnet=testnet
-            )
-            
-            # Test connection
-            self._test_connection()
-            
-            self.logger.info("Bot initialized successfully")
-            print("✅ Bot initialized successfully")
-            
-        except Exception as e:
-            self.logger.error(f"Failed to initialize bot: {str(e)}")
-            print(f"❌ Failed to initialize bot: {str(e)}")
-            raise
-    
-    def _setup_logging(self) -> logging.Logger:
-        """Setup logging configuration with proper encoding"""
-        import os
-        
-        # Create logs directory if it doesn't exist
-        os.makedirs('logs', exist_ok=True)
-        
-        # Create logger
-        logger = logging.getLogger('TradingBot')
-        logger.setLevel(logging.INFO)
-        
-        # Clear existing handlers
-        logger.handlers.clear()
-        
-        # Create formatters (without emojis for file logging)
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        console_formatter = logging.Formatter(
-            '%(levelname)s - %(message)s'
-        )
-        
-        # File handler with UTF-8 encoding
-        try:
-            file_handler = logging.FileHandler('logs/trading_bot.log', encoding='utf-8')
-            file_handler.setLevel(logging.DEBUG)
-            file_handler.setFormatter(file_formatter)
-            logger.addHandler(file_handler)
-        except Exception as e:
-            print(f"Warning: Could not setup file logging: {e}")
-        
-        # Console handler (simplified to avoid encoding issues)
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(console_formatter)
-        logger.addHandler(console_handler)
-        
-        return logger
-    
-    def _test_connection(self) -> None:
-        """Test API connection"""
-        try:
-            account_info = self.client.futures_account()
-            self.logger.info("API connection successful")
-            print("🔗 API connection successful")
-        except Exception as e:
-            self.logger.error(f"API connection failed: {str(e)}")
-            raise Exception(f"API connection failed: {str(e)}")
-    
-    def get_account_info(self) -> Dict[str, Any]:
-        """Get account information"""
-        try:
-            self.logger.info("Fetching account information...")
-            account_info = self.client.futures_account()
-            
-            # Log account balance
-            total_balance = float(account_info['totalWalletBalance'])
-            available_balance = float(account_info['availableBalance'])
-            
-            self.logger.info(f"Total Balance: {total_balance} USDT")
-            self.logger.info(f"Available Balance: {available_balance} USDT")
-            
-            return account_info
-            
-        except BinanceAPIException as e:
-            self.logger.error(f"API Error getting account info: {e}")
-            raise
-        except Exception as e:
-            self.logger.error(f"Error getting account info: {e}")
-            raise
-    
-    def get_symbol_price(self, symbol: str) -> float:
-        """Get current price for a symbol"""
-        try:
-            ticker = self.client.futures_symbol_ticker(symbol=symbol)
-            price = float(ticker['price'])
-            self.logger.info(f"Current price for {symbol}: {price}")
-            return price
-        except Exception as e:
-            self.logger.error(f"Error getting price for {symbol}: {e}")
-            raise
-    
-    def place_market_order(self, symbol: str, side: str, quantity: float) -> Dict[str, Any]:
-        """Place a market order"""
-        
-        # Validate parameters
-        if not self._validate_order_params(symbol, side, 'MARKET', quantity):
-            raise ValueError("Invalid order parameters")
-        
-        try:
-            self.logger.info(f"Placing MARKET {side} order: {quantity} {symbol}")
-            
-            # Place actual order
-            order = self.client.futures_create_order(
-                symbol=symbol,
-                side=side.upper(),
-                type=ORDER_TYPE_MARKET,
-                quantity=quantity
-            )
-            
-            self.logger.info(f"Market order placed successfully: {order['orderId']}")
-            
-            return order
-            
-        except BinanceAPIException as e:
-            self.logger.error(f"Binance API Error: {e}")
-            raise
-        except BinanceOrderException as e:
-            self.logger.error(f"Binance Order Error: {e}")
-            raise
-        except Exception as e:
-            self.logger.error(f"Unexpected error placing market order: {e}")
-            raise
-    
-    def place_limit_order(self, symbol: str, side: str, quantity: float, price: float) -> Dict[str, Any]:
-        """Place a limit order"""
-        
-        # Validate parameters
-        if not self._validate_order_params(symbol, side, 'LIMIT', quantity, price):
-            raise ValueError("Invalid order parameters")
-        
-        try:
-            self.logger.info(f"Placing LIMIT {side} order: {quantity} {symbol} at {price}")
-            
-            # Place actual order
-            order = self.client.futures_create_order(
-                symbol=symbol,
-                side=side.upper(),
-                type=ORDER_TYPE_LIMIT,
-                timeInForce=TIME_IN_FORCE_GTC,
-                quantity=quantity,
-                price=price
-            )
-            
-            self.logger.info(f"Limit order placed successfully: {order['orderId']}")
-            
-            return order
-            
-        except BinanceAPIException as e:
-            self.logger.error(f"Binance API Error: {e}")
-            raise
-        except BinanceOrderException as e:
-            self.logger.error(f"Binance Order Error: {e}")
-            raise
-        except Exception as e:
-            self.logger.error(f"Unexpected error placing limit order: {e}")
-            raise
-    
-    def place_stop_loss_limit_order(self, symbol: str, side: str, quantity: float, 
-                                   price: float, stop_price: float) -> Dict[str, Any]:
-        """Place a stop-loss limit order"""
-        
-        try:
-            self.logger.info(f"Placing STOP_LOSS_LIMIT {side} order: {quantity} {symbol}")
-            self.logger.info(f"Stop Price: {stop_price}, Limit Price: {price}")
-            
-            # Place actual order
-            order = self.client.futures_create_order(
-                symbol=symbol,
-                side=side.upper(),
-                type=ORDER_TYPE_STOP,
-                timeInForce=TIME_IN_FORCE_GTC,
-                quantity=quantity,
-                price=price,
-                stopPrice=stop_price
-            )
-            
-            self.logger.info(f"Stop-loss limit order placed successfully: {order['orderId']}")
-            
-            return order
-            
-        except BinanceAPIException as e:
-            self.logger.error(f"Binance API Error: {e}")
-            raise
-        except BinanceOrderException as e:
-            self.logger.error(f"Binance Order Error: {e}")
-            raise
-        except Exception as e:
-            self.logger.error(f"Unexpected error placing stop-loss limit order: {e}")
-            raise
-    
-    def get_open_orders(self, symbol: str = None) -> List[Dict[str, Any]]:
-        """Get open orders"""
-        try:
-            if symbol:
-                orders = self.client.futures_get_open_orders(symbol=symbol)
-                self.logger.info(f"Retrieved {len(orders)} open orders for {symbol}")
-            else:
-                orders = self.client.futures_get_open_orders()
-                self.logger.info(f"Retrieved {len(orders)} open orders")
-            
-            return orders
-            
-        except Exception as e:
-            self.logger.error(f"Error getting open orders: {e}")
-            raise
-    
-    def cancel_order(self, symbol: str, order_id: int) -> Dict[str, Any]:
-        """Cancel an order"""
-        try:
-            self.logger.info(f"Cancelling order {order_id} for {symbol}")
-            
-            result = self.client.futures_cancel_order(
-                symbol=symbol,
-                orderId=order_id
-            )
-            
-            self.logger.info(f"Order {order_id} cancelled successfully")
-            return result
-            
-        except Exception as e:
-            self.logger.error(f"Error cancelling order {order_id}: {e}")
-            raise
-    
-    def get_order_status(self, symbol: str, order_id: int) -> Dict[str, Any]:
-        """Get order status"""
-        try:
-            order = self.client.futures_get_order(
-                symbol=symbol,
-                orderId=order_id
-            )
-            
-            self.logger.info(f"Order {order_id} status: {order['status']}")
-            return order
-            
-        except Exception as e:
-            self.logger.error(f"Error getting order status: {e}")
-            raise
-    
-    def _validate_order_params(self, symbol: str, side: str, order_type: str, quantity: float, 
-                              price: Optional[float] = None) -> bool:
-        """Validate order parameters"""
-        
-        if not symbol or len(symbol) < 3:
-            self.logger.error("Invalid symbol")
-            return False
-        
-        if side.upper() not in ['BUY', 'SELL']:
-            self.logger.error("Side must be BUY or SELL")
-            return False
-        
-        if order_type.upper() not in ['MARKET', 'LIMIT', 'STOP_LOSS_LIMIT']:
-            self.logger.error("Unsupported order type")
-            return False
-        
-        if quantity <= 0:
-            self.logger.error("Quantity must be greater than 0")
-            return False
-        
-        if order_type.upper() in ['LIMIT', 'STOP_LOSS_LIMIT'] and (not price or price <= 0):
-            self.logger.error("Price must be specified and greater than 0 for limit orders")
-            return False
-        
-        return True
+import sys
+import time
+import json
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List
+
+from config import Config
+from exchange_filters import ExchangeFilterCache, ALGO_ORDER_TYPES
+from rate_limit import RateLimitGovernor, GovernedClient
+from log_pipeline import setup_queue_logging
+from metrics import Metrics, InstrumentedClient
+from startup import create_client, LazyClient
+from transport import create_lean_client
+from ledger import Ledger
+from risk import RiskEngine, RiskRejected
+from journal import OrderJournal, ACK, UPDATE, OPEN_STATUSES, reconcile_orders
+
+# Futures API enum values (binance.enums; python-binance itself is only imported with the client)
+ORDER_TYPE_MARKET = 'MARKET'
+ORDER_TYPE_LIMIT = 'LIMIT'
+FUTURE_ORDER_TYPE_STOP = 'STOP'
+FUTURE_ORDER_TYPE_STOP_MARKET = 'STOP_MARKET'
+TIME_IN_FORCE_GTC = 'GTC'
+
+# Exchange maximums for the futures batch endpoints
+BATCH_ORDERS_MAX = 5
+BATCH_CANCEL_MAX = 10
+
+# Bot order types mapped to the futures API order type
+ORDER_TYPE_MAP = {
+    'MARKET': ORDER_TYPE_MARKET,
+    'LIMIT': ORDER_TYPE_LIMIT,
+    'STOP_LOSS_LIMIT': FUTURE_ORDER_TYPE_STOP,
+    'STOP_MARKET': FUTURE_ORDER_TYPE_STOP_MARKET,
+}
+
+def chunked(items: List[Any], size: int) -> List[List[Any]]:
+    """Split a list into consecutive chunks of at most ``size`` items"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+# API error codes meaning "sent, outcome unknown" (-1007) or "internal error" (-1001)
+TRANSIENT_ERROR_CODES = (-1001, -1007)
+# API error code for "Order does not exist"
+ORDER_NOT_FOUND_CODE = -2013
+# API error codes for cancelling an order that already filled or was cancelled ("Unknown order sent")
+CANCEL_UNKNOWN_ORDER_CODES = (-2011, ORDER_NOT_FOUND_CODE)
+
+def new_client_order_id() -> str:
+    """Generate a unique newClientOrderId (at most 36 characters)"""
+    return f"{Config.CLIENT_ORDER_ID_PREFIX}{uuid.uuid4().hex}"
+
+def binance_exception(name: str) -> Any:
+    """A binance.exceptions class for an ``except`` clause, or () (matches nothing) before binance is loaded"""
+    module = sys.modules.get('binance.exceptions')
+    return getattr(module, name) if module is not None else ()
+
+def is_transient_error(error: Exception) -> bool:
+    """True for timeouts, dropped connections and 5xx / unknown-status API errors"""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    # requests is only loaded along with the real client
+    requests_exceptions = sys.modules.get('requests.exceptions')
+    if requests_exceptions is not None and isinstance(
+            error, (requests_exceptions.Timeout, requests_exceptions.ConnectionError)):
+        return True
+    status_code = getattr(error, 'status_code', None)
+    if isinstance(status_code, int) and status_code >= 500:
+        return True
+    return getattr(error, 'code', None) in TRANSIENT_ERROR_CODES
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff delay before retry number ``attempt`` (0-based)"""
+    return min(Config.ORDER_RETRY_BACKOFF * (2 ** attempt), Config.ORDER_RETRY_BACKOFF_MAX)
+
+def reduce_only_params(reduce_only: bool) -> Dict[str, str]:
+    """The reduceOnly order param, sent only when set"""
+    return {'reduceOnly': 'true'} if reduce_only else {}
+
+def batch_order_params(order: Dict[str, Any]) -> Dict[str, str]:
+    """Convert a bot order dict into batch-orders endpoint params"""
+    order_type = order['type'].upper()
+    params = {
+        'symbol': order['symbol'],
+        'side': order['side'].upper(),
+        'type': ORDER_TYPE_MAP[order_type],
+        'quantity': str(order['quantity']),
+        'newClientOrderId': order.get('client_order_id') or new_client_order_id(),
+    }
+    
+    if order_type in ('LIMIT', 'STOP_LOSS_LIMIT'):
+        params['timeInForce'] = TIME_IN_FORCE_GTC
+        params['price'] = str(order['price'])
+    
+    if order_type in ('STOP_LOSS_LIMIT', 'STOP_MARKET'):
+        params['stopPrice'] = str(order['stop_price'])
+    
+    params.update(reduce_only_params(order.get('reduce_only', False)))
+    return params
+
+class BasicBot:
+    """Enhanced Trading Bot for Binance Futures Testnet"""
+    
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = True,
+                 client: Optional[Any] = None):
+        """Initialize the trading bot
+        
+        ``client`` may be any object exposing the ``futures_*`` methods of
+        ``binance.Client`` (e.g. ``fake_exchange.FakeFuturesClient``).
+        """
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.testnet = testnet
+        self.price_stream = None
+        self.order_books: Dict[str, Any] = {}
+        self.order_store = None
+        self.kline_store = None
+        self.scanner = None
+        self.ledger = Ledger() if Config.LEDGER_ENABLED else None
+        self.risk = RiskEngine(self.ledger) if Config.RISK_ENABLED else None
+        if self.risk is not None:
+            self.risk.on_kill = self.kill_switch
+        self.journal = OrderJournal() if Config.JOURNAL_ENABLED else None
+        
+        # Setup logging
+        self.logger = self._setup_logging()
+        
+        # Initialize Binance client
+        try:
+            if client is not None:
+                raw_client = client
+            elif Config.TRANSPORT == 'lean':
+                # Keep-alive HTTP/1.1 and pre-keyed signing for the trading endpoints (see transport.py)
+                raw_client = create_lean_client(api_key, api_secret, testnet)
+            elif Config.FAST_START:
+                # python-binance is imported and the client built on the first exchange call
+                raw_client = LazyClient(lambda: create_client(api_key, api_secret, testnet))
+            else:
+                raw_client = create_client(api_key, api_secret, testnet)
+            
+            # Exchange calls are timed inside the governor, so queueing is not counted
+            self.metrics = Metrics() if Config.METRICS_ENABLED else None
+            if self.metrics is not None:
+                raw_client = InstrumentedClient(raw_client, self.metrics)
+            
+            # Every futures_* call is admitted by the rate-limit governor
+            self.governor = RateLimitGovernor() if Config.RATE_LIMIT_ENABLED else None
+            self.client = GovernedClient(raw_client, self.governor) if self.governor else raw_client
+            
+            # Exchange filters are fetched lazily on the first order
+            self.filters = ExchangeFilterCache(self.client) if Config.EXCHANGE_FILTERS_ENABLED else None
+            
+            # Test connection
+            self._test_connection()
+            
+            self.logger.info("Bot initialized successfully")
+            print("✅ Bot initialized successfully")
+            
+        except Exception as e:
+            self.logger.error(f"Failed to initialize bot: {str(e)}")
+            print(f"❌ Failed to initialize bot: {str(e)}")
+            raise
+    
+    def _setup_logging(self) -> logging.Logger:
+        """Setup logging configuration with proper encoding"""
+        import os
+        
+        # Background JSON-lines writer keeps file I/O off the order path
+        if Config.LOG_QUEUE_ENABLED:
+            return setup_queue_logging()
+        
+        # Create logs directory if it doesn't exist
+        os.makedirs(os.path.dirname(Config.LOG_FILE) or '.', exist_ok=True)
+        
+        # Create logger
+        logger = logging.getLogger('TradingBot')
+        logger.setLevel(logging.INFO)
+        
+        # Clear existing handlers
+        logger.handlers.clear()
+        
+        # Create formatters (without emojis for file logging)
+        file_formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        console_formatter = logging.Formatter(
+            '%(levelname)s - %(message)s'
+        )
+        
+        # File handler with UTF-8 encoding
+        try:
+            file_handler = logging.FileHandler(Config.LOG_FILE, encoding='utf-8')
+            file_handler.setLevel(logging.DEBUG)
+            file_handler.setFormatter(file_formatter)
+            logger.addHandler(file_handler)
+        except Exception as e:
+            print(f"Warning: Could not setup file logging: {e}")
+        
+        # Console handler (simplified to avoid encoding issues)
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(console_formatter)
+        logger.addHandler(console_handler)
+        
+        return logger
+    
+    def _test_connection(self) -> None:
+        """Test API connection (Config.CONNECTION_PROBE: 'account', 'ping' or 'none')"""
+        if Config.CONNECTION_PROBE == 'none':
+            self.logger.info("Connection probe skipped")
+            return
+        
+        try:
+            if Config.CONNECTION_PROBE == 'ping':
+                self.client.futures_ping()
+            else:
+                self.client.futures_account()
+            self.logger.info("API connection successful")
+            print("🔗 API connection successful")
+        except Exception as e:
+            self.logger.error(f"API connection failed: {str(e)}")
+            raise Exception(f"API connection failed: {str(e)}")
+    
+    def attach_user_stream(self, user_stream) -> None:
+        """Serve order and account queries from a user_stream.UserDataStream store"""
+        self.order_store = user_stream.store
+        if self.ledger is not None:
+            # Fills from the stream; the ledger ignores any already booked from REST responses
+            self.order_store.add_listener(
+                lambda event_type, payload: self.ledger.apply_order(payload) if event_type == 'ORDER' else None)
+        if self.journal is not None:
+            self.order_store.add_listener(
+                lambda event_type, payload: self.journal.stream_order(payload) if event_type == 'ORDER' else None)
+        self.logger.info("User data stream attached")
+    
+    def recover_orders(self) -> Dict[str, int]:
+        """Rebuild order state from the journal, fetching only orders that may have changed
+        
+        Orders the journal has as open or unacknowledged are checked with
+        the exchange (see journal.reconcile_orders). Their current state is
+        journaled and fed to the order store, and the journal is compacted
+        down to the orders still open.
+        """
+        if self.journal is None:
+            return {}
+        
+        try:
+            entries = self.journal.recover()
+            orders, requests = reconcile_orders(self.client, entries)
+            changed = 0
+            for order in orders:
+                entry = entries.get(order['clientOrderId'])
+                if entry is not None and (entry.order is None or entry.status != order['status']
+                                          or entry.order.get('executedQty') != order.get('executedQty')):
+                    changed += 1
+                if 'orderId' in order:
+                    self.journal.order(order)
+                    if self.order_store is not None:
+                        self.order_store.record_order(dict(order))
+                else:
+                    # Never reached the exchange
+                    self.journal.reject(order['clientOrderId'], order['symbol'], {'msg': "Not found on recovery"})
+            
+            still_open = [order['clientOrderId'] for order in orders if order['status'] in OPEN_STATUSES]
+            self.journal.compact(still_open)
+            
+            summary = {'orders': len(entries), 'open': len(still_open), 'changed': changed, 'requests': requests}
+            self.logger.info(f"Recovered {len(entries)} journaled orders: {len(still_open)} open, "
+                             f"{changed} changed while offline ({requests} requests)")
+            return summary
+            
+        except Exception as e:
+            self.logger.error(f"Error recovering orders from journal: {e}")
+            raise
+    
+    def _track_order(self, order: Dict[str, Any], kind: str = UPDATE) -> None:
+        """Record a REST order response in the journal, order store and ledger, if attached"""
+        if self.journal is not None:
+            self.journal.order(order, kind)
+        if self.order_store is not None:
+            self.order_store.record_order(dict(order))
+        if self.ledger is not None:
+            self.ledger.apply_order(order)
+    
+    def get_rate_limit_headroom(self) -> Dict[str, Any]:
+        """Get remaining request-weight and order-count headroom"""
+        if self.governor is None:
+            return {}
+        return self.governor.headroom()
+    
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-endpoint latency percentiles (µs), error and retry counts"""
+        if self.metrics is None:
+            return {}
+        return self.metrics.summary()
+    
+    def get_account_info(self) -> Dict[str, Any]:
+        """Get account information"""
+        try:
+            self.logger.info("Fetching account information...")
+            if self.ledger is not None:
+                # Memory read; the exchange is only asked when the ledger is due for reconciliation
+                synced_at = self.ledger.synced_at
+                if synced_at is None or time.monotonic() - synced_at > Config.LEDGER_RECONCILE_INTERVAL:
+                    self.ledger.reconcile(self.client.futures_account())
+                account_info = self.ledger.account_info()
+            else:
+                account_info = None
+                if self.order_store is not None and self.order_store.synced:
+                    account_info = self.order_store.account_info()
+                if account_info is None:
+                    account_info = self.client.futures_account()
+            
+            # Log account balance
+            total_balance = float(account_info['totalWalletBalance'])
+            available_balance = float(account_info['availableBalance'])
+            
+            self.logger.info(f"Total Balance: {total_balance} USDT")
+            self.logger.info(f"Available Balance: {available_balance} USDT")
+            
+            return account_info
+            
+        except binance_exception('BinanceAPIException') as e:
+            self.logger.error(f"API Error getting account info: {e}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Error getting account info: {e}")
+            raise
+    
+    def attach_price_stream(self, price_stream) -> None:
+        """Serve get_symbol_price from a market_data.PriceStream when it is fresh"""
+        self.price_stream = price_stream
+        if self.ledger is not None:
+            price_stream.add_listener(lambda symbol, entry: self.ledger.apply_mark(symbol, entry.mark_price))
+        self.logger.info(f"Price stream attached for {', '.join(price_stream.symbols)}")
+    
+    def get_symbol_price(self, symbol: str) -> float:
+        """Get current price for a symbol"""
+        # Streamed price table first; REST only when missing or stale
+        if self.price_stream is not None:
+            price = self.price_stream.get_price(symbol)
+            if price is not None:
+                return price
+        
+        try:
+            ticker = self.client.futures_symbol_ticker(symbol=symbol)
+            price = float(ticker['price'])
+            self.logger.info(f"Current price for {symbol}: {price}")
+            return price
+        except Exception as e:
+            self.logger.error(f"Error getting price for {symbol}: {e}")
+            raise
+    
+    def _get_scanner(self):
+        if self.scanner is None:
+            from scanner import MarketScanner
+            self.scanner = MarketScanner(self.client)
+        return self.scanner
+    
+    def get_prices(self, symbols: Optional[List[str]] = None) -> Dict[str, float]:
+        """Get current prices for many symbols (all listed symbols by default)
+        
+        Fresh streamed prices are used where available; the rest come from
+        one cached all-symbols snapshot (see scanner.MarketScanner), not a
+        request per symbol. Symbols the exchange does not list are left out.
+        """
+        prices = {}
+        if self.price_stream is not None and symbols is not None:
+            for symbol in symbols:
+                price = self.price_stream.get_price(symbol)
+                if price is not None:
+                    prices[symbol] = price
+            if len(prices) == len(symbols):
+                return prices
+        
+        try:
+            missing = None if symbols is None else [symbol for symbol in symbols if symbol not in prices]
+            prices.update(self._get_scanner().get_prices(missing))
+            self.logger.info(f"Loaded prices for {len(prices)} symbols")
+            return prices
+        except Exception as e:
+            self.logger.error(f"Error getting prices: {e}")
+            raise
+    
+    def scan(self, **screens) -> List[Dict[str, Any]]:
+        """Screen every futures symbol at once (see scanner.MarketScanner.scan)"""
+        try:
+            results = self._get_scanner().scan(**screens)
+            self.logger.info(f"Market scan matched {len(results)} symbols")
+            return results
+        except Exception as e:
+            self.logger.error(f"Error scanning market: {e}")
+            raise
+    
+    def get_klines(self, symbol: str, interval: str, start: Any, end: Any) -> Dict[str, Any]:
+        """Get historical klines as numpy columns, served from the local kline cache
+        
+        Only ranges missing from the cache are fetched (see klines.KlineStore).
+        """
+        if self.kline_store is None:
+            from klines import KlineStore
+            self.kline_store = KlineStore(self.client)
+        
+        try:
+            klines = self.kline_store.load(symbol, interval, start, end)
+            self.logger.info(f"Loaded {len(klines['close'])} {symbol} {interval} klines")
+            return klines
+        except Exception as e:
+            self.logger.error(f"Error getting klines for {symbol}: {e}")
+            raise
+    
+    def attach_order_book(self, depth_book) -> None:
+        """Register an order_book.DepthBook for slippage estimates"""
+        self.order_books[depth_book.symbol] = depth_book
+        self.logger.info(f"Order book attached for {depth_book.symbol}")
+    
+    def estimate_slippage(self, symbol: str, side: str, quantity: float) -> Dict[str, float]:
+        """Estimate VWAP and slippage of a market order from the local order book"""
+        depth_book = self.order_books.get(symbol)
+        if depth_book is None:
+            raise ValueError(f"No order book attached for {symbol}")
+        
+        estimate = depth_book.estimate_slippage(side, quantity)
+        self.logger.info(f"Estimated {side} {quantity} {symbol}: VWAP {estimate['vwap']}, "
+                         f"slippage {estimate['slippage_bps']:.2f} bps")
+        return estimate
+    
+    def place_market_order(self, symbol: str, side: str, quantity: float,
+                           client_order_id: Optional[str] = None, reduce_only: bool = False) -> Dict[str, Any]:
+        """Place a market order (``reduce_only`` may only shrink the position)"""
+        
+        # Validate parameters
+        if not self._validate_order_params(symbol, side, 'MARKET', quantity):
+            raise ValueError("Invalid order parameters")
+        quantity, _, _ = self._apply_exchange_filters(symbol, 'MARKET', quantity)
+        self._check_risk(symbol, side, quantity)
+        
+        try:
+            self.logger.info("Placing MARKET %s order: %s %s", side, quantity, symbol)
+            
+            # Place actual order
+            order = self._submit_order(
+                client_order_id,
+                symbol=symbol,
+                side=side.upper(),
+                type=ORDER_TYPE_MARKET,
+                quantity=quantity,
+                **reduce_only_params(reduce_only)
+            )
+            
+            self.logger.info("Market order placed successfully: %s", order['orderId'])
+            self._track_order(order, ACK)
+            
+            return order
+            
+        except binance_exception('BinanceAPIException') as e:
+            self.logger.error(f"Binance API Error: {e}")
+            raise
+        except binance_exception('BinanceOrderException') as e:
+            self.logger.error(f"Binance Order Error: {e}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Unexpected error placing market order: {e}")
+            raise
+    
+    def place_limit_order(self, symbol: str, side: str, quantity: float, price: float,
+                          client_order_id: Optional[str] = None, reduce_only: bool = False) -> Dict[str, Any]:
+        """Place a limit order (``reduce_only`` may only shrink the position)"""
+        
+        # Validate parameters
+        if not self._validate_order_params(symbol, side, 'LIMIT', quantity, price):
+            raise ValueError("Invalid order parameters")
+        quantity, price, _ = self._apply_exchange_filters(symbol, 'LIMIT', quantity, price)
+        self._check_risk(symbol, side, quantity, price)
+        
+        try:
+            self.logger.info("Placing LIMIT %s order: %s %s at %s", side, quantity, symbol, price)
+            
+            # Place actual order
+            order = self._submit_order(
+                client_order_id,
+                symbol=symbol,
+                side=side.upper(),
+                type=ORDER_TYPE_LIMIT,
+                timeInForce=TIME_IN_FORCE_GTC,
+                quantity=quantity,
+                price=price,
+                **reduce_only_params(reduce_only)
+            )
+            
+            self.logger.info("Limit order placed successfully: %s", order['orderId'])
+            self._track_order(order, ACK)
+            
+            return order
+            
+        except binance_exception('BinanceAPIException') as e:
+            self.logger.error(f"Binance API Error: {e}")
+            raise
+        except binance_exception('BinanceOrderException') as e:
+            self.logger.error(f"Binance Order Error: {e}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Unexpected error placing limit order: {e}")
+            raise
+    
+    def place_stop_loss_limit_order(self, symbol: str, side: str, quantity: float, 
+                                   price: float, stop_price: float,
+                                   client_order_id: Optional[str] = None,
+                                   reduce_only: bool = False) -> Dict[str, Any]:
+        """Place a stop-loss limit order (``reduce_only`` may only shrink the position)"""
+        
+        # Validate parameters
+        if not self._validate_order_params(symbol, side, 'STOP_LOSS_LIMIT', quantity, price):
+            raise ValueError("Invalid order parameters")
+        quantity, price, stop_price = self._apply_exchange_filters(symbol, 'STOP_LOSS_LIMIT', quantity,
+                                                                   price, stop_price)
+        self._check_risk(symbol, side, quantity, price)
+        
+        try:
+            self.logger.info("Placing STOP_LOSS_LIMIT %s order: %s %s", side, quantity, symbol)
+            self.logger.info("Stop Price: %s, Limit Price: %s", stop_price, price)
+            
+            # Place actual order
+            order = self._submit_order(
+                client_order_id,
+                symbol=symbol,
+                side=side.upper(),
+                type=FUTURE_ORDER_TYPE_STOP,
+                timeInForce=TIME_IN_FORCE_GTC,
+                quantity=quantity,
+                price=price,
+                stopPrice=stop_price,
+                **reduce_only_params(reduce_only)
+            )
+            
+            self.logger.info("Stop-loss limit order placed successfully: %s", order['orderId'])
+            self._track_order(order, ACK)
+            
+            return order
+            
+        except binance_exception('BinanceAPIException') as e:
+            self.logger.error(f"Binance API Error: {e}")
+            raise
+        except binance_exception('BinanceOrderException') as e:
+            self.logger.error(f"Binance Order Error: {e}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Unexpected error placing stop-loss limit order: {e}")
+            raise
+    
+    def place_stop_market_order(self, symbol: str, side: str, quantity: float, stop_price: float,
+                                client_order_id: Optional[str] = None,
+                                reduce_only: bool = False) -> Dict[str, Any]:
+        """Place a stop-market order (a market order once the price reaches ``stop_price``)"""
+        
+        # Validate parameters
+        if not self._validate_order_params(symbol, side, 'STOP_MARKET', quantity):
+            raise ValueError("Invalid order parameters")
+        if not stop_price or stop_price <= 0:
+            self.logger.error("Stop price must be greater than 0")
+            raise ValueError("Invalid order parameters")
+        quantity, _, stop_price = self._apply_exchange_filters(symbol, 'STOP_MARKET', quantity,
+                                                               stop_price=stop_price)
+        self._check_risk(symbol, side, quantity)
+        
+        try:
+            self.logger.info("Placing STOP_MARKET %s order: %s %s, stop %s", side, quantity, symbol, stop_price)
+            
+            # Place actual order
+            order = self._submit_order(
+                client_order_id,
+                symbol=symbol,
+                side=side.upper(),
+                type=FUTURE_ORDER_TYPE_STOP_MARKET,
+                quantity=quantity,
+                stopPrice=stop_price,
+                **reduce_only_params(reduce_only)
+            )
+            
+            self.logger.info("Stop-market order placed successfully: %s", order['orderId'])
+            self._track_order(order, ACK)
+            
+            return order
+            
+        except binance_exception('BinanceAPIException') as e:
+            self.logger.error(f"Binance API Error: {e}")
+            raise
+        except binance_exception('BinanceOrderException') as e:
+            self.logger.error(f"Binance Order Error: {e}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Unexpected error placing stop-market order: {e}")
+            raise
+    
+    def get_open_orders(self, symbol: str = None) -> List[Dict[str, Any]]:
+        """Get open orders"""
+        # Order store is authoritative once it has been reconciled
+        if self.order_store is not None and self.order_store.synced:
+            return self.order_store.open_orders(symbol)
+        
+        try:
+            if symbol:
+                orders = self.client.futures_get_open_orders(symbol=symbol)
+                self.logger.info(f"Retrieved {len(orders)} open orders for {symbol}")
+            else:
+                orders = self.client.futures_get_open_orders()
+                self.logger.info(f"Retrieved {len(orders)} open orders")
+            
+            return orders
+            
+        except Exception as e:
+            self.logger.error(f"Error getting open orders: {e}")
+            raise
+    
+    def cancel_order(self, symbol: str, order_id: int) -> Dict[str, Any]:
+        """Cancel an order"""
+        try:
+            self.logger.info(f"Cancelling order {order_id} for {symbol}")
+            if self.journal is not None:
+                self.journal.cancel(symbol, order_id)
+            
+            result = self.client.futures_cancel_order(
+                symbol=symbol,
+                orderId=order_id
+            )
+            
+            self.logger.info(f"Order {order_id} cancelled successfully")
+            self._track_order(result)
+            return result
+            
+        except Exception as e:
+            if getattr(e, 'code', None) in CANCEL_UNKNOWN_ORDER_CODES:
+                # Usually a cancel racing a fill; the caller picks up the final state
+                self.logger.warning(f"Order {order_id} already closed, not cancelled: {e}")
+            else:
+                self.logger.error(f"Error cancelling order {order_id}: {e}")
+            raise
+    
+    def kill_switch(self, reason: str = "manual") -> List[Dict[str, Any]]:
+        """Block new orders and cancel every open order
+        
+        Returns one cancel result per open order; failures come back as
+        ``{'code': ..., 'msg': ...}`` dicts.
+        """
+        if self.risk is not None:
+            self.risk.engage_kill_switch(reason)
+        self.logger.critical(f"Kill switch: cancelling all open orders ({reason})")
+        
+        def cancel(order: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                return self.cancel_order(order['symbol'], order['orderId'])
+            except Exception as e:
+                return {'code': getattr(e, 'code', -1), 'msg': str(e), 'orderId': order['orderId']}
+        
+        open_orders = self.get_open_orders()
+        if not open_orders:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(open_orders), Config.BATCH_MAX_WORKERS)) as pool:
+            return list(pool.map(cancel, open_orders))
+    
+    def get_order_status(self, symbol: str, order_id: int) -> Dict[str, Any]:
+        """Get order status"""
+        if self.order_store is not None and self.order_store.synced:
+            order = self.order_store.get_order(order_id)
+            if order is not None:
+                return order
+        
+        try:
+            order = self.client.futures_get_order(
+                symbol=symbol,
+                orderId=order_id
+            )
+            
+            self.logger.info(f"Order {order_id} status: {order['status']}")
+            self._track_order(order)
+            return order
+            
+        except Exception as e:
+            self.logger.error(f"Error getting order status: {e}")
+            raise
+    
+    def place_orders_batch(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Place many orders through the futures batch-orders endpoint
+        
+        Each order is a dict with ``symbol``, ``side``, ``type`` (MARKET, LIMIT,
+        STOP_LOSS_LIMIT or STOP_MARKET), ``quantity`` and, where required,
+        ``price`` and ``stop_price`` (and optionally ``client_order_id`` and
+        ``reduce_only``). The whole batch is validated before anything is sent.
+        Returns one result per input order, in input order; rejected orders
+        come back as ``{'code': ..., 'msg': ...}`` dicts.
+        """
+        # Validate the whole batch up front
+        for index, order in enumerate(orders):
+            if not self._validate_order_params(order.get('symbol'), order.get('side', ''),
+                                               order.get('type', ''), order.get('quantity', 0),
+                                               order.get('price')):
+                raise ValueError(f"Invalid order parameters at batch index {index}")
+            if order['type'].upper() in ('STOP_LOSS_LIMIT', 'STOP_MARKET') and not order.get('stop_price'):
+                raise ValueError(f"Stop price required at batch index {index}")
+        
+        # Exchange filters (and auto-rounding) on copies of the orders
+        checked = []
+        for index, order in enumerate(orders):
+            order = dict(order)
+            try:
+                order['quantity'], order['price'], order['stop_price'] = self._apply_exchange_filters(
+                    order['symbol'], order['type'], order['quantity'], order.get('price'), order.get('stop_price'))
+            except ValueError as e:
+                raise ValueError(f"{e} at batch index {index}")
+            checked.append(order)
+        self._check_risk_batch(checked)
+        
+        chunks = chunked([batch_order_params(order) for order in checked], BATCH_ORDERS_MAX)
+        self.logger.info(f"Placing {len(orders)} orders in {len(chunks)} batch requests")
+        
+        results = self._run_chunks(self._submit_batch, chunks)
+        
+        for result in results:
+            if 'orderId' in result:
+                self._track_order(result, ACK)
+        
+        failed = sum(1 for result in results if 'orderId' not in result)
+        self.logger.info(f"Batch placed: {len(results) - failed} accepted, {failed} rejected")
+        return results
+    
+    def cancel_orders_batch(self, symbol: str, order_ids: List[int]) -> List[Dict[str, Any]]:
+        """Cancel many orders through the futures cancel-multiple endpoint
+        
+        Returns one result per order id, in input order.
+        """
+        chunks = chunked(list(order_ids), BATCH_CANCEL_MAX)
+        self.logger.info(f"Cancelling {len(order_ids)} orders for {symbol} in {len(chunks)} batch requests")
+        
+        def send(chunk: List[int]) -> List[Dict[str, Any]]:
+            if self.journal is not None:
+                for order_id in chunk:
+                    self.journal.cancel(symbol, order_id)
+            try:
+                return self.client.futures_cancel_orders(
+                    symbol=symbol,
+                    orderIdList=json.dumps(chunk, separators=(',', ':'))
+                )
+            except Exception as e:
+                self.logger.error(f"Error cancelling order batch: {e}")
+                return [{'code': getattr(e, 'code', -1), 'msg': str(e)} for _ in chunk]
+        
+        results = self._run_chunks(send, chunks)
+        
+        for result in results:
+            if 'orderId' in result:
+                self._track_order(result)
+        
+        failed = sum(1 for result in results if 'orderId' not in result)
+        self.logger.info(f"Batch cancel: {len(results) - failed} cancelled, {failed} failed")
+        return results
+    
+    def _submit_order(self, client_order_id: Optional[str] = None, **params) -> Dict[str, Any]:
+        """Send futures_create_order with a client order id, timeout and safe retries
+        
+        When a submission fails with a transient error its outcome is unknown,
+        so the order is looked up by client order id (with exponential
+        backoff) and only resent once the exchange confirms it does not exist.
+        """
+        params['newClientOrderId'] = client_order_id or new_client_order_id()
+        params['requests_params'] = {'timeout': Config.ORDER_TIMEOUT}
+        if self.journal is None:
+            return self._send_order(params)
+        
+        # Durable before it is sent, so a restart knows to look for it
+        self.journal.intent(params)
+        try:
+            return self._send_order(params)
+        except Exception as e:
+            # An order whose outcome is still unknown stays pending for recovery
+            if not is_transient_error(e):
+                self.journal.reject(params['newClientOrderId'], params['symbol'], e)
+            raise
+    
+    def _send_order(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Send an order, looking it up before any resend (see _submit_order)"""
+        attempt = 0
+        while True:
+            try:
+                if self.journal is not None:
+                    self.journal.submit(params['newClientOrderId'], params['symbol'], attempt)
+                return self.client.futures_create_order(**params)
+            except Exception as e:
+                if not is_transient_error(e):
+                    # A resend may be rejected because the first attempt did land
+                    if attempt:
+                        try:
+                            existing = self._find_order(params['symbol'], params['newClientOrderId'])
+                        except Exception:
+                            existing = None
+                        if existing is not None:
+                            return existing
+                    raise
+                error = e
+                self.logger.warning(f"Transient error submitting {params['newClientOrderId']}: {e}")
+                if self.metrics is not None:
+                    self.metrics.increment('retries', 'futures_create_order', params['symbol'])
+            
+            # Outcome unknown: find out whether the order exists before resending
+            while True:
+                if attempt >= Config.ORDER_MAX_RETRIES:
+                    self.logger.error(f"Order {params['newClientOrderId']} status unknown after {attempt} retries")
+                    raise error
+                time.sleep(retry_delay(attempt))
+                attempt += 1
+                try:
+                    existing = self._find_order(params['symbol'], params['newClientOrderId'])
+                    break
+                except Exception as e:
+                    if not is_transient_error(e):
+                        raise
+                    error = e
+            
+            if existing is not None:
+                self.logger.info(f"Order {params['newClientOrderId']} reached the exchange, not resending")
+                return existing
+            self.logger.info(f"Order {params['newClientOrderId']} not on the exchange, resending")
+    
+    def _find_order(self, symbol: str, client_order_id: str) -> Optional[Dict[str, Any]]:
+        """Look an order up by client order id; None if the exchange does not know it"""
+        try:
+            return self.client.futures_get_order(
+                symbol=symbol,
+                origClientOrderId=client_order_id,
+                requests_params={'timeout': Config.ORDER_TIMEOUT}
+            )
+        except Exception as e:
+            if getattr(e, 'code', None) == ORDER_NOT_FOUND_CODE:
+                return None
+            raise
+    
+    def _submit_batch(self, chunk: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Send one batch chunk, resending only orders confirmed not to have landed"""
+        results: Dict[str, Dict[str, Any]] = {}
+        to_send = list(chunk)
+        unknown: List[Dict[str, str]] = []
+        error: Optional[Exception] = None
+        attempt = 0
+        if self.journal is not None:
+            self.journal.intents(chunk)
+        
+        while to_send or unknown:
+            if to_send:
+                if self.journal is not None:
+                    for order in to_send:
+                        self.journal.submit(order['newClientOrderId'], order['symbol'], attempt)
+                try:
+                    # No per-call requests_params here: python-binance would sign and send it as a
+                    # batch parameter; create_client sets ORDER_TIMEOUT as the client-wide timeout
+                    response = self.client.futures_place_batch_order(batchOrders=to_send)
+                    for order, result in zip(to_send, response):
+                        results[order['newClientOrderId']] = result
+                except Exception as e:
+                    error = e
+                    if is_transient_error(e):
+                        self.logger.warning(f"Transient error placing order batch: {e}")
+                        unknown.extend(to_send)
+                        if self.metrics is not None:
+                            self.metrics.increment('retries', 'futures_place_batch_order', to_send[0]['symbol'])
+                    else:
+                        self.logger.error(f"Error placing order batch: {e}")
+                        for order in to_send:
+                            results[order['newClientOrderId']] = {'code': getattr(e, 'code', -1), 'msg': str(e)}
+                to_send = []
+            
+            if not unknown:
+                break
+            if attempt >= Config.ORDER_MAX_RETRIES:
+                for order in unknown:
+                    results[order['newClientOrderId']] = {'code': getattr(error, 'code', -1),
+                                                          'msg': f"Order status unknown: {error}"}
+                break
+            
+            # Outcome unknown: look each order up before resending it
+            time.sleep(retry_delay(attempt))
+            attempt += 1
+            still_unknown = []
+            for order in unknown:
+                try:
+                    existing = self._find_order(order['symbol'], order['newClientOrderId'])
+                except Exception as e:
+                    if is_transient_error(e):
+                        still_unknown.append(order)
+                    else:
+                        results[order['newClientOrderId']] = {'code': getattr(e, 'code', -1), 'msg': str(e)}
+                    continue
+                if existing is not None:
+                    results[order['newClientOrderId']] = existing
+                else:
+                    to_send.append(order)
+            unknown = still_unknown
+        
+        if self.journal is not None:
+            # Orders still unknown stay pending for recovery
+            unresolved = {order['newClientOrderId'] for order in unknown}
+            for order in chunk:
+                result = results[order['newClientOrderId']]
+                if 'orderId' not in result and order['newClientOrderId'] not in unresolved:
+                    self.journal.reject(order['newClientOrderId'], order['symbol'], result)
+        
+        return [results[order['newClientOrderId']] for order in chunk]
+    
+    def _run_chunks(self, send, chunks: List[List[Any]]) -> List[Dict[str, Any]]:
+        """Send batch chunks in parallel and flatten the results in order"""
+        if len(chunks) <= 1:
+            return [result for chunk in chunks for result in send(chunk)]
+        
+        with ThreadPoolExecutor(max_workers=min(len(chunks), Config.BATCH_MAX_WORKERS)) as pool:
+            return [result for chunk_results in pool.map(send, chunks) for result in chunk_results]
+    
+    def _check_risk(self, symbol: str, side: str, quantity: float, price: Optional[float] = None) -> None:
+        """Run the pre-trade risk checks; raises RiskRejected"""
+        if self.risk is None:
+            return
+        self._seed_ledger()
+        try:
+            self.risk.check(symbol, side, quantity, price, self._risk_reference(symbol, price))
+        except RiskRejected as e:
+            self.logger.warning(str(e))
+            raise
+    
+    def _check_risk_batch(self, orders: List[Dict[str, Any]]) -> None:
+        """Run the pre-trade risk checks on a batch as one combined exposure; raises RiskRejected"""
+        if self.risk is None:
+            return
+        self._seed_ledger()
+        try:
+            self.risk.check_batch([(order['symbol'], order['side'], order['quantity'], order.get('price'),
+                                    self._risk_reference(order['symbol'], order.get('price'))) for order in orders])
+        except RiskRejected as e:
+            self.logger.warning(str(e))
+            raise
+    
+    def _seed_ledger(self) -> None:
+        if self.ledger is not None and self.ledger.synced_at is None:
+            # Seed the ledger once so position and leverage limits see the real account
+            self.ledger.reconcile(self.client.futures_account())
+    
+    def _risk_reference(self, symbol: str, price: Optional[float]) -> float:
+        # Reference price from memory: streamed price, then the ledger's mark
+        reference = self.price_stream.get_price(symbol) if self.price_stream is not None else None
+        if reference is None and self.ledger is not None:
+            position = self.ledger.positions.get((symbol, 'BOTH'))
+            reference = position.mark_price if position is not None and position.mark_price else None
+        if reference is None:
+            # Limit orders fall back to their own price (no band check); market orders ask REST
+            reference = price if price is not None else self.get_symbol_price(symbol)
+        return reference
+    
+    def _apply_exchange_filters(self, symbol: str, order_type: str, quantity: float,
+                                price: Optional[float] = None,
+                                stop_price: Optional[float] = None) -> tuple:
+        """Check an order against the cached exchange filters
+        
+        Returns ``(quantity, price, stop_price)``, rounded onto the exchange
+        grid when Config.AUTO_ROUND_ORDERS is set. Raises ValueError if the
+        exchange would reject the order.
+        """
+        if self.filters is None:
+            return quantity, price, stop_price
+        
+        symbol_filters = self.filters.get(symbol)
+        if symbol_filters is None:
+            if self.filters.symbols:
+                self.logger.error(f"Unknown symbol {symbol}")
+                raise ValueError(f"Unknown symbol {symbol}")
+            # Filters unavailable; leave validation to the exchange
+            return quantity, price, stop_price
+        
+        # Open-order counts and a reference price only when they are already in memory
+        open_orders = open_algo_orders = None
+        if self.order_store is not None and self.order_store.synced:
+            symbol_orders = self.order_store.open_orders(symbol)
+            open_orders = len(symbol_orders)
+            open_algo_orders = sum(1 for o in symbol_orders if o['type'] in ALGO_ORDER_TYPES)
+        reference_price = self.price_stream.get_price(symbol) if self.price_stream is not None else None
+        
+        ok, message, quantity, price, stop_price = symbol_filters.check(
+            order_type, quantity, price, stop_price,
+            reference_price=reference_price,
+            open_orders=open_orders,
+            open_algo_orders=open_algo_orders,
+            auto_round=Config.AUTO_ROUND_ORDERS
+        )
+        if not ok:
+            self.logger.error(message)
+            raise ValueError(message)
+        return quantity, price, stop_price
+    
+    def _validate_order_params(self, symbol: str, side: str, order_type: str, quantity: float, 
+                              price: Optional[float] = None) -> bool:
+        """Validate order parameters"""
+        
+        if not symbol or len(symbol) < 3:
+            self.logger.error("Invalid symbol")
+            return False
+        
+        if side.upper() not in ['BUY', 'SELL']:
+            self.logger.error("Side must be BUY or SELL")
+            return False
+        
+        if order_type.upper() not in ['MARKET', 'LIMIT', 'STOP_LOSS_LIMIT', 'STOP_MARKET']:
+            self.logger.error("Unsupported order type")
+            return False
+        
+        if quantity <= 0:
+            self.logger.error("Quantity must be greater than 0")
+            return False
+        
+        if order_type.upper() in ['LIMIT', 'STOP_LOSS_LIMIT'] and (not price or price <= 0):
+            self.logger.error("Price must be specified and greater than 0 for limit orders")
+            return False
+        
+        return True
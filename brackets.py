@@ -0,0 +1,511 @@
+"""
+Bracket orders: an entry plus linked take-profit and stop exits (OCO).
+
+Binance Futures has no OCO order type, so ``BracketManager`` links the
+legs itself. The entry goes out first. Once it fills, the exits rest on
+the exchange as reduce-only orders: a LIMIT take-profit, and a
+STOP_MARKET stop (STOP with a limit price if one is given). They
+therefore trigger server-side even while the bot is down.
+
+Leg updates come from the user-data stream (``OrderStateStore``
+listener), not from polling. A full fill on either exit cancels the
+other at once; a partial fill shrinks the other to the remaining
+position (cancelled and placed again, reduce-only), so the rest of the
+position stays protected. That work runs on a worker pool, so the
+stream thread never waits on REST. Call ``reconcile`` after a stream reconnect to
+catch up on events missed while disconnected.
+
+In one-way position mode, brackets on the same symbol share its
+position, and reduce-only exits are checked against the net position.
+"""
+
+import sys
+import time
+import logging
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
+
+from config import Config
+from bot import new_client_order_id
+
+ENTRY = 'ENTRY'
+TAKE_PROFIT = 'TAKE_PROFIT'
+STOP_LOSS = 'STOP_LOSS'
+
+OPEN_STATUSES = ('NEW', 'PARTIALLY_FILLED')
+# Leg statuses in the order they may advance (terminal statuses rank highest)
+STATUS_RANK = {'PENDING_NEW': 0, 'NEW': 1, 'PARTIALLY_FILLED': 2}
+
+# API error code for a stop that would trigger immediately
+IMMEDIATE_TRIGGER_CODE = -2021
+
+# Quantities closer than this are equal (absorbs float error in fill arithmetic)
+QUANTITY_EPSILON = 1e-9
+
+
+class BracketLeg:
+    """One order of a bracket"""
+
+    __slots__ = ('name', 'client_order_id', 'order_id', 'quantity', 'status', 'filled', 'avg_price',
+                 'cancel_requested')
+
+    def __init__(self, name: str, quantity: float):
+        self.name = name
+        self.client_order_id = new_client_order_id()
+        self.order_id: Optional[int] = None
+        self.quantity = quantity
+        self.status = 'PENDING_NEW'
+        self.filled = 0.0
+        self.avg_price = 0.0
+        self.cancel_requested = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.status in OPEN_STATUSES
+
+    @property
+    def is_done(self) -> bool:
+        return self.status not in STATUS_RANK
+
+    def update(self, order: Dict[str, Any]) -> None:
+        """Apply an order response or event; stale updates never move the leg backwards"""
+        if order.get('orderId') is not None:
+            self.order_id = order['orderId']
+        executed = float(order.get('executedQty') or 0)
+        if executed > self.filled:
+            self.filled = executed
+            self.avg_price = float(order.get('avgPrice') or 0) or self.avg_price
+        status = order.get('status')
+        if status and not self.is_done and STATUS_RANK.get(status, 3) >= STATUS_RANK[self.status]:
+            self.status = status
+
+
+class Bracket:
+    """An entry with take-profit and stop exits"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, symbol: str, side: str, quantity: float, take_profit: float, stop_loss: float,
+                 entry_price: Optional[float] = None, stop_limit_price: Optional[float] = None):
+        self.id = next(self._ids)
+        self.symbol = symbol.upper()
+        self.side = side.upper()
+        self.quantity = quantity
+        self.entry_price = entry_price
+        self.take_profit = take_profit
+        self.stop_loss = stop_loss
+        self.stop_limit_price = stop_limit_price
+        self.status = 'PENDING'
+        self.exit_reason: Optional[str] = None
+        self.error: Optional[str] = None
+        self.legs: Dict[str, BracketLeg] = {ENTRY: BracketLeg(ENTRY, quantity)}
+        # Exits replaced after a partial fill of their sibling; their fills still count
+        self.retired: List[BracketLeg] = []
+        self.canceling = False
+        # Seconds from the exit fill event to the sibling cancel being sent / acknowledged
+        self.dispatch_time: Optional[float] = None
+        self.reaction_time: Optional[float] = None
+        self.created_at = time.time()
+        self.closed_at: Optional[float] = None
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+
+    @property
+    def exit_side(self) -> str:
+        return 'SELL' if self.side == 'BUY' else 'BUY'
+
+    @property
+    def position(self) -> float:
+        """Quantity still held: entry fills less exit fills"""
+        exits = sum(leg.filled for name, leg in self.legs.items() if name != ENTRY)
+        exits += sum(leg.filled for leg in self.retired)
+        return round(max(self.legs[ENTRY].filled - exits, 0.0), 8)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'symbol': self.symbol,
+            'side': self.side,
+            'quantity': self.quantity,
+            'status': self.status,
+            'exit_reason': self.exit_reason,
+            'position': self.position,
+            'legs': {name: {'orderId': leg.order_id, 'status': leg.status, 'filled': leg.filled,
+                            'avgPrice': leg.avg_price} for name, leg in self.legs.items()},
+            'reaction_time': self.reaction_time,
+            'error': self.error,
+        }
+
+
+class BracketManager:
+    """Places brackets and keeps their exits one-cancels-the-other from stream events"""
+
+    def __init__(self, bot: Any, store: Any = None, max_workers: int = Config.BRACKET_MAX_WORKERS):
+        """Initialize the manager
+
+        ``store`` is the ``user_stream.OrderStateStore`` fed by the
+        user-data stream (default: ``bot.order_store``, set by
+        ``BasicBot.attach_user_stream``).
+        """
+        self.bot = bot
+        self.store = store if store is not None else bot.order_store
+        if self.store is None:
+            raise ValueError("Bracket orders need a user data stream (BasicBot.attach_user_stream)")
+        self.brackets: Dict[int, Bracket] = {}
+        self.logger = logging.getLogger('TradingBot')
+        self._legs: Dict[str, Tuple[Bracket, BracketLeg]] = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='Bracket')
+        self.store.add_listener(self._on_store_event)
+
+    def close(self) -> None:
+        """Stop listening (resting exits stay on the exchange)"""
+        self.store.remove_listener(self._on_store_event)
+        self._pool.shutdown(wait=True)
+
+    # Public API
+
+    def place(self, symbol: str, side: str, quantity: float, take_profit: float, stop_loss: float,
+              entry_price: Optional[float] = None, stop_limit_price: Optional[float] = None,
+              entry_timeout: Optional[float] = None) -> Bracket:
+        """Send a bracket's entry (LIMIT at ``entry_price``, else MARKET); exits follow its fill
+
+        A limit entry still working after ``entry_timeout`` seconds is
+        cancelled; if it partly filled, the exits cover the filled quantity.
+        """
+        bracket = Bracket(symbol, side, quantity, take_profit, stop_loss, entry_price, stop_limit_price)
+        low, high = (stop_loss, take_profit) if bracket.side == 'BUY' else (take_profit, stop_loss)
+        if not low < high or (entry_price is not None and not low < entry_price < high):
+            self.logger.error(f"Bracket prices out of order: stop {stop_loss}, entry {entry_price}, "
+                              f"take profit {take_profit}")
+            raise ValueError("Take profit and stop loss must be on either side of the entry")
+
+        self.brackets[bracket.id] = bracket
+        entry = bracket.legs[ENTRY]
+        self._legs[entry.client_order_id] = (bracket, entry)
+        self.logger.info(f"Bracket {bracket.id}: {bracket.side} {quantity} {bracket.symbol}, "
+                         f"TP {take_profit}, SL {stop_loss}")
+        try:
+            if entry_price is None:
+                order = self.bot.place_market_order(bracket.symbol, bracket.side, quantity,
+                                                    client_order_id=entry.client_order_id)
+            else:
+                order = self.bot.place_limit_order(bracket.symbol, bracket.side, quantity, entry_price,
+                                                   client_order_id=entry.client_order_id)
+        except Exception as e:
+            with bracket.lock:
+                bracket.status = 'FAILED'
+                bracket.error = str(e)
+                self._finish(bracket)
+            raise
+        self._apply(bracket, entry, order)
+        if entry_timeout is not None and bracket.status == 'PENDING':
+            timer = threading.Timer(entry_timeout, self._expire_entry, (bracket,))
+            timer.daemon = True
+            timer.start()
+        return bracket
+
+    def cancel(self, bracket_id: int, flatten: bool = False) -> Bracket:
+        """Cancel a bracket's open legs; with ``flatten`` also close its position at market"""
+        bracket = self.brackets[bracket_id]
+        with bracket.lock:
+            bracket.canceling = True
+            legs = [leg for leg in bracket.legs.values() if leg.is_open and not leg.cancel_requested]
+            for leg in legs:
+                leg.cancel_requested = True
+        for leg in legs:
+            self._cancel_leg(bracket, leg)
+
+        position = bracket.position
+        if flatten and position:
+            try:
+                self.bot.place_market_order(bracket.symbol, bracket.exit_side, position, reduce_only=True)
+            except Exception as e:
+                bracket.error = f"Flatten failed: {e}"
+                self.logger.error(f"Bracket {bracket.id} flatten failed: {e}")
+        with bracket.lock:
+            if bracket.status in ('PENDING', 'OPEN'):
+                bracket.status = 'CANCELED'
+                self._finish(bracket)
+        return bracket
+
+    def wait(self, bracket_id: int, timeout: Optional[float] = None) -> bool:
+        """Block until a bracket is closed, cancelled or failed"""
+        return self.brackets[bracket_id].done.wait(timeout)
+
+    def active(self) -> List[Bracket]:
+        return [bracket for bracket in self.brackets.values() if not bracket.done.is_set()]
+
+    def reconcile(self) -> None:
+        """Re-read every working leg over REST (after a stream reconnect)"""
+        for bracket in self.active():
+            for leg in list(bracket.legs.values()):
+                if leg.order_id is None or leg.is_done:
+                    continue
+                try:
+                    order = self.bot.get_order_status(bracket.symbol, leg.order_id)
+                except Exception as e:
+                    self.logger.warning(f"Bracket {bracket.id} {leg.name} status unavailable: {e}")
+                    continue
+                self._apply(bracket, leg, order)
+
+    # Event handling
+
+    def _on_store_event(self, event_type: str, payload: Dict[str, Any]) -> None:
+        # Runs on the user-stream thread: state is updated here, REST calls go to the pool
+        if event_type == 'ORDER':
+            entry = self._legs.get(payload.get('clientOrderId'))
+            if entry is not None:
+                received = time.perf_counter()
+                cancels, resizes, exits_quantity = self._update(entry[0], entry[1], payload)
+                if cancels or resizes or exits_quantity:
+                    self._pool.submit(self._act, entry[0], cancels, resizes, exits_quantity, received)
+
+    def _apply(self, bracket: Bracket, leg: BracketLeg, order: Dict[str, Any]) -> None:
+        """Apply an order response to a leg and carry out whatever it triggers"""
+        cancels, resizes, exits_quantity = self._update(bracket, leg, order)
+        self._act(bracket, cancels, resizes, exits_quantity)
+
+    def _update(self, bracket: Bracket, leg: BracketLeg,
+                order: Dict[str, Any]) -> Tuple[List[BracketLeg], List[BracketLeg], float]:
+        """Apply an update to a leg
+
+        Returns the legs to cancel, the exits to shrink to the remaining
+        position and the exit quantity to place.
+        """
+        cancels: List[BracketLeg] = []
+        resizes: List[BracketLeg] = []
+        exits_quantity = 0.0
+        with bracket.lock:
+            leg.update(order)
+            if leg.name == ENTRY:
+                if leg.is_done and bracket.status == 'PENDING':
+                    if leg.filled and not bracket.canceling:
+                        bracket.status = 'OPEN'
+                        exits_quantity = leg.filled
+                    elif not bracket.canceling:
+                        bracket.status = 'CANCELED'
+                        self._finish(bracket)
+            else:
+                exits = [other for name, other in bracket.legs.items() if name != ENTRY]
+                position = bracket.position
+                for other in exits:
+                    if not other.is_open or other.cancel_requested:
+                        continue
+                    if (bracket.canceling or position <= QUANTITY_EPSILON
+                            or any(exit_leg.status == 'FILLED' for exit_leg in exits if exit_leg is not other)):
+                        # A fully filled sibling (or a flat position) cancels the exit, as does
+                        # an exit acknowledged after the bracket was cancelled
+                        other.cancel_requested = True
+                        cancels.append(other)
+                    elif other.quantity - other.filled > position + QUANTITY_EPSILON:
+                        # A partial fill of its sibling left this exit larger than the position
+                        other.cancel_requested = True
+                        resizes.append(other)
+                if leg.filled and position <= QUANTITY_EPSILON and bracket.status == 'OPEN':
+                    bracket.status = 'CLOSED'
+                    bracket.exit_reason = leg.name
+                elif leg.is_done and not leg.cancel_requested and not leg.filled and bracket.status == 'OPEN':
+                    self.logger.warning(f"Bracket {bracket.id} {leg.name} ended {leg.status} unexpectedly")
+                if bracket.status == 'CLOSED' and not any(other.is_open for other in bracket.legs.values()):
+                    self._finish(bracket)
+        return cancels, resizes, exits_quantity
+
+    def _act(self, bracket: Bracket, cancels: List[BracketLeg], resizes: List[BracketLeg], exits_quantity: float,
+             received: Optional[float] = None) -> None:
+        for other in cancels:
+            sent = time.perf_counter()
+            self._cancel_leg(bracket, other)
+            if received is not None and bracket.reaction_time is None:
+                bracket.dispatch_time = sent - received
+                bracket.reaction_time = time.perf_counter() - received
+        for other in resizes:
+            self._resize_exit(bracket, other)
+        if exits_quantity:
+            self._place_exits(bracket, exits_quantity)
+
+    def _place_exits(self, bracket: Bracket, quantity: float) -> None:
+        # The stop goes first: protection matters more than the target
+        for name in (STOP_LOSS, TAKE_PROFIT):
+            leg = BracketLeg(name, quantity)
+            with bracket.lock:
+                if bracket.status != 'OPEN' or bracket.canceling or any(
+                        other.filled for other_name, other in bracket.legs.items() if other_name != ENTRY):
+                    return
+                bracket.legs[name] = leg
+                self._legs[leg.client_order_id] = (bracket, leg)
+            self._submit_exit(bracket, leg)
+
+    def _resize_exit(self, bracket: Bracket, old: BracketLeg) -> None:
+        """Replace an exit with one for the remaining position"""
+        self._cancel_leg(bracket, old)
+        with bracket.lock:
+            quantity = bracket.position
+            if old.is_open:
+                # Cancel failed with the order still working: keep the larger exit rather than none
+                self.logger.warning(f"Bracket {bracket.id} {old.name} could not be resized")
+                return
+            if bracket.status != 'OPEN' or bracket.canceling or quantity <= QUANTITY_EPSILON:
+                return
+            leg = BracketLeg(old.name, quantity)
+            bracket.legs[old.name] = leg
+            bracket.retired.append(old)
+            self._legs[leg.client_order_id] = (bracket, leg)
+        self.logger.info(f"Bracket {bracket.id} {old.name} resized to {quantity}")
+        self._submit_exit(bracket, leg)
+
+    def _submit_exit(self, bracket: Bracket, leg: BracketLeg) -> None:
+        try:
+            order = self._send_exit(bracket, leg)
+        except Exception as e:
+            self.logger.error(f"Bracket {bracket.id} {leg.name} rejected: {e}")
+            with bracket.lock:
+                leg.status = 'REJECTED'
+                bracket.error = f"{leg.name}: {e}"
+            return
+        self._apply(bracket, leg, order)
+
+    def _send_exit(self, bracket: Bracket, leg: BracketLeg) -> Dict[str, Any]:
+        symbol, side, cid = bracket.symbol, bracket.exit_side, leg.client_order_id
+        if leg.name == TAKE_PROFIT:
+            return self.bot.place_limit_order(symbol, side, leg.quantity, bracket.take_profit,
+                                              client_order_id=cid, reduce_only=True)
+        try:
+            if bracket.stop_limit_price is not None:
+                return self.bot.place_stop_loss_limit_order(symbol, side, leg.quantity, bracket.stop_limit_price,
+                                                            bracket.stop_loss, client_order_id=cid,
+                                                            reduce_only=True)
+            return self.bot.place_stop_market_order(symbol, side, leg.quantity, bracket.stop_loss,
+                                                    client_order_id=cid, reduce_only=True)
+        except Exception as e:
+            if getattr(e, 'code', None) != IMMEDIATE_TRIGGER_CODE:
+                raise
+            # The price is already through the stop: exit now
+            self.logger.warning(f"Bracket {bracket.id} stop already triggered, closing at market")
+            return self.bot.place_market_order(symbol, side, leg.quantity, client_order_id=cid, reduce_only=True)
+
+    def _expire_entry(self, bracket: Bracket) -> None:
+        entry = bracket.legs[ENTRY]
+        with bracket.lock:
+            if bracket.status != 'PENDING' or not entry.is_open or entry.cancel_requested:
+                return
+            entry.cancel_requested = True
+        self.logger.info(f"Bracket {bracket.id} entry timed out")
+        self._cancel_leg(bracket, entry)
+
+    def _cancel_leg(self, bracket: Bracket, leg: BracketLeg) -> None:
+        if leg.order_id is None:
+            return
+        try:
+            order = self.bot.cancel_order(bracket.symbol, leg.order_id)
+        except Exception as e:
+            # Usually the leg filled first; its own event settles the state
+            self.logger.warning(f"Bracket {bracket.id} cancel of {leg.name} failed: {e}")
+            return
+        self._apply(bracket, leg, order)
+
+    def _finish(self, bracket: Bracket) -> None:
+        """Mark a bracket done and stop routing its events (caller holds the bracket lock)"""
+        if bracket.done.is_set():
+            return
+        bracket.closed_at = time.time()
+        for leg in list(bracket.legs.values()) + bracket.retired:
+            self._legs.pop(leg.client_order_id, None)
+        bracket.done.set()
+        self.logger.info(f"Bracket {bracket.id} {bracket.status}"
+                         + (f" by {bracket.exit_reason}" if bracket.exit_reason else ""))
+
+
+def run_benchmark(brackets: int = 300, latency: float = 0.001, volatility_bps: float = 10.0,
+                  width_pct: float = 0.3, entry_timeout: float = 5.0, timeout: float = 60.0) -> Dict[str, float]:
+    """Run ``brackets`` concurrent brackets (one per symbol) on the fake exchange until all exit
+
+    Each symbol random-walks ``volatility_bps`` per step, and its exits
+    sit ``width_pct`` either side of the entry. Half the entries are
+    market orders and half rest near the touch, expiring unfilled after
+    ``entry_timeout`` seconds. Fills reach the manager
+    through an OrderStateStore fed with the exchange's user-data events.
+    Reaction time runs from the exit fill event to the sibling's
+    cancel being acknowledged, including ``latency`` seconds of
+    simulated network per REST call. Risk checks are off (one account
+    trading hundreds of symbols would hit the order-rate limit). The
+    fake exchange runs in this process, so the GIL switch interval is
+    shortened for the run; otherwise the stream thread waits out the
+    price walker's 5 ms slices and that wait dominates the timings.
+    """
+    from bot import BasicBot
+    from fake_exchange import FakeExchange, FakeFuturesClient
+    from user_stream import OrderStateStore
+
+    saved = (Config.RISK_ENABLED, Config.RATE_LIMIT_ENABLED)
+    switch_interval = sys.getswitchinterval()
+    Config.RISK_ENABLED = Config.RATE_LIMIT_ENABLED = False
+    sys.setswitchinterval(0.0002)
+    try:
+        symbols = [f"SYM{i:03d}USDT" for i in range(brackets)]
+        exchange = FakeExchange(prices={symbol: 100.0 for symbol in symbols}, spread_bps=2.0, seed=5)
+        bot = BasicBot('fake', 'fake', client=FakeFuturesClient(exchange, latency=latency))
+        bot.logger.setLevel(logging.WARNING)
+        store = OrderStateStore()
+        exchange.add_listener(store.handle_message)
+        bot.order_store = store
+        manager = BracketManager(bot)
+
+        width = width_pct / 100
+        placed = []
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            def place(i: int) -> Bracket:
+                side = 'BUY' if i % 2 else 'SELL'
+                price = exchange.prices[symbols[i]]
+                sign = 1 if side == 'BUY' else -1
+                entry = None if i % 4 < 2 else round(price * (1 - sign * 0.0005), 2)
+                return manager.place(symbols[i], side, 1.0, round(price * (1 + sign * width), 2),
+                                     round(price * (1 - sign * width), 2), entry_price=entry,
+                                     entry_timeout=entry_timeout)
+            placed = list(pool.map(place, range(brackets)))
+
+        began = time.perf_counter()
+        while manager.active() and time.perf_counter() - began < timeout:
+            exchange.random_walk(volatility_bps)
+            time.sleep(0.001)
+        elapsed = time.perf_counter() - began
+        for bracket in manager.active():
+            manager.cancel(bracket.id, flatten=True)
+        manager.close()
+
+        reactions = sorted(b.reaction_time for b in placed if b.reaction_time is not None)
+        dispatches = sorted(b.dispatch_time for b in placed if b.dispatch_time is not None)
+
+        def percentile(values: List[float], q: float) -> float:
+            return values[min(int(q * len(values)), len(values) - 1)] * 1000 if values else 0.0
+
+        return {
+            'brackets': brackets,
+            'closed': sum(1 for b in placed if b.status == 'CLOSED'),
+            'expired': sum(1 for b in placed if b.status == 'CANCELED'),
+            'take_profit': sum(1 for b in placed if b.exit_reason == TAKE_PROFIT),
+            'stop_loss': sum(1 for b in placed if b.exit_reason == STOP_LOSS),
+            'both_exits_filled': sum(1 for b in placed if TAKE_PROFIT in b.legs and STOP_LOSS in b.legs
+                                     and b.legs[TAKE_PROFIT].filled and b.legs[STOP_LOSS].filled),
+            'orphaned_orders': len(exchange.open_orders()),
+            'elapsed_s': elapsed,
+            'dispatch_p50_ms': percentile(dispatches, 0.5),
+            'reaction_p50_ms': percentile(reactions, 0.5),
+            'reaction_p99_ms': percentile(reactions, 0.99),
+            'reaction_max_ms': reactions[-1] * 1000 if reactions else 0.0,
+        }
+    finally:
+        Config.RISK_ENABLED, Config.RATE_LIMIT_ENABLED = saved
+        sys.setswitchinterval(switch_interval)
+
+
+if __name__ == "__main__":
+    results = run_benchmark()
+    print(f"📊 {results['closed']}/{results['brackets']} brackets closed in {results['elapsed_s']:.1f} s "
+          f"({results['take_profit']} take-profit, {results['stop_loss']} stop-loss, "
+          f"{results['expired']} entries expired)")
+    print(f"📊 Sibling cancel after exit fill: p50 {results['reaction_p50_ms']:.2f} ms, "
+          f"p99 {results['reaction_p99_ms']:.2f} ms, max {results['reaction_max_ms']:.2f} ms "
+          f"(dispatch p50 {results['dispatch_p50_ms']:.2f} ms)")
+    print(f"📊 Both exits filled: {results['both_exits_filled']}, orphaned orders: {results['orphaned_orders']}")
@@ -1,33 +1,148 @@
-import os
-from typing import Dict, Any
-
-class Config:
-    """Configuration class for the trading bot"""
-    
-    # API Configuration
-    API_KEY = os.getenv('BINANCE_API_KEY', '')
-    API_SECRET = os.getenv('BINANCE_API_SECRET', '')
-    
-    # Testnet Configuration
-    TESTNET = True
-    BASE_URL = 'https://testnet.binancefuture.com'
-    
-    # Trading Configuration
-    DEFAULT_SYMBOL = 'BTCUSDT'
-    DEFAULT_QUANTITY = 0.001
-    
-    # Logging Configuration
-    LOG_LEVEL = 'INFO'
-    LOG_FILE = 'logs/trading_bot.log'
-    
-    # Order Configuration
-    SUPPORTED_ORDER_TYPES = ['MARKET', 'LIMIT', 'STOP_LOSS_LIMIT', 'OCO']
-    SUPPORTED_SIDES = ['BUY', 'SELL']
-    
-    @classmethod
-    def validate_config(cls) -> bool:
-        """Validate configuration settings"""
-        if not cls.API_KEY or not cls.API_SECRET:
-            print("❌ Error: API_KEY and API_SECRET must be set")
-            return False
-        return True
+import os
+from typing import Dict, Any
+
+class Config:
+    """Configuration class for the trading bot"""
+    
+    # API Configuration
+    API_KEY = os.getenv('BINANCE_API_KEY', '')
+    API_SECRET = os.getenv('BINANCE_API_SECRET', '')
+    
+    # Testnet Configuration
+    TESTNET = True
+    BASE_URL = os.getenv('BINANCE_FUTURES_BASE_URL', 'https://testnet.binancefuture.com')
+    
+    # REST Transport Configuration
+    TRANSPORT = os.getenv('BOT_TRANSPORT', 'binance')  # 'binance' (python-binance) or 'lean' (transport.py)
+    API_PRIVATE_KEY_FILE = os.getenv('BINANCE_PRIVATE_KEY_FILE', '')  # Ed25519 PEM key for the lean transport
+    TRANSPORT_RECV_WINDOW = 5000  # Milliseconds a signed request stays valid
+    TRANSPORT_TIME_SYNC_INTERVAL = 300.0  # Seconds between server-time offset refreshes
+    TRANSPORT_IDLE_TIMEOUT = 30.0  # Seconds idle before a keep-alive connection is reopened instead of reused
+    
+    # Startup Configuration
+    FAST_START = os.getenv('BOT_FAST_START', '0') == '1'  # Build the client on first use, skip the probe
+    CONNECTION_PROBE = os.getenv('BOT_PROBE', 'none' if FAST_START else 'account')  # 'account', 'ping' or 'none'
+    TIME_OFFSET_CACHE = 'logs/time_offset.json'  # Cached server-time offset for signed requests
+    TIME_OFFSET_TTL = 3600  # Seconds before the cached offset is measured again
+    
+    # Trading Configuration
+    DEFAULT_SYMBOL = 'BTCUSDT'
+    DEFAULT_QUANTITY = 0.001
+    
+    # Async Execution Configuration
+    ASYNC_MAX_CONNECTIONS = 20  # Shared HTTP connection pool size / max in-flight requests
+    BATCH_MAX_WORKERS = 5  # Batch chunks sent in parallel by BasicBot
+    
+    # Market Data Stream Configuration
+    STREAM_BASE_URL = os.getenv('BINANCE_FUTURES_WS_URL', '')  # Overrides the public stream host when set
+    PRICE_STREAM_ENABLED = os.getenv('BOT_PRICE_STREAM', '1') == '1'
+    PRICE_STREAM_SYMBOLS = ['BTCUSDT', 'ETHUSDT', 'ADAUSDT', 'SOLUSDT']
+    PRICE_MAX_AGE = 5.0  # Seconds before a streamed price is stale and REST is used
+    STREAM_RECONNECT_DELAY = 1.0  # Seconds between WebSocket reconnect attempts
+    DEPTH_SNAPSHOT_LIMIT = 1000  # Levels per side in the REST depth snapshot
+    
+    # Kline Cache Configuration
+    KLINE_CACHE_DIR = 'data/klines'  # Day-partitioned .npy files per symbol and interval
+    KLINE_FETCH_WORKERS = 4  # Kline pages fetched in parallel
+    KLINE_PAGE_LIMIT = 1000  # Candles per futures_klines call (weight 5; 1500 costs 10)
+    
+    # Backtest Configuration (Binance Futures default fee tier)
+    BACKTEST_TAKER_FEE = 0.0005  # 0.05% per taker fill
+    BACKTEST_MAKER_FEE = 0.0002  # 0.02% per maker fill
+    BACKTEST_SLIPPAGE_BPS = 1.0  # Slippage on market and triggered stop fills
+    BACKTEST_INITIAL_BALANCE = 15000.0  # Starting USDT balance
+    
+    # Strategy Runner Configuration
+    RUNNER_MAX_IN_FLIGHT = 8  # Order requests outstanding at once
+    RUNNER_BATCH_WINDOW = 0.002  # Seconds spent collecting intents into one dispatch
+    
+    # Ledger Configuration
+    LEDGER_ENABLED = os.getenv('BOT_LEDGER', '1') == '1'  # Serve account queries from the local ledger
+    LEDGER_RECONCILE_INTERVAL = 60.0  # Seconds between reconciliations against futures_account()
+    LEDGER_DEFAULT_LEVERAGE = 20  # Leverage assumed for margin until the account snapshot reports it
+    
+    # Risk Configuration (a limit of 0 disables that check)
+    RISK_ENABLED = os.getenv('BOT_RISK', '1') == '1'  # Pre-trade checks on every order
+    RISK_MAX_ORDER_NOTIONAL = 10000.0  # USDT per order
+    RISK_MAX_POSITION_NOTIONAL = 50000.0  # USDT per symbol position
+    RISK_MAX_LEVERAGE = 10.0  # Gross position notional / margin balance
+    RISK_MAX_ORDERS_PER_SECOND = 50  # Orders admitted per rolling second
+    RISK_PRICE_BAND_PCT = 5.0  # Max distance of a limit price from the reference price
+    RISK_MAX_LOSS = 1000.0  # Session loss (realized + unrealized - fees) that trips the kill switch
+    
+    # Execution Pool Configuration
+    POOL_ACCOUNTS = [name for name in os.getenv('BOT_POOL_ACCOUNTS', '').split(',') if name]  # Account names
+    POOL_MAX_WORKERS = 16  # Threads for fan-out calls (and per worker process)
+    
+    # Stream Recorder Configuration
+    RECORD_ENABLED = os.getenv('BOT_RECORD', '0') == '1'  # Capture the consumed streams under RECORD_DIR
+    RECORD_DIR = 'data/recordings'
+    RECORD_COMPRESS = True  # zlib-compress each chunk
+    RECORD_CHUNK_RECORDS = 4096  # 64-byte records per chunk (the unit of compression and indexing)
+    RECORD_FLUSH_INTERVAL = 1.0  # Seconds before a partially filled chunk is written
+    
+    # Execution Algorithm Configuration
+    ALGO_POLL_INTERVAL = 0.5  # Seconds between child-order checks when no order event arrives
+    ALGO_REPRICE_BPS = 5.0  # Distance from the touch at which a resting child is re-placed
+    ALGO_MAX_WORKERS = 8  # Threads for synchronous bot calls
+    
+    # Bracket Order Configuration
+    BRACKET_MAX_WORKERS = 16  # Threads reacting to bracket leg fills (sibling cancels, exit placement)
+    
+    # Market Scanner Configuration
+    SCAN_TTL = 2.0  # Seconds an all-symbols snapshot (prices, 24h stats, book, funding) is reused
+    
+    # User Data Stream Configuration
+    USER_STREAM_ENABLED = os.getenv('BOT_USER_STREAM', '1') == '1'
+    LISTEN_KEY_KEEPALIVE = 30 * 60  # Seconds between listenKey keepalives (key expires after 60 min)
+    ORDER_STORE_MAX_CLOSED = 1000  # Filled/cancelled orders kept in memory
+    
+    # Order Journal Configuration
+    JOURNAL_ENABLED = os.getenv('BOT_JOURNAL', '0') == '1'  # Write-ahead journal of every order event
+    JOURNAL_PATH = 'data/journal/orders.db'  # SQLite database (WAL mode)
+    JOURNAL_SYNC_INTENTS = True  # Wait for the intent's commit before sending an order
+    JOURNAL_SYNCHRONOUS = 'FULL'  # SQLite synchronous: FULL fsyncs each commit, NORMAL only at checkpoints
+    JOURNAL_BATCH_SIZE = 512  # Queued events written per commit at most
+    JOURNAL_ALL_SYMBOLS_THRESHOLD = 40  # Above this many symbols, recovery lists open orders in one call
+    
+    # Order Submission Configuration
+    ORDER_TIMEOUT = 5.0  # Seconds per order request before it is treated as unknown
+    ORDER_MAX_RETRIES = 3  # Retries after a timeout / connection error / 5xx
+    ORDER_RETRY_BACKOFF = 0.05  # First retry delay in seconds, doubled per attempt
+    ORDER_RETRY_BACKOFF_MAX = 1.0  # Cap on the retry delay in seconds
+    CLIENT_ORDER_ID_PREFIX = 'bb_'  # Prefix for generated newClientOrderId values
+    
+    # Rate Limit Configuration (Binance Futures defaults)
+    RATE_LIMIT_ENABLED = True
+    RATE_LIMIT_WEIGHT_1M = 2400  # Request weight per minute
+    RATE_LIMIT_ORDERS_10S = 300  # Orders per 10 seconds
+    RATE_LIMIT_ORDERS_1M = 1200  # Orders per minute
+    RATE_LIMIT_SAFETY = 0.9  # Fraction of each limit the governor will use
+    
+    # Latency Metrics Configuration
+    METRICS_ENABLED = os.getenv('BOT_METRICS', '1') == '1'  # Per-endpoint latency histograms
+    METRICS_FILE = 'logs/metrics.prom'  # Prometheus text dump
+    METRICS_DUMP_INTERVAL = 15.0  # Seconds between dumps when periodic dumping is started
+    
+    # Logging Configuration
+    LOG_LEVEL = 'INFO'
+    LOG_FILE = 'logs/trading_bot.log'
+    LOG_QUEUE_ENABLED = os.getenv('BOT_LOG_QUEUE', '0') == '1'  # JSON lines written by a background thread
+    LOG_ROTATE_BYTES = 10 * 1024 * 1024  # Rotate the queued log file at this size
+    LOG_ROTATE_WHEN = None  # Or rotate by time instead, e.g. 'midnight'
+    LOG_BACKUP_COUNT = 5  # Rotated log files kept
+    
+    # Order Configuration
+    SUPPORTED_ORDER_TYPES = ['MARKET', 'LIMIT', 'STOP_LOSS_LIMIT', 'OCO']
+    SUPPORTED_SIDES = ['BUY', 'SELL']
+    EXCHANGE_FILTERS_ENABLED = True  # Check tick/lot/notional filters locally before sending
+    EXCHANGE_INFO_TTL = 3600  # Seconds before cached exchange filters are refreshed
+    AUTO_ROUND_ORDERS = False  # Round price/quantity onto the tick/step grid instead of rejecting
+    
+    @classmethod
+    def validate_config(cls) -> bool:
+        """Validate configuration settings"""
+        if not cls.API_KEY or not cls.API_SECRET:
+            print("❌ Error: API_KEY and API_SECRET must be set")
+            return False
+        return True
@@ -0,0 +1,201 @@
+"""
+Cached exchange symbol filters for local order validation.
+
+``ExchangeFilterCache`` indexes ``futures_exchange_info()`` by symbol and
+refreshes it after a TTL (or on demand). ``SymbolFilters.check`` applies
+PRICE_FILTER, LOT_SIZE / MARKET_LOT_SIZE, MIN_NOTIONAL and the max-orders
+limits locally, optionally rounding price and quantity onto the grid, so
+orders the exchange would reject never leave the process.
+"""
+
+import math
+import time
+import logging
+import threading
+from decimal import Decimal
+from typing import Dict, Any, Optional, Tuple
+
+from config import Config
+
+# Seconds to wait before retrying a failed exchange info refresh
+REFRESH_RETRY_DELAY = 30.0
+
+ALGO_ORDER_TYPES = ('STOP', 'STOP_LOSS_LIMIT', 'STOP_MARKET', 'TAKE_PROFIT',
+                    'TAKE_PROFIT_MARKET', 'TRAILING_STOP_MARKET')
+
+
+# Relative tolerance when testing whether a float sits on the tick/step grid
+GRID_TOLERANCE = 1e-9
+
+
+def _parse_step(step: str) -> Tuple[float, int]:
+    """Return a step size as (float, number of decimals)"""
+    exponent = Decimal(step).normalize().as_tuple().exponent
+    return float(step), max(-exponent, 0)
+
+
+def _on_grid(value: float, step: float) -> bool:
+    if not step:
+        return True
+    ratio = value / step
+    return abs(ratio - round(ratio)) <= GRID_TOLERANCE * max(1.0, abs(ratio))
+
+
+def _round_to_step(value: float, step: float, decimals: int, down: bool) -> float:
+    if not step:
+        return value
+    ratio = value / step
+    # Nudge by the tolerance so values already on the grid are not floored a step down
+    steps = math.floor(ratio + GRID_TOLERANCE * max(1.0, abs(ratio))) if down else round(ratio)
+    return round(steps * step, decimals)
+
+
+class SymbolFilters:
+    """Trading filters for one symbol"""
+
+    __slots__ = ('symbol', 'min_price', 'max_price', 'tick_size', 'tick_decimals',
+                 'min_qty', 'max_qty', 'step_size', 'step_decimals',
+                 'market_min_qty', 'market_max_qty', 'market_step_size', 'market_step_decimals',
+                 'min_notional', 'max_num_orders', 'max_num_algo_orders')
+
+    def __init__(self, symbol_info: Dict[str, Any]):
+        """Build from one ``symbols`` entry of futures_exchange_info()"""
+        self.symbol = symbol_info['symbol']
+        self.min_price = self.max_price = 0.0
+        self.tick_size, self.tick_decimals = 0.0, 0
+        self.min_qty = self.max_qty = 0.0
+        self.step_size, self.step_decimals = 0.0, 0
+        self.market_min_qty = self.market_max_qty = 0.0
+        self.market_step_size, self.market_step_decimals = 0.0, 0
+        self.min_notional = 0.0
+        self.max_num_orders = 0
+        self.max_num_algo_orders = 0
+
+        for f in symbol_info.get('filters', []):
+            filter_type = f['filterType']
+            if filter_type == 'PRICE_FILTER':
+                self.min_price = float(f['minPrice'])
+                self.max_price = float(f['maxPrice'])
+                self.tick_size, self.tick_decimals = _parse_step(f['tickSize'])
+            elif filter_type == 'LOT_SIZE':
+                self.min_qty = float(f['minQty'])
+                self.max_qty = float(f['maxQty'])
+                self.step_size, self.step_decimals = _parse_step(f['stepSize'])
+            elif filter_type == 'MARKET_LOT_SIZE':
+                self.market_min_qty = float(f['minQty'])
+                self.market_max_qty = float(f['maxQty'])
+                self.market_step_size, self.market_step_decimals = _parse_step(f['stepSize'])
+            elif filter_type == 'MIN_NOTIONAL':
+                self.min_notional = float(f.get('notional', f.get('minNotional', 0)))
+            elif filter_type == 'MAX_NUM_ORDERS':
+                self.max_num_orders = int(f['limit'])
+            elif filter_type == 'MAX_NUM_ALGO_ORDERS':
+                self.max_num_algo_orders = int(f['limit'])
+
+        # Symbols without a MARKET_LOT_SIZE filter use LOT_SIZE for market orders too
+        if not self.market_step_size:
+            self.market_min_qty, self.market_max_qty = self.min_qty, self.max_qty
+            self.market_step_size, self.market_step_decimals = self.step_size, self.step_decimals
+
+    def check(self, order_type: str, quantity: float, price: Optional[float] = None,
+              stop_price: Optional[float] = None, reference_price: Optional[float] = None,
+              open_orders: Optional[int] = None, open_algo_orders: Optional[int] = None,
+              auto_round: bool = False) -> Tuple[bool, str, float, Optional[float], Optional[float]]:
+        """Validate an order against the filters
+
+        With ``auto_round`` the quantity is rounded down to the lot step and
+        prices to the nearest tick before checking. ``reference_price`` is
+        used for the notional check of market orders; ``open_orders`` /
+        ``open_algo_orders`` (current counts for the symbol) enable the
+        max-orders checks. Returns ``(ok, message, quantity, price, stop_price)``.
+        """
+        order_type = order_type.upper()
+        is_market = order_type == 'MARKET'
+        step = self.market_step_size if is_market else self.step_size
+        step_decimals = self.market_step_decimals if is_market else self.step_decimals
+        min_qty = self.market_min_qty if is_market else self.min_qty
+        max_qty = self.market_max_qty if is_market else self.max_qty
+
+        if auto_round:
+            quantity = _round_to_step(quantity, step, step_decimals, down=True)
+            if price is not None:
+                price = _round_to_step(price, self.tick_size, self.tick_decimals, down=False)
+            if stop_price is not None:
+                stop_price = _round_to_step(stop_price, self.tick_size, self.tick_decimals, down=False)
+
+        if quantity < min_qty or (max_qty and quantity > max_qty):
+            return False, f"Quantity {quantity} outside LOT_SIZE [{min_qty}, {max_qty}]", quantity, price, stop_price
+        if not _on_grid(quantity, step):
+            return False, f"Quantity {quantity} is not a multiple of step size {step}", quantity, price, stop_price
+
+        for label, value in (('Price', price), ('Stop price', stop_price)):
+            if value is None:
+                continue
+            if value < self.min_price or (self.max_price and value > self.max_price):
+                return (False, f"{label} {value} outside PRICE_FILTER [{self.min_price}, {self.max_price}]",
+                        quantity, price, stop_price)
+            if not _on_grid(value, self.tick_size):
+                return (False, f"{label} {value} is not a multiple of tick size {self.tick_size}",
+                        quantity, price, stop_price)
+
+        notional_price = reference_price if is_market else price
+        if notional_price and self.min_notional and quantity * notional_price < self.min_notional:
+            return (False, f"Notional {quantity * notional_price:.4f} below MIN_NOTIONAL {self.min_notional}",
+                    quantity, price, stop_price)
+
+        if open_orders is not None and self.max_num_orders and open_orders >= self.max_num_orders:
+            return False, f"MAX_NUM_ORDERS limit {self.max_num_orders} reached", quantity, price, stop_price
+        if (order_type in ALGO_ORDER_TYPES and open_algo_orders is not None
+                and self.max_num_algo_orders and open_algo_orders >= self.max_num_algo_orders):
+            return (False, f"MAX_NUM_ALGO_ORDERS limit {self.max_num_algo_orders} reached",
+                    quantity, price, stop_price)
+
+        return True, "Valid parameters", quantity, price, stop_price
+
+
+class ExchangeFilterCache:
+    """Symbol filter index over futures_exchange_info() with a TTL"""
+
+    def __init__(self, client: Any = None, ttl: float = Config.EXCHANGE_INFO_TTL):
+        """Initialize the cache
+
+        ``client`` is a ``binance.Client`` used to (re)load exchange info
+        when the cache is empty or older than ``ttl`` seconds. Without a
+        client, feed it with ``load()``.
+        """
+        self.client = client
+        self.ttl = ttl
+        self.symbols: Dict[str, SymbolFilters] = {}
+        self.loaded_at = 0.0
+        self._retry_at = 0.0
+        self.logger = logging.getLogger('TradingBot')
+        self._lock = threading.Lock()
+
+    def load(self, exchange_info: Dict[str, Any]) -> None:
+        """Index an exchange info payload"""
+        symbols = {info['symbol']: SymbolFilters(info) for info in exchange_info.get('symbols', [])}
+        self.symbols = symbols
+        self.loaded_at = time.monotonic()
+        self.logger.info(f"Exchange filters loaded for {len(symbols)} symbols")
+
+    def refresh(self) -> None:
+        """Reload exchange info from the exchange now"""
+        with self._lock:
+            self.load(self.client.futures_exchange_info())
+
+    def is_stale(self) -> bool:
+        return not self.symbols or time.monotonic() - self.loaded_at > self.ttl
+
+    def get(self, symbol: str) -> Optional[SymbolFilters]:
+        """Return filters for a symbol, refreshing first if the cache is stale"""
+        if self.client is not None and self.is_stale() and time.monotonic() >= self._retry_at:
+            try:
+                with self._lock:
+                    # Another thread may have refreshed while we waited
+                    if self.is_stale():
+                        self.load(self.client.futures_exchange_info())
+            except Exception as e:
+                # Keep serving the previous index rather than retrying on every order
+                self._retry_at = time.monotonic() + REFRESH_RETRY_DELAY
+                self.logger.error(f"Error refreshing exchange filters: {e}")
+        return self.symbols.get(symbol)
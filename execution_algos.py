@@ -0,0 +1,698 @@
+"""
+Parent-order execution algorithms.
+
+An ``AlgoExecutor`` works large parent orders through a ``BasicBot`` (or
+an ``AsyncBasicBot``). It slices each parent into child limit orders
+resting at the touch, cancels and re-places children the market has
+moved away from, and optionally finishes with a market order for the
+remainder. Every parent is a task on one asyncio event loop. A
+synchronous bot's calls run on a small thread pool. Fills come from the
+bot's user-data stream (``bot.order_store``) when one is attached, and
+from polling otherwise.
+
+Algorithms:
+
+- ``TWAP``: equal slices over a time window.
+- ``VWAP``: slices weighted by a historical intraday volume profile
+  (``volume_profile`` over the bot's cached klines).
+- ``Iceberg``: shows at most ``display_qty`` at a time.
+- ``POV``: follows a fixed share of market volume.
+"""
+
+import math
+import time
+import asyncio
+import logging
+import functools
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Callable, Tuple
+
+from config import Config
+
+OPEN_STATUSES = ('NEW', 'PARTIALLY_FILLED')
+# Child errors tolerated per parent before it is failed
+MAX_CHILD_ERRORS = 3
+
+
+class ChildOrder:
+    """One child order of a parent"""
+
+    __slots__ = ('order_id', 'client_order_id', 'type', 'quantity', 'price', 'filled', 'cum_quote', 'status',
+                 'placed_at')
+
+    def __init__(self, order: Dict[str, Any], order_type: str, quantity: float, price: Optional[float]):
+        self.order_id = order['orderId']
+        self.client_order_id = order.get('clientOrderId')
+        self.type = order_type
+        self.quantity = quantity
+        self.price = price
+        self.filled = 0.0
+        self.cum_quote = 0.0
+        self.status = 'NEW'
+        self.placed_at = time.monotonic()
+
+    @property
+    def is_open(self) -> bool:
+        return self.status in OPEN_STATUSES
+
+    @property
+    def remaining(self) -> float:
+        return self.quantity - self.filled if self.is_open else 0.0
+
+
+class ParentOrder:
+    """A parent order and its execution progress"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, symbol: str, side: str, quantity: float, algo: 'ExecutionAlgo'):
+        self.id = next(self._ids)
+        self.symbol = symbol.upper()
+        self.side = side.upper()
+        self.quantity = quantity
+        self.algo = algo
+        self.filled = 0.0
+        self.cum_quote = 0.0
+        self.status = 'PENDING'
+        self.arrival_price: Optional[float] = None
+        self.children: Dict[int, ChildOrder] = {}
+        self.child_errors = 0
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.done = threading.Event()
+        self._changed: Optional[asyncio.Event] = None
+
+    @property
+    def remaining(self) -> float:
+        return max(self.quantity - self.filled, 0.0)
+
+    @property
+    def avg_price(self) -> float:
+        return self.cum_quote / self.filled if self.filled else 0.0
+
+    def slippage_bps(self) -> float:
+        """Average fill price against the arrival price, in bps (positive is worse)"""
+        if not self.filled or not self.arrival_price:
+            return 0.0
+        sign = 1 if self.side == 'BUY' else -1
+        return sign * (self.avg_price / self.arrival_price - 1) * 1e4
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'symbol': self.symbol,
+            'side': self.side,
+            'algo': self.algo.name,
+            'quantity': self.quantity,
+            'filled': self.filled,
+            'avg_price': self.avg_price,
+            'arrival_price': self.arrival_price,
+            'slippage_bps': self.slippage_bps(),
+            'status': self.status,
+            'children': len(self.children),
+            'open_children': sum(1 for child in self.children.values() if child.is_open),
+            'error': self.error,
+        }
+
+
+class AlgoContext:
+    """Child-order operations for one parent, used by the algorithms"""
+
+    def __init__(self, executor: 'AlgoExecutor', parent: ParentOrder, filters: Any):
+        self.executor = executor
+        self.parent = parent
+        self.filters = filters
+        self.poll_interval = executor.poll_interval
+        self.logger = executor.logger
+
+    # Prices and quantities
+
+    async def touch(self) -> Tuple[float, float]:
+        """Current best bid and ask (the last price for both if no fresh quote is streamed)"""
+        price_stream = getattr(self.executor.bot, 'price_stream', None)
+        if price_stream is not None:
+            entry = price_stream.get_quote(self.parent.symbol)
+            if entry is not None and entry.book_time > time.monotonic() - price_stream.max_age:
+                return entry.bid, entry.ask
+        price = await self.executor.call('get_symbol_price', self.parent.symbol)
+        return price, price
+
+    async def passive_price(self, offset_bps: float = 0.0) -> float:
+        """Price on our side of the book, ``offset_bps`` further away from the spread"""
+        bid, ask = await self.touch()
+        if self.parent.side == 'BUY':
+            return self.round_price(bid * (1 - offset_bps / 1e4), down=True)
+        return self.round_price(ask * (1 + offset_bps / 1e4), down=False)
+
+    def round_price(self, price: float, down: bool) -> float:
+        tick = getattr(self.filters, 'tick_size', 0.0)
+        if not tick:
+            return price
+        steps = math.floor(price / tick + 1e-9) if down else math.ceil(price / tick - 1e-9)
+        return round(steps * tick, self.filters.tick_decimals)
+
+    def round_qty(self, quantity: float, market: bool = False) -> float:
+        """Round down to the lot step; 0 if below the minimum order size"""
+        filters = self.filters
+        if filters is None:
+            return quantity
+        step = filters.market_step_size if market else filters.step_size
+        decimals = filters.market_step_decimals if market else filters.step_decimals
+        minimum = filters.market_min_qty if market else filters.min_qty
+        if step:
+            quantity = round(math.floor(quantity / step + 1e-9) * step, decimals)
+        return quantity if quantity >= minimum else 0.0
+
+    def tradable(self, quantity: float, price: float, market: bool = False) -> float:
+        """``quantity`` rounded, or 0 if it is below the minimum size or notional"""
+        quantity = self.round_qty(quantity, market)
+        min_notional = getattr(self.filters, 'min_notional', 0.0)
+        if quantity and min_notional and quantity * price < min_notional:
+            return 0.0
+        return quantity
+
+    # Children
+
+    def open_children(self) -> List[ChildOrder]:
+        return [child for child in self.parent.children.values() if child.is_open]
+
+    def working_qty(self) -> float:
+        return sum(child.remaining for child in self.parent.children.values())
+
+    async def place_limit(self, quantity: float, price: float) -> Optional[ChildOrder]:
+        return await self._place('LIMIT', quantity, price)
+
+    async def place_market(self, quantity: float) -> Optional[ChildOrder]:
+        return await self._place('MARKET', quantity, None)
+
+    async def _place(self, order_type: str, quantity: float, price: Optional[float]) -> Optional[ChildOrder]:
+        parent = self.parent
+        try:
+            if order_type == 'LIMIT':
+                order = await self.executor.call('place_limit_order', parent.symbol, parent.side, quantity, price)
+            else:
+                order = await self.executor.call('place_market_order', parent.symbol, parent.side, quantity)
+        except Exception as e:
+            parent.child_errors += 1
+            self.logger.warning(f"Parent {parent.id} {order_type} child of {quantity} failed: {e}")
+            if parent.child_errors >= MAX_CHILD_ERRORS:
+                raise
+            return None
+        child = ChildOrder(order, order_type, quantity, price)
+        parent.children[child.order_id] = child
+        self.executor.track(parent, child)
+        self.executor.apply(parent, child, order)
+        return child
+
+    async def cancel(self, child: ChildOrder) -> None:
+        """Cancel a child; if it already completed, pick up its final state instead"""
+        try:
+            result = await self.executor.call('cancel_order', self.parent.symbol, child.order_id)
+        except Exception as e:
+            self.logger.info(f"Cancel of child {child.order_id} failed ({e}), refreshing its status")
+            await self.refresh(child)
+            return
+        self.executor.apply(self.parent, child, result)
+
+    async def cancel_all(self) -> None:
+        children = self.open_children()
+        if children:
+            await asyncio.gather(*(self.cancel(child) for child in children))
+
+    async def refresh(self, child: Optional[ChildOrder] = None) -> None:
+        """Poll the status of one child, or of every open child"""
+        children = [child] if child is not None else self.open_children()
+        for child in children:
+            try:
+                order = await self.executor.call('get_order_status', self.parent.symbol, child.order_id)
+            except Exception as e:
+                self.logger.warning(f"Status of child {child.order_id} unavailable: {e}")
+                continue
+            self.executor.apply(self.parent, child, order)
+
+    # Waiting
+
+    async def wait(self, timeout: float) -> None:
+        """Sleep up to ``timeout`` seconds, waking early when a child fills or changes state"""
+        changed = self.parent._changed
+        changed.clear()
+        try:
+            await asyncio.wait_for(changed.wait(), max(timeout, 0.0))
+        except asyncio.TimeoutError:
+            pass
+        if self.executor.bot_order_store is None:
+            await self.refresh()
+
+    async def work(self, target: float, until: float, offset_bps: float = 0.0,
+                   reprice_bps: Optional[float] = None, max_child: Optional[float] = None,
+                   limit_price: Optional[float] = None) -> None:
+        """Keep passive children working towards ``target`` cumulative fill until ``until`` (monotonic)
+
+        Children rest ``offset_bps`` behind the touch (or at ``limit_price``)
+        and are cancelled and re-placed once the touch moves more than
+        ``reprice_bps`` away. At most ``max_child`` is shown at once.
+        """
+        parent = self.parent
+        reprice_bps = Config.ALGO_REPRICE_BPS if reprice_bps is None else reprice_bps
+        target = min(target, parent.quantity)
+        while True:
+            price = limit_price if limit_price is not None else await self.passive_price(offset_bps)
+            if limit_price is None:
+                stale = [child for child in self.open_children()
+                         if abs(child.price / price - 1) * 1e4 > reprice_bps]
+                if stale:
+                    await asyncio.gather(*(self.cancel(child) for child in stale))
+
+            wanted = target - parent.filled - self.working_qty()
+            if max_child is not None:
+                wanted = min(wanted, max_child - self.working_qty())
+            quantity = self.tradable(wanted, price)
+            if quantity:
+                await self.place_limit(quantity, price)
+
+            now = time.monotonic()
+            if now >= until or not self.tradable(target - parent.filled, price):
+                return
+            await self.wait(min(self.poll_interval, until - now))
+
+    async def sweep(self) -> None:
+        """Cancel resting children and send the remainder as a market order"""
+        await self.cancel_all()
+        bid, ask = await self.touch()
+        quantity = self.tradable(self.parent.remaining, ask if self.parent.side == 'BUY' else bid, market=True)
+        if not quantity:
+            return
+        child = await self.place_market(quantity)
+        # Market orders may be acknowledged before they fill
+        deadline = time.monotonic() + self.poll_interval * 10
+        while child is not None and child.is_open and time.monotonic() < deadline:
+            await self.wait(self.poll_interval)
+
+
+class ExecutionAlgo:
+    """Base class: ``run`` drives one parent through an AlgoContext"""
+
+    name = 'algo'
+
+    async def run(self, ctx: AlgoContext) -> None:
+        raise NotImplementedError
+
+
+class TWAP(ExecutionAlgo):
+    """Equal slices over ``duration`` seconds, remainder swept at the end"""
+
+    name = 'twap'
+
+    def __init__(self, duration: float, slices: int = 10, offset_bps: float = 0.0,
+                 reprice_bps: Optional[float] = None, sweep: bool = True):
+        self.duration = duration
+        self.slices = slices
+        self.offset_bps = offset_bps
+        self.reprice_bps = reprice_bps
+        self.sweep = sweep
+
+    def schedule(self) -> List[float]:
+        """Cumulative fraction of the parent due by the end of each slice"""
+        return [(k + 1) / self.slices for k in range(self.slices)]
+
+    async def run(self, ctx: AlgoContext) -> None:
+        start = time.monotonic()
+        schedule = self.schedule()
+        for k, fraction in enumerate(schedule):
+            slice_end = start + self.duration * (k + 1) / len(schedule)
+            await ctx.work(ctx.parent.quantity * fraction, slice_end, self.offset_bps, self.reprice_bps)
+            if not ctx.parent.remaining:
+                return
+        if self.sweep:
+            await ctx.sweep()
+
+
+class VWAP(TWAP):
+    """Slices sized by an intraday volume profile (one weight per slice)"""
+
+    name = 'vwap'
+
+    def __init__(self, duration: float, profile: List[float], offset_bps: float = 0.0,
+                 reprice_bps: Optional[float] = None, sweep: bool = True):
+        super().__init__(duration, len(profile), offset_bps, reprice_bps, sweep)
+        total = sum(profile)
+        self.profile = [weight / total for weight in profile] if total else [1 / len(profile)] * len(profile)
+
+    def schedule(self) -> List[float]:
+        return list(itertools.accumulate(self.profile))
+
+    @classmethod
+    def from_history(cls, bot: Any, symbol: str, duration: float, slices: int = 10, days: int = 5,
+                     **kwargs) -> 'VWAP':
+        """Build the profile from the last ``days`` of cached 1m klines (``bot.get_klines``)"""
+        end = int(time.time() * 1000)
+        klines = bot.get_klines(symbol, '1m', end - days * 86_400_000, end)
+        return cls(duration, volume_profile(klines, end, duration, slices), **kwargs)
+
+
+class Iceberg(ExecutionAlgo):
+    """Shows at most ``display_qty`` at a time, at a fixed limit or pegged to the touch"""
+
+    name = 'iceberg'
+
+    def __init__(self, display_qty: float, limit_price: Optional[float] = None, offset_bps: float = 0.0,
+                 reprice_bps: Optional[float] = None, duration: Optional[float] = None):
+        self.display_qty = display_qty
+        self.limit_price = limit_price
+        self.offset_bps = offset_bps
+        self.reprice_bps = reprice_bps
+        self.duration = duration
+
+    async def run(self, ctx: AlgoContext) -> None:
+        until = time.monotonic() + self.duration if self.duration else math.inf
+        await ctx.work(ctx.parent.quantity, until, self.offset_bps, self.reprice_bps,
+                       max_child=self.display_qty, limit_price=self.limit_price)
+        await ctx.cancel_all()
+
+
+class POV(ExecutionAlgo):
+    """Keeps filled quantity at ``participation`` of the market volume traded since the start
+
+    ``volume_source`` returns cumulative market volume for the symbol
+    (any baseline). By default it sums 1m klines since the start.
+    Unfilled quantity left after ``max_duration`` is swept if ``sweep``.
+    """
+
+    name = 'pov'
+
+    def __init__(self, participation: float, max_duration: float, interval: float = 5.0,
+                 volume_source: Optional[Callable[[], Any]] = None, offset_bps: float = 0.0,
+                 reprice_bps: Optional[float] = None, sweep: bool = False):
+        self.participation = participation
+        self.max_duration = max_duration
+        self.interval = interval
+        self.volume_source = volume_source
+        self.offset_bps = offset_bps
+        self.reprice_bps = reprice_bps
+        self.sweep = sweep
+
+    async def _market_volume(self, ctx: AlgoContext, start_ms: int) -> float:
+        if self.volume_source is not None:
+            volume = self.volume_source()
+            return await volume if asyncio.iscoroutine(volume) else volume
+        rows = await ctx.executor.call_client('futures_klines', symbol=ctx.parent.symbol, interval='1m',
+                                              startTime=start_ms - start_ms % 60_000)
+        return sum(float(row[5]) for row in rows)
+
+    async def run(self, ctx: AlgoContext) -> None:
+        start = time.monotonic()
+        start_ms = int(time.time() * 1000)
+        baseline = await self._market_volume(ctx, start_ms)
+        end = start + self.max_duration
+        while ctx.parent.remaining and time.monotonic() < end:
+            traded = await self._market_volume(ctx, start_ms) - baseline
+            await ctx.work(traded * self.participation, min(time.monotonic() + self.interval, end),
+                           self.offset_bps, self.reprice_bps)
+        if self.sweep:
+            await ctx.sweep()
+        else:
+            await ctx.cancel_all()
+
+
+def volume_profile(klines: Dict[str, Any], now_ms: int, duration: float, slices: int) -> List[float]:
+    """Average share of volume in each slice of the next ``duration`` seconds, by time of day
+
+    ``klines`` are 1m columns as returned by ``BasicBot.get_klines``. Each
+    slice covers the same minutes of the day on every day in the history.
+    """
+    day_ms = 86_400_000
+    slice_ms = duration * 1000 / slices
+    start_of_day = now_ms % day_ms
+    weights = [0.0] * slices
+    for open_time, volume in zip(klines['open_time'], klines['volume']):
+        offset = (int(open_time) % day_ms - start_of_day) % day_ms
+        if offset < duration * 1000:
+            weights[min(int(offset // slice_ms), slices - 1)] += float(volume)
+    if not any(weights):
+        return [1.0] * slices
+    return weights
+
+
+class AlgoExecutor:
+    """Runs parent orders concurrently on one asyncio event loop"""
+
+    def __init__(self, bot: Any, poll_interval: float = Config.ALGO_POLL_INTERVAL,
+                 max_workers: int = Config.ALGO_MAX_WORKERS):
+        """Initialize the executor
+
+        ``bot`` is a ``BasicBot`` (its calls run on ``max_workers`` threads)
+        or an ``AsyncBasicBot``. Children are re-checked every
+        ``poll_interval`` seconds, and sooner on order events.
+        """
+        self.bot = bot
+        self.poll_interval = poll_interval
+        self.parents: Dict[int, ParentOrder] = {}
+        self.logger = logging.getLogger('TradingBot')
+        self.bot_order_store = getattr(bot, 'order_store', None)
+        self._children: Dict[int, Tuple[ParentOrder, ChildOrder]] = {}
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='AlgoCall')
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        if self.bot_order_store is not None:
+            self.bot_order_store.add_listener(self._on_store_event)
+
+    # Loop management
+
+    def start(self) -> 'AlgoExecutor':
+        """Run the event loop on a background thread (for ``submit`` from synchronous code)"""
+        ready = threading.Event()
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._loop.call_soon(ready.set)
+            self._loop.run_forever()
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name='AlgoExecutor', daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self, cancel_children: bool = True) -> None:
+        """Cancel working parents (and their resting children) and stop the loop"""
+        if self._loop is not None and self._thread is not None:
+            if cancel_children:
+                for parent_id in list(self._tasks):
+                    self.cancel(parent_id)
+                for parent in list(self.parents.values()):
+                    parent.done.wait(self.poll_interval * 10)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(5.0)
+        if self.bot_order_store is not None:
+            self.bot_order_store.remove_listener(self._on_store_event)
+        self._pool.shutdown(wait=False)
+
+    def submit(self, symbol: str, side: str, quantity: float, algo: ExecutionAlgo) -> ParentOrder:
+        """Start a parent order from any thread; returns immediately"""
+        parent = ParentOrder(symbol, side, quantity, algo)
+        self.parents[parent.id] = parent
+        asyncio.run_coroutine_threadsafe(self._run(parent), self._loop)
+        return parent
+
+    def wait(self, parent_id: int, timeout: Optional[float] = None) -> bool:
+        """Block until a parent has finished"""
+        return self.parents[parent_id].done.wait(timeout)
+
+    def cancel(self, parent_id: int) -> None:
+        """Stop a parent; its resting children are cancelled"""
+        task = self._tasks.get(parent_id)
+        if task is not None:
+            self._loop.call_soon_threadsafe(task.cancel)
+
+    async def execute(self, symbol: str, side: str, quantity: float, algo: ExecutionAlgo) -> ParentOrder:
+        """Run a parent order to completion on the current event loop (e.g. next to an AsyncBasicBot)"""
+        parent = ParentOrder(symbol, side, quantity, algo)
+        self.parents[parent.id] = parent
+        return await self._run(parent)
+
+    # Bot calls
+
+    async def call(self, method: str, *args, **kwargs) -> Any:
+        """Call a bot method, awaiting it on an async bot or on the thread pool otherwise"""
+        function = getattr(self.bot, method)
+        if asyncio.iscoroutinefunction(function):
+            return await function(*args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._pool, functools.partial(function, *args, **kwargs))
+
+    async def call_client(self, method: str, **params) -> Any:
+        """Call the bot's exchange client directly"""
+        function = getattr(self.bot.client, method)
+        if asyncio.iscoroutinefunction(function):
+            return await function(**params)
+        return await asyncio.get_running_loop().run_in_executor(self._pool, functools.partial(function, **params))
+
+    # Fill tracking
+
+    def track(self, parent: ParentOrder, child: ChildOrder) -> None:
+        self._children[child.order_id] = (parent, child)
+
+    def apply(self, parent: ParentOrder, child: ChildOrder, order: Dict[str, Any]) -> None:
+        """Apply an order response or event to a child (cumulative fields, so duplicates are harmless)"""
+        executed = float(order.get('executedQty') or 0)
+        if executed > child.filled:
+            avg_price = float(order.get('avgPrice') or 0)
+            cum_quote = (executed * avg_price if avg_price
+                         else child.cum_quote + (executed - child.filled) * (child.price or 0))
+            parent.filled += executed - child.filled
+            parent.cum_quote += cum_quote - child.cum_quote
+            child.filled, child.cum_quote = executed, cum_quote
+        status = order.get('status')
+        if status and (child.is_open or status not in OPEN_STATUSES):
+            child.status = status
+        if not child.is_open:
+            self._children.pop(child.order_id, None)
+        if parent._changed is not None:
+            parent._changed.set()
+
+    def _on_store_event(self, event_type: str, payload: Dict[str, Any]) -> None:
+        # Runs on the user-stream thread
+        if event_type == 'ORDER' and payload.get('orderId') in self._children and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._on_order, payload)
+
+    def _on_order(self, order: Dict[str, Any]) -> None:
+        entry = self._children.get(order['orderId'])
+        if entry is not None:
+            self.apply(entry[0], entry[1], order)
+
+    # Parent lifecycle
+
+    async def _run(self, parent: ParentOrder) -> ParentOrder:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        self._tasks[parent.id] = asyncio.current_task()
+        parent._changed = asyncio.Event()
+        parent.status = 'WORKING'
+        self.logger.info(f"Parent {parent.id}: {parent.algo.name} {parent.side} {parent.quantity} {parent.symbol}")
+        ctx = None
+        try:
+            filters = None
+            if getattr(self.bot, 'filters', None) is not None:
+                filters = await asyncio.get_running_loop().run_in_executor(
+                    self._pool, self.bot.filters.get, parent.symbol)
+            ctx = AlgoContext(self, parent, filters)
+            bid, ask = await ctx.touch()
+            parent.arrival_price = (bid + ask) / 2
+            await parent.algo.run(ctx)
+            parent.status = 'FILLED' if not ctx.round_qty(parent.remaining) else 'DONE'
+        except asyncio.CancelledError:
+            parent.status = 'CANCELED'
+        except Exception as e:
+            parent.status = 'FAILED'
+            parent.error = str(e)
+            self.logger.error(f"Parent {parent.id} failed: {e}")
+        finally:
+            if ctx is not None and ctx.open_children():
+                # Shielded so a cancelled parent still pulls its resting children
+                await asyncio.shield(ctx.cancel_all())
+            self._tasks.pop(parent.id, None)
+            parent.finished_at = time.time()
+            parent.done.set()
+        self.logger.info(f"Parent {parent.id} {parent.status}: {parent.filled}/{parent.quantity} "
+                         f"at {parent.avg_price:.8g} ({parent.slippage_bps():+.2f} bps vs arrival)")
+        return parent
+
+
+def run_benchmark(parents: int = 24, duration: float = 4.0, quantity: float = 0.5,
+                  latency: float = 0.002) -> Dict[str, Dict[str, float]]:
+    """Run ``parents`` concurrent parents (all four algorithms) against the fake exchange
+
+    The fake market maker quotes 4 bps wide around a random walk, so a
+    market order pays at least half the spread. The algorithms rest at
+    the touch and mostly fill passively. Each algorithm gets as many buy
+    as sell parents, so the walk's drift largely cancels out of the
+    average slippage. The ``market`` row is a market order of the same
+    size sent once per side at the start. Fills and quotes
+    reach the bot through an order store and a price stream fed by the
+    fake exchange's events, as they would from the live streams. Risk
+    checks and the rate-limit governor are off, since a single account
+    would be throttled by this many concurrent parents.
+    """
+    from bot import BasicBot
+    from fake_exchange import FakeExchange, FakeFuturesClient
+    from market_data import PriceStream
+    from user_stream import OrderStateStore
+
+    saved = (Config.RISK_ENABLED, Config.RATE_LIMIT_ENABLED)
+    Config.RISK_ENABLED = Config.RATE_LIMIT_ENABLED = False
+    try:
+        exchange = FakeExchange(spread_bps=4.0, seed=1)
+        bot = BasicBot('fake', 'fake', client=FakeFuturesClient(exchange, latency=latency))
+        bot.logger.setLevel(logging.WARNING)
+
+        price_stream = PriceStream(['BTCUSDT'])
+        exchange.add_market_listener(lambda stream, data: price_stream.handle_message(data))
+        bot.attach_price_stream(price_stream)
+        store = OrderStateStore()
+        exchange.add_listener(store.handle_message)
+        bot.order_store = store
+
+        walking = threading.Event()
+        walking.set()
+
+        def walk() -> None:
+            while walking.is_set():
+                exchange.random_walk(0.5)
+                time.sleep(0.01)
+
+        walker = threading.Thread(target=walk, daemon=True)
+        walker.start()
+        market = []
+        for side in ('BUY', 'SELL'):
+            bid, ask = exchange.quote('BTCUSDT')
+            order = bot.place_market_order('BTCUSDT', side, quantity)
+            sign = 1 if side == 'BUY' else -1
+            market.append(sign * (float(order['avgPrice']) / ((bid + ask) / 2) - 1) * 1e4)
+
+        executor = AlgoExecutor(bot, poll_interval=0.1).start()
+        algos: List[ExecutionAlgo] = [
+            TWAP(duration, slices=8),
+            VWAP(duration, profile=[3, 2, 1, 1, 1, 2, 3, 4]),
+            Iceberg(display_qty=quantity / 10, duration=duration),
+            POV(0.2, duration, interval=0.25, sweep=True,
+                # Synthetic market volume of 2 BTC/s
+                volume_source=functools.partial(lambda began: (time.monotonic() - began) * 2.0, time.monotonic())),
+        ]
+        began = time.perf_counter()
+        submitted = [executor.submit('BTCUSDT', 'BUY' if i // len(algos) % 2 else 'SELL', quantity,
+                                     algos[i % len(algos)])
+                     for i in range(parents)]
+        for parent in submitted:
+            executor.wait(parent.id, duration * 5)
+        elapsed = time.perf_counter() - began
+        executor.stop()
+        walking.clear()
+        walker.join()
+
+        results: Dict[str, Dict[str, float]] = {}
+        for parent in submitted:
+            result = results.setdefault(parent.algo.name, {'parents': 0, 'filled_pct': 0.0, 'slippage_bps': 0.0,
+                                                           'children': 0, 'elapsed_s': elapsed})
+            result['parents'] += 1
+            result['filled_pct'] += parent.filled / parent.quantity * 100
+            result['slippage_bps'] += parent.slippage_bps()
+            result['children'] += len(parent.children)
+        for result in results.values():
+            result['filled_pct'] /= result['parents']
+            result['slippage_bps'] /= result['parents']
+        results['market'] = {'parents': len(market), 'filled_pct': 100.0, 'slippage_bps': sum(market) / len(market),
+                             'children': len(market), 'elapsed_s': 0.0}
+        return results
+    finally:
+        Config.RISK_ENABLED, Config.RATE_LIMIT_ENABLED = saved
+
+
+if __name__ == "__main__":
+    for name, result in run_benchmark().items():
+        print(f"📊 {name:>7}: {result['filled_pct']:5.1f}% filled, {result['slippage_bps']:+5.2f} bps vs arrival mid, "
+              f"{result['children'] / max(result['parents'], 1):5.1f} children per parent")
@@ -0,0 +1,439 @@
+"""
+Execution pool spreading order flow over several accounts.
+
+Each account (a sub-account or a separate API key) has its own
+``BasicBot`` and therefore its own rate limits. ``ExecutionPool`` routes
+every order to one account: a symbol pinned with ``assign`` always goes
+to its account, anything else goes to the account with the most
+remaining order/weight headroom. Cancels and status queries follow the
+account that placed the order. Balances, positions and open orders are
+merged into one view.
+
+Accounts can run in this process or, with ``processes=True``, each in a
+worker process (``ProcessBot``) so signing and JSON parsing for busy
+accounts do not share one interpreter.
+"""
+
+import os
+import time
+import logging
+import threading
+import itertools
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, Optional, List, Tuple, Callable
+
+from config import Config
+
+
+class PoolWorkerError(Exception):
+    """An exception raised inside a ProcessBot worker, re-raised in the caller"""
+
+    def __init__(self, error_type: str, message: str, code: Optional[int] = None):
+        super().__init__(f"{error_type}: {message}")
+        self.error_type = error_type
+        self.code = code
+
+
+def _serve_bot(conn: Any, api_key: str, api_secret: str, testnet: bool,
+               client_factory: Optional[Callable[[], Any]], max_workers: int,
+               config: Optional[Dict[str, Any]] = None) -> None:
+    """Worker process: run requests against a local BasicBot until the pipe is closed"""
+    from bot import BasicBot
+
+    for name, value in (config or {}).items():
+        setattr(Config, name, value)
+    try:
+        bot = BasicBot(api_key, api_secret, testnet, client=client_factory() if client_factory else None)
+    except Exception as e:
+        conn.send((None, False, (type(e).__name__, str(e), getattr(e, 'code', None))))
+        return
+    conn.send((None, True, None))
+
+    send_lock = threading.Lock()
+
+    def run(request_id: int, method: str, args: tuple, kwargs: Dict[str, Any]) -> None:
+        try:
+            reply = (request_id, True, getattr(bot, method)(*args, **kwargs))
+        except Exception as e:
+            reply = (request_id, False, (type(e).__name__, str(e), getattr(e, 'code', None)))
+        with send_lock:
+            conn.send(reply)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            try:
+                request = conn.recv()
+            except EOFError:
+                break
+            if request is None:
+                break
+            executor.submit(run, *request)
+
+
+class ProcessBot:
+    """Proxy for a BasicBot running in a worker process
+
+    Method calls are forwarded over a pipe and run concurrently in the
+    worker; each call blocks the calling thread until its reply arrives.
+    ``client_factory`` must be picklable (e.g. a module-level function).
+    ``config`` maps ``Config`` attribute names to values set in the worker
+    before its bot is built; changes made to ``Config`` in this process
+    are not seen by workers started with the spawn method.
+    """
+
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = True,
+                 client_factory: Optional[Callable[[], Any]] = None,
+                 max_workers: int = Config.POOL_MAX_WORKERS,
+                 config: Optional[Dict[str, Any]] = None):
+        self._conn, child_conn = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve_bot, args=(child_conn, api_key, api_secret, testnet, client_factory, max_workers, config),
+            name='PoolWorker', daemon=True)
+        self._process.start()
+        child_conn.close()
+
+        _, ok, payload = self._conn.recv()
+        if not ok:
+            self._process.join()
+            raise PoolWorkerError(*payload)
+
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count()
+        self._send_lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read_replies, name='PoolWorkerReader', daemon=True)
+        self._reader.start()
+
+    def _read_replies(self) -> None:
+        while True:
+            try:
+                request_id, ok, payload = self._conn.recv()
+            except (EOFError, OSError):
+                break
+            future = self._pending.pop(request_id, None)
+            if future is None:
+                continue
+            if ok:
+                future.set_result(payload)
+            else:
+                future.set_exception(PoolWorkerError(*payload))
+        # Worker gone: fail whatever is still waiting
+        for request_id in list(self._pending):
+            self._pending.pop(request_id).set_exception(PoolWorkerError('EOFError', 'Pool worker exited'))
+
+    def call(self, method: str, *args, **kwargs) -> Any:
+        """Run ``bot.<method>(*args, **kwargs)`` in the worker and return its result"""
+        future: Future = Future()
+        request_id = next(self._ids)
+        self._pending[request_id] = future
+        with self._send_lock:
+            self._conn.send((request_id, method, args, kwargs))
+        return future.result()
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the worker process"""
+        try:
+            with self._send_lock:
+                self._conn.send(None)
+        except OSError:
+            pass
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._conn.close()
+
+
+def load_credentials(names: Optional[List[str]] = None) -> Dict[str, Tuple[str, str]]:
+    """Read ``BINANCE_API_KEY_<NAME>`` / ``BINANCE_API_SECRET_<NAME>`` for each pool account
+
+    ``names`` defaults to ``Config.POOL_ACCOUNTS`` (env ``BOT_POOL_ACCOUNTS``,
+    comma-separated).
+    """
+    credentials = {}
+    for name in names if names is not None else Config.POOL_ACCOUNTS:
+        key = os.getenv(f"BINANCE_API_KEY_{name.upper()}", '')
+        secret = os.getenv(f"BINANCE_API_SECRET_{name.upper()}", '')
+        if not key or not secret:
+            raise ValueError(f"Missing API credentials for pool account '{name}'")
+        credentials[name] = (key, secret)
+    return credentials
+
+
+class ExecutionPool:
+    """Routes orders over several BasicBot accounts and aggregates their state"""
+
+    def __init__(self, bots: Dict[str, Any], max_workers: int = Config.POOL_MAX_WORKERS):
+        """Initialize the pool
+
+        ``bots`` maps account names to ``BasicBot`` (or ``ProcessBot``)
+        instances. ``max_workers`` bounds the threads used for fan-out
+        calls (batches and aggregated queries).
+        """
+        if not bots:
+            raise ValueError("Execution pool needs at least one account")
+        self.bots = dict(bots)
+        self.affinity: Dict[str, str] = {}
+        self.logger = logging.getLogger('TradingBot')
+        self._owners: Dict[Tuple[str, int], str] = {}
+        self._in_flight = {name: 0 for name in self.bots}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ExecutionPool')
+        self._headroom: Dict[str, Optional[float]] = {name: None for name in self.bots}
+        self.get_rate_limit_headroom()
+
+    @classmethod
+    def from_credentials(cls, credentials: Dict[str, Tuple[str, str]], testnet: bool = True,
+                         processes: bool = False) -> 'ExecutionPool':
+        """Build one bot per ``{name: (api_key, api_secret)}`` entry, optionally in worker processes"""
+        from bot import BasicBot
+
+        factory = ProcessBot if processes else BasicBot
+        return cls({name: factory(key, secret, testnet) for name, (key, secret) in credentials.items()})
+
+    def close(self) -> None:
+        """Stop worker processes and the fan-out threads"""
+        self._executor.shutdown(wait=True)
+        for bot in self.bots.values():
+            if isinstance(bot, ProcessBot):
+                bot.close()
+
+    # Routing
+
+    def assign(self, symbol: str, account: str) -> None:
+        """Pin all orders for ``symbol`` to ``account``"""
+        if account not in self.bots:
+            raise ValueError(f"Unknown pool account: {account}")
+        self.affinity[symbol.upper()] = account
+
+    @staticmethod
+    def _available(headroom: Dict[str, Any]) -> Optional[float]:
+        if not headroom:
+            return None
+        return min(headroom['orders_10s_available'], headroom['orders_1m_available'], headroom['weight_available'])
+
+    def _refresh_headroom(self, name: str) -> None:
+        """Re-read one account's headroom (one IPC call for a ProcessBot; never under the pool lock)"""
+        try:
+            self._headroom[name] = self._available(self.bots[name].get_rate_limit_headroom())
+        except Exception as e:
+            self.logger.warning(f"Rate-limit headroom of account {name} unavailable: {e}")
+
+    def _headroom_score(self, name: str) -> float:
+        """Orders the account could send at its last headroom reading, less the ones routed to it since"""
+        available = self._headroom[name]
+        if available is None:
+            return -self._in_flight[name]
+        return available - self._in_flight[name]
+
+    def route(self, symbol: str, account: Optional[str] = None, orders: int = 1) -> str:
+        """Pick the account for ``orders`` new orders on ``symbol`` and count them as in flight"""
+        name = account or self.affinity.get(symbol.upper())
+        with self._lock:
+            if name is None:
+                name = max(self.bots, key=self._headroom_score)
+            elif name not in self.bots:
+                raise ValueError(f"Unknown pool account: {name}")
+            self._in_flight[name] += orders
+        return name
+
+    def _release(self, name: str, orders: int = 1) -> None:
+        with self._lock:
+            self._in_flight[name] -= orders
+        # The finished orders are now counted by the account's own governor
+        self._refresh_headroom(name)
+
+    def _owner(self, symbol: str, order_id: int, account: Optional[str]) -> str:
+        name = account or self._owners.get((symbol.upper(), order_id))
+        if name is None:
+            raise ValueError(f"Order {order_id} for {symbol} was not placed through the pool; pass account=")
+        return name
+
+    def _record(self, name: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        result['account'] = name
+        if 'orderId' in result:
+            self._owners[(result['symbol'], result['orderId'])] = name
+        return result
+
+    # Orders
+
+    def _place(self, method: str, symbol: str, account: Optional[str], *args, **kwargs) -> Dict[str, Any]:
+        name = self.route(symbol, account)
+        try:
+            return self._record(name, getattr(self.bots[name], method)(symbol, *args, **kwargs))
+        finally:
+            self._release(name)
+
+    def place_market_order(self, symbol: str, side: str, quantity: float, client_order_id: Optional[str] = None,
+                           account: Optional[str] = None) -> Dict[str, Any]:
+        """Place a market order on the routed account; the result carries ``account``"""
+        return self._place('place_market_order', symbol, account, side, quantity, client_order_id=client_order_id)
+
+    def place_limit_order(self, symbol: str, side: str, quantity: float, price: float,
+                          client_order_id: Optional[str] = None, account: Optional[str] = None) -> Dict[str, Any]:
+        """Place a limit order on the routed account"""
+        return self._place('place_limit_order', symbol, account, side, quantity, price,
+                           client_order_id=client_order_id)
+
+    def place_stop_loss_limit_order(self, symbol: str, side: str, quantity: float, price: float, stop_price: float,
+                                    client_order_id: Optional[str] = None,
+                                    account: Optional[str] = None) -> Dict[str, Any]:
+        """Place a stop-loss limit order on the routed account"""
+        return self._place('place_stop_loss_limit_order', symbol, account, side, quantity, price, stop_price,
+                           client_order_id=client_order_id)
+
+    def place_orders_batch(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Place many orders, split across accounts and sent in parallel
+
+        Orders may carry an ``account`` key; the rest are routed per
+        symbol. Returns one result per input order, in input order.
+        """
+        groups: Dict[str, List[int]] = {}
+        for index, order in enumerate(orders):
+            name = self.route(order['symbol'], order.get('account'))
+            groups.setdefault(name, []).append(index)
+
+        def send(name: str) -> List[Dict[str, Any]]:
+            indexes = groups[name]
+            try:
+                batch = [{key: value for key, value in orders[i].items() if key != 'account'} for i in indexes]
+                return self.bots[name].place_orders_batch(batch)
+            finally:
+                self._release(name, len(indexes))
+
+        self.logger.info(f"Routing {len(orders)} orders over {len(groups)} accounts")
+        results: List[Optional[Dict[str, Any]]] = [None] * len(orders)
+        futures = {name: self._executor.submit(send, name) for name in groups}
+        for name, future in futures.items():
+            try:
+                group_results = future.result()
+            except Exception as e:
+                self.logger.error(f"Batch on account {name} failed: {e}")
+                group_results = [{'code': getattr(e, 'code', -1), 'msg': str(e)} for _ in groups[name]]
+            for index, result in zip(groups[name], group_results):
+                results[index] = self._record(name, result)
+        return results
+
+    def cancel_order(self, symbol: str, order_id: int, account: Optional[str] = None) -> Dict[str, Any]:
+        """Cancel an order on the account that placed it"""
+        name = self._owner(symbol, order_id, account)
+        return self._record(name, self.bots[name].cancel_order(symbol, order_id))
+
+    def get_order_status(self, symbol: str, order_id: int, account: Optional[str] = None) -> Dict[str, Any]:
+        """Get an order's status from the account that placed it"""
+        name = self._owner(symbol, order_id, account)
+        return self._record(name, self.bots[name].get_order_status(symbol, order_id))
+
+    # Aggregated view
+
+    def _fan_out(self, method: str, *args) -> Dict[str, Any]:
+        futures = {name: self._executor.submit(getattr(bot, method), *args) for name, bot in self.bots.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+    def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Open orders of all accounts, each tagged with ``account``"""
+        return [self._record(name, order) for name, orders in self._fan_out('get_open_orders', symbol).items()
+                for order in orders]
+
+    def get_account_summary(self) -> Dict[str, Any]:
+        """Per-account and total balances, plus positions netted across accounts
+
+        Positions are keyed by symbol (and position side in hedge mode) with
+        the summed amount, the amount-weighted entry price, summed
+        unrealized PnL and the per-account amounts.
+        """
+        accounts = self._fan_out('get_account_info')
+        summary: Dict[str, Any] = {'accounts': {}, 'total_wallet_balance': 0.0, 'available_balance': 0.0,
+                                   'unrealized_pnl': 0.0, 'positions': {}}
+        for name, info in accounts.items():
+            wallet = float(info['totalWalletBalance'])
+            available = float(info['availableBalance'])
+            unrealized = float(info.get('totalUnrealizedProfit', 0))
+            summary['accounts'][name] = {'wallet_balance': wallet, 'available_balance': available,
+                                         'unrealized_pnl': unrealized}
+            summary['total_wallet_balance'] += wallet
+            summary['available_balance'] += available
+            summary['unrealized_pnl'] += unrealized
+
+            for position in info.get('positions', []):
+                amount = float(position['positionAmt'])
+                if not amount:
+                    continue
+                side = position.get('positionSide', 'BOTH')
+                key = position['symbol'] if side == 'BOTH' else f"{position['symbol']} {side}"
+                merged = summary['positions'].setdefault(key, {'amount': 0.0, 'entry_price': 0.0,
+                                                               'unrealized_pnl': 0.0, 'accounts': {}})
+                # Entry notional is accumulated here and divided out below
+                merged['entry_price'] += float(position['entryPrice']) * abs(amount)
+                merged['amount'] += amount
+                merged['unrealized_pnl'] += float(position.get('unrealizedProfit', 0))
+                merged['accounts'][name] = amount
+
+        for merged in summary['positions'].values():
+            gross = sum(abs(amount) for amount in merged['accounts'].values())
+            merged['entry_price'] = merged['entry_price'] / gross if gross else 0.0
+        return summary
+
+    def get_rate_limit_headroom(self) -> Dict[str, Dict[str, Any]]:
+        """Rate-limit headroom per account (also refreshes the routing cache)"""
+        headroom = self._fan_out('get_rate_limit_headroom')
+        for name, account_headroom in headroom.items():
+            self._headroom[name] = self._available(account_headroom)
+        return headroom
+
+
+def _fake_client() -> Any:
+    from fake_exchange import FakeFuturesClient
+
+    return FakeFuturesClient(latency=0.005)
+
+
+def run_benchmark(orders: int = 400, accounts: int = 4, processes: bool = False) -> Dict[str, float]:
+    """Time ``orders`` concurrent market orders on one account vs a pool of ``accounts``
+
+    Each account is a fake exchange with 5 ms latency behind the normal
+    rate-limit governor, so a single account is throttled once its
+    10-second order budget is spent while the pool spreads the load.
+    Pre-trade risk checks are turned off, as the order-rate limit would
+    reject the burst.
+    """
+    from bot import BasicBot
+
+    def timed(target: Any) -> float:
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            began = time.perf_counter()
+            list(executor.map(lambda _: target.place_market_order('BTCUSDT', 'BUY', 0.001), range(orders)))
+            return time.perf_counter() - began
+
+    saved = Config.RISK_ENABLED
+    Config.RISK_ENABLED = False
+    try:
+        logging.getLogger('TradingBot').setLevel(logging.WARNING)
+        single = BasicBot('fake', 'fake', client=_fake_client())
+        single.logger.setLevel(logging.WARNING)
+        single_s = timed(single)
+
+        if processes:
+            bots = {f"acct{i}": ProcessBot('fake', 'fake', client_factory=_fake_client,
+                                           config={'RISK_ENABLED': False})
+                    for i in range(accounts)}
+        else:
+            bots = {f"acct{i}": BasicBot('fake', 'fake', client=_fake_client()) for i in range(accounts)}
+        pool = ExecutionPool(bots)
+        try:
+            pool_s = timed(pool)
+        finally:
+            pool.close()
+    finally:
+        Config.RISK_ENABLED = saved
+    return {'orders': orders, 'accounts': accounts, 'single_s': single_s, 'pool_s': pool_s}
+
+
+if __name__ == "__main__":
+    result = run_benchmark()
+    print(f"📊 {result['orders']} orders on 1 account:   {result['single_s']:7.2f} s")
+    print(f"📊 {result['orders']} orders on {result['accounts']} accounts:  {result['pool_s']:7.2f} s")
@@ -0,0 +1,839 @@
+"""
+Fake Binance Futures exchange for local testing and benchmarks.
+
+``FakeExchange`` is an in-memory exchange with a price-time priority
+matching engine. A synthetic market maker quotes around each symbol's
+reference price with unlimited depth. Resting orders fill when the
+price moves through them, and stop orders trigger on the reference
+price. Positions, fees and wallet balance are tracked, and order and
+account changes are published as user-data stream events. Error
+injection (``error_rate``/``timeout_rate``) and the random price walk
+use a seeded RNG.
+
+``FakeFuturesClient`` / ``FakeAsyncFuturesClient`` implement the subset of
+``binance.Client`` / ``binance.AsyncClient`` the bots use, with an optional
+simulated network round trip. ``fake_server.FakeExchangeServer`` serves
+the same exchange over HTTP and WebSocket.
+"""
+
+import math
+import time
+import json
+import random
+import bisect
+import asyncio
+import threading
+from collections import deque
+from typing import Dict, Any, Optional, List, Callable, Tuple
+
+from klines import INTERVAL_MS
+
+# Tick size and lot step per fake symbol
+SYMBOL_GRID = {
+    'BTCUSDT': ('0.10', '0.001'),
+    'ETHUSDT': ('0.01', '0.001'),
+    'ADAUSDT': ('0.00010', '1'),
+    'SOLUSDT': ('0.0100', '1'),
+}
+
+OPEN_STATUSES = ('NEW', 'PARTIALLY_FILLED')
+
+# Leverage reported for every position
+LEVERAGE = 20
+
+# Remaining quantities below this count as filled
+QTY_EPSILON = 1e-9
+
+
+def _fmt(value: float) -> str:
+    """Format a number the way the API does (no exponent, no trailing zeros)"""
+    text = f"{value:.8f}".rstrip('0').rstrip('.')
+    return '0' if text in ('', '-0') else text
+
+
+class FakeExchangeError(ValueError):
+    """Order rejection carrying a Binance API error code"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class _Order:
+    """Mutable exchange-side order state"""
+
+    __slots__ = ('order_id', 'client_order_id', 'symbol', 'side', 'type', 'orig_type', 'price', 'stop_price',
+                 'quantity', 'executed', 'cum_quote', 'status', 'time_in_force', 'reduce_only', 'update_time')
+
+    def __init__(self, order_id: int, client_order_id: str, symbol: str, side: str, order_type: str,
+                 quantity: float, price: float, stop_price: float, time_in_force: str, reduce_only: bool):
+        self.order_id = order_id
+        self.client_order_id = client_order_id
+        self.symbol = symbol
+        self.side = side
+        self.type = order_type
+        self.orig_type = order_type
+        self.price = price
+        self.stop_price = stop_price
+        self.quantity = quantity
+        self.executed = 0.0
+        self.cum_quote = 0.0
+        self.status = 'NEW'
+        self.time_in_force = time_in_force
+        self.reduce_only = reduce_only
+        self.update_time = int(time.time() * 1000)
+
+    @property
+    def remaining(self) -> float:
+        return self.quantity - self.executed
+
+    def to_dict(self) -> Dict[str, Any]:
+        """REST order response shape"""
+        return {
+            'orderId': self.order_id,
+            'symbol': self.symbol,
+            'status': self.status,
+            'clientOrderId': self.client_order_id,
+            'price': _fmt(self.price),
+            'avgPrice': _fmt(self.cum_quote / self.executed) if self.executed else '0',
+            'origQty': _fmt(self.quantity),
+            'executedQty': _fmt(self.executed),
+            'cumQuote': _fmt(self.cum_quote),
+            'timeInForce': self.time_in_force,
+            'type': self.type,
+            'origType': self.orig_type,
+            'reduceOnly': self.reduce_only,
+            'side': self.side,
+            'positionSide': 'BOTH',
+            'stopPrice': _fmt(self.stop_price),
+            'updateTime': self.update_time,
+            'transactTime': self.update_time,
+        }
+
+
+class _BookSide:
+    """Resting orders on one side: price levels best-first, FIFO within a level"""
+
+    def __init__(self, is_bid: bool):
+        self.is_bid = is_bid
+        self.levels: Dict[float, deque] = {}
+        # Sort keys (negated prices for bids) in ascending order, so index 0 is the best level
+        self._keys: List[float] = []
+
+    def _key(self, price: float) -> float:
+        return -price if self.is_bid else price
+
+    def best(self) -> Optional[float]:
+        if not self._keys:
+            return None
+        return -self._keys[0] if self.is_bid else self._keys[0]
+
+    def add(self, order: _Order) -> None:
+        level = self.levels.get(order.price)
+        if level is None:
+            level = self.levels[order.price] = deque()
+            bisect.insort(self._keys, self._key(order.price))
+        level.append(order)
+
+    def remove(self, order: _Order) -> None:
+        level = self.levels[order.price]
+        level.remove(order)
+        if not level:
+            self._drop_level(order.price)
+
+    def _drop_level(self, price: float) -> None:
+        del self.levels[price]
+        del self._keys[bisect.bisect_left(self._keys, self._key(price))]
+
+    def pop_front(self, price: float) -> None:
+        level = self.levels[price]
+        level.popleft()
+        if not level:
+            self._drop_level(price)
+
+    def depth(self, limit: int) -> List[List[str]]:
+        levels = []
+        for key in self._keys[:limit]:
+            price = -key if self.is_bid else key
+            levels.append([_fmt(price), _fmt(sum(order.remaining for order in self.levels[price]))])
+        return levels
+
+
+class FakeExchange:
+    """In-memory futures exchange with a matching engine, shared by fake clients and servers"""
+
+    def __init__(self, prices: Optional[Dict[str, float]] = None, balance: float = 15000.0,
+                 spread_bps: float = 0.0, maker_fee: float = 0.0002, taker_fee: float = 0.0005,
+                 error_rate: float = 0.0, timeout_rate: float = 0.0, seed: int = 0):
+        """Initialize the fake exchange
+
+        The market maker quotes ``spread_bps`` wide around each reference
+        price. On each call a fraction ``error_rate`` fails with -1001
+        (not executed). A further ``timeout_rate`` fails with -1007 after
+        being executed, like a backend timeout with unknown status.
+        """
+        self.prices = dict(prices or {'BTCUSDT': 60000.0, 'ETHUSDT': 3000.0,
+                                      'ADAUSDT': 0.45, 'SOLUSDT': 150.0})
+        self.balance = balance
+        self.half_spread = spread_bps / 2e4
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.orders: Dict[int, _Order] = {}
+        self.positions: Dict[str, List[float]] = {}
+        self.fills = 0
+        self.update_id = 0
+        self._open: Dict[int, _Order] = {}
+        self._client_ids: Dict[str, int] = {}
+        self._books = {symbol: (_BookSide(True), _BookSide(False)) for symbol in self.prices}
+        self._stops: Dict[str, List[_Order]] = {symbol: [] for symbol in self.prices}
+        self._next_order_id = 1
+        self._rng = random.Random(seed)
+        self._user_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._market_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        self._lock = threading.RLock()
+
+    # Listeners
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """Call ``callback(event)`` with every ORDER_TRADE_UPDATE / ACCOUNT_UPDATE event"""
+        self._user_listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        self._user_listeners.remove(callback)
+
+    def add_market_listener(self, callback: Callable[[str, Dict[str, Any]], None]) -> None:
+        """Call ``callback(stream_name, data)`` with markPrice and bookTicker events on price changes"""
+        self._market_listeners.append(callback)
+
+    def remove_market_listener(self, callback: Callable[[str, Dict[str, Any]], None]) -> None:
+        self._market_listeners.remove(callback)
+
+    def _emit(self, events: Optional[List[Dict[str, Any]]]) -> None:
+        for event in events or ():
+            for callback in self._user_listeners:
+                callback(event)
+
+    def _order_event(self, order: _Order, execution_type: str, events: Optional[List[Dict[str, Any]]],
+                     last_qty: float = 0.0, last_price: float = 0.0, fee: float = 0.0,
+                     realized: float = 0.0) -> None:
+        if events is None:
+            return
+        events.append({'e': 'ORDER_TRADE_UPDATE', 'E': order.update_time, 'T': order.update_time, 'o': {
+            's': order.symbol, 'c': order.client_order_id, 'S': order.side, 'o': order.type,
+            'f': order.time_in_force, 'q': _fmt(order.quantity), 'p': _fmt(order.price),
+            'ap': _fmt(order.cum_quote / order.executed) if order.executed else '0',
+            'sp': _fmt(order.stop_price), 'x': execution_type, 'X': order.status, 'i': order.order_id,
+            'l': _fmt(last_qty), 'z': _fmt(order.executed), 'L': _fmt(last_price), 'N': 'USDT', 'n': _fmt(fee),
+            'T': order.update_time, 't': self.fills, 'R': order.reduce_only, 'ps': 'BOTH', 'rp': _fmt(realized),
+            'ot': order.orig_type,
+        }})
+
+    def _account_event(self, symbol: str, events: Optional[List[Dict[str, Any]]]) -> None:
+        if events is None:
+            return
+        amount, entry = self.positions.get(symbol, (0.0, 0.0))
+        now = int(time.time() * 1000)
+        events.append({'e': 'ACCOUNT_UPDATE', 'E': now, 'T': now, 'a': {
+            'm': 'ORDER',
+            'B': [{'a': 'USDT', 'wb': _fmt(self.balance), 'cw': _fmt(self.balance), 'bc': '0'}],
+            'P': [{'s': symbol, 'pa': _fmt(amount), 'ep': _fmt(entry),
+                   'up': _fmt(amount * (self.prices[symbol] - entry)), 'mt': 'cross', 'iw': '0', 'ps': 'BOTH'}],
+        }})
+
+    def listen_key(self) -> str:
+        """Issue a listenKey; every key streams the same account's events"""
+        return f"fakeListenKey{self._rng.getrandbits(64):016x}"
+
+    # Faults
+
+    def call(self, operation: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run an exchange operation with error injection applied"""
+        if not (self.error_rate or self.timeout_rate):
+            return operation(*args, **kwargs)
+        roll = self._rng.random()
+        if roll < self.error_rate:
+            raise FakeExchangeError(-1001, "Internal error; unable to process your request. Please try again.")
+        result = operation(*args, **kwargs)
+        if roll < self.error_rate + self.timeout_rate:
+            raise FakeExchangeError(-1007, "Timeout waiting for response from backend server. "
+                                           "Send status unknown; execution status unknown.")
+        return result
+
+    # Market data
+
+    def _check_symbol(self, symbol: str) -> None:
+        if symbol not in self.prices:
+            raise FakeExchangeError(-1121, f"Invalid symbol: {symbol}")
+
+    def quote(self, symbol: str) -> Tuple[float, float]:
+        """The market maker's bid and ask"""
+        price = self.prices[symbol]
+        return price * (1 - self.half_spread), price * (1 + self.half_spread)
+
+    def account(self) -> Dict[str, Any]:
+        """Return a futures_account() style payload"""
+        with self._lock:
+            positions = []
+            unrealized = 0.0
+            margin = 0.0
+            for symbol, (amount, entry) in self.positions.items():
+                if not amount:
+                    continue
+                mark = self.prices[symbol]
+                profit = amount * (mark - entry)
+                initial_margin = abs(amount) * mark / LEVERAGE
+                unrealized += profit
+                margin += initial_margin
+                positions.append({'symbol': symbol, 'positionSide': 'BOTH', 'positionAmt': _fmt(amount),
+                                  'entryPrice': _fmt(entry), 'markPrice': _fmt(mark),
+                                  'unrealizedProfit': _fmt(profit), 'notional': _fmt(amount * mark),
+                                  'initialMargin': _fmt(initial_margin), 'leverage': str(LEVERAGE),
+                                  'isolated': False})
+            available = self.balance + unrealized - margin
+            return {
+                'totalWalletBalance': f"{self.balance:.8f}",
+                'availableBalance': f"{available:.8f}",
+                'totalUnrealizedProfit': f"{unrealized:.8f}",
+                'totalMarginBalance': f"{self.balance + unrealized:.8f}",
+                'totalPositionInitialMargin': f"{margin:.8f}",
+                'assets': [{'asset': 'USDT', 'walletBalance': f"{self.balance:.8f}",
+                            'crossWalletBalance': f"{self.balance:.8f}", 'unrealizedProfit': f"{unrealized:.8f}",
+                            'availableBalance': f"{available:.8f}"}],
+                'positions': positions,
+            }
+
+    def exchange_info(self) -> Dict[str, Any]:
+        """Return a futures_exchange_info() style payload"""
+        symbols = []
+        for symbol in self.prices:
+            tick_size, step_size = SYMBOL_GRID.get(symbol, ('0.01', '0.001'))
+            symbols.append({'symbol': symbol, 'status': 'TRADING', 'filters': [
+                {'filterType': 'PRICE_FILTER', 'minPrice': tick_size, 'maxPrice': '1000000', 'tickSize': tick_size},
+                {'filterType': 'LOT_SIZE', 'minQty': step_size, 'maxQty': '1000', 'stepSize': step_size},
+                {'filterType': 'MARKET_LOT_SIZE', 'minQty': step_size, 'maxQty': '100', 'stepSize': step_size},
+                {'filterType': 'MAX_NUM_ORDERS', 'limit': 200},
+                {'filterType': 'MAX_NUM_ALGO_ORDERS', 'limit': 10},
+                {'filterType': 'MIN_NOTIONAL', 'notional': '5'},
+            ]})
+        return {'timezone': 'UTC', 'serverTime': int(time.time() * 1000), 'symbols': symbols}
+
+    def ticker(self, symbol: Optional[str] = None) -> Any:
+        """Return a futures_symbol_ticker() style payload (a list of all symbols without ``symbol``)"""
+        if symbol is None:
+            return [self.ticker(name) for name in list(self.prices)]
+        self._check_symbol(symbol)
+        return {'symbol': symbol, 'price': str(self.prices[symbol]),
+                'time': int(time.time() * 1000)}
+
+    def ticker_24h(self, symbol: Optional[str] = None) -> Any:
+        """Return futures_ticker() 24h statistics, synthesised deterministically per symbol"""
+        if symbol is None:
+            return [self.ticker_24h(name) for name in list(self.prices)]
+        self._check_symbol(symbol)
+        rng = random.Random(symbol)
+        price = self.prices[symbol]
+        open_price = price / (1 + rng.uniform(-0.1, 0.1))
+        high = max(open_price, price) * (1 + rng.uniform(0.002, 0.03))
+        low = min(open_price, price) * (1 - rng.uniform(0.002, 0.03))
+        quote_volume = 10 ** rng.uniform(5, 10)
+        now = int(time.time() * 1000)
+        return {'symbol': symbol, 'priceChange': _fmt(price - open_price),
+                'priceChangePercent': f"{(price / open_price - 1) * 100:.3f}",
+                'weightedAvgPrice': _fmt((high + low) / 2), 'lastPrice': _fmt(price), 'lastQty': '1',
+                'openPrice': _fmt(open_price), 'highPrice': _fmt(high), 'lowPrice': _fmt(low),
+                'volume': _fmt(quote_volume / price), 'quoteVolume': f"{quote_volume:.2f}",
+                'openTime': now - 86_400_000, 'closeTime': now, 'firstId': 1, 'lastId': 1000, 'count': 1000}
+
+    def book_ticker(self, symbol: Optional[str] = None) -> Any:
+        """Return a futures_orderbook_ticker() payload for the market maker's quote"""
+        if symbol is None:
+            return [self.book_ticker(name) for name in list(self.prices)]
+        self._check_symbol(symbol)
+        bid, ask = self.quote(symbol)
+        return {'symbol': symbol, 'bidPrice': _fmt(bid), 'bidQty': '100', 'askPrice': _fmt(ask), 'askQty': '100',
+                'time': int(time.time() * 1000)}
+
+    def premium_index(self, symbol: Optional[str] = None) -> Any:
+        """Return a futures_mark_price() (premium index) payload with a fixed per-symbol funding rate"""
+        if symbol is None:
+            return [self.premium_index(name) for name in list(self.prices)]
+        self._check_symbol(symbol)
+        price = self.prices[symbol]
+        funding_rate = random.Random(symbol).uniform(-0.0005, 0.0005)
+        now = int(time.time() * 1000)
+        return {'symbol': symbol, 'markPrice': _fmt(price), 'indexPrice': _fmt(price * (1 - funding_rate)),
+                'estimatedSettlePrice': _fmt(price), 'lastFundingRate': f"{funding_rate:.8f}",
+                'interestRate': '0.00010000', 'nextFundingTime': now - now % 28_800_000 + 28_800_000, 'time': now}
+
+    def depth(self, symbol: str, limit: int = 500) -> Dict[str, Any]:
+        """Return a futures_order_book() style payload: resting orders plus the market maker's quote"""
+        self._check_symbol(symbol)
+        with self._lock:
+            bids, asks = self._books[symbol]
+            bid, ask = self.quote(symbol)
+            # The market maker shows a fixed size at its quote
+            bid_levels = sorted(bids.depth(limit) + [[_fmt(bid), '100']], key=lambda level: -float(level[0]))
+            ask_levels = sorted(asks.depth(limit) + [[_fmt(ask), '100']], key=lambda level: float(level[0]))
+            now = int(time.time() * 1000)
+            return {'lastUpdateId': self.update_id, 'E': now, 'T': now,
+                    'bids': bid_levels[:limit], 'asks': ask_levels[:limit]}
+
+    def klines(self, symbol: str, interval_ms: int, start_time: int, end_time: Optional[int] = None,
+               limit: int = 500) -> List[List[Any]]:
+        """Return futures_klines() rows for a deterministic synthetic price path"""
+        self._check_symbol(symbol)
+        now = int(time.time() * 1000)
+        end_time = min(end_time if end_time is not None else now, now)
+        base = self.prices[symbol]
+        open_time = -(-start_time // interval_ms) * interval_ms
+        rows = []
+        while open_time <= end_time and len(rows) < limit:
+            # Smooth drift plus a per-candle wiggle, both functions of time only
+            open_price = base * (1 + 0.02 * math.sin(open_time / 8.64e7))
+            close_price = base * (1 + 0.02 * math.sin((open_time + interval_ms) / 8.64e7))
+            wiggle = base * 0.0005 * (1 + math.sin(open_time / 7.1e5))
+            volume = 10 + (open_time // interval_ms) % 7
+            rows.append([open_time, f"{open_price:.2f}", f"{max(open_price, close_price) + wiggle:.2f}",
+                         f"{min(open_price, close_price) - wiggle:.2f}", f"{close_price:.2f}", f"{volume:.3f}",
+                         open_time + interval_ms - 1, f"{volume * close_price:.2f}", 100 + volume,
+                         f"{volume / 2:.3f}", f"{volume * close_price / 2:.2f}", '0'])
+            open_time += interval_ms
+        return rows
+
+    def set_price(self, symbol: str, price: float) -> None:
+        """Move a symbol's reference price, filling crossed resting orders and triggering stops"""
+        self._check_symbol(symbol)
+        events = [] if self._user_listeners else None
+        with self._lock:
+            self.prices[symbol] = price
+            bid, ask = self.quote(symbol)
+            bids, asks = self._books[symbol]
+
+            # Resting orders the new quote trades through fill at their own price
+            while bids.best() is not None and bids.best() >= ask:
+                level_price = bids.best()
+                for order in list(bids.levels[level_price]):
+                    self._fill(order, order.remaining, level_price, True, events)
+                    bids.pop_front(level_price)
+            while asks.best() is not None and asks.best() <= bid:
+                level_price = asks.best()
+                for order in list(asks.levels[level_price]):
+                    self._fill(order, order.remaining, level_price, True, events)
+                    asks.pop_front(level_price)
+
+            stops = self._stops[symbol]
+            if stops:
+                triggered = [order for order in stops
+                             if (order.side == 'BUY' and price >= order.stop_price)
+                             or (order.side == 'SELL' and price <= order.stop_price)]
+                for order in triggered:
+                    stops.remove(order)
+                    order.type = 'LIMIT' if order.orig_type == 'STOP' else 'MARKET'
+                    self._match(order, events)
+            self.update_id += 1
+
+        self._emit(events)
+        if self._market_listeners:
+            now = int(time.time() * 1000)
+            stream = symbol.lower()
+            mark = {'e': 'markPriceUpdate', 'E': now, 's': symbol, 'p': _fmt(price), 'r': '0.00010000', 'T': now}
+            book = {'e': 'bookTicker', 'E': now, 'T': now, 's': symbol,
+                    'b': _fmt(bid), 'B': '100', 'a': _fmt(ask), 'A': '100'}
+            for callback in self._market_listeners:
+                callback(f"{stream}@markPrice@1s", mark)
+                callback(f"{stream}@bookTicker", book)
+
+    def random_walk(self, volatility_bps: float = 1.0) -> None:
+        """Move every price one step of a seeded Gaussian random walk, rounded to the tick"""
+        for symbol in list(self.prices):
+            tick = float(SYMBOL_GRID.get(symbol, ('0.01', '0.001'))[0])
+            price = self.prices[symbol] * (1 + self._rng.gauss(0.0, volatility_bps / 1e4))
+            self.set_price(symbol, max(round(round(price / tick) * tick, 8), tick))
+
+    # Matching
+
+    def _apply_position(self, symbol: str, quantity: float, price: float) -> float:
+        """Book a signed fill into the position; returns the realized PnL"""
+        position = self.positions.setdefault(symbol, [0.0, 0.0])
+        amount, entry = position
+        if abs(amount) < QTY_EPSILON or (amount > 0) == (quantity > 0):
+            new_amount = amount + quantity
+            position[1] = (entry * abs(amount) + price * abs(quantity)) / abs(new_amount)
+            position[0] = new_amount
+            return 0.0
+        closed = min(abs(quantity), abs(amount))
+        realized = closed * (price - entry) * (1 if amount > 0 else -1)
+        new_amount = amount + quantity
+        if abs(new_amount) < QTY_EPSILON:
+            position[:] = [0.0, 0.0]
+        else:
+            if (new_amount > 0) != (amount > 0):
+                position[1] = price
+            position[0] = new_amount
+        return realized
+
+    def _fill(self, order: _Order, quantity: float, price: float, maker: bool,
+              events: Optional[List[Dict[str, Any]]]) -> None:
+        order.executed += quantity
+        order.cum_quote += quantity * price
+        order.update_time = int(time.time() * 1000)
+        if order.remaining <= QTY_EPSILON:
+            order.status = 'FILLED'
+            self._open.pop(order.order_id, None)
+        else:
+            order.status = 'PARTIALLY_FILLED'
+
+        fee = quantity * price * (self.maker_fee if maker else self.taker_fee)
+        realized = self._apply_position(order.symbol, quantity if order.side == 'BUY' else -quantity, price)
+        self.balance += realized - fee
+        self.fills += 1
+        self._order_event(order, 'TRADE', events, quantity, price, fee, realized)
+        self._account_event(order.symbol, events)
+
+    def _match(self, order: _Order, events: Optional[List[Dict[str, Any]]]) -> None:
+        """Match an incoming (or just triggered) order, then rest or expire what is left"""
+        bids, asks = self._books[order.symbol]
+        is_buy = order.side == 'BUY'
+        opposite, own = (asks, bids) if is_buy else (bids, asks)
+        bid, ask = self.quote(order.symbol)
+        quote = ask if is_buy else bid
+        limit = order.price if order.type == 'LIMIT' else None
+
+        def crosses(price: float) -> bool:
+            return limit is None or (limit >= price if is_buy else limit <= price)
+
+        if order.time_in_force == 'GTX' and (crosses(quote) or (opposite.best() is not None
+                                                                and crosses(opposite.best()))):
+            # Post-only order that would take liquidity
+            order.status = 'EXPIRED'
+            self._open.pop(order.order_id, None)
+            self._order_event(order, 'EXPIRED', events)
+            return
+
+        if order.time_in_force == 'FOK' and not crosses(quote):
+            available = 0.0
+            for level_price in list(opposite.levels):
+                if crosses(level_price):
+                    available += sum(resting.remaining for resting in opposite.levels[level_price])
+            if available < order.remaining - QTY_EPSILON:
+                order.status = 'EXPIRED'
+                self._open.pop(order.order_id, None)
+                self._order_event(order, 'EXPIRED', events)
+                return
+
+        while order.remaining > QTY_EPSILON:
+            best = opposite.best()
+            # Resting orders first when they are at least as good as the market maker
+            if best is not None and crosses(best) and (best <= quote if is_buy else best >= quote):
+                maker = opposite.levels[best][0]
+                quantity = min(order.remaining, maker.remaining)
+                self._fill(maker, quantity, best, True, events)
+                self._fill(order, quantity, best, False, events)
+                if maker.remaining <= QTY_EPSILON:
+                    opposite.pop_front(best)
+                continue
+            if crosses(quote):
+                self._fill(order, order.remaining, quote, False, events)
+            break
+
+        if order.remaining > QTY_EPSILON:
+            if order.time_in_force in ('IOC', 'FOK') or order.type == 'MARKET':
+                order.status = 'EXPIRED'
+                self._open.pop(order.order_id, None)
+                self._order_event(order, 'EXPIRED', events)
+            else:
+                own.add(order)
+        self.update_id += 1
+
+    # Orders
+
+    def create_order(self, **params) -> Dict[str, Any]:
+        """Accept an order and match it; MARKET and marketable LIMIT orders fill immediately"""
+        symbol = params['symbol']
+        self._check_symbol(symbol)
+        side = params['side']
+        order_type = params['type']
+        if order_type not in ('MARKET', 'LIMIT', 'STOP', 'STOP_MARKET'):
+            raise FakeExchangeError(-1116, "Invalid orderType.")
+        quantity = float(params['quantity'])
+        if quantity <= 0:
+            raise FakeExchangeError(-4003, "Quantity less than or equal to zero.")
+        price = float(params.get('price') or 0)
+        if order_type in ('LIMIT', 'STOP') and price <= 0:
+            raise FakeExchangeError(-4001, "Price less than or equal to zero.")
+        stop_price = float(params.get('stopPrice') or 0)
+        reduce_only = str(params.get('reduceOnly', 'false')).lower() == 'true'
+
+        events = [] if self._user_listeners else None
+        with self._lock:
+            client_order_id = params.get('newClientOrderId')
+            if client_order_id:
+                existing = self.orders.get(self._client_ids.get(client_order_id))
+                if existing is not None and existing.status in OPEN_STATUSES:
+                    raise FakeExchangeError(-4116, "ClientOrderId is duplicated.")
+            if reduce_only:
+                amount = self.positions.get(symbol, (0.0, 0.0))[0]
+                if not amount or (amount > 0) == (side == 'BUY') or quantity > abs(amount) + QTY_EPSILON:
+                    raise FakeExchangeError(-2022, "ReduceOnly Order is rejected.")
+            if order_type in ('STOP', 'STOP_MARKET'):
+                last = self.prices[symbol]
+                if (side == 'BUY' and last >= stop_price) or (side == 'SELL' and last <= stop_price):
+                    raise FakeExchangeError(-2021, "Order would immediately trigger.")
+
+            order_id = self._next_order_id
+            self._next_order_id += 1
+            order = _Order(order_id, client_order_id or f"fake_{order_id}", symbol, side, order_type, quantity,
+                           price, stop_price, params.get('timeInForce', 'GTC'), reduce_only)
+            self.orders[order_id] = order
+            self._open[order_id] = order
+            self._client_ids[order.client_order_id] = order_id
+            self._order_event(order, 'NEW', events)
+
+            if order_type in ('STOP', 'STOP_MARKET'):
+                self._stops[symbol].append(order)
+            else:
+                self._match(order, events)
+            result = order.to_dict()
+
+        self._emit(events)
+        return result
+
+    def _find(self, symbol: str, orderId: Optional[int] = None,
+              origClientOrderId: Optional[str] = None) -> _Order:
+        if orderId is None:
+            orderId = self._client_ids.get(origClientOrderId)
+        order = self.orders.get(int(orderId)) if orderId is not None else None
+        if order is None or order.symbol != symbol:
+            raise FakeExchangeError(-2013, "Order does not exist.")
+        return order
+
+    def cancel_order(self, symbol: str, orderId: Optional[int] = None,
+                     origClientOrderId: Optional[str] = None) -> Dict[str, Any]:
+        """Cancel an open order"""
+        events = [] if self._user_listeners else None
+        with self._lock:
+            order = self._find(symbol, orderId, origClientOrderId)
+            if order.status not in OPEN_STATUSES:
+                raise FakeExchangeError(-2011, f"Unknown order sent: {order.order_id}")
+            if order in self._stops[symbol]:
+                self._stops[symbol].remove(order)
+            else:
+                bids, asks = self._books[symbol]
+                (bids if order.side == 'BUY' else asks).remove(order)
+                self.update_id += 1
+            order.status = 'CANCELED'
+            order.update_time = int(time.time() * 1000)
+            del self._open[order.order_id]
+            self._order_event(order, 'CANCELED', events)
+            result = order.to_dict()
+        self._emit(events)
+        return result
+
+    def get_order(self, symbol: str, orderId: Optional[int] = None,
+                  origClientOrderId: Optional[str] = None) -> Dict[str, Any]:
+        """Look up an order by exchange or client order id"""
+        with self._lock:
+            return self._find(symbol, orderId, origClientOrderId).to_dict()
+
+    def batch_create(self, batch_orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Accept a batch of orders, reporting per-order errors like the exchange"""
+        results = []
+        for params in batch_orders:
+            try:
+                results.append(self.create_order(**params))
+            except FakeExchangeError as e:
+                results.append({'code': e.code, 'msg': str(e)})
+        return results
+
+    def batch_cancel(self, symbol: str, order_ids: List[int]) -> List[Dict[str, Any]]:
+        """Cancel a batch of orders, reporting per-order errors like the exchange"""
+        results = []
+        for order_id in order_ids:
+            try:
+                results.append(self.cancel_order(symbol, order_id))
+            except FakeExchangeError as e:
+                results.append({'code': e.code, 'msg': str(e)})
+        return results
+
+    def all_orders(self, symbol: str, order_id: Optional[int] = None, limit: int = 500) -> List[Dict[str, Any]]:
+        """Return a symbol's orders of any status, oldest first, from ``order_id`` on"""
+        self._check_symbol(symbol)
+        with self._lock:
+            orders = [o.to_dict() for o in self.orders.values()
+                      if o.symbol == symbol and (order_id is None or o.order_id >= order_id)]
+        return orders[:min(limit, 1000)]
+
+    def open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return open orders, optionally for one symbol"""
+        with self._lock:
+            return [o.to_dict() for o in self._open.values() if symbol is None or o.symbol == symbol]
+
+
+class FakeFuturesClient:
+    """Drop-in stand-in for ``binance.Client`` backed by a FakeExchange"""
+
+    def __init__(self, exchange: Optional[FakeExchange] = None, latency: float = 0.0, jitter: float = 0.0):
+        """Initialize the fake client
+
+        Each call sleeps ``latency`` seconds plus up to ``jitter`` seconds
+        of uniform random delay.
+        """
+        self.exchange = exchange or FakeExchange()
+        self.latency = latency
+        self.jitter = jitter
+        self._rng = random.Random(0)
+
+    def _round_trip(self) -> None:
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+
+    def _call(self, operation: Callable[..., Any], *args, **kwargs) -> Any:
+        self._round_trip()
+        return self.exchange.call(operation, *args, **kwargs)
+
+    def futures_ping(self) -> Dict[str, Any]:
+        return self._call(dict)
+
+    def futures_time(self) -> Dict[str, Any]:
+        return self._call(lambda: {'serverTime': int(time.time() * 1000)})
+
+    def futures_account(self, **params) -> Dict[str, Any]:
+        return self._call(self.exchange.account)
+
+    def futures_exchange_info(self) -> Dict[str, Any]:
+        return self._call(self.exchange.exchange_info)
+
+    def futures_symbol_ticker(self, symbol: Optional[str] = None, **params) -> Any:
+        return self._call(self.exchange.ticker, symbol)
+
+    def futures_ticker(self, symbol: Optional[str] = None, **params) -> Any:
+        return self._call(self.exchange.ticker_24h, symbol)
+
+    def futures_orderbook_ticker(self, symbol: Optional[str] = None, **params) -> Any:
+        return self._call(self.exchange.book_ticker, symbol)
+
+    def futures_mark_price(self, symbol: Optional[str] = None, **params) -> Any:
+        return self._call(self.exchange.premium_index, symbol)
+
+    def futures_order_book(self, symbol: str, limit: int = 500, **params) -> Dict[str, Any]:
+        return self._call(self.exchange.depth, symbol, limit)
+
+    def futures_klines(self, symbol: str, interval: str, startTime: int = 0, endTime: Optional[int] = None,
+                       limit: int = 500, **params) -> List[List[Any]]:
+        return self._call(self.exchange.klines, symbol, INTERVAL_MS[interval], startTime, endTime, limit)
+
+    def futures_create_order(self, **params) -> Dict[str, Any]:
+        return self._call(self.exchange.create_order, **params)
+
+    def futures_cancel_order(self, symbol: str, orderId: Optional[int] = None,
+                             origClientOrderId: Optional[str] = None, **params) -> Dict[str, Any]:
+        return self._call(self.exchange.cancel_order, symbol, orderId, origClientOrderId)
+
+    def futures_get_order(self, symbol: str, orderId: Optional[int] = None,
+                          origClientOrderId: Optional[str] = None, **params) -> Dict[str, Any]:
+        return self._call(self.exchange.get_order, symbol, orderId, origClientOrderId)
+
+    def futures_get_open_orders(self, symbol: Optional[str] = None, **params) -> List[Dict[str, Any]]:
+        return self._call(self.exchange.open_orders, symbol)
+
+    def futures_get_all_orders(self, symbol: str, orderId: Optional[int] = None, limit: int = 500,
+                               **params) -> List[Dict[str, Any]]:
+        return self._call(self.exchange.all_orders, symbol, orderId, limit)
+
+    def futures_place_batch_order(self, batchOrders: List[Dict[str, Any]], **params) -> List[Dict[str, Any]]:
+        return self._call(self.exchange.batch_create, batchOrders)
+
+    def futures_cancel_orders(self, symbol: str, orderIdList: str, **params) -> List[Dict[str, Any]]:
+        return self._call(self.exchange.batch_cancel, symbol, json.loads(orderIdList))
+
+    def futures_stream_get_listen_key(self) -> str:
+        return self._call(self.exchange.listen_key)
+
+    def futures_stream_keepalive(self, listenKey: str) -> Dict[str, Any]:
+        return self._call(dict)
+
+    def futures_stream_close(self, listenKey: str) -> Dict[str, Any]:
+        return self._call(dict)
+
+
+class FakeAsyncFuturesClient:
+    """Drop-in stand-in for ``binance.AsyncClient`` backed by a FakeExchange"""
+
+    def __init__(self, exchange: Optional[FakeExchange] = None, latency: float = 0.0, jitter: float = 0.0):
+        """Initialize the fake client (see FakeFuturesClient)"""
+        self.exchange = exchange or FakeExchange()
+        self.latency = latency
+        self.jitter = jitter
+        self._rng = random.Random(0)
+
+    async def _call(self, operation: Callable[..., Any], *args, **kwargs) -> Any:
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        return self.exchange.call(operation, *args, **kwargs)
+
+    async def futures_ping(self) -> Dict[str, Any]:
+        return await self._call(dict)
+
+    async def futures_time(self) -> Dict[str, Any]:
+        return await self._call(lambda: {'serverTime': int(time.time() * 1000)})
+
+    async def futures_account(self, **params) -> Dict[str, Any]:
+        return await self._call(self.exchange.account)
+
+    async def futures_exchange_info(self) -> Dict[str, Any]:
+        return await self._call(self.exchange.exchange_info)
+
+    async def futures_symbol_ticker(self, symbol: Optional[str] = None, **params) -> Any:
+        return await self._call(self.exchange.ticker, symbol)
+
+    async def futures_ticker(self, symbol: Optional[str] = None, **params) -> Any:
+        return await self._call(self.exchange.ticker_24h, symbol)
+
+    async def futures_orderbook_ticker(self, symbol: Optional[str] = None, **params) -> Any:
+        return await self._call(self.exchange.book_ticker, symbol)
+
+    async def futures_mark_price(self, symbol: Optional[str] = None, **params) -> Any:
+        return await self._call(self.exchange.premium_index, symbol)
+
+    async def futures_order_book(self, symbol: str, limit: int = 500, **params) -> Dict[str, Any]:
+        return await self._call(self.exchange.depth, symbol, limit)
+
+    async def futures_klines(self, symbol: str, interval: str, startTime: int = 0, endTime: Optional[int] = None,
+                             limit: int = 500, **params) -> List[List[Any]]:
+        return await self._call(self.exchange.klines, symbol, INTERVAL_MS[interval], startTime, endTime, limit)
+
+    async def futures_create_order(self, **params) -> Dict[str, Any]:
+        return await self._call(self.exchange.create_order, **params)
+
+    async def futures_cancel_order(self, symbol: str, orderId: Optional[int] = None,
+                                   origClientOrderId: Optional[str] = None, **params) -> Dict[str, Any]:
+        return await self._call(self.exchange.cancel_order, symbol, orderId, origClientOrderId)
+
+    async def futures_get_order(self, symbol: str, orderId: Optional[int] = None,
+                                origClientOrderId: Optional[str] = None, **params) -> Dict[str, Any]:
+        return await self._call(self.exchange.get_order, symbol, orderId, origClientOrderId)
+
+    async def futures_get_open_orders(self, symbol: Optional[str] = None, **params) -> List[Dict[str, Any]]:
+        return await self._call(self.exchange.open_orders, symbol)
+
+    async def futures_place_batch_order(self, batchOrders: List[Dict[str, Any]], **params) -> List[Dict[str, Any]]:
+        return await self._call(self.exchange.batch_create, batchOrders)
+
+    async def futures_cancel_orders(self, symbol: str, orderIdList: str, **params) -> List[Dict[str, Any]]:
+        return await self._call(self.exchange.batch_cancel, symbol, json.loads(orderIdList))
+
+    async def futures_stream_get_listen_key(self) -> str:
+        return await self._call(self.exchange.listen_key)
+
+    async def futures_stream_keepalive(self, listenKey: str) -> Dict[str, Any]:
+        return await self._call(dict)
+
+    async def futures_stream_close(self, listenKey: str) -> Dict[str, Any]:
+        return await self._call(dict)
+
+    async def close_connection(self) -> None:
+        pass
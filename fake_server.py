@@ -0,0 +1,329 @@
+"""
+Local HTTP and WebSocket front end for the fake exchange.
+
+``FakeExchangeServer`` serves a ``fake_exchange.FakeExchange`` over the
+Binance Futures REST paths ``BasicBot`` calls and the WebSocket streams it
+subscribes to. A bot pointed at it with ``BINANCE_FUTURES_BASE_URL`` /
+``BINANCE_FUTURES_WS_URL`` uses its real python-binance client,
+connection pool and stream clients. Signatures are only checked when the
+REST server is given the API secret, and every listenKey streams the
+same account.
+"""
+
+import hmac
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, List, Set
+from urllib.parse import urlsplit, parse_qsl
+
+import websockets
+
+from fake_exchange import FakeExchange, FakeExchangeError
+from klines import INTERVAL_MS
+
+# Transient error codes answered with HTTP 503 (the real API's gateway errors)
+TRANSIENT_CODES = (-1001, -1007)
+# API error code for "Signature for this request is not valid"
+BAD_SIGNATURE_CODE = -1022
+
+
+def signature_valid(secret: str, query: str, body: str, params: Dict[str, str]) -> bool:
+    """Check a request's HMAC-SHA256 signature
+
+    The API signs the query string and body exactly as sent. python-binance
+    signs its params before URL-encoding them, so that form is accepted too.
+    """
+    signature = params.get('signature', '')
+    sent = '&'.join(part for part in f"{query}&{body}".strip('&').split('&')
+                    if part and not part.startswith('signature='))
+    decoded = '&'.join(f"{key}={value}" for key, value in params.items() if key != 'signature')
+    return any(hmac.compare_digest(hmac.new(secret.encode(), payload.encode(), hashlib.sha256).hexdigest(),
+                                   signature) for payload in (sent, decoded))
+
+
+def _route(exchange: FakeExchange, method: str, path: str, params: Dict[str, str]) -> Any:
+    """Dispatch one REST request to the exchange"""
+    symbol = params.get('symbol')
+    order_id = int(params['orderId']) if params.get('orderId') else None
+    if path in ('/fapi/v1/ping', '/api/v3/ping'):
+        return {}
+    if path == '/fapi/v1/time':
+        return {'serverTime': int(time.time() * 1000)}
+    if path == '/fapi/v1/exchangeInfo':
+        return exchange.exchange_info()
+    if path == '/fapi/v1/ticker/price':
+        return exchange.ticker(symbol)
+    if path == '/fapi/v1/ticker/24hr':
+        return exchange.ticker_24h(symbol)
+    if path == '/fapi/v1/ticker/bookTicker':
+        return exchange.book_ticker(symbol)
+    if path == '/fapi/v1/premiumIndex':
+        return exchange.premium_index(symbol)
+    if path == '/fapi/v1/depth':
+        return exchange.depth(symbol, int(params.get('limit', 500)))
+    if path == '/fapi/v1/klines':
+        return exchange.klines(symbol, INTERVAL_MS[params['interval']], int(params.get('startTime', 0)),
+                               int(params['endTime']) if 'endTime' in params else None,
+                               int(params.get('limit', 500)))
+    if path in ('/fapi/v2/account', '/fapi/v1/account'):
+        return exchange.account()
+    if path == '/fapi/v1/openOrders':
+        return exchange.open_orders(symbol)
+    if path == '/fapi/v1/allOrders':
+        return exchange.all_orders(symbol, order_id, int(params.get('limit', 500)))
+    if path == '/fapi/v1/order':
+        if method == 'POST':
+            order_params = {k: v for k, v in params.items() if k not in ('timestamp', 'signature', 'recvWindow')}
+            return exchange.create_order(**order_params)
+        if method == 'DELETE':
+            return exchange.cancel_order(symbol, order_id, params.get('origClientOrderId'))
+        return exchange.get_order(symbol, order_id, params.get('origClientOrderId'))
+    if path == '/fapi/v1/batchOrders':
+        if method == 'POST':
+            return exchange.batch_create(json.loads(params['batchOrders']))
+        return exchange.batch_cancel(symbol, json.loads(params['orderIdList']))
+    if path == '/fapi/v1/listenKey':
+        return {'listenKey': exchange.listen_key()} if method == 'POST' else {}
+    raise FakeExchangeError(-1000, f"Unknown endpoint {method} {path}")
+
+
+class FakeRestServer:
+    """Threaded HTTP/1.1 server for the fake exchange's REST endpoints
+
+    ``latency`` seconds are added to every request on the server side.
+    With ``api_secret``, signed requests must carry a valid signature.
+    """
+
+    def __init__(self, exchange: FakeExchange, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 api_secret: Optional[str] = None):
+        """Initialize the server (port 0 picks a free port)"""
+        self.exchange = exchange
+        self.latency = latency
+        self.api_secret = api_secret
+        self.requests = 0
+        self.bad_signatures = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; without this, delayed ACKs add ~40 ms per request
+            disable_nagle_algorithm = True
+
+            def _handle(self, method: str):
+                parts = urlsplit(self.path)
+                params = dict(parse_qsl(parts.query))
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length).decode() if length else ''
+                params.update(parse_qsl(body))
+                if server.latency:
+                    time.sleep(server.latency)
+                server.requests += 1
+                try:
+                    if server.api_secret and 'signature' in params and not signature_valid(
+                            server.api_secret, parts.query, body, params):
+                        server.bad_signatures += 1
+                        raise FakeExchangeError(BAD_SIGNATURE_CODE, "Signature for this request is not valid.")
+                    status, body = 200, server.exchange.call(_route, server.exchange, method, parts.path, params)
+                except FakeExchangeError as e:
+                    status, body = (503 if e.code in TRANSIENT_CODES else 400), {'code': e.code, 'msg': str(e)}
+                except (KeyError, ValueError, TypeError) as e:
+                    status, body = 400, {'code': -1102, 'msg': f"Mandatory parameter missing or malformed: {e}"}
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._handle('GET')
+
+            def do_POST(self):
+                self._handle('POST')
+
+            def do_PUT(self):
+                self._handle('PUT')
+
+            def do_DELETE(self):
+                self._handle('DELETE')
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        """Start serving on a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name='FakeRest', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the server"""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class FakeStreamServer:
+    """WebSocket server for user-data (``/ws/<listenKey>``) and combined market (``/stream``) streams"""
+
+    def __init__(self, exchange: FakeExchange, host: str = '127.0.0.1', port: int = 0):
+        """Initialize the server (port 0 picks a free port)"""
+        self.exchange = exchange
+        self.host = host
+        self.port = port
+        self._user_queues: Set[asyncio.Queue] = set()
+        self._market_queues: Dict[asyncio.Queue, Set[str]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    def start(self) -> None:
+        """Start serving on a background thread"""
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name='FakeStream', daemon=True)
+        self._thread.start()
+        if not ready.wait(5.0):
+            raise RuntimeError("Fake stream server failed to start")
+        self.exchange.add_listener(self._on_user_event)
+        self.exchange.add_market_listener(self._on_market_event)
+
+    def stop(self) -> None:
+        """Stop the server"""
+        self.exchange.remove_listener(self._on_user_event)
+        self.exchange.remove_market_listener(self._on_market_event)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+            self._thread.join(5.0)
+
+    def _on_user_event(self, event: Dict[str, Any]) -> None:
+        if self._user_queues:
+            message = json.dumps(event)
+            for queue in list(self._user_queues):
+                self._loop.call_soon_threadsafe(queue.put_nowait, message)
+
+    def _on_market_event(self, stream: str, data: Dict[str, Any]) -> None:
+        message = None
+        for queue, streams in list(self._market_queues.items()):
+            if stream in streams:
+                message = message or json.dumps({'stream': stream, 'data': data})
+                self._loop.call_soon_threadsafe(queue.put_nowait, message)
+
+    def _run(self, ready: threading.Event) -> None:
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve(ready))
+        finally:
+            self._loop.close()
+
+    async def _serve(self, ready: threading.Event) -> None:
+        self._stopped = asyncio.Event()
+        async with websockets.serve(self._handler, self.host, self.port) as server:
+            self.port = list(server.sockets)[0].getsockname()[1]
+            ready.set()
+            await self._stopped.wait()
+
+    async def _handler(self, websocket, path: Optional[str] = None) -> None:
+        if path is None:
+            # websockets >= 13 passes only the connection
+            path = getattr(websocket, 'path', None) or websocket.request.path
+        parts = urlsplit(path)
+        queue: asyncio.Queue = asyncio.Queue()
+        if parts.path.startswith('/ws/'):
+            self._user_queues.add(queue)
+        else:
+            streams: List[str] = dict(parse_qsl(parts.query)).get('streams', '').split('/')
+            self._market_queues[queue] = set(streams)
+        try:
+            while True:
+                await websocket.send(await queue.get())
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._user_queues.discard(queue)
+            self._market_queues.pop(queue, None)
+
+
+class FakeExchangeServer:
+    """REST and WebSocket servers over one FakeExchange, with an optional random-walk price feed"""
+
+    def __init__(self, exchange: Optional[FakeExchange] = None, host: str = '127.0.0.1', latency: float = 0.0,
+                 tick_interval: float = 0.0, volatility_bps: float = 1.0):
+        """Initialize the servers
+
+        With ``tick_interval`` > 0 every price takes a random-walk step
+        of ``volatility_bps`` that often, filling resting orders and
+        publishing market stream updates.
+        """
+        self.exchange = exchange or FakeExchange()
+        self.rest = FakeRestServer(self.exchange, host, latency=latency)
+        self.streams = FakeStreamServer(self.exchange, host)
+        self.tick_interval = tick_interval
+        self.volatility_bps = volatility_bps
+        self._running = threading.Event()
+        self._feed: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Value for BINANCE_FUTURES_BASE_URL"""
+        return self.rest.url
+
+    @property
+    def ws_url(self) -> str:
+        """Value for BINANCE_FUTURES_WS_URL"""
+        return self.streams.url
+
+    def start(self) -> 'FakeExchangeServer':
+        """Start both servers and the price feed"""
+        self.rest.start()
+        self.streams.start()
+        if self.tick_interval > 0:
+            self._running.set()
+            self._feed = threading.Thread(target=self._run_feed, name='FakePriceFeed', daemon=True)
+            self._feed.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the price feed and both servers"""
+        self._running.clear()
+        if self._feed is not None:
+            self._feed.join(5.0)
+        self.streams.stop()
+        self.rest.stop()
+
+    def _run_feed(self) -> None:
+        while self._running.is_set():
+            self.exchange.random_walk(self.volatility_bps)
+            time.sleep(self.tick_interval)
+
+    def __enter__(self) -> 'FakeExchangeServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    with FakeExchangeServer(tick_interval=0.5) as fake:
+        print("🧪 Fake exchange running")
+        print(f"   BINANCE_FUTURES_BASE_URL={fake.base_url}")
+        print(f"   BINANCE_FUTURES_WS_URL={fake.ws_url}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print("👋 Stopped")
@@ -0,0 +1,654 @@
+"""
+Streaming technical indicators with O(1) updates, plus matching batch functions.
+
+Each indicator class (``SMA``, ``EMA``, ``RSI``, ``ATR``, ``Bollinger``,
+``VWAP``, ``ZScore``) keeps a small amount of running state. Windows are
+held in ``RingBuffer``s, so one new tick or bar costs a few float
+operations whatever the period. Running window sums are rebuilt once per
+pass through the window, which keeps rounding error from accumulating
+without breaking the amortised O(1) cost.
+
+The lower-case functions (``sma``, ``ema``, ``rsi``, ...) compute the
+same series over whole NumPy arrays, for backtests and warm-up. Warm-up
+and seeding rules are the same (NaN until the period is filled,
+SMA-seeded EMAs, Wilder smoothing for RSI and ATR), so both paths agree
+to floating-point rounding.
+
+``IndicatorEngine`` keeps one indicator set per symbol. It is fed by
+price updates (for example a ``market_data.PriceStream``), either per
+tick or aggregated into time bars.
+"""
+
+import math
+import time
+import logging
+import threading
+from typing import Dict, Any, Optional, List, Callable, Tuple
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+NAN = float('nan')
+
+# Largest power of the decay factor applied within one block of the batch smoother
+_MAX_BLOCK_GROWTH_LOG10 = 200.0
+
+
+class RingBuffer:
+    """Fixed-size FIFO of floats; ``push`` returns the value it evicts (None until full)"""
+
+    __slots__ = ('size', 'values', 'position', 'count')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = [0.0] * size
+        self.position = 0
+        self.count = 0
+
+    def push(self, value: float) -> Optional[float]:
+        evicted = self.values[self.position] if self.count == self.size else None
+        self.values[self.position] = value
+        self.position += 1
+        if self.position == self.size:
+            self.position = 0
+        if self.count < self.size:
+            self.count += 1
+        return evicted
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.size
+
+    def __len__(self) -> int:
+        return self.count
+
+    def to_list(self) -> List[float]:
+        """Contents, oldest first"""
+        if self.count < self.size:
+            return self.values[:self.count]
+        return self.values[self.position:] + self.values[:self.position]
+
+
+class Indicator:
+    """Base class: ``value`` is NaN until ``period`` inputs have been seen"""
+
+    __slots__ = ('period', 'value')
+
+    def __init__(self, period: int):
+        if period < 1:
+            raise ValueError(f"Indicator period must be positive, got {period}")
+        self.period = period
+        self.value = NAN
+
+    @property
+    def ready(self) -> bool:
+        return self.value == self.value
+
+    def update(self, value: float) -> float:
+        raise NotImplementedError
+
+    def on_bar(self, open_: float, high: float, low: float, close: float, volume: float) -> float:
+        """Apply one bar (a tick is a bar with open = high = low = close)"""
+        return self.update(close)
+
+
+class RollingStats:
+    """Windowed mean and variance (sliding Welford update)"""
+
+    __slots__ = ('buffer', 'mean', 'm2')
+
+    def __init__(self, period: int):
+        self.buffer = RingBuffer(period)
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, value: float) -> None:
+        buffer = self.buffer
+        evicted = buffer.push(value)
+        if evicted is None:
+            delta = value - self.mean
+            self.mean += delta / buffer.count
+            self.m2 += delta * (value - self.mean)
+            return
+        old_mean = self.mean
+        self.mean = old_mean + (value - evicted) / buffer.size
+        self.m2 += (value - evicted) * (value - self.mean + evicted - old_mean)
+        if buffer.position == 0:
+            # Rebuild from the window once per pass so rounding error cannot accumulate
+            values = buffer.values
+            self.mean = math.fsum(values) / buffer.size
+            self.m2 = math.fsum((v - self.mean) ** 2 for v in values)
+        elif self.m2 < 0.0:
+            self.m2 = 0.0
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation of the window"""
+        return math.sqrt(self.m2 / self.buffer.count) if self.buffer.count else NAN
+
+
+class SMA(Indicator):
+    """Simple moving average"""
+
+    __slots__ = ('stats',)
+
+    def __init__(self, period: int):
+        super().__init__(period)
+        self.stats = RollingStats(period)
+
+    def update(self, value: float) -> float:
+        stats = self.stats
+        stats.update(value)
+        if stats.buffer.count == self.period:
+            self.value = stats.mean
+        return self.value
+
+
+class EMA(Indicator):
+    """Exponential moving average (alpha = 2 / (period + 1)), seeded with the SMA of the first ``period`` inputs"""
+
+    __slots__ = ('alpha', '_count', '_sum')
+
+    def __init__(self, period: int):
+        super().__init__(period)
+        self.alpha = 2.0 / (period + 1)
+        self._count = 0
+        self._sum = 0.0
+
+    def update(self, value: float) -> float:
+        if self._count < self.period:
+            self._count += 1
+            self._sum += value
+            if self._count == self.period:
+                self.value = self._sum / self.period
+            return self.value
+        self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+def _rsi_value(avg_gain: float, avg_loss: float) -> float:
+    if avg_loss == 0.0:
+        return 100.0 if avg_gain > 0.0 else 50.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+class RSI(Indicator):
+    """Relative strength index with Wilder smoothing; first value after ``period`` changes"""
+
+    __slots__ = ('avg_gain', 'avg_loss', '_previous', '_count')
+
+    def __init__(self, period: int = 14):
+        super().__init__(period)
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self._previous: Optional[float] = None
+        self._count = 0
+
+    def update(self, value: float) -> float:
+        previous = self._previous
+        self._previous = value
+        if previous is None:
+            return self.value
+        change = value - previous
+        gain = change if change > 0.0 else 0.0
+        loss = -change if change < 0.0 else 0.0
+        if self._count < self.period:
+            # Warm-up: plain sums, averaged once the period is filled
+            self._count += 1
+            self.avg_gain += gain
+            self.avg_loss += loss
+            if self._count < self.period:
+                return self.value
+            self.avg_gain /= self.period
+            self.avg_loss /= self.period
+        else:
+            self.avg_gain += (gain - self.avg_gain) / self.period
+            self.avg_loss += (loss - self.avg_loss) / self.period
+        self.value = _rsi_value(self.avg_gain, self.avg_loss)
+        return self.value
+
+
+class ATR(Indicator):
+    """Average true range with Wilder smoothing (needs bars: ``update(high, low, close)``)"""
+
+    __slots__ = ('_previous_close', '_count', '_sum')
+
+    def __init__(self, period: int = 14):
+        super().__init__(period)
+        self._previous_close: Optional[float] = None
+        self._count = 0
+        self._sum = 0.0
+
+    def update(self, high: float, low: float, close: float) -> float:
+        previous = self._previous_close
+        self._previous_close = close
+        true_range = high - low
+        if previous is not None:
+            true_range = max(true_range, abs(high - previous), abs(low - previous))
+        if self._count < self.period:
+            self._count += 1
+            self._sum += true_range
+            if self._count == self.period:
+                self.value = self._sum / self.period
+            return self.value
+        self.value += (true_range - self.value) / self.period
+        return self.value
+
+    def on_bar(self, open_: float, high: float, low: float, close: float, volume: float) -> float:
+        return self.update(high, low, close)
+
+
+class Bollinger(Indicator):
+    """Bollinger bands: SMA ± ``width`` population standard deviations; ``value`` is the middle band"""
+
+    __slots__ = ('width', 'stats', 'upper', 'lower')
+
+    def __init__(self, period: int = 20, width: float = 2.0):
+        super().__init__(period)
+        self.width = width
+        self.stats = RollingStats(period)
+        self.upper = NAN
+        self.lower = NAN
+
+    def update(self, value: float) -> float:
+        stats = self.stats
+        stats.update(value)
+        if stats.buffer.count == self.period:
+            band = self.width * stats.std
+            self.value = stats.mean
+            self.upper = stats.mean + band
+            self.lower = stats.mean - band
+        return self.value
+
+
+class ZScore(Indicator):
+    """Rolling z-score of the latest input against its ``period`` window (0 for a flat window)"""
+
+    __slots__ = ('stats',)
+
+    def __init__(self, period: int = 20):
+        super().__init__(period)
+        self.stats = RollingStats(period)
+
+    def update(self, value: float) -> float:
+        stats = self.stats
+        stats.update(value)
+        if stats.buffer.count == self.period:
+            std = stats.std
+            self.value = (value - stats.mean) / std if std > 0.0 else 0.0
+        return self.value
+
+
+class VWAP(Indicator):
+    """Volume-weighted average price, cumulative since the last ``reset`` or over a rolling ``period``
+
+    Bars are weighted at their typical price (high + low + close) / 3.
+    The cumulative form has a value from the first input with volume.
+    """
+
+    __slots__ = ('rolling', '_prices', '_volumes', '_pv_sum', '_volume_sum')
+
+    def __init__(self, period: Optional[int] = None):
+        super().__init__(period or 1)
+        self.rolling = period is not None
+        self._prices = RingBuffer(period) if self.rolling else None
+        self._volumes = RingBuffer(period) if self.rolling else None
+        self._pv_sum = 0.0
+        self._volume_sum = 0.0
+
+    def reset(self) -> None:
+        """Start a new cumulative session"""
+        self.__init__(self.period if self.rolling else None)
+
+    def update(self, price: float, volume: float) -> float:
+        pv = price * volume
+        if self.rolling:
+            evicted_pv = self._prices.push(pv)
+            evicted_volume = self._volumes.push(volume)
+            if evicted_pv is None:
+                self._pv_sum += pv
+                self._volume_sum += volume
+                if not self._prices.full:
+                    return self.value
+            elif self._prices.position == 0:
+                self._pv_sum = math.fsum(self._prices.values)
+                self._volume_sum = math.fsum(self._volumes.values)
+            else:
+                self._pv_sum += pv - evicted_pv
+                self._volume_sum += volume - evicted_volume
+        else:
+            self._pv_sum += pv
+            self._volume_sum += volume
+        if self._volume_sum > 0.0:
+            self.value = self._pv_sum / self._volume_sum
+        return self.value
+
+    def on_bar(self, open_: float, high: float, low: float, close: float, volume: float) -> float:
+        return self.update((high + low + close) / 3.0, volume)
+
+
+# Batch functions
+
+
+def _smooth(values: np.ndarray, alpha: float, seed: float) -> np.ndarray:
+    """y[j] = y[j-1] + alpha * (values[j] - y[j-1]) with y[-1] = seed, vectorised in blocks
+
+    Within a block the recurrence has the closed form
+    y[j] = d^(j+1) * seed + alpha * d^j * sum_k(values[k] * d^-k), with
+    d = 1 - alpha. Blocks are short enough that d^-k stays finite.
+    """
+    out = np.empty(len(values))
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[:] = values
+        return out
+    block = max(1, int(_MAX_BLOCK_GROWTH_LOG10 / -math.log10(decay))) if decay < 1.0 else len(values) or 1
+    steps = np.arange(min(block, len(values)))
+    grow = decay ** -steps
+    shrink = decay ** (steps + 1)
+    scale = alpha * shrink / decay
+    level = seed
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        m = len(chunk)
+        out[start:start + m] = shrink[:m] * level + np.cumsum(chunk * grow[:m]) * scale[:m]
+        level = out[start + m - 1]
+    return out
+
+
+def _windows(values: np.ndarray, period: int) -> np.ndarray:
+    return sliding_window_view(np.asarray(values, dtype=np.float64), period)
+
+
+def _nan_series(n: int) -> np.ndarray:
+    return np.full(n, np.nan)
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """Batch ``SMA``"""
+    out = _nan_series(len(values))
+    if len(values) >= period:
+        out[period - 1:] = _windows(values, period).mean(axis=1)
+    return out
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """Batch ``EMA``"""
+    values = np.asarray(values, dtype=np.float64)
+    out = _nan_series(len(values))
+    if len(values) >= period:
+        seed = np.cumsum(values[:period])[-1] / period
+        out[period - 1] = seed
+        out[period:] = _smooth(values[period:], 2.0 / (period + 1), seed)
+    return out
+
+
+def rsi(values: np.ndarray, period: int = 14) -> np.ndarray:
+    """Batch ``RSI``"""
+    values = np.asarray(values, dtype=np.float64)
+    out = _nan_series(len(values))
+    if len(values) <= period:
+        return out
+    changes = np.diff(values)
+    gains = np.where(changes > 0.0, changes, 0.0)
+    losses = np.where(changes < 0.0, -changes, 0.0)
+    averages = []
+    for series in (gains, losses):
+        seed = np.cumsum(series[:period])[-1] / period
+        averages.append(np.concatenate(([seed], _smooth(series[period:], 1.0 / period, seed))))
+    avg_gain, avg_loss = averages
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    out[period:] = np.where(avg_loss == 0.0, np.where(avg_gain > 0.0, 100.0, 50.0), result)
+    return out
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Batch ``ATR``"""
+    high, low, close = (np.asarray(column, dtype=np.float64) for column in (high, low, close))
+    out = _nan_series(len(close))
+    if len(close) < period:
+        return out
+    true_range = high - low
+    true_range[1:] = np.maximum.reduce([true_range[1:], np.abs(high[1:] - close[:-1]), np.abs(low[1:] - close[:-1])])
+    seed = np.cumsum(true_range[:period])[-1] / period
+    out[period - 1] = seed
+    out[period:] = _smooth(true_range[period:], 1.0 / period, seed)
+    return out
+
+
+def bollinger(values: np.ndarray, period: int = 20, width: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Batch ``Bollinger``: (lower, middle, upper)"""
+    middle, lower, upper = _nan_series(len(values)), _nan_series(len(values)), _nan_series(len(values))
+    if len(values) >= period:
+        windows = _windows(values, period)
+        mean = windows.mean(axis=1)
+        band = width * windows.std(axis=1)
+        middle[period - 1:], lower[period - 1:], upper[period - 1:] = mean, mean - band, mean + band
+    return lower, middle, upper
+
+
+def zscore(values: np.ndarray, period: int = 20) -> np.ndarray:
+    """Batch ``ZScore``"""
+    values = np.asarray(values, dtype=np.float64)
+    out = _nan_series(len(values))
+    if len(values) >= period:
+        windows = _windows(values, period)
+        std = windows.std(axis=1)
+        deviation = values[period - 1:] - windows.mean(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[period - 1:] = np.where(std > 0.0, deviation / std, 0.0)
+    return out
+
+
+def vwap(prices: np.ndarray, volumes: np.ndarray, period: Optional[int] = None) -> np.ndarray:
+    """Batch ``VWAP`` (pass typical prices for bars)"""
+    prices, volumes = np.asarray(prices, dtype=np.float64), np.asarray(volumes, dtype=np.float64)
+    pv = prices * volumes
+    out = _nan_series(len(prices))
+    if period is None:
+        pv_sum, volume_sum = np.cumsum(pv), np.cumsum(volumes)
+        start = 0
+    elif len(prices) >= period:
+        pv_sum, volume_sum = _windows(pv, period).sum(axis=1), _windows(volumes, period).sum(axis=1)
+        start = period - 1
+    else:
+        return out
+    valid = volume_sum > 0.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(valid, pv_sum / volume_sum, np.nan)
+    # Like the streaming form, a stretch without volume keeps the last value
+    out[start:] = result[np.maximum.accumulate(np.where(valid, np.arange(len(result)), 0))]
+    return out
+
+
+def default_indicators() -> Dict[str, Indicator]:
+    """A standard per-symbol indicator set"""
+    return {
+        'ema_20': EMA(20),
+        'sma_50': SMA(50),
+        'rsi_14': RSI(14),
+        'atr_14': ATR(14),
+        'bollinger_20': Bollinger(20, 2.0),
+        'vwap': VWAP(),
+        'zscore_50': ZScore(50),
+    }
+
+
+class IndicatorEngine:
+    """Per-symbol indicator sets kept current from price updates"""
+
+    def __init__(self, factory: Callable[[], Dict[str, Indicator]] = default_indicators,
+                 bar_interval: Optional[float] = None):
+        """Initialize the engine
+
+        ``factory`` builds a fresh indicator set for each new symbol. With
+        ``bar_interval`` (seconds) ticks are aggregated into time bars and
+        the indicators update when a bar closes. Otherwise every tick is
+        applied as a one-price bar.
+        """
+        self.factory = factory
+        self.bar_interval = bar_interval
+        self.symbols: Dict[str, Dict[str, Indicator]] = {}
+        self.logger = logging.getLogger('TradingBot')
+        self._bars: Dict[str, List[float]] = {}
+        self._listeners: List[Callable[[str, Dict[str, Indicator]], None]] = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback: Callable[[str, Dict[str, Indicator]], None]) -> None:
+        """Call ``callback(symbol, indicators)`` after every indicator update"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, Dict[str, Indicator]], None]) -> None:
+        self._listeners.remove(callback)
+
+    def indicators(self, symbol: str) -> Dict[str, Indicator]:
+        """The indicator set of a symbol (created on first use)"""
+        indicators = self.symbols.get(symbol)
+        if indicators is None:
+            with self._lock:
+                indicators = self.symbols.setdefault(symbol, self.factory())
+        return indicators
+
+    def get(self, symbol: str, name: str) -> float:
+        """Current value of one indicator, NaN before warm-up"""
+        indicators = self.symbols.get(symbol)
+        return indicators[name].value if indicators is not None else NAN
+
+    def on_bar(self, symbol: str, open_: float, high: float, low: float, close: float,
+               volume: float = 0.0) -> None:
+        """Apply one completed bar to every indicator of a symbol"""
+        indicators = self.indicators(symbol)
+        for indicator in indicators.values():
+            indicator.on_bar(open_, high, low, close, volume)
+        for callback in self._listeners:
+            try:
+                callback(symbol, indicators)
+            except Exception as e:
+                self.logger.error(f"Indicator listener error: {e}")
+
+    def on_price(self, symbol: str, price: float, volume: float = 0.0, timestamp: Optional[float] = None) -> None:
+        """Apply one price update (``timestamp`` in epoch seconds, default now)"""
+        if self.bar_interval is None:
+            self.on_bar(symbol, price, price, price, price, volume)
+            return
+        timestamp = time.time() if timestamp is None else timestamp
+        bar_start = timestamp - timestamp % self.bar_interval
+        bar = self._bars.get(symbol)
+        if bar is None or bar_start > bar[0]:
+            if bar is not None:
+                self.on_bar(symbol, *bar[1:])
+            self._bars[symbol] = [bar_start, price, price, price, price, volume]
+            return
+        if price > bar[2]:
+            bar[2] = price
+        elif price < bar[3]:
+            bar[3] = price
+        bar[4] = price
+        bar[5] += volume
+
+    def load_klines(self, symbol: str, klines: Dict[str, Any]) -> None:
+        """Warm a symbol's indicators from historical kline columns (e.g. ``BasicBot.get_klines``)"""
+        columns = [np.asarray(klines[name], dtype=np.float64).tolist()
+                   for name in ('open', 'high', 'low', 'close', 'volume')]
+        indicators = list(self.indicators(symbol).values())
+        for bar in zip(*columns):
+            for indicator in indicators:
+                indicator.on_bar(*bar)
+
+    def attach_price_stream(self, price_stream: Any) -> None:
+        """Feed every markPrice / bookTicker update of a ``market_data.PriceStream``"""
+        def on_update(symbol: str, entry: Any) -> None:
+            # The newer of the mark price and the book mid
+            if entry.mark_time >= entry.book_time:
+                self.on_price(symbol, entry.mark_price)
+            else:
+                self.on_price(symbol, (entry.bid + entry.ask) / 2)
+
+        price_stream.add_listener(on_update)
+
+
+def _max_difference(streamed: np.ndarray, batch: np.ndarray) -> float:
+    """Largest difference between two series relative to max(|value|, 1) (NaN positions must match)"""
+    if not np.array_equal(np.isnan(streamed), np.isnan(batch)):
+        return math.inf
+    valid = ~np.isnan(batch)
+    if not valid.any():
+        return 0.0
+    return float(np.max(np.abs(streamed[valid] - batch[valid]) / np.maximum(np.abs(batch[valid]), 1.0)))
+
+
+def run_benchmark(symbols: int = 500, ticks: int = 500_000, history: int = 100_000) -> Dict[str, float]:
+    """Streaming throughput across ``symbols`` and agreement with the batch functions
+
+    ``ticks`` random-walk prices are fed round-robin through an
+    ``IndicatorEngine`` with the default seven-indicator set. The
+    streaming classes and the batch functions are then run over one
+    ``history``-bar series, comparing every value and timing both.
+    """
+    from backtest import synthetic_klines
+
+    rng = np.random.default_rng(3)
+    steps = ticks // symbols
+    paths = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.001, (steps, symbols)), axis=0))
+    volumes = rng.uniform(0.1, 10.0, (steps, symbols))
+    names = [f"SYM{i:03d}USDT" for i in range(symbols)]
+    engine = IndicatorEngine()
+    for name in names:
+        engine.indicators(name)
+    per_symbol = len(default_indicators())
+
+    rows = list(zip(paths.tolist(), volumes.tolist()))
+    began = time.perf_counter()
+    for prices, quantities in rows:
+        for name, price, volume in zip(names, prices, quantities):
+            engine.on_price(name, price, volume)
+    elapsed = time.perf_counter() - began
+
+    klines = synthetic_klines(history)
+    klines['volume'] = rng.uniform(0.1, 10.0, history)
+    o, h, l, c, v = (klines[name] for name in ('open', 'high', 'low', 'close', 'volume'))
+    streaming = {name: (indicator, []) for name, indicator in default_indicators().items()}
+    bands: List[Tuple[float, float]] = []
+    began = time.perf_counter()
+    for bar in zip(o.tolist(), h.tolist(), l.tolist(), c.tolist(), v.tolist()):
+        for indicator, values in streaming.values():
+            values.append(indicator.on_bar(*bar))
+        bollinger_indicator = streaming['bollinger_20'][0]
+        bands.append((bollinger_indicator.lower, bollinger_indicator.upper))
+    streaming_bars = time.perf_counter() - began
+
+    began = time.perf_counter()
+    lower, middle, upper = bollinger(c, 20, 2.0)
+    batch = {
+        'ema_20': ema(c, 20),
+        'sma_50': sma(c, 50),
+        'rsi_14': rsi(c, 14),
+        'atr_14': atr(h, l, c, 14),
+        'bollinger_20': middle,
+        'vwap': vwap((h + l + c) / 3, v),
+        'zscore_50': zscore(c, 50),
+    }
+    batch_time = time.perf_counter() - began
+    differences = {name: _max_difference(np.array(streaming[name][1]), series) for name, series in batch.items()}
+    band_columns = np.array(bands).T
+    differences['bollinger_bands'] = max(_max_difference(band_columns[0], lower),
+                                         _max_difference(band_columns[1], upper))
+
+    return {
+        'symbols': symbols,
+        'ticks_per_s': steps * symbols / elapsed,
+        'updates_per_s': steps * symbols * per_symbol / elapsed,
+        'streaming_bars_per_s': history / streaming_bars,
+        'batch_bars_per_s': history / batch_time,
+        'max_relative_difference': max(differences.values()),
+        'differences': differences,
+    }
+
+
+if __name__ == "__main__":
+    results = run_benchmark()
+    print(f"📊 Streaming: {results['ticks_per_s']:,.0f} ticks/s across {results['symbols']} symbols "
+          f"({results['updates_per_s']:,.0f} indicator updates/s)")
+    print(f"📊 Per-bar:   {results['streaming_bars_per_s']:,.0f} bars/s streaming, "
+          f"{results['batch_bars_per_s']:,.0f} bars/s batch (all seven indicators)")
+    print(f"📊 Streaming vs batch: max relative difference {results['max_relative_difference']:.2e}")
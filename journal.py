@@ -0,0 +1,502 @@
+"""
+Write-ahead order journal with crash recovery.
+
+``OrderJournal`` appends every order event ``BasicBot`` produces to a
+SQLite database in WAL mode:
+- the intent (the order parameters, under the client order id);
+- each submission attempt;
+- the exchange's acknowledgement, or its rejection;
+- cancel requests;
+- every later state change or fill seen from REST or the user-data stream.
+
+Appends are serialized on the caller's thread and queued. A background
+writer commits whatever has queued up in one transaction, so a burst of
+orders shares one WAL fsync (group commit). An intent can wait for its
+commit before the order is sent. Then no order reaches the exchange
+without a durable record of it: when the commit fails, the wait raises
+``JournalError`` and the order is not sent.
+
+``recover`` folds the journal back into the last known state of each
+order. ``BasicBot.recover_orders`` then asks the exchange only about
+the orders the journal still has as open or unacknowledged, rather
+than rebuilding state from whole-account queries.
+"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import sqlite3
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
+
+from config import Config
+
+# Event kinds
+INTENT = 'intent'
+SUBMIT = 'submit'
+ACK = 'ack'
+REJECT = 'reject'
+CANCEL = 'cancel'
+UPDATE = 'update'
+FILL = 'fill'
+
+# Recovered status of an order whose intent was journaled but never acknowledged
+PENDING = 'PENDING'
+OPEN_STATUSES = ('NEW', 'PARTIALLY_FILLED')
+
+# API error code for "Order does not exist"
+ORDER_NOT_FOUND_CODE = -2013
+# Order history page (GET /fapi/v1/allOrders): request weight and maximum orders per page
+ALL_ORDERS_WEIGHT = 5
+ALL_ORDERS_LIMIT = 1000
+# Failed commits remembered for waiters (oldest dropped first)
+MAX_WRITE_FAILURES = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    client_order_id TEXT NOT NULL,
+    order_id INTEGER,
+    symbol TEXT,
+    status TEXT,
+    payload TEXT
+)
+"""
+
+
+class JournalError(Exception):
+    """Raised when a journal event waited on could not be committed"""
+
+
+class JournalEntry:
+    """Last journaled state of one order"""
+
+    __slots__ = ('client_order_id', 'symbol', 'params', 'order', 'status', 'attempts', 'updated_at')
+
+    def __init__(self, client_order_id: str, symbol: Optional[str]):
+        self.client_order_id = client_order_id
+        self.symbol = symbol
+        self.params: Optional[Dict[str, Any]] = None
+        self.order: Optional[Dict[str, Any]] = None
+        self.status = PENDING
+        self.attempts = 0
+        self.updated_at = 0.0
+
+    @property
+    def order_id(self) -> Optional[int]:
+        return self.order['orderId'] if self.order is not None else None
+
+    @property
+    def is_open(self) -> bool:
+        """True while the exchange may still hold (or fill) the order"""
+        return self.status == PENDING or self.status in OPEN_STATUSES
+
+    def apply_order(self, order: Dict[str, Any]) -> None:
+        # Ignore a state older than the one already applied, as OrderStateStore does
+        if self.order is not None and order.get('updateTime', 0) < self.order.get('updateTime', 0):
+            return
+        if self.order is None:
+            self.order = dict(order)
+        else:
+            self.order.update(order)
+        self.status = self.order['status']
+
+
+class OrderJournal:
+    """Append-only SQLite (WAL) journal of order intents, submissions, acks and fills"""
+
+    def __init__(self, path: str = Config.JOURNAL_PATH, sync_intents: bool = Config.JOURNAL_SYNC_INTENTS,
+                 synchronous: str = Config.JOURNAL_SYNCHRONOUS, batch_size: int = Config.JOURNAL_BATCH_SIZE):
+        """Open (or create) a journal
+
+        With ``sync_intents`` an intent is only returned from once it is
+        committed. ``synchronous`` is the SQLite setting: with FULL each
+        commit fsyncs the WAL. NORMAL leaves the fsync to checkpoints,
+        which survives a process crash but not a power loss. Up to
+        ``batch_size`` queued events go into one commit.
+        """
+        self.path = path
+        self.sync_intents = sync_intents
+        self.synchronous = synchronous
+        self.batch_size = batch_size
+        self.events = 0
+        self.commits = 0
+        self.logger = logging.getLogger('TradingBot')
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(SCHEMA)
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._committed = threading.Condition()
+        self._queued_seq = 0
+        self._committed_seq = 0
+        # (first seq, last seq, error) of each commit that failed
+        self._failures: deque = deque(maxlen=MAX_WRITE_FAILURES)
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name='OrderJournal', daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(f'PRAGMA synchronous={self.synchronous}')
+        return conn
+
+    # Appending
+
+    def append(self, kind: str, client_order_id: str, symbol: Optional[str] = None,
+               payload: Optional[Dict[str, Any]] = None, order_id: Optional[int] = None,
+               status: Optional[str] = None, durable: bool = False) -> int:
+        """Queue one event and return its sequence number
+
+        With ``durable`` this blocks until the event is committed, and
+        raises ``JournalError`` if the commit failed.
+        """
+        row = (time.time(), kind, client_order_id, order_id, symbol, status,
+               json.dumps(payload, separators=(',', ':')) if payload is not None else None)
+        with self._lock:
+            if self._closed:
+                return 0
+            self._queued_seq += 1
+            seq = self._queued_seq
+            self._queue.put(row)
+        if durable:
+            self.wait(seq)
+        return seq
+
+    def intent(self, params: Dict[str, Any]) -> int:
+        """Journal an order about to be sent (futures_create_order params with newClientOrderId)"""
+        params = {key: value for key, value in params.items() if key != 'requests_params'}
+        return self.append(INTENT, params['newClientOrderId'], params.get('symbol'), params,
+                           durable=self.sync_intents)
+
+    def intents(self, batch: List[Dict[str, Any]]) -> None:
+        """Journal a batch of orders about to be sent, waiting for one commit for all of them"""
+        seq = 0
+        for params in batch:
+            seq = self.append(INTENT, params['newClientOrderId'], params.get('symbol'), params)
+        if self.sync_intents and seq:
+            self.wait(seq)
+
+    def submit(self, client_order_id: str, symbol: str, attempt: int) -> int:
+        return self.append(SUBMIT, client_order_id, symbol, {'attempt': attempt})
+
+    def reject(self, client_order_id: str, symbol: str, error: Any) -> int:
+        """Journal a definite rejection (an exception or an API error dict)"""
+        if isinstance(error, dict):
+            payload = {'code': error.get('code', -1), 'msg': error.get('msg', '')}
+        else:
+            payload = {'code': getattr(error, 'code', -1), 'msg': str(error)}
+        return self.append(REJECT, client_order_id, symbol, payload, status='REJECTED')
+
+    def cancel(self, symbol: str, order_id: int) -> int:
+        return self.append(CANCEL, '', symbol, order_id=order_id)
+
+    def order(self, order: Dict[str, Any], kind: str = UPDATE) -> int:
+        """Journal an order state (REST response or user-stream order)"""
+        return self.append(kind, order.get('clientOrderId', ''), order.get('symbol'), order,
+                           order_id=order.get('orderId'), status=order.get('status'))
+
+    def stream_order(self, order: Dict[str, Any]) -> int:
+        """Journal a user-stream order event: a fill for trades, an update otherwise"""
+        return self.order(order, FILL if order.get('executionType') == 'TRADE' else UPDATE)
+
+    # Writing
+
+    def wait(self, seq: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """Block until event ``seq`` (default: everything queued so far) is committed
+
+        Raises ``JournalError`` if the commit holding ``seq`` failed.
+        """
+        seq = self._queued_seq if seq is None else seq
+        with self._committed:
+            done = self._committed.wait_for(lambda: self._committed_seq >= seq or not self._writer.is_alive(),
+                                            timeout)
+            if done and self._committed_seq < seq:
+                raise JournalError(f"Journal writer stopped before event {seq} was committed")
+            for first, last, error in self._failures:
+                if first <= seq <= last:
+                    raise JournalError(f"Journal events {first}-{last} not committed: {error}") from error
+        return done
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        written = 0
+        while True:
+            rows = [self._queue.get()]
+            while len(rows) < self.batch_size:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = rows[-1] is None
+            rows = [row for row in rows if row is not None]
+            if rows:
+                try:
+                    with conn:
+                        conn.executemany('INSERT INTO events (ts, kind, client_order_id, order_id, symbol, '
+                                         'status, payload) VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+                    self.events += len(rows)
+                    self.commits += 1
+                except Exception as e:
+                    self.logger.error(f"Error writing {len(rows)} journal events: {e}")
+                    failure = (written + 1, written + len(rows), e)
+                else:
+                    failure = None
+                # Rows leave the queue in sequence order
+                written += len(rows)
+                with self._committed:
+                    if failure is not None:
+                        self._failures.append(failure)
+                    self._committed_seq = written
+                    self._committed.notify_all()
+            if stop:
+                conn.close()
+                return
+
+    def close(self) -> None:
+        """Commit everything queued and stop the writer"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._writer.join()
+        with self._committed:
+            self._committed.notify_all()
+        atexit.unregister(self.close)
+
+    # Recovery
+
+    def recover(self) -> Dict[str, JournalEntry]:
+        """Fold the journal into the last known state of each order, by client order id"""
+        entries: Dict[str, JournalEntry] = {}
+        conn = self._connect()
+        try:
+            rows = conn.execute('SELECT ts, kind, client_order_id, symbol, payload '
+                                'FROM events ORDER BY seq')
+            for ts, kind, client_order_id, symbol, payload in rows:
+                if kind == CANCEL:
+                    continue
+                entry = entries.get(client_order_id)
+                if entry is None:
+                    if not client_order_id:
+                        continue
+                    entry = entries[client_order_id] = JournalEntry(client_order_id, symbol)
+                entry.updated_at = ts
+                if kind == INTENT:
+                    entry.params = json.loads(payload)
+                elif kind == SUBMIT:
+                    entry.attempts += 1
+                elif kind == REJECT:
+                    if entry.order is None:
+                        entry.status = 'REJECTED'
+                else:
+                    entry.apply_order(json.loads(payload))
+        finally:
+            conn.close()
+        self.logger.info(f"Order journal replayed: {len(entries)} orders, "
+                         f"{sum(1 for e in entries.values() if e.is_open)} open or unacknowledged")
+        return entries
+
+    def compact(self, keep: Optional[List[str]] = None) -> int:
+        """Delete the events of every order not in ``keep`` (client order ids); returns rows deleted
+
+        Call it after recovery with the ids still open, so the journal
+        only carries live orders forward.
+        """
+        self.wait()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('CREATE TEMP TABLE keep (client_order_id TEXT PRIMARY KEY)')
+                conn.executemany('INSERT OR IGNORE INTO keep VALUES (?)', [(cid,) for cid in keep or ()])
+                deleted = conn.execute('DELETE FROM events WHERE client_order_id NOT IN '
+                                       '(SELECT client_order_id FROM keep)').rowcount
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        finally:
+            conn.close()
+        self.logger.info(f"Order journal compacted: {deleted} events removed")
+        return deleted
+
+
+def reconcile_orders(client: Any, entries: Dict[str, JournalEntry],
+                     all_symbols_threshold: int = Config.JOURNAL_ALL_SYMBOLS_THRESHOLD) -> Tuple[List[Dict[str, Any]], int]:
+    """Fetch the current state of the journal's open and unacknowledged orders
+
+    Open orders are listed per symbol (weight 1 each), or in one call for
+    every symbol (weight 40) when more than ``all_symbols_threshold``
+    symbols are involved. Journaled orders missing from that list have
+    closed. They are fetched by order id, or through one page of a
+    symbol's order history (weight 5) when more than five closed on that
+    symbol. An unacknowledged intent missing from the list is looked up
+    by client order id.
+
+    Returns the orders found and the number of requests made. Intents the
+    exchange never received come back as stubs with status REJECTED.
+    """
+    pending = [entry for entry in entries.values() if entry.is_open and entry.symbol]
+    symbols = sorted({entry.symbol for entry in pending})
+    if not symbols:
+        return [], 0
+
+    if len(symbols) > all_symbols_threshold:
+        listed = client.futures_get_open_orders()
+        requests = 1
+    else:
+        listed = [order for symbol in symbols for order in client.futures_get_open_orders(symbol=symbol)]
+        requests = len(symbols)
+    found = {order['clientOrderId']: order for order in listed}
+
+    # Closed while we were down: page through the order history where that is cheaper
+    closed: Dict[str, Dict[str, JournalEntry]] = {}
+    for entry in pending:
+        if entry.client_order_id not in found and entry.order_id is not None:
+            closed.setdefault(entry.symbol, {})[entry.client_order_id] = entry
+    for symbol, wanted in closed.items():
+        if len(wanted) <= ALL_ORDERS_WEIGHT:
+            continue
+        start = min(entry.order_id for entry in wanted.values())
+        while True:
+            page = client.futures_get_all_orders(symbol=symbol, orderId=start, limit=ALL_ORDERS_LIMIT)
+            requests += 1
+            for order in page:
+                if order['clientOrderId'] in wanted:
+                    found[order['clientOrderId']] = order
+            if len(page) < ALL_ORDERS_LIMIT or all(cid in found for cid in wanted):
+                break
+            start = page[-1]['orderId'] + 1
+
+    orders = list(found.values())
+    for entry in pending:
+        if entry.client_order_id in found:
+            continue
+        requests += 1
+        try:
+            if entry.order_id is not None:
+                orders.append(client.futures_get_order(symbol=entry.symbol, orderId=entry.order_id))
+            else:
+                orders.append(client.futures_get_order(symbol=entry.symbol,
+                                                       origClientOrderId=entry.client_order_id))
+        except Exception as e:
+            # The exchange has no such order, so the intent never landed
+            if getattr(e, 'code', None) != ORDER_NOT_FOUND_CODE:
+                raise
+            orders.append({'clientOrderId': entry.client_order_id, 'symbol': entry.symbol,
+                           'status': 'REJECTED', 'updateTime': int(time.time() * 1000)})
+    return orders, requests
+
+
+def run_benchmark(orders: int = 2000, offline_fills: int = 100, path: Optional[str] = None) -> Dict[str, float]:
+    """Measure the journal's cost per order, and recovery against a fresh full reconcile
+
+    ``orders`` limit orders are placed through a BasicBot on the fake
+    exchange (no simulated latency), first without a journal and then
+    with one, once with durable intents and once without. The difference
+    in time per order is the persistence cost. A run from 8 threads shows
+    how group commit spreads the fsyncs. The journaled bot then
+    "crashes" and ``offline_fills`` of its orders fill while it is down.
+    Recovery replays the journal and fetches only the changed orders.
+    """
+    import shutil
+    import tempfile
+    from bot import BasicBot
+    from fake_exchange import FakeExchange, FakeFuturesClient
+
+    directory = tempfile.mkdtemp(prefix='journal_bench_')
+    path = path or os.path.join(directory, 'orders.db')
+    saved = (Config.RISK_ENABLED, Config.RATE_LIMIT_ENABLED, Config.JOURNAL_ENABLED)
+    Config.RISK_ENABLED = Config.RATE_LIMIT_ENABLED = False
+    try:
+        def place(journal: Optional[OrderJournal], workers: int = 1) -> Tuple[float, Any, FakeExchange]:
+            exchange = FakeExchange(prices={'BTCUSDT': 60000.0}, spread_bps=2.0)
+            Config.JOURNAL_ENABLED = False
+            bot = BasicBot('fake', 'fake', client=FakeFuturesClient(exchange))
+            bot.logger.setLevel(logging.WARNING)
+            bot.journal = journal
+
+            def order(i: int) -> None:
+                bot.place_limit_order('BTCUSDT', 'BUY' if i % 2 else 'SELL', 0.001,
+                                      59000.0 - i % 100 if i % 2 else 61000.0 + i % 100)
+
+            began = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(order, range(orders)))
+            if journal is not None:
+                journal.wait()
+            return (time.perf_counter() - began) / orders, bot, exchange
+
+        baseline, _, _ = place(None)
+        buffered_journal = OrderJournal(os.path.join(directory, 'buffered.db'), sync_intents=False)
+        buffered, _, _ = place(buffered_journal)
+        buffered_journal.close()
+
+        concurrent_journal = OrderJournal(os.path.join(directory, 'concurrent.db'), sync_intents=True)
+        concurrent, _, _ = place(concurrent_journal, workers=8)
+        concurrent_journal.close()
+
+        journal = OrderJournal(path, sync_intents=True)
+        durable, bot, exchange = place(journal)
+        journal.close()
+
+        # While "down": the price drops through the top ``offline_fills`` resting bids
+        bids = sorted((float(o['price']) for o in exchange.open_orders() if o['side'] == 'BUY'), reverse=True)
+        open_before = len(exchange.open_orders())
+        exchange.set_price('BTCUSDT', bids[min(offline_fills, len(bids)) - 1] / (1 + exchange.half_spread) - 0.01)
+        filled_offline = open_before - len(exchange.open_orders())
+
+        began = time.perf_counter()
+        recovered_journal = OrderJournal(path)
+        entries = recovered_journal.recover()
+        replay_time = time.perf_counter() - began
+        found, requests = reconcile_orders(bot.client, entries)
+        for order in found:
+            entry = entries.get(order['clientOrderId'])
+            if entry is not None:
+                entry.apply_order(order)
+        recover_time = time.perf_counter() - began
+        open_after = sum(1 for entry in entries.values() if entry.is_open)
+        recovered_journal.close()
+        return {
+            'orders': orders,
+            'baseline_us': baseline * 1e6,
+            'buffered_us': buffered * 1e6,
+            'durable_us': durable * 1e6,
+            'concurrent_us': concurrent * 1e6,
+            'events_per_commit': journal.events / max(journal.commits, 1),
+            'concurrent_events_per_commit': concurrent_journal.events / max(concurrent_journal.commits, 1),
+            'filled_offline': filled_offline,
+            'recovered_open': open_after,
+            'exchange_open': len(exchange.open_orders()),
+            'replay_ms': replay_time * 1000,
+            'recover_ms': recover_time * 1000,
+            'reconcile_requests': requests,
+        }
+    finally:
+        Config.RISK_ENABLED, Config.RATE_LIMIT_ENABLED, Config.JOURNAL_ENABLED = saved
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    results = run_benchmark()
+    print(f"📊 Per order ({results['orders']} limit orders, fake exchange): "
+          f"{results['baseline_us']:.0f} µs without journal, "
+          f"{results['buffered_us']:.0f} µs buffered (+{results['buffered_us'] - results['baseline_us']:.0f}), "
+          f"{results['durable_us']:.0f} µs with durable intents "
+          f"(+{results['durable_us'] - results['baseline_us']:.0f})")
+    print(f"📊 Group commit: {results['events_per_commit']:.1f} events per commit one order at a time, "
+          f"{results['concurrent_events_per_commit']:.1f} from 8 threads "
+          f"({results['concurrent_us']:.0f} µs per order with durable intents)")
+    print(f"📊 Recovery: journal replayed in {results['replay_ms']:.0f} ms, reconciled in "
+          f"{results['recover_ms']:.0f} ms with {results['reconcile_requests']} requests; "
+          f"{results['filled_offline']} orders filled while down, "
+          f"{results['recovered_open']} open after recovery (exchange: {results['exchange_open']})")
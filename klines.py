@@ -0,0 +1,257 @@
+"""
+Historical futures klines with a columnar on-disk cache.
+
+``KlineStore`` keeps candles under ``<root>/<SYMBOL>/<interval>/<YYYY-MM-DD>.npy``,
+one file per UTC day. Each file is a float64 array of shape
+``(len(COLUMNS), n)``, so every column is contiguous and readable straight
+from a memory map. ``sync`` works out which ranges are missing (absent
+days, and the gaps before, between and after the candles of partially
+filled ones) and fetches only those, in parallel pages of
+``futures_klines``. ``load`` returns the cached
+columns for a time range.
+"""
+
+import os
+import time
+import logging
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple, Union
+import numpy as np
+
+from config import Config
+
+# Kline interval lengths in milliseconds (intervals that divide a UTC day)
+INTERVAL_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000,
+    '8h': 28_800_000, '12h': 43_200_000, '1d': 86_400_000,
+}
+
+# Column order of the futures_klines() rows (the trailing 'ignore' field is dropped)
+COLUMNS = ('open_time', 'open', 'high', 'low', 'close', 'volume', 'close_time',
+           'quote_volume', 'trades', 'taker_buy_base', 'taker_buy_quote')
+
+DAY_MS = 86_400_000
+
+TimeLike = Union[int, float, str, datetime]
+
+
+def to_ms(value: TimeLike) -> int:
+    """Convert epoch ms, a datetime (naive means UTC) or an ISO date string to epoch ms"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+    return int(value)
+
+
+def day_label(day_start: int) -> str:
+    return datetime.fromtimestamp(day_start / 1000, timezone.utc).strftime('%Y-%m-%d')
+
+
+def rows_to_columns(rows: List[List[Any]]) -> np.ndarray:
+    """Convert futures_klines() rows to a (len(COLUMNS), n) float64 array"""
+    if not rows:
+        return np.empty((len(COLUMNS), 0))
+    return np.array([row[:len(COLUMNS)] for row in rows], dtype=np.float64).T.copy()
+
+
+class KlineStore:
+    """Day-partitioned, memory-mappable kline cache filled from the futures REST API"""
+
+    def __init__(self, client: Any, root: str = Config.KLINE_CACHE_DIR,
+                 max_workers: int = Config.KLINE_FETCH_WORKERS, page_limit: int = Config.KLINE_PAGE_LIMIT):
+        """Initialize the store
+
+        ``client`` is a ``binance.Client`` (e.g. ``BasicBot.client``).
+        ``page_limit`` candles are requested per call; up to ``max_workers``
+        pages are fetched at once.
+        """
+        self.client = client
+        self.root = root
+        self.max_workers = max_workers
+        self.page_limit = page_limit
+        self.logger = logging.getLogger('TradingBot')
+
+    def partition_path(self, symbol: str, interval: str, day_start: int) -> str:
+        return os.path.join(self.root, symbol.upper(), interval, f"{day_label(day_start)}.npy")
+
+    def read_partition(self, symbol: str, interval: str, day_start: int) -> Optional[np.ndarray]:
+        """Memory-map one day's columns, or None if it is not cached"""
+        path = self.partition_path(symbol, interval, day_start)
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode='r')
+
+    def _write_partition(self, symbol: str, interval: str, day_start: int, columns: np.ndarray) -> None:
+        path = self.partition_path(symbol, interval, day_start)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp.npy"
+        np.save(tmp_path, columns)
+        os.replace(tmp_path, path)
+
+    def missing_ranges(self, symbol: str, interval: str, start: TimeLike,
+                       end: TimeLike) -> List[Tuple[int, int]]:
+        """Open-time ranges ``[first, last]`` in the window that are not cached yet
+
+        Only closed candles are considered, so the current day is topped up
+        on later calls.
+        """
+        interval_ms = INTERVAL_MS[interval]
+        start_ms = -(-to_ms(start) // interval_ms) * interval_ms
+        # Last candle that has closed by now
+        last_closed = (int(time.time() * 1000) // interval_ms - 1) * interval_ms
+        end_ms = min(to_ms(end), last_closed)
+
+        ranges: List[Tuple[int, int]] = []
+        day_start = start_ms // DAY_MS * DAY_MS
+        while day_start <= end_ms:
+            first = max(start_ms, day_start)
+            last = min(end_ms, day_start + DAY_MS - interval_ms)
+            cached = self.read_partition(symbol, interval, day_start)
+            if cached is not None and cached.shape[1]:
+                open_times = cached[0].astype(np.int64)
+                # Gaps before the first cached candle, between non-consecutive ones and after the last
+                breaks = np.flatnonzero(np.diff(open_times) > interval_ms)
+                gap_firsts = np.concatenate(([first], open_times[breaks] + interval_ms,
+                                             [open_times[-1] + interval_ms]))
+                gap_lasts = np.concatenate(([open_times[0] - interval_ms], open_times[breaks + 1] - interval_ms,
+                                            [last]))
+                gaps = [(max(int(gap_first), first), min(int(gap_last), last))
+                        for gap_first, gap_last in zip(gap_firsts, gap_lasts)]
+            else:
+                gaps = [(first, last)]
+            for gap_first, gap_last in gaps:
+                if gap_first > gap_last:
+                    continue
+                if ranges and ranges[-1][1] + interval_ms == gap_first:
+                    ranges[-1] = (ranges[-1][0], gap_last)
+                else:
+                    ranges.append((gap_first, gap_last))
+            day_start += DAY_MS
+        return ranges
+
+    def sync(self, symbol: str, interval: str, start: TimeLike, end: TimeLike) -> int:
+        """Fetch the missing candles in the window into the cache; returns how many were fetched"""
+        symbol = symbol.upper()
+        interval_ms = INTERVAL_MS[interval]
+        pages = []
+        for first, last in self.missing_ranges(symbol, interval, start, end):
+            page_span = self.page_limit * interval_ms
+            for page_start in range(first, last + 1, page_span):
+                pages.append((page_start, min(page_start + page_span - interval_ms, last)))
+        if not pages:
+            return 0
+
+        self.logger.info(f"Fetching {symbol} {interval} klines in {len(pages)} pages")
+
+        def fetch(page: Tuple[int, int]) -> List[List[Any]]:
+            return self.client.futures_klines(symbol=symbol, interval=interval, startTime=page[0],
+                                              endTime=page[1] + interval_ms - 1, limit=self.page_limit)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pages))) as executor:
+            fetched = rows_to_columns([row for rows in executor.map(fetch, pages) for row in rows])
+
+        # Merge into the day partitions, keeping candles already cached
+        days = fetched[0] // DAY_MS * DAY_MS
+        for day_start in np.unique(days):
+            day_start = int(day_start)
+            new = fetched[:, days == day_start]
+            cached = self.read_partition(symbol, interval, day_start)
+            if cached is not None and cached.shape[1]:
+                merged = np.concatenate([cached, new], axis=1)
+                _, keep = np.unique(merged[0], return_index=True)
+                new = merged[:, keep]
+            # Release the memory map before replacing the file (required on Windows)
+            cached = None
+            self._write_partition(symbol, interval, day_start, new)
+
+        self.logger.info(f"Cached {fetched.shape[1]} {symbol} {interval} klines")
+        return fetched.shape[1]
+
+    def load(self, symbol: str, interval: str, start: TimeLike, end: TimeLike,
+             sync: bool = True) -> Dict[str, np.ndarray]:
+        """Return the candles with open time in ``[start, end]`` as a dict of columns
+
+        With ``sync`` missing ranges are fetched first. A window within one
+        day is a view of that day's memory map; longer windows are one
+        concatenation of the mapped columns.
+        """
+        symbol = symbol.upper()
+        if sync:
+            self.sync(symbol, interval, start, end)
+
+        start_ms, end_ms = to_ms(start), to_ms(end)
+        parts = []
+        day_start = start_ms // DAY_MS * DAY_MS
+        while day_start <= end_ms:
+            cached = self.read_partition(symbol, interval, day_start)
+            if cached is not None and cached.shape[1]:
+                open_times = cached[0]
+                lo = np.searchsorted(open_times, start_ms, side='left')
+                hi = np.searchsorted(open_times, end_ms, side='right')
+                if hi > lo:
+                    parts.append(cached[:, lo:hi])
+            day_start += DAY_MS
+
+        if not parts:
+            columns = np.empty((len(COLUMNS), 0))
+        elif len(parts) == 1:
+            columns = parts[0]
+        else:
+            columns = np.concatenate(parts, axis=1)
+        return {name: columns[index] for index, name in enumerate(COLUMNS)}
+
+
+def to_dataframe(klines: Dict[str, np.ndarray]) -> Any:
+    """Convert loaded columns to a pandas DataFrame indexed by open time"""
+    import pandas as pd
+
+    frame = pd.DataFrame(klines)
+    frame.index = pd.to_datetime(frame.pop('open_time').astype('int64'), unit='ms', utc=True)
+    return frame
+
+
+def run_benchmark(days: int = 30, latency: float = 0.05) -> Dict[str, float]:
+    """Time a cold fill, an incremental top-up and a cached load of 1m klines
+
+    Uses the fake client with ``latency`` seconds of simulated round trip
+    and a temporary cache directory.
+    """
+    import tempfile
+    import shutil
+    from fake_exchange import FakeFuturesClient
+
+    client = FakeFuturesClient(latency=latency)
+    root = tempfile.mkdtemp(prefix='klines_')
+    try:
+        store = KlineStore(client, root=root)
+        end = int(time.time() * 1000)
+        start = end - days * DAY_MS
+
+        began = time.perf_counter()
+        fetched = store.sync('BTCUSDT', '1m', start, end)
+        cold_s = time.perf_counter() - began
+
+        began = time.perf_counter()
+        store.sync('BTCUSDT', '1m', start, end + 3_600_000)
+        topup_s = time.perf_counter() - began
+
+        began = time.perf_counter()
+        klines = store.load('BTCUSDT', '1m', start, end, sync=False)
+        load_s = time.perf_counter() - began
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {'candles': fetched, 'loaded': len(klines['close']), 'cold_fill_s': cold_s,
+            'top_up_s': topup_s, 'cached_load_s': load_s}
+
+
+if __name__ == "__main__":
+    result = run_benchmark()
+    print(f"📊 Cold fill of {result['candles']} candles:  {result['cold_fill_s']:8.3f} s")
+    print(f"📊 Incremental top-up:            {result['top_up_s']:8.3f} s")
+    print(f"📊 Cached load of {result['loaded']} candles: {result['cached_load_s'] * 1000:8.2f} ms")
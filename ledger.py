@@ -0,0 +1,313 @@
+"""
+In-process position and PnL ledger.
+
+``Ledger`` keeps positions, average entry, realized/unrealized PnL,
+commissions and position margin up to date from order fills and mark
+prices. Every event touches one position and adjusts running totals, so
+account queries are memory reads. Fills are taken from the cumulative
+``executedQty``/``avgPrice`` of each order, so the same fill seen from a
+REST response and a user-stream event is only counted once.
+``reconcile`` compares against a ``futures_account()`` snapshot,
+reports the drift and re-seeds from it.
+"""
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List
+
+from config import Config
+
+TERMINAL_STATUSES = ('FILLED', 'CANCELED', 'EXPIRED', 'REJECTED')
+
+# Position amounts below this are treated as flat
+QTY_EPSILON = 1e-12
+
+
+class Position:
+    """One symbol/position-side of the ledger"""
+
+    __slots__ = ('symbol', 'position_side', 'amount', 'entry_price', 'mark_price', 'leverage',
+                 'unrealized_pnl', 'notional', 'margin', 'realized_pnl')
+
+    def __init__(self, symbol: str, position_side: str = 'BOTH', leverage: int = Config.LEDGER_DEFAULT_LEVERAGE):
+        self.symbol = symbol
+        self.position_side = position_side
+        self.amount = 0.0
+        self.entry_price = 0.0
+        self.mark_price = 0.0
+        self.leverage = leverage
+        self.unrealized_pnl = 0.0
+        self.notional = 0.0
+        self.margin = 0.0
+        self.realized_pnl = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """futures_account() position shape"""
+        return {
+            'symbol': self.symbol,
+            'positionSide': self.position_side,
+            'positionAmt': str(self.amount),
+            'entryPrice': str(self.entry_price),
+            'markPrice': str(self.mark_price),
+            'unrealizedProfit': str(self.unrealized_pnl),
+            'positionInitialMargin': str(self.margin),
+            'leverage': str(self.leverage),
+            'realizedProfit': str(self.realized_pnl),
+        }
+
+
+class Ledger:
+    """Positions, balances and PnL maintained incrementally from fills and mark prices"""
+
+    def __init__(self, default_leverage: int = Config.LEDGER_DEFAULT_LEVERAGE,
+                 max_closed_orders: int = Config.ORDER_STORE_MAX_CLOSED):
+        """Initialize an empty ledger (call ``load_account`` or ``reconcile`` to seed it)"""
+        self.default_leverage = default_leverage
+        self.max_closed_orders = max_closed_orders
+        self.positions: Dict[tuple, Position] = {}
+        self.wallet_balance = 0.0
+        self.unrealized_pnl = 0.0
+        self.gross_notional = 0.0
+        self.position_margin = 0.0
+        self.realized_pnl = 0.0
+        self.commission = 0.0
+        self.synced_at: Optional[float] = None
+        self.leverages: Dict[str, int] = {}
+        self.logger = logging.getLogger('TradingBot')
+        self._by_symbol: Dict[str, List[Position]] = {}
+        # (symbol, orderId) -> (executedQty, avgPrice, finished) already applied
+        self._fills: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        self._closed = 0
+        self._lock = threading.Lock()
+
+    def _position(self, symbol: str, position_side: str) -> Position:
+        position = self.positions.get((symbol, position_side))
+        if position is None:
+            position = Position(symbol, position_side, self.leverages.get(symbol, self.default_leverage))
+            self.positions[(symbol, position_side)] = position
+            self._by_symbol.setdefault(symbol, []).append(position)
+        return position
+
+    def _revalue(self, position: Position) -> None:
+        """Recompute one position's unrealized PnL, notional and margin and move the totals by the change"""
+        unrealized = position.amount * (position.mark_price - position.entry_price)
+        notional = abs(position.amount) * position.mark_price
+        margin = notional / position.leverage
+        self.unrealized_pnl += unrealized - position.unrealized_pnl
+        self.gross_notional += notional - position.notional
+        self.position_margin += margin - position.margin
+        position.unrealized_pnl = unrealized
+        position.notional = notional
+        position.margin = margin
+
+    def _apply_fill(self, position: Position, quantity: float, price: float) -> None:
+        """Apply a signed fill quantity at ``price`` to a position"""
+        amount = position.amount
+        if abs(amount) < QTY_EPSILON or (amount > 0) == (quantity > 0):
+            new_amount = amount + quantity
+            position.entry_price = (position.entry_price * abs(amount) + price * abs(quantity)) / abs(new_amount)
+        else:
+            closed = min(abs(quantity), abs(amount))
+            realized = closed * (price - position.entry_price) * (1 if amount > 0 else -1)
+            position.realized_pnl += realized
+            self.realized_pnl += realized
+            self.wallet_balance += realized
+            new_amount = amount + quantity
+            if abs(new_amount) < QTY_EPSILON:
+                new_amount = 0.0
+                position.entry_price = 0.0
+            elif (new_amount > 0) != (amount > 0):
+                # Flipped through zero: the remainder opens at the fill price
+                position.entry_price = price
+        position.amount = new_amount
+        if not position.mark_price:
+            position.mark_price = price
+        self._revalue(position)
+
+    def apply_fill(self, symbol: str, side: str, quantity: float, price: float, commission: float = 0.0,
+                   position_side: str = 'BOTH') -> None:
+        """Apply one fill directly (quantity is unsigned; ``side`` is BUY or SELL)"""
+        with self._lock:
+            signed = quantity if side.upper() == 'BUY' else -quantity
+            self._apply_fill(self._position(symbol, position_side), signed, price)
+            self.wallet_balance -= commission
+            self.commission += commission
+
+    def apply_order(self, order: Dict[str, Any]) -> None:
+        """Apply the newly filled part of a REST order response or user-stream order
+
+        Only the increase in ``executedQty`` since this order was last seen
+        is booked, at the price implied by the change in ``avgPrice``.
+        Commission is booked from user-stream TRADE events.
+        """
+        executed = float(order.get('executedQty') or 0)
+        key = (order['symbol'], order['orderId'])
+        with self._lock:
+            previous_qty, previous_avg, _ = self._fills.get(key, (0.0, 0.0, False))
+            delta = executed - previous_qty
+            if delta > QTY_EPSILON:
+                avg_price = float(order.get('avgPrice') or 0)
+                price = (avg_price * executed - previous_avg * previous_qty) / delta
+                if price <= 0:
+                    price = float(order.get('lastFilledPrice') or 0) or avg_price
+                signed = delta if order['side'] == 'BUY' else -delta
+                self._apply_fill(self._position(order['symbol'], order.get('positionSide', 'BOTH')), signed, price)
+                previous_qty, previous_avg = executed, avg_price
+
+            if order.get('executionType') == 'TRADE':
+                commission = float(order.get('commission') or 0)
+                self.wallet_balance -= commission
+                self.commission += commission
+
+            if previous_qty:
+                terminal = order.get('status') in TERMINAL_STATUSES
+                if terminal and not self._fills.get(key, (0, 0, False))[2]:
+                    self._closed += 1
+                self._fills[key] = (previous_qty, previous_avg, terminal)
+                if self._closed > self.max_closed_orders:
+                    self._prune_fills()
+
+    def _prune_fills(self) -> None:
+        # Drop the oldest finished orders; a late duplicate of these would be booked again
+        excess = self._closed - self.max_closed_orders // 2
+        for key in list(self._fills):
+            if excess <= 0:
+                break
+            if self._fills[key][2]:
+                del self._fills[key]
+                excess -= 1
+        self._closed = sum(1 for fill in self._fills.values() if fill[2])
+
+    def apply_mark(self, symbol: str, mark_price: float) -> None:
+        """Revalue a symbol's positions at a new mark price"""
+        positions = self._by_symbol.get(symbol)
+        if not positions or not mark_price:
+            return
+        with self._lock:
+            for position in positions:
+                position.mark_price = mark_price
+                self._revalue(position)
+
+    def set_leverage(self, symbol: str, leverage: int) -> None:
+        """Leverage used for the symbol's margin"""
+        with self._lock:
+            self.leverages[symbol] = leverage
+            for position in self._by_symbol.get(symbol, []):
+                position.leverage = leverage
+                self._revalue(position)
+
+    def load_account(self, account: Dict[str, Any]) -> None:
+        """Seed balance and positions from a futures_account() payload"""
+        with self._lock:
+            self.wallet_balance = float(account['totalWalletBalance'])
+            self.positions = {}
+            self._by_symbol = {}
+            self.unrealized_pnl = 0.0
+            self.gross_notional = 0.0
+            self.position_margin = 0.0
+            for p in account.get('positions', []):
+                amount = float(p['positionAmt'])
+                if not amount:
+                    continue
+                if p.get('leverage'):
+                    self.leverages[p['symbol']] = int(p['leverage'])
+                position = self._position(p['symbol'], p.get('positionSide', 'BOTH'))
+                position.amount = amount
+                position.entry_price = float(p.get('entryPrice', 0))
+                mark_price = float(p.get('markPrice', 0))
+                if not mark_price:
+                    mark_price = position.entry_price + float(p.get('unrealizedProfit', 0)) / amount
+                position.mark_price = mark_price
+                self._revalue(position)
+            self.synced_at = time.monotonic()
+
+    def reconcile(self, account: Dict[str, Any], tolerance: float = 1e-6) -> Dict[str, Any]:
+        """Compare with a futures_account() snapshot, log any drift and re-seed from it
+
+        Returns ``{'wallet': exchange minus ledger, 'positions': {symbol: amount drift}}``.
+        """
+        with self._lock:
+            drift: Dict[str, Any] = {'wallet': float(account['totalWalletBalance']) - self.wallet_balance,
+                                     'positions': {}}
+            local = {key: position.amount for key, position in self.positions.items()}
+        for p in account.get('positions', []):
+            key = (p['symbol'], p.get('positionSide', 'BOTH'))
+            diff = float(p['positionAmt']) - local.pop(key, 0.0)
+            if abs(diff) > tolerance:
+                drift['positions'][p['symbol']] = diff
+        for (symbol, _), amount in local.items():
+            if abs(amount) > tolerance:
+                drift['positions'][symbol] = -amount
+
+        if self.synced_at is not None and (abs(drift['wallet']) > tolerance or drift['positions']):
+            self.logger.warning(f"Ledger drift: wallet {drift['wallet']:+.8f} USDT, "
+                                f"positions {drift['positions']}")
+        self.load_account(account)
+        return drift
+
+    def summary(self) -> Dict[str, float]:
+        """Account totals as floats"""
+        with self._lock:
+            margin_balance = self.wallet_balance + self.unrealized_pnl
+            return {
+                'wallet_balance': self.wallet_balance,
+                'unrealized_pnl': self.unrealized_pnl,
+                'margin_balance': margin_balance,
+                'gross_notional': self.gross_notional,
+                'position_margin': self.position_margin,
+                'available_balance': margin_balance - self.position_margin,
+                'margin_usage_pct': self.position_margin / margin_balance * 100 if margin_balance > 0 else 0.0,
+                'realized_pnl': self.realized_pnl,
+                'commission': self.commission,
+            }
+
+    def account_info(self) -> Dict[str, Any]:
+        """futures_account()-shaped view
+
+        The available balance does not reserve margin for open orders.
+        """
+        totals = self.summary()
+        with self._lock:
+            positions = [position.to_dict() for position in self.positions.values() if position.amount]
+        return {
+            'totalWalletBalance': str(totals['wallet_balance']),
+            'availableBalance': str(totals['available_balance']),
+            'totalUnrealizedProfit': str(totals['unrealized_pnl']),
+            'totalMarginBalance': str(totals['margin_balance']),
+            'totalPositionInitialMargin': str(totals['position_margin']),
+            'positions': positions,
+        }
+
+
+def run_benchmark(events: int = 200_000) -> Dict[str, float]:
+    """Time fills and mark updates applied to the ledger (µs per event)"""
+    ledger = Ledger()
+    ledger.load_account({'totalWalletBalance': '15000.0', 'positions': []})
+    symbols = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'ADAUSDT']
+    orders = [{'symbol': symbols[i % 4], 'orderId': i, 'side': 'BUY' if i % 3 else 'SELL', 'status': 'FILLED',
+               'executedQty': '0.01', 'avgPrice': str(100.0 + i % 7)} for i in range(events)]
+
+    began = time.perf_counter()
+    for order in orders:
+        ledger.apply_order(order)
+    fill_s = time.perf_counter() - began
+
+    began = time.perf_counter()
+    for i in range(events):
+        ledger.apply_mark(symbols[i % 4], 100.0 + i % 11)
+    mark_s = time.perf_counter() - began
+
+    began = time.perf_counter()
+    for _ in range(events):
+        ledger.summary()
+    query_s = time.perf_counter() - began
+    return {'fill_us': fill_s / events * 1e6, 'mark_us': mark_s / events * 1e6, 'query_us': query_s / events * 1e6}
+
+
+if __name__ == "__main__":
+    result = run_benchmark()
+    print(f"📊 Fill:         {result['fill_us']:6.2f} µs per event")
+    print(f"📊 Mark update:  {result['mark_us']:6.2f} µs per event")
+    print(f"📊 Account read: {result['query_us']:6.2f} µs per call")
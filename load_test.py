@@ -0,0 +1,216 @@
+"""
+Load test for BasicBot against the fake exchange.
+
+``run_load_test`` drives one ``BasicBot`` from a thread pool with a mix
+of resting limit orders, market orders and cancels. The bot talks to
+``fake_exchange.FakeExchange`` either in-process (``transport='inproc'``,
+measuring the bot's own overhead) or through ``fake_server`` over real
+HTTP with the python-binance client (``transport='http'``) or the lean
+transport (``transport='lean'``, see transport.py). Latency, jitter,
+injected errors and the price walk are seeded, so runs are repeatable.
+Per-operation latency percentiles, throughput and error counts are
+reported.
+"""
+
+import os
+import time
+import random
+import logging
+import argparse
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any
+
+from config import Config
+from fake_exchange import FakeExchange, FakeFuturesClient, SYMBOL_GRID
+from metrics import LatencyHistogram
+
+# Share of each operation in the generated flow (the rest are cancels)
+LIMIT_SHARE = 0.6
+MARKET_SHARE = 0.2
+
+# Cancel rejected because the order is no longer open
+UNKNOWN_ORDER_CODE = -2011
+
+
+def run_load_test(orders: int = 5000, threads: int = 16, transport: str = 'inproc', latency: float = 0.0,
+                  jitter: float = 0.0, error_rate: float = 0.0, timeout_rate: float = 0.0,
+                  tick_interval: float = 0.01, seed: int = 0) -> Dict[str, Any]:
+    """Send ``orders`` operations through BasicBot from ``threads`` threads
+
+    Limit orders rest 0-20 bps from the market while the price takes a
+    1 bp random-walk step every ``tick_interval`` seconds, so some of
+    them fill. Cancels target the oldest resting order. The rate-limit
+    governor and pre-trade risk checks are turned off, since both would
+    throttle or reject the burst by design. Bot logging is raised to
+    CRITICAL. In 'http' and 'lean' modes the server runs in this process
+    and shares the interpreter with the bot. Latencies are in microseconds.
+    """
+    from bot import BasicBot
+
+    exchange = FakeExchange(error_rate=error_rate, timeout_rate=timeout_rate, seed=seed)
+    saved = (Config.RATE_LIMIT_ENABLED, Config.RISK_ENABLED, Config.LOG_FILE, Config.TIME_OFFSET_CACHE)
+    server = None
+    with tempfile.TemporaryDirectory() as work_dir:
+        Config.RATE_LIMIT_ENABLED = False
+        Config.RISK_ENABLED = False
+        Config.LOG_FILE = os.path.join(work_dir, 'load_test.log')
+        # The local server's clock offset must not replace the cached exchange offset
+        Config.TIME_OFFSET_CACHE = os.path.join(work_dir, 'time_offset.json')
+        try:
+            if transport == 'http':
+                from requests.adapters import HTTPAdapter
+                from fake_server import FakeExchangeServer
+                from startup import create_client
+
+                server = FakeExchangeServer(exchange, latency=latency).start()
+                saved_url, Config.BASE_URL = Config.BASE_URL, server.base_url
+                try:
+                    client = create_client('fake', 'fake', testnet=True)
+                finally:
+                    Config.BASE_URL = saved_url
+                # One keep-alive connection per worker thread
+                client.session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=threads))
+            elif transport == 'lean':
+                from fake_server import FakeExchangeServer
+                from transport import FuturesTransport, LeanFuturesClient
+
+                server = FakeExchangeServer(exchange, latency=latency).start()
+                client = LeanFuturesClient(FuturesTransport(server.base_url, 'fake', 'fake'))
+            elif transport == 'inproc':
+                client = FakeFuturesClient(exchange, latency=latency, jitter=jitter)
+            else:
+                raise ValueError(f"Unknown transport: {transport}")
+
+            bot = BasicBot('fake', 'fake', client=client)
+            bot.logger.setLevel(logging.CRITICAL)
+            return _drive(bot, exchange, orders, threads, tick_interval, seed, transport)
+        finally:
+            if server is not None:
+                server.stop()
+            Config.RATE_LIMIT_ENABLED, Config.RISK_ENABLED, Config.LOG_FILE, Config.TIME_OFFSET_CACHE = saved
+
+
+def _drive(bot: Any, exchange: FakeExchange, orders: int, threads: int, tick_interval: float,
+           seed: int, transport: str) -> Dict[str, Any]:
+    """Run the generated operation flow and collect the results"""
+    symbol = 'BTCUSDT'
+    tick = float(SYMBOL_GRID[symbol][0])
+    rng = random.Random(seed)
+    # Draw the whole flow up front so every worker count sees the same operations
+    plan = []
+    for i in range(orders):
+        roll = rng.random()
+        side = 'BUY' if i % 2 else 'SELL'
+        if roll < LIMIT_SHARE:
+            plan.append(('limit', side, rng.uniform(0, 20) / 1e4))
+        elif roll < LIMIT_SHARE + MARKET_SHARE:
+            plan.append(('market', side, 0.0))
+        else:
+            plan.append(('cancel', side, 0.0))
+
+    histograms = {operation: LatencyHistogram() for operation in ('limit', 'market', 'cancel', 'cancel_miss')}
+    errors: Dict[str, int] = {}
+    resting: deque = deque()
+    lock = threading.Lock()
+
+    def run(step: Any) -> None:
+        operation, side, offset = step
+        began = time.perf_counter_ns()
+        try:
+            if operation == 'cancel':
+                try:
+                    order_id = resting.popleft()
+                except IndexError:
+                    return
+                try:
+                    bot.cancel_order(symbol, order_id)
+                except Exception as e:
+                    if getattr(e, 'code', None) != UNKNOWN_ORDER_CODE:
+                        raise
+                    # The order filled before the cancel arrived
+                    operation = 'cancel_miss'
+            elif operation == 'market':
+                bot.place_market_order(symbol, side, 0.001)
+            else:
+                reference = exchange.prices[symbol]
+                price = reference * (1 - offset) if side == 'BUY' else reference * (1 + offset)
+                price = round(round(price / tick) * tick, 8)
+                resting.append(bot.place_limit_order(symbol, side, 0.001, price)['orderId'])
+        except Exception as e:
+            key = str(getattr(e, 'code', type(e).__name__))
+            with lock:
+                errors[key] = errors.get(key, 0) + 1
+            return
+        histograms[operation].record((time.perf_counter_ns() - began) // 1000)
+
+    walking = threading.Event()
+
+    def walk() -> None:
+        while walking.is_set():
+            exchange.random_walk(1.0)
+            time.sleep(tick_interval)
+
+    walker = threading.Thread(target=walk, name='LoadTestPrices', daemon=True)
+    if tick_interval > 0:
+        walking.set()
+        walker.start()
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            began = time.perf_counter()
+            list(executor.map(run, plan))
+            elapsed = time.perf_counter() - began
+    finally:
+        walking.clear()
+        if walker.is_alive():
+            walker.join()
+
+    client_ids = [order.client_order_id for order in exchange.orders.values()]
+    completed = sum(histogram.count for histogram in histograms.values())
+    return {
+        'transport': transport,
+        'threads': threads,
+        'operations': completed,
+        'elapsed_s': elapsed,
+        'ops_per_s': completed / elapsed if elapsed else 0.0,
+        'latency_us': {operation: histogram.snapshot() for operation, histogram in histograms.items()},
+        'errors': errors,
+        'exchange_orders': len(client_ids),
+        'fills': exchange.fills,
+        'open_orders': len(exchange.open_orders()),
+        # Orders sent twice under the same client order id (should be 0: retries look the order up first)
+        'duplicates': len(client_ids) - len(set(client_ids)),
+    }
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    """Print a load-test result"""
+    print(f"📊 {result['transport']}: {result['operations']} operations from {result['threads']} threads in "
+          f"{result['elapsed_s']:.2f} s ({result['ops_per_s']:.0f} ops/s)")
+    for operation, stats in result['latency_us'].items():
+        print(f"   {operation:>11}: n={stats['count']:6d}  p50 {stats['p50']:7d} µs  p90 {stats['p90']:7d} µs  "
+              f"p99 {stats['p99']:7d} µs  p99.9 {stats['p999']:7d} µs  max {stats['max']:7d} µs")
+    print(f"   exchange: {result['exchange_orders']} orders, {result['fills']} fills, "
+          f"{result['open_orders']} open, {result['duplicates']} duplicates")
+    if result['errors']:
+        print(f"⚠️  errors: {result['errors']}")
+    else:
+        print("✅ no errors")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test BasicBot against the fake exchange")
+    parser.add_argument('--orders', type=int, default=5000)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--transport', choices=('inproc', 'http', 'lean'), default='inproc')
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument('--jitter', type=float, default=0.0, help="extra random seconds per request (inproc)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of requests failing with -1001")
+    parser.add_argument('--timeout-rate', type=float, default=0.0, help="share of requests executed but "
+                                                                        "answered with -1007")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print_report(run_load_test(args.orders, args.threads, args.transport, args.latency, args.jitter,
+                               args.error_rate, args.timeout_rate, seed=args.seed))
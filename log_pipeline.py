@@ -0,0 +1,177 @@
+"""
+Non-blocking structured logging for the trading bot.
+
+``setup_queue_logging`` attaches a single ``QueueHandler`` to the
+``TradingBot`` logger. Records are handed to a ``QueueListener`` thread
+unformatted, so message formatting, JSON encoding and disk writes all
+happen off the order path. The file is written as JSON lines and rotated
+by size or by time.
+"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import logging
+import tempfile
+import contextlib
+import logging.handlers
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from config import Config
+
+# Attributes every LogRecord has; anything else came in through ``extra=``
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='microseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread
+
+    The stock handler formats every record before enqueueing it so it can
+    be pickled; an in-process queue does not need that. Log arguments must
+    therefore not be mutated after the logging call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _file_handler(log_file: str, max_bytes: int, when: Optional[str], backup_count: int) -> logging.Handler:
+    """Size-rotating handler, or time-rotating when ``when`` is set (e.g. 'midnight')"""
+    if when:
+        return logging.handlers.TimedRotatingFileHandler(log_file, when=when, backupCount=backup_count,
+                                                         encoding='utf-8', utc=True)
+    return logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count,
+                                                encoding='utf-8')
+
+
+def setup_queue_logging(log_file: Optional[str] = None, log_level: Optional[str] = None,
+                        max_bytes: Optional[int] = None, when: Optional[str] = None,
+                        backup_count: Optional[int] = None) -> logging.Logger:
+    """Route the TradingBot logger through a background JSON-lines writer
+
+    Unset arguments come from the LOG_* settings in Config. Calling it
+    again replaces the previous pipeline. The listener is stopped (and the
+    queue drained) at interpreter exit.
+    """
+    global _listener
+    stop_queue_logging()
+
+    log_file = log_file or Config.LOG_FILE
+    log_level = log_level or Config.LOG_LEVEL
+    max_bytes = Config.LOG_ROTATE_BYTES if max_bytes is None else max_bytes
+    when = when or Config.LOG_ROTATE_WHEN
+    backup_count = Config.LOG_BACKUP_COUNT if backup_count is None else backup_count
+
+    os.makedirs(os.path.dirname(log_file) or '.', exist_ok=True)
+
+    logger = logging.getLogger('TradingBot')
+    logger.setLevel(getattr(logging, log_level.upper()))
+    logger.handlers.clear()
+
+    handlers = []
+    try:
+        file_handler = _file_handler(log_file, max_bytes, when, backup_count)
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+    except Exception as e:
+        print(f"Warning: Could not setup file logging: {e}")
+
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(getattr(logging, log_level.upper()))
+    console_handler.setFormatter(logging.Formatter('%(levelname)s - %(message)s'))
+    handlers.append(console_handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(LazyQueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return logger
+
+
+def stop_queue_logging() -> None:
+    """Flush queued records and stop the background writer"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_queue_logging)
+
+
+def run_benchmark(num_orders: int = 2000, latency: float = 0.001) -> Dict[str, Dict[str, float]]:
+    """Compare order-path latency with the synchronous FileHandler vs the queue pipeline
+
+    Orders go to the in-process fake exchange with ``latency`` seconds of
+    simulated round trip, which is subtracted from the reported figures so
+    they show the bot's own overhead, logging included. Console output is
+    discarded in both modes.
+    """
+    from bot import BasicBot
+    from fake_exchange import FakeFuturesClient
+    # The bot's pipeline lives in the imported module, not in __main__
+    from log_pipeline import stop_queue_logging
+
+    saved = (Config.LOG_FILE, Config.LOG_QUEUE_ENABLED, Config.RATE_LIMIT_ENABLED, Config.RISK_ENABLED)
+    results = {}
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, 'w') as devnull:
+        Config.RATE_LIMIT_ENABLED = False
+        # The burst would trip the pre-trade order-rate limit
+        Config.RISK_ENABLED = False
+        try:
+            for mode, queued in (('sync', False), ('queue', True)):
+                Config.LOG_FILE = os.path.join(log_dir, f"{mode}.log")
+                Config.LOG_QUEUE_ENABLED = queued
+                with contextlib.redirect_stderr(devnull), contextlib.redirect_stdout(devnull):
+                    bot = BasicBot('fake', 'fake', client=FakeFuturesClient(latency=latency))
+                    samples = []
+                    for i in range(num_orders):
+                        start = time.perf_counter()
+                        bot.place_limit_order('BTCUSDT', 'BUY', 0.01, 50000.0 + (i % 100) * 0.1)
+                        samples.append(time.perf_counter() - start - latency)
+                    stop_queue_logging()
+                    logging.getLogger('TradingBot').handlers.clear()
+
+                samples.sort()
+                results[mode] = {
+                    'mean_us': sum(samples) / len(samples) * 1e6,
+                    'p50_us': samples[len(samples) // 2] * 1e6,
+                    'p99_us': samples[int(len(samples) * 0.99)] * 1e6,
+                    'max_us': samples[-1] * 1e6,
+                }
+        finally:
+            Config.LOG_FILE, Config.LOG_QUEUE_ENABLED, Config.RATE_LIMIT_ENABLED, Config.RISK_ENABLED = saved
+    return results
+
+
+if __name__ == "__main__":
+    for mode, stats in run_benchmark().items():
+        print(f"📊 {mode:>5} logging: mean {stats['mean_us']:8.1f} µs  p50 {stats['p50_us']:8.1f} µs  "
+              f"p99 {stats['p99_us']:8.1f} µs  max {stats['max_us']:9.1f} µs")
@@ -0,0 +1,369 @@
+"""
+Streaming market data for the trading bot.
+
+``WebSocketStream`` runs a reconnecting WebSocket client on a background
+thread. ``PriceStream`` builds on it to keep the latest mark price and best
+bid/ask for a set of symbols in memory, so ``BasicBot.get_symbol_price`` can
+answer from the table instead of making a REST call. ``ReplayServer`` serves
+recorded stream messages locally for tests and benchmarks.
+"""
+
+import json
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, Any, Optional, List, Callable, Iterable
+import websockets
+
+from config import Config
+
+FUTURES_STREAM_URL = 'wss://fstream.binance.com'
+FUTURES_TESTNET_STREAM_URL = 'wss://stream.binancefuture.com'
+
+
+def stream_base_url(testnet: bool = True) -> str:
+    """Return the futures WebSocket base URL (``Config.STREAM_BASE_URL`` wins when set)"""
+    if Config.STREAM_BASE_URL:
+        return Config.STREAM_BASE_URL
+    return FUTURES_TESTNET_STREAM_URL if testnet else FUTURES_STREAM_URL
+
+
+def combined_stream_url(base_url: str, streams: Iterable[str]) -> str:
+    """Build a combined-stream URL (messages arrive as ``{'stream', 'data'}``)"""
+    return f"{base_url.rstrip('/')}/stream?streams={'/'.join(streams)}"
+
+
+class WebSocketStream:
+    """Reconnecting WebSocket client running on a background thread"""
+
+    def __init__(self, url: str, on_message: Callable[[Dict[str, Any]], None],
+                 on_connect: Optional[Callable[[], None]] = None,
+                 on_disconnect: Optional[Callable[[], None]] = None,
+                 reconnect_delay: float = Config.STREAM_RECONNECT_DELAY):
+        """Initialize the stream
+
+        ``on_message`` receives every decoded JSON message. ``on_connect`` is
+        called after each successful (re)connect, before any message;
+        ``on_disconnect`` is called on the stream thread when an established
+        connection drops and must not block.
+        """
+        self.url = url
+        self.on_message = on_message
+        self.on_connect = on_connect
+        self.on_disconnect = on_disconnect
+        self.reconnect_delay = reconnect_delay
+        self.logger = logging.getLogger('TradingBot')
+        self.connected = threading.Event()
+        self.reconnects = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ws = None
+        self._stopping = False
+        self._message_listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    def add_message_listener(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """Call ``callback(message)`` with every decoded message before ``on_message`` (e.g. a recorder)"""
+        self._message_listeners.append(callback)
+
+    def remove_message_listener(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        self._message_listeners.remove(callback)
+
+    def start(self) -> None:
+        """Start the background thread"""
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name='WebSocketStream', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the stream and wait for the thread to exit"""
+        self._stopping = True
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._cancel_tasks)
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.connected.clear()
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """Block until the stream is connected"""
+        return self.connected.wait(timeout)
+
+    def reconnect(self) -> None:
+        """Drop the current connection; the stream reconnects to ``self.url``"""
+        loop, ws = self._loop, self._ws
+        if loop is not None and ws is not None:
+            loop.call_soon_threadsafe(lambda: loop.create_task(ws.close()))
+
+    def _cancel_tasks(self) -> None:
+        for task in asyncio.all_tasks(self._loop):
+            task.cancel()
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._listen())
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+    async def _listen(self) -> None:
+        while not self._stopping:
+            try:
+                async with websockets.connect(self.url, max_size=None) as ws:
+                    self._ws = ws
+                    self.logger.info(f"Stream connected: {self.url}")
+                    if self.on_connect is not None:
+                        await self._loop.run_in_executor(None, self.on_connect)
+                    self.connected.set()
+
+                    async for raw in ws:
+                        try:
+                            message = json.loads(raw)
+                            for callback in self._message_listeners:
+                                callback(message)
+                            self.on_message(message)
+                        except Exception as e:
+                            self.logger.error(f"Error handling stream message: {e}")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"Stream disconnected: {e}")
+
+            was_connected = self._ws is not None
+            self._ws = None
+            self.connected.clear()
+            if was_connected and self.on_disconnect is not None:
+                self.on_disconnect()
+            if not self._stopping:
+                self.reconnects += 1
+                await asyncio.sleep(self.reconnect_delay)
+
+
+class PriceEntry:
+    """Latest mark price and top of book for one symbol"""
+
+    __slots__ = ('mark_price', 'mark_time', 'bid', 'bid_qty', 'ask', 'ask_qty', 'book_time')
+
+    def __init__(self):
+        self.mark_price = 0.0
+        self.mark_time = 0.0
+        self.bid = 0.0
+        self.bid_qty = 0.0
+        self.ask = 0.0
+        self.ask_qty = 0.0
+        self.book_time = 0.0
+
+
+class PriceStream:
+    """In-memory price table fed by markPrice and bookTicker streams"""
+
+    def __init__(self, symbols: List[str], testnet: bool = True, base_url: Optional[str] = None,
+                 max_age: float = Config.PRICE_MAX_AGE):
+        """Initialize the price stream
+
+        ``max_age`` is how old (in seconds) a value may be before
+        ``get_price`` treats it as stale and returns None.
+        """
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.max_age = max_age
+        self.prices: Dict[str, PriceEntry] = {symbol: PriceEntry() for symbol in self.symbols}
+
+        streams = []
+        for symbol in self.symbols:
+            streams.append(f"{symbol.lower()}@markPrice@1s")
+            streams.append(f"{symbol.lower()}@bookTicker")
+        url = combined_stream_url(base_url or stream_base_url(testnet), streams)
+        self.stream = WebSocketStream(url, self.handle_message)
+        self._listeners: List[Callable[[str, PriceEntry], None]] = []
+
+    def add_listener(self, callback: Callable[[str, 'PriceEntry'], None]) -> None:
+        """Call ``callback(symbol, entry)`` after every applied update (on the stream thread)"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, 'PriceEntry'], None]) -> None:
+        self._listeners.remove(callback)
+
+    def start(self) -> None:
+        """Start streaming"""
+        self.stream.start()
+
+    def stop(self) -> None:
+        """Stop streaming"""
+        self.stream.stop()
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """Block until the stream is connected"""
+        return self.stream.wait_connected(timeout)
+
+    def handle_message(self, message: Dict[str, Any]) -> None:
+        """Apply one combined-stream (or raw) markPrice/bookTicker message"""
+        data = message.get('data', message)
+        entry = self.prices.get(data.get('s'))
+        if entry is None:
+            return
+
+        event = data.get('e')
+        if event == 'markPriceUpdate':
+            entry.mark_price = float(data['p'])
+            entry.mark_time = time.monotonic()
+        elif event == 'bookTicker':
+            entry.bid = float(data['b'])
+            entry.bid_qty = float(data['B'])
+            entry.ask = float(data['a'])
+            entry.ask_qty = float(data['A'])
+            entry.book_time = time.monotonic()
+        else:
+            return
+
+        for callback in self._listeners:
+            try:
+                callback(data['s'], entry)
+            except Exception as e:
+                self.stream.logger.error(f"Price listener error: {e}")
+
+    def get_price(self, symbol: str, max_age: Optional[float] = None) -> Optional[float]:
+        """Return the mark price, or the book mid if only that is fresh; None if stale"""
+        entry = self.prices.get(symbol)
+        if entry is None:
+            return None
+
+        oldest = time.monotonic() - (self.max_age if max_age is None else max_age)
+        if entry.mark_time > oldest:
+            return entry.mark_price
+        if entry.book_time > oldest:
+            return (entry.bid + entry.ask) / 2
+        return None
+
+    def get_quote(self, symbol: str) -> Optional[PriceEntry]:
+        """Return the raw table entry for a symbol"""
+        return self.prices.get(symbol)
+
+
+class ReplayServer:
+    """Local WebSocket server that replays recorded stream messages
+
+    Every client that connects receives ``messages`` in order, ``interval``
+    seconds apart, and the connection is then held open until the client
+    leaves. Messages may be dicts or a JSON-lines file path.
+    """
+
+    def __init__(self, messages: Any, host: str = '127.0.0.1', port: int = 0,
+                 interval: float = 0.0, repeat: int = 1):
+        """Initialize the server (port 0 picks a free port)"""
+        if isinstance(messages, str):
+            with open(messages, encoding='utf-8') as f:
+                messages = [json.loads(line) for line in f if line.strip()]
+        self.messages = [json.dumps(message) for message in messages]
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.repeat = repeat
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    def start(self) -> None:
+        """Start serving on a background thread"""
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name='ReplayServer', daemon=True)
+        self._thread.start()
+        if not ready.wait(5.0):
+            raise RuntimeError("Replay server failed to start")
+
+    def stop(self) -> None:
+        """Stop the server"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+            self._thread.join(5.0)
+
+    def _run(self, ready: threading.Event) -> None:
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve(ready))
+        finally:
+            self._loop.close()
+
+    async def _serve(self, ready: threading.Event) -> None:
+        self._stopped = asyncio.Event()
+        async with websockets.serve(self._handler, self.host, self.port) as server:
+            self.port = list(server.sockets)[0].getsockname()[1]
+            ready.set()
+            await self._stopped.wait()
+
+    async def _handler(self, websocket, path: Optional[str] = None) -> None:
+        try:
+            for _ in range(self.repeat):
+                for message in self.messages:
+                    await websocket.send(message)
+                    if self.interval:
+                        await asyncio.sleep(self.interval)
+            await websocket.wait_closed()
+        except websockets.ConnectionClosed:
+            pass
+
+
+def synthetic_price_messages(symbols: List[str], count: int, start_price: float = 100.0) -> List[Dict[str, Any]]:
+    """Generate combined-stream markPrice/bookTicker messages for tests"""
+    messages = []
+    for i in range(count):
+        for symbol in symbols:
+            price = start_price + i * 0.1
+            event_time = int(time.time() * 1000)
+            messages.append({'stream': f"{symbol.lower()}@markPrice@1s", 'data': {
+                'e': 'markPriceUpdate', 'E': event_time, 's': symbol,
+                'p': f"{price:.2f}", 'r': '0.00010000', 'T': event_time}})
+            messages.append({'stream': f"{symbol.lower()}@bookTicker", 'data': {
+                'e': 'bookTicker', 'E': event_time, 'T': event_time, 's': symbol,
+                'b': f"{price - 0.05:.2f}", 'B': '1.000', 'a': f"{price + 0.05:.2f}", 'A': '1.000'}})
+    return messages
+
+
+def run_benchmark(lookups: int = 10000, rest_latency: float = 0.05) -> Dict[str, float]:
+    """Compare stream-backed vs REST-backed ``get_symbol_price`` latency
+
+    The stream is served by a local ReplayServer. REST lookups go through
+    the fake client with ``rest_latency`` seconds of simulated round trip.
+    """
+    from bot import BasicBot
+    from fake_exchange import FakeFuturesClient
+
+    symbols = ['BTCUSDT', 'ETHUSDT']
+    server = ReplayServer(synthetic_price_messages(symbols, 10))
+    server.start()
+
+    stream = PriceStream(symbols, base_url=server.url)
+    stream.start()
+    stream.wait_connected(5.0)
+    while stream.get_price('ETHUSDT') is None:
+        time.sleep(0.01)
+
+    bot = BasicBot('fake', 'fake', client=FakeFuturesClient(latency=rest_latency))
+    bot.logger.setLevel(logging.WARNING)
+
+    rest_lookups = 50
+    start = time.perf_counter()
+    for _ in range(rest_lookups):
+        bot.get_symbol_price('BTCUSDT')
+    rest_us = (time.perf_counter() - start) / rest_lookups * 1e6
+
+    bot.attach_price_stream(stream)
+    start = time.perf_counter()
+    for _ in range(lookups):
+        bot.get_symbol_price('BTCUSDT')
+    stream_us = (time.perf_counter() - start) / lookups * 1e6
+
+    stream.stop()
+    server.stop()
+    return {'stream_lookup_us': stream_us, 'rest_lookup_us': rest_us}
+
+
+if __name__ == "__main__":
+    result = run_benchmark(rest_latency=0.05)
+    print(f"📊 Stream-backed get_symbol_price: {result['stream_lookup_us']:10.2f} µs/lookup")
+    print(f"📊 REST get_symbol_price (50ms RTT): {result['rest_lookup_us']:10.2f} µs/lookup")
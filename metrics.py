@@ -0,0 +1,294 @@
+"""
+Latency instrumentation for exchange calls.
+
+``InstrumentedClient`` wraps a ``binance.Client`` (or ``AsyncClient``) and
+records, per endpoint and symbol, the wall time of every ``futures_*``
+call and the exchange acknowledgement delay (order ``updateTime`` minus
+local send time) into ``LatencyHistogram`` instances held by ``Metrics``.
+The bot adds retry counts. Results are available in process
+(``Metrics.summary``) and as a Prometheus text-format file.
+"""
+
+import os
+import time
+import inspect
+import logging
+import threading
+from typing import Dict, Any, Optional, List, Tuple
+
+from config import Config
+
+# Histogram precision: 2**SUB_BUCKET_BITS linear sub-buckets per power of two (relative error at most 1/64, about 1.6%)
+SUB_BUCKET_BITS = 7
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_HALF_SUB_BUCKETS = _SUB_BUCKETS >> 1
+
+# Quantiles exported to Prometheus
+EXPORT_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of integer microsecond values
+
+    Values below 2**SUB_BUCKET_BITS are counted exactly; above that each
+    power-of-two range is split into 2**(SUB_BUCKET_BITS - 1) buckets, so
+    any recorded value is reported within 1/64 of its true magnitude.
+    """
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max', '_lock')
+
+    def __init__(self):
+        self.counts: List[int] = [0] * _SUB_BUCKETS
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _index(value: int) -> int:
+        if value < _SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        return _SUB_BUCKETS + (shift - 1) * _HALF_SUB_BUCKETS + (value >> shift) - _HALF_SUB_BUCKETS
+
+    @staticmethod
+    def _bucket_value(index: int) -> int:
+        """Highest value that falls into a bucket"""
+        if index < _SUB_BUCKETS:
+            return index
+        shift, offset = divmod(index - _SUB_BUCKETS, _HALF_SUB_BUCKETS)
+        return ((_HALF_SUB_BUCKETS + offset + 1) << (shift + 1)) - 1
+
+    def record(self, value: int) -> None:
+        """Record one value (negative values are clamped to 0)"""
+        value = max(int(value), 0)
+        index = self._index(value)
+        with self._lock:
+            counts = self.counts
+            if index >= len(counts):
+                counts.extend([0] * (index + 1 - len(counts)))
+            counts[index] += 1
+            if not self.count or value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+            self.count += 1
+            self.total += value
+
+    def percentile(self, q: float) -> int:
+        """Value at quantile ``q`` (0-1), accurate to the bucket width"""
+        with self._lock:
+            if not self.count:
+                return 0
+            rank = max(1, int(q * self.count + 0.5))
+            seen = 0
+            for index, bucket_count in enumerate(self.counts):
+                seen += bucket_count
+                if seen >= rank:
+                    return min(self._bucket_value(index), self.max)
+            return self.max
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Add another histogram's counts into this one"""
+        with other._lock:
+            counts, count, total, low, high = list(other.counts), other.count, other.total, other.min, other.max
+        if not count:
+            return
+        with self._lock:
+            if len(counts) > len(self.counts):
+                self.counts.extend([0] * (len(counts) - len(self.counts)))
+            for index, bucket_count in enumerate(counts):
+                self.counts[index] += bucket_count
+            self.min = min(self.min, low) if self.count else low
+            self.max = max(self.max, high)
+            self.count += count
+            self.total += total
+
+    def snapshot(self) -> Dict[str, float]:
+        """Summary statistics in microseconds"""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min,
+            'p50': self.percentile(0.5),
+            'p90': self.percentile(0.9),
+            'p99': self.percentile(0.99),
+            'p999': self.percentile(0.999),
+            'max': self.max,
+        }
+
+
+class Metrics:
+    """Latency histograms and counters keyed by (name, endpoint, symbol)"""
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self.histograms: Dict[Tuple[str, str, str], LatencyHistogram] = {}
+        self.counters: Dict[Tuple[str, str, str], int] = {}
+        self.logger = logging.getLogger('TradingBot')
+        self._lock = threading.Lock()
+        self._dump_stop: Optional[threading.Event] = None
+
+    def observe(self, name: str, endpoint: str, symbol: str, seconds: float) -> None:
+        """Record a duration"""
+        key = (name, endpoint, symbol)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, LatencyHistogram())
+        histogram.record(seconds * 1e6)
+
+    def increment(self, name: str, endpoint: str, symbol: str = '', amount: int = 1) -> None:
+        """Add to a counter"""
+        key = (name, endpoint, symbol)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def histogram(self, name: str, endpoint: str, symbol: Optional[str] = None) -> LatencyHistogram:
+        """Histogram for one endpoint, merged across symbols unless ``symbol`` is given"""
+        merged = LatencyHistogram()
+        for (key_name, key_endpoint, key_symbol), histogram in list(self.histograms.items()):
+            if key_name == name and key_endpoint == endpoint and symbol in (None, key_symbol):
+                merged.merge(histogram)
+        return merged
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-endpoint/symbol latency percentiles (µs) and counters"""
+        result: Dict[str, Dict[str, Any]] = {}
+        for (name, endpoint, symbol), histogram in sorted(self.histograms.items()):
+            result.setdefault(f"{endpoint} {symbol}".strip(), {})[name] = histogram.snapshot()
+        with self._lock:
+            counters = sorted(self.counters.items())
+        for (name, endpoint, symbol), value in counters:
+            result.setdefault(f"{endpoint} {symbol}".strip(), {})[name] = value
+        return result
+
+    def prometheus_text(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        by_name: Dict[str, List[Tuple[str, str, LatencyHistogram]]] = {}
+        for (name, endpoint, symbol), histogram in sorted(self.histograms.items()):
+            by_name.setdefault(name, []).append((endpoint, symbol, histogram))
+        for name, series in by_name.items():
+            metric = f"bot_{name}_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for endpoint, symbol, histogram in series:
+                labels = f'endpoint="{endpoint}",symbol="{symbol}"'
+                for q in EXPORT_QUANTILES:
+                    lines.append(f'{metric}{{{labels},quantile="{q}"}} {histogram.percentile(q) / 1e6:.6f}')
+                lines.append(f"{metric}_sum{{{labels}}} {histogram.total / 1e6:.6f}")
+                lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+
+        with self._lock:
+            counters = sorted(self.counters.items())
+        seen = set()
+        for (name, endpoint, symbol), value in counters:
+            metric = f"bot_{name}_total"
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f'{metric}{{endpoint="{endpoint}",symbol="{symbol}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str = Config.METRICS_FILE) -> None:
+        """Atomically write the Prometheus text dump (node_exporter textfile format)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+    def start_dump(self, path: str = Config.METRICS_FILE, interval: float = Config.METRICS_DUMP_INTERVAL) -> None:
+        """Rewrite the Prometheus dump every ``interval`` seconds on a background thread"""
+        self.stop_dump()
+        stop = self._dump_stop = threading.Event()
+
+        def dump_loop():
+            while not stop.wait(interval):
+                try:
+                    self.write_prometheus(path)
+                except Exception as e:
+                    self.logger.warning(f"Error writing metrics dump: {e}")
+
+        threading.Thread(target=dump_loop, name='MetricsDump', daemon=True).start()
+
+    def stop_dump(self) -> None:
+        if self._dump_stop is not None:
+            self._dump_stop.set()
+            self._dump_stop = None
+
+
+def _symbol_of(params: Dict[str, Any]) -> str:
+    symbol = params.get('symbol')
+    if symbol is None and params.get('batchOrders'):
+        symbol = params['batchOrders'][0].get('symbol')
+    return symbol or ''
+
+
+def _record_ack(metrics: Metrics, endpoint: str, symbol: str, sent_ms: float, result: Any) -> None:
+    """Record exchange acknowledgement delay for order responses"""
+    for order in (result if isinstance(result, list) else (result,)):
+        if isinstance(order, dict):
+            acked_ms = order.get('updateTime') or order.get('transactTime')
+            if acked_ms:
+                metrics.observe('ack', endpoint, symbol, (acked_ms - sent_ms) / 1e3)
+
+
+class InstrumentedClient:
+    """Proxy that times every ``futures_*`` call of a client into a Metrics registry
+
+    Coroutine methods (``binance.AsyncClient``) get an async wrapper. Other
+    attributes are passed through unchanged.
+    """
+
+    def __init__(self, client: Any, metrics: Metrics):
+        self.__dict__['_client'] = client
+        self.__dict__['_metrics'] = metrics
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if not name.startswith('futures_') or not callable(attr):
+            return attr
+
+        metrics = self._metrics
+        is_order = 'order' in name and 'get' not in name
+
+        if inspect.iscoroutinefunction(attr):
+            async def instrumented(*args, **params):
+                symbol = _symbol_of(params)
+                sent_ms = time.time() * 1000
+                start = time.perf_counter()
+                try:
+                    result = await attr(*args, **params)
+                except Exception:
+                    metrics.increment('errors', name, symbol)
+                    raise
+                finally:
+                    metrics.observe('request', name, symbol, time.perf_counter() - start)
+                if is_order:
+                    _record_ack(metrics, name, symbol, sent_ms, result)
+                return result
+        else:
+            def instrumented(*args, **params):
+                symbol = _symbol_of(params)
+                sent_ms = time.time() * 1000
+                start = time.perf_counter()
+                try:
+                    result = attr(*args, **params)
+                except Exception:
+                    metrics.increment('errors', name, symbol)
+                    raise
+                finally:
+                    metrics.observe('request', name, symbol, time.perf_counter() - start)
+                if is_order:
+                    _record_ack(metrics, name, symbol, sent_ms, result)
+                return result
+
+        instrumented.__name__ = name
+        # Cache the wrapper so later lookups skip __getattr__
+        self.__dict__[name] = instrumented
+        return instrumented
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._client, name, value)
@@ -0,0 +1,405 @@
+"""
+Local futures order book maintained from depth-diff streams.
+
+``OrderBook`` holds each side as two parallel sorted ``array('d')`` columns
+(price key and quantity) with the best level at the end, so best bid/ask is
+O(1), a level update is a binary search plus a short tail move, top-N is
+O(N) and the VWAP to fill a quantity walks only the levels it consumes.
+
+``DepthBook`` keeps an ``OrderBook`` in sync with the exchange: REST
+snapshot, buffered ``<symbol>@depth`` diffs, sequence-gap detection and
+automatic resync.
+"""
+
+import json
+import time
+import logging
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Any, Optional, List, Tuple, Callable
+
+from config import Config
+from market_data import WebSocketStream, combined_stream_url, stream_base_url
+
+
+class SequenceGapError(Exception):
+    """Raised when a depth diff does not follow the book's last update"""
+
+
+class BookSide:
+    """One side of the book; best level is the last element"""
+
+    __slots__ = ('sign', 'keys', 'qtys')
+
+    def __init__(self, is_bid: bool):
+        # Bids are stored by price, asks by -price, so both ascend towards the best level
+        self.sign = 1.0 if is_bid else -1.0
+        self.keys = array('d')
+        self.qtys = array('d')
+
+    def load(self, levels: List[List[str]]) -> None:
+        """Replace the side with snapshot levels"""
+        sign = self.sign
+        pairs = sorted((float(p) * sign, float(q)) for p, q in levels if float(q) > 0)
+        self.keys = array('d', [k for k, _ in pairs])
+        self.qtys = array('d', [q for _, q in pairs])
+
+    def update(self, price: float, qty: float) -> None:
+        """Set the quantity at a price level (0 removes the level)"""
+        keys = self.keys
+        key = price * self.sign
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            if qty:
+                self.qtys[i] = qty
+            else:
+                del keys[i]
+                del self.qtys[i]
+        elif qty:
+            keys.insert(i, key)
+            self.qtys.insert(i, qty)
+
+    def best(self) -> Optional[Tuple[float, float]]:
+        if not self.keys:
+            return None
+        return self.keys[-1] * self.sign, self.qtys[-1]
+
+    def top(self, n: int) -> List[Tuple[float, float]]:
+        keys, qtys, sign = self.keys, self.qtys, self.sign
+        size = len(keys)
+        return [(keys[i] * sign, qtys[i]) for i in range(size - 1, max(size - n, 0) - 1, -1)]
+
+    def vwap(self, quantity: float) -> Tuple[float, float]:
+        """Return (vwap, filled) for taking ``quantity`` from this side"""
+        keys, qtys, sign = self.keys, self.qtys, self.sign
+        remaining = quantity
+        notional = 0.0
+        i = len(keys) - 1
+        while remaining > 0 and i >= 0:
+            take = qtys[i] if qtys[i] < remaining else remaining
+            notional += take * keys[i] * sign
+            remaining -= take
+            i -= 1
+        filled = quantity - remaining
+        return (notional / filled if filled else 0.0), filled
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class OrderBook:
+    """Order book for one symbol built from a snapshot plus depth diffs"""
+
+    def __init__(self, symbol: str):
+        """Initialize an empty (unsynced) book"""
+        self.symbol = symbol.upper()
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self.last_update_id = 0
+        self.synced = False
+        self._first_diff = True
+
+    def apply_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        """Load a REST depth snapshot (``futures_order_book`` payload)"""
+        self.bids.load(snapshot['bids'])
+        self.asks.load(snapshot['asks'])
+        self.last_update_id = snapshot['lastUpdateId']
+        self.synced = True
+        self._first_diff = True
+
+    def apply_diff(self, event: Dict[str, Any]) -> bool:
+        """Apply a depthUpdate event
+
+        Returns False if the event predates the book and was skipped. On a
+        sequence gap the book is marked unsynced and a ``SequenceGapError``
+        is raised; reload a snapshot before applying more diffs.
+        """
+        if not self.synced:
+            raise SequenceGapError(f"{self.symbol} book is not synced")
+
+        first_id, final_id = event['U'], event['u']
+        if final_id < self.last_update_id:
+            return False
+
+        if self._first_diff:
+            # First diff must straddle the snapshot's lastUpdateId
+            if first_id > self.last_update_id:
+                self.synced = False
+                raise SequenceGapError(
+                    f"{self.symbol} first diff {first_id}-{final_id} does not cover snapshot {self.last_update_id}")
+            self._first_diff = False
+        elif event['pu'] != self.last_update_id:
+            self.synced = False
+            raise SequenceGapError(
+                f"{self.symbol} gap: expected pu={self.last_update_id}, got {event['pu']}")
+
+        update_bid = self.bids.update
+        for price, qty in event['b']:
+            update_bid(float(price), float(qty))
+        update_ask = self.asks.update
+        for price, qty in event['a']:
+            update_ask(float(price), float(qty))
+
+        self.last_update_id = final_id
+        return True
+
+    def best_bid(self) -> Optional[Tuple[float, float]]:
+        return self.bids.best()
+
+    def best_ask(self) -> Optional[Tuple[float, float]]:
+        return self.asks.best()
+
+    def mid_price(self) -> Optional[float]:
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def top(self, n: int = 5) -> Dict[str, List[Tuple[float, float]]]:
+        """Return the best ``n`` levels per side, best first"""
+        return {'bids': self.bids.top(n), 'asks': self.asks.top(n)}
+
+    def vwap(self, side: str, quantity: float) -> Tuple[float, float]:
+        """Return (vwap, filled) for a market order of ``quantity`` on ``side``
+
+        A BUY takes liquidity from the asks, a SELL from the bids.
+        """
+        book_side = self.asks if side.upper() == 'BUY' else self.bids
+        return book_side.vwap(quantity)
+
+    def estimate_slippage(self, side: str, quantity: float) -> Dict[str, float]:
+        """Estimate the fill of a market order against the current book"""
+        vwap, filled = self.vwap(side, quantity)
+        mid = self.mid_price()
+        slippage_bps = 0.0
+        if mid and filled:
+            slippage_bps = abs(vwap - mid) / mid * 10000
+        return {
+            'vwap': vwap,
+            'filled': filled,
+            'unfilled': quantity - filled,
+            'mid_price': mid or 0.0,
+            'slippage_bps': slippage_bps,
+        }
+
+
+class DepthBook:
+    """OrderBook kept in sync with the exchange over the depth-diff stream"""
+
+    def __init__(self, client: Any, symbol: str, testnet: bool = True,
+                 base_url: Optional[str] = None, snapshot_limit: int = Config.DEPTH_SNAPSHOT_LIMIT):
+        """Initialize the depth book
+
+        ``client`` is a ``binance.Client`` (e.g. ``BasicBot.client``) used
+        for REST snapshots.
+        """
+        self.client = client
+        self.symbol = symbol.upper()
+        self.snapshot_limit = snapshot_limit
+        self.book = OrderBook(self.symbol)
+        self.resyncs = 0
+        self.logger = logging.getLogger('TradingBot')
+        self._lock = threading.Lock()
+        self._buffer: List[Dict[str, Any]] = []
+        self._resyncing = False
+        self._listeners: List[Callable[['DepthBook'], None]] = []
+        # Called with every REST snapshot before it is applied (e.g. by a recorder)
+        self.on_snapshot: Optional[Callable[[Dict[str, Any]], None]] = None
+
+        url = combined_stream_url(base_url or stream_base_url(testnet),
+                                  [f"{self.symbol.lower()}@depth@100ms"])
+        self.stream = WebSocketStream(url, self.handle_message, on_connect=self._on_connect)
+
+    def add_listener(self, callback: Callable[['DepthBook'], None]) -> None:
+        """Call ``callback(depth_book)`` after every applied diff (on the stream thread)"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[['DepthBook'], None]) -> None:
+        self._listeners.remove(callback)
+
+    def start(self) -> None:
+        """Start streaming; the snapshot is fetched once the stream is up"""
+        self.stream.start()
+
+    def stop(self) -> None:
+        """Stop streaming"""
+        self.stream.stop()
+
+    def _on_connect(self) -> None:
+        # Anything missed while disconnected invalidates the book
+        with self._lock:
+            self.book.synced = False
+        self.resync()
+
+    def resync(self) -> None:
+        """Fetch a fresh snapshot and replay buffered diffs on top of it"""
+        with self._lock:
+            if self._resyncing:
+                return
+            self._resyncing = True
+            self._buffer.clear()
+
+        try:
+            snapshot = self.client.futures_order_book(symbol=self.symbol, limit=self.snapshot_limit)
+        except Exception as e:
+            self.logger.error(f"Error fetching {self.symbol} depth snapshot: {e}")
+            with self._lock:
+                self._resyncing = False
+            return
+
+        if self.on_snapshot is not None:
+            try:
+                self.on_snapshot(snapshot)
+            except Exception as e:
+                self.logger.error(f"Depth snapshot callback error: {e}")
+
+        if not self.load_snapshot(snapshot):
+            # Snapshot was older than the buffered diffs; back off briefly and try again
+            timer = threading.Timer(Config.STREAM_RECONNECT_DELAY, self.resync)
+            timer.daemon = True
+            timer.start()
+
+    def load_snapshot(self, snapshot: Dict[str, Any]) -> bool:
+        """Load a depth snapshot and apply the diffs buffered since; False if they do not line up"""
+        with self._lock:
+            self.book.apply_snapshot(snapshot)
+            buffered, self._buffer = self._buffer, []
+            self._resyncing = False
+            self.resyncs += 1
+            try:
+                for event in buffered:
+                    self.book.apply_diff(event)
+            except SequenceGapError as e:
+                self.logger.warning(f"Depth resync failed, retrying: {e}")
+                return False
+            self.logger.info(f"{self.symbol} order book synced at {self.book.last_update_id}")
+            return True
+
+    def handle_message(self, message: Dict[str, Any]) -> None:
+        """Apply one depthUpdate message (combined-stream or raw)"""
+        event = message.get('data', message)
+        gap = False
+        with self._lock:
+            if self._resyncing or not self.book.synced:
+                self._buffer.append(event)
+                return
+            try:
+                self.book.apply_diff(event)
+            except SequenceGapError as e:
+                self.logger.warning(str(e))
+                gap = True
+
+        if gap:
+            threading.Thread(target=self.resync, daemon=True).start()
+            return
+
+        for callback in self._listeners:
+            try:
+                callback(self)
+            except Exception as e:
+                self.logger.error(f"Order book listener error: {e}")
+
+    def best_bid(self) -> Optional[Tuple[float, float]]:
+        with self._lock:
+            return self.book.best_bid()
+
+    def best_ask(self) -> Optional[Tuple[float, float]]:
+        with self._lock:
+            return self.book.best_ask()
+
+    def top(self, n: int = 5) -> Dict[str, List[Tuple[float, float]]]:
+        with self._lock:
+            return self.book.top(n)
+
+    def estimate_slippage(self, side: str, quantity: float) -> Dict[str, float]:
+        with self._lock:
+            if not self.book.synced:
+                raise SequenceGapError(f"{self.symbol} book is resyncing")
+            return self.book.estimate_slippage(side, quantity)
+
+
+def synthetic_depth_diffs(count: int, levels: int = 500, mid: float = 60000.0,
+                          tick: float = 0.1, changes: int = 10) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Generate a snapshot and ``count`` sequential depthUpdate events"""
+    import random
+    rng = random.Random(42)
+
+    snapshot = {
+        'lastUpdateId': 1000,
+        'bids': [[f"{mid - (i + 1) * tick:.1f}", f"{rng.uniform(0.01, 5):.3f}"] for i in range(levels)],
+        'asks': [[f"{mid + (i + 1) * tick:.1f}", f"{rng.uniform(0.01, 5):.3f}"] for i in range(levels)],
+    }
+
+    # The first event straddles the snapshot, as on the live stream
+    events = []
+    last_id = 998
+    for _ in range(count):
+        bids, asks = [], []
+        for _ in range(changes):
+            offset = int(rng.expovariate(0.05)) + 1
+            qty = '0' if rng.random() < 0.2 else f"{rng.uniform(0.01, 5):.3f}"
+            if rng.random() < 0.5:
+                bids.append([f"{mid - offset * tick:.1f}", qty])
+            else:
+                asks.append([f"{mid + offset * tick:.1f}", qty])
+        events.append({'e': 'depthUpdate', 'E': 0, 'T': 0, 's': 'BTCUSDT',
+                       'U': last_id + 1, 'u': last_id + 5, 'pu': last_id, 'b': bids, 'a': asks})
+        last_id += 5
+    return snapshot, events
+
+
+def run_benchmark(count: int = 100000, diff_file: Optional[str] = None) -> Dict[str, float]:
+    """Replay a depth-diff JSON-lines file through OrderBook and measure throughput
+
+    Each line is one depthUpdate event; the first line may be a snapshot
+    (an object with ``lastUpdateId``). Without ``diff_file`` a synthetic file
+    is generated. Timing includes JSON decoding of every line.
+    """
+    import os
+    import tempfile
+
+    cleanup = diff_file is None
+    if diff_file is None:
+        snapshot, events = synthetic_depth_diffs(count)
+        fd, diff_file = tempfile.mkstemp(suffix='.jsonl')
+        with os.fdopen(fd, 'w') as f:
+            f.write(json.dumps(snapshot) + '\n')
+            for event in events:
+                f.write(json.dumps(event) + '\n')
+
+    with open(diff_file, encoding='utf-8') as f:
+        lines = f.readlines()
+    if cleanup:
+        os.remove(diff_file)
+
+    book = OrderBook('BTCUSDT')
+    book.apply_snapshot(json.loads(lines[0]))
+
+    start = time.perf_counter()
+    for line in lines[1:]:
+        book.apply_diff(json.loads(line))
+    elapsed = time.perf_counter() - start
+
+    updates = len(lines) - 1
+    start = time.perf_counter()
+    for _ in range(10000):
+        book.estimate_slippage('BUY', 2.5)
+    vwap_us = (time.perf_counter() - start) / 10000 * 1e6
+
+    return {
+        'updates': updates,
+        'updates_per_second': updates / elapsed,
+        'apply_us': elapsed / updates * 1e6,
+        'vwap_us': vwap_us,
+        'levels': len(book.bids) + len(book.asks),
+    }
+
+
+if __name__ == "__main__":
+    result = run_benchmark()
+    target = 10000
+    status = "✅" if result['updates_per_second'] >= target else "❌"
+    print(f"📊 Replayed {result['updates']} diffs: {result['updates_per_second']:,.0f} updates/s "
+          f"({result['apply_us']:.1f} µs each) {status} target {target:,}/s")
+    print(f"📊 VWAP-to-fill estimate: {result['vwap_us']:.2f} µs over {result['levels']} levels")
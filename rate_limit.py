@@ -0,0 +1,250 @@
+"""
+Client-side rate-limit governor for the Binance Futures REST API.
+
+``RateLimitGovernor`` keeps token buckets for request weight and order
+counts, synchronised from the ``X-MBX-USED-WEIGHT-1M`` and
+``X-MBX-ORDER-COUNT-*`` response headers, and admits calls through a
+priority queue (cancels, then new orders, then informational calls).
+``GovernedClient`` wraps a ``binance.Client`` so every ``futures_*`` call
+goes through the governor.
+"""
+
+import time
+import heapq
+import logging
+import threading
+from typing import Dict, Any, Optional, Callable, Union
+
+from config import Config
+
+# Admission priorities (lower goes first)
+PRIORITY_CANCEL = 0
+PRIORITY_ORDER = 1
+PRIORITY_INFO = 2
+
+# Request weight per client method; callables receive the call params
+ENDPOINT_WEIGHTS: Dict[str, Union[int, Callable[[Dict[str, Any]], int]]] = {
+    'futures_account': 5,
+    'futures_account_balance': 5,
+    'futures_position_information': 5,
+    'futures_exchange_info': 1,
+    'futures_symbol_ticker': lambda p: 1 if p.get('symbol') else 2,
+    'futures_orderbook_ticker': lambda p: 2 if p.get('symbol') else 5,
+    'futures_mark_price': lambda p: 1 if p.get('symbol') else 10,
+    'futures_ticker': lambda p: 1 if p.get('symbol') else 40,
+    'futures_get_open_orders': lambda p: 1 if p.get('symbol') else 40,
+    'futures_order_book': lambda p: {5: 2, 10: 2, 20: 2, 50: 2, 100: 5, 500: 10}.get(p.get('limit', 500), 20),
+    'futures_klines': lambda p: 1 if p.get('limit', 500) < 100 else 2 if p.get('limit', 500) < 500
+                                else 5 if p.get('limit', 500) <= 1000 else 10,
+    'futures_place_batch_order': 5,
+    'futures_get_all_orders': 5,
+}
+
+# Methods that count against the order-rate limits
+ORDER_METHODS = {'futures_create_order', 'futures_place_batch_order'}
+
+
+def classify_call(method: str, params: Dict[str, Any]) -> tuple:
+    """Return (priority, weight, order_count) for a client method call"""
+    weight = ENDPOINT_WEIGHTS.get(method, 1)
+    if callable(weight):
+        weight = weight(params)
+
+    if 'cancel' in method:
+        return PRIORITY_CANCEL, weight, 0
+    if method in ORDER_METHODS:
+        orders = len(params.get('batchOrders', ())) or 1
+        return PRIORITY_ORDER, weight, orders
+    return PRIORITY_INFO, weight, 0
+
+
+class TokenBucket:
+    """Continuously refilling token bucket"""
+
+    __slots__ = ('capacity', 'rate', 'tokens', 'updated')
+
+    def __init__(self, capacity: float, window: float):
+        self.capacity = capacity
+        self.rate = capacity / window
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 if they are now)"""
+        missing = amount - self.tokens
+        return missing / self.rate if missing > 0 else 0.0
+
+    def cap_used(self, used: float) -> None:
+        """Align with the exchange's view of how much of the window is used"""
+        self.tokens = min(self.tokens, self.capacity - used)
+
+
+class RateLimitGovernor:
+    """Token-bucket admission control for REST weight and order counts"""
+
+    def __init__(self, weight_limit: int = Config.RATE_LIMIT_WEIGHT_1M,
+                 order_limit_10s: int = Config.RATE_LIMIT_ORDERS_10S,
+                 order_limit_1m: int = Config.RATE_LIMIT_ORDERS_1M,
+                 safety: float = Config.RATE_LIMIT_SAFETY):
+        """Initialize the governor
+
+        Limits are the exchange's; ``safety`` (0-1) is the fraction of them
+        the governor will actually use.
+        """
+        self.weight = TokenBucket(weight_limit * safety, 60.0)
+        self.orders_10s = TokenBucket(order_limit_10s * safety, 10.0)
+        self.orders_1m = TokenBucket(order_limit_1m * safety, 60.0)
+        self.safety = safety
+        self.paused_until = 0.0
+        self.used_weight_1m = 0
+        self.order_count_10s = 0
+        self.order_count_1m = 0
+        self.throttled = 0
+        self.bans = 0
+        self.logger = logging.getLogger('TradingBot')
+        self._cond = threading.Condition()
+        self._waiters: list = []
+        self._sequence = 0
+
+    def acquire(self, priority: int, weight: int, orders: int = 0) -> None:
+        """Block until the call may be sent"""
+        with self._cond:
+            # Fast path: nobody queued and enough headroom
+            if not self._waiters and self._try_take(weight, orders) == 0.0:
+                return
+
+            self._sequence += 1
+            ticket = (priority, self._sequence)
+            heapq.heappush(self._waiters, ticket)
+            self.throttled += 1
+            try:
+                while True:
+                    if self._waiters[0] == ticket:
+                        wait = self._try_take(weight, orders)
+                        if wait == 0.0:
+                            return
+                    else:
+                        wait = None
+                    self._cond.wait(wait)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def _try_take(self, weight: int, orders: int) -> float:
+        """Take tokens if available; otherwise return seconds to wait (caller holds the lock)"""
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+
+        self.weight.refill(now)
+        wait = self.weight.wait_time(weight)
+        if orders:
+            self.orders_10s.refill(now)
+            self.orders_1m.refill(now)
+            wait = max(wait, self.orders_10s.wait_time(orders), self.orders_1m.wait_time(orders))
+        if wait > 0:
+            return wait
+
+        self.weight.tokens -= weight
+        if orders:
+            self.orders_10s.tokens -= orders
+            self.orders_1m.tokens -= orders
+        return 0.0
+
+    def update_from_headers(self, headers: Any) -> None:
+        """Sync buckets from X-MBX-USED-WEIGHT-1M / X-MBX-ORDER-COUNT-* headers"""
+        used_weight = headers.get('X-MBX-USED-WEIGHT-1M')
+        count_10s = headers.get('X-MBX-ORDER-COUNT-10S')
+        count_1m = headers.get('X-MBX-ORDER-COUNT-1M')
+        with self._cond:
+            if used_weight is not None:
+                self.used_weight_1m = int(used_weight)
+                self.weight.cap_used(self.used_weight_1m)
+            if count_10s is not None:
+                self.order_count_10s = int(count_10s)
+                self.orders_10s.cap_used(self.order_count_10s)
+            if count_1m is not None:
+                self.order_count_1m = int(count_1m)
+                self.orders_1m.cap_used(self.order_count_1m)
+
+    def on_rate_limited(self, status_code: int, retry_after: Optional[float] = None) -> None:
+        """Pause all calls after an HTTP 429 (rate limited) or 418 (IP banned)"""
+        pause = retry_after if retry_after else (60.0 if status_code == 418 else 10.0)
+        with self._cond:
+            self.paused_until = max(self.paused_until, time.monotonic() + pause)
+            self.weight.tokens = 0
+            self.bans += 1
+            self._cond.notify_all()
+        self.logger.warning(f"HTTP {status_code} from exchange, pausing requests for {pause:.0f}s")
+
+    def headroom(self) -> Dict[str, Any]:
+        """Live view of the remaining rate-limit capacity"""
+        with self._cond:
+            now = time.monotonic()
+            self.weight.refill(now)
+            self.orders_10s.refill(now)
+            self.orders_1m.refill(now)
+            return {
+                'weight_available': max(self.weight.tokens, 0.0),
+                'weight_capacity': self.weight.capacity,
+                'weight_headroom_pct': max(self.weight.tokens, 0.0) / self.weight.capacity * 100,
+                'orders_10s_available': max(self.orders_10s.tokens, 0.0),
+                'orders_1m_available': max(self.orders_1m.tokens, 0.0),
+                'used_weight_1m': self.used_weight_1m,
+                'order_count_10s': self.order_count_10s,
+                'order_count_1m': self.order_count_1m,
+                'queued': len(self._waiters),
+                'throttled_total': self.throttled,
+                'bans_total': self.bans,
+                'paused_for': max(self.paused_until - now, 0.0),
+            }
+
+
+class GovernedClient:
+    """Proxy that sends every ``futures_*`` call of a client through a governor
+
+    Other attributes are passed through to the wrapped client unchanged.
+    Header sync reads ``client.response`` on the calling thread, so with
+    concurrent calls the client must keep it per thread, as
+    ``startup.create_client`` and the lean transport do.
+    """
+
+    def __init__(self, client: Any, governor: RateLimitGovernor):
+        self.__dict__['_client'] = client
+        self.__dict__['_governor'] = governor
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if not name.startswith('futures_') or not callable(attr):
+            return attr
+
+        client, governor = self._client, self._governor
+
+        def governed(*args, **params):
+            governor.acquire(*classify_call(name, params))
+            try:
+                result = attr(*args, **params)
+            except Exception as e:
+                status_code = getattr(e, 'status_code', None)
+                if status_code in (418, 429):
+                    response = getattr(e, 'response', None)
+                    retry_after = response.headers.get('Retry-After') if response is not None else None
+                    governor.on_rate_limited(status_code, float(retry_after) if retry_after else None)
+                raise
+            response = getattr(client, 'response', None)
+            if response is not None:
+                governor.update_from_headers(response.headers)
+            return result
+
+        governed.__name__ = name
+        # Cache the wrapper so later lookups skip __getattr__
+        self.__dict__[name] = governed
+        return governed
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._client, name, value)
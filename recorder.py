@@ -0,0 +1,524 @@
+"""
+Capture and replay of the streams the bot consumes.
+
+``Recorder`` appends stream messages to a compact binary file made of
+fixed-width 64-byte slots. markPrice and bookTicker updates take one slot.
+A depthUpdate takes a header slot plus one slot per four price levels.
+Anything else (order and account events, depth snapshots) is stored as
+JSON in as many slots as it needs. Slots are grouped into chunks, and each
+chunk is optionally zlib-compressed and decodable on its own. A sidecar
+``.idx`` file holds each chunk's first and last receive timestamp and its
+offset, so a replay can seek straight to a point in time. Encoding
+happens on the stream thread; compression and disk writes happen on a
+background thread.
+
+``Replayer`` reads a recording back and feeds it to ``PriceStream``,
+``DepthBook`` and ``UserDataStream`` / ``OrderStateStore`` consumers,
+either as fast as possible or paced at (a multiple of) real time.
+Numeric fields of the compact records come back as canonical float
+strings (``'60000.1'`` rather than ``'60000.10'``).
+"""
+
+import os
+import json
+import time
+import zlib
+import queue
+import atexit
+import bisect
+import struct
+import logging
+import threading
+from typing import Dict, Any, Optional, List, Callable, Iterator, Tuple
+
+from config import Config
+
+MAGIC = b'BOTREC01'
+FLAG_ZLIB = 1
+SLOT_SIZE = 64
+
+# File header: magic, flags, slot size
+FILE_HEADER = struct.Struct('<8sII')
+# Chunk header: stored payload bytes, slots, first and last receive time (ns)
+CHUNK_HEADER = struct.Struct('<IIqq')
+# Index entry: first and last receive time (ns), chunk offset
+INDEX_ENTRY = struct.Struct('<qqQ')
+
+# Record slot: receive time (ns), event time (ms), kind, flags, symbol id, count, id, four values
+RECORD = struct.Struct('<qqBBHIqdddd')
+# Symbol definition slot: same prefix, name in place of the values
+SYMBOL_RECORD = struct.Struct('<qqBBHIq32s')
+# Continuation slot of a depth record: four (price, qty) levels
+LEVELS = struct.Struct('<8d')
+
+KIND_SYMBOL = 0
+KIND_MARK = 1
+KIND_BOOK_TICKER = 2
+KIND_DEPTH = 3
+KIND_JSON = 4
+
+# Events handed to each kind of consumer on replay
+PRICE_EVENTS = ('markPriceUpdate', 'bookTicker')
+DEPTH_EVENTS = ('depthUpdate', 'depthSnapshot')
+USER_EVENTS = ('ORDER_TRADE_UPDATE', 'ACCOUNT_UPDATE')
+
+
+def _num(value: float) -> str:
+    return repr(value)
+
+
+def _slots_for(size: int) -> int:
+    return -(-size // SLOT_SIZE)
+
+
+class _ChunkEncoder:
+    """Encodes messages into the slots of one chunk, with chunk-local symbol ids"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.slots = 0
+        self.first_ts = 0
+        self.last_ts = 0
+        self._symbols: Dict[str, int] = {}
+
+    def _symbol(self, symbol: str, ts: int) -> int:
+        symbol_id = self._symbols.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._symbols[symbol] = len(self._symbols)
+            name = symbol.encode()
+            self.buffer += SYMBOL_RECORD.pack(ts, 0, KIND_SYMBOL, 0, symbol_id, len(name), 0, name)
+            self.slots += 1
+        return symbol_id
+
+    def add(self, event: Dict[str, Any], ts: int) -> None:
+        if not self.slots:
+            self.first_ts = ts
+        self.last_ts = ts
+        kind = event.get('e')
+        buffer = self.buffer
+        if kind == 'markPriceUpdate':
+            symbol_id = self._symbol(event['s'], ts)
+            buffer += RECORD.pack(ts, event.get('E', 0), KIND_MARK, 0, symbol_id, 0, event.get('T', 0),
+                                  float(event['p']), float(event.get('i', 0)), float(event.get('r') or 0),
+                                  float(event.get('P', 0)))
+            self.slots += 1
+        elif kind == 'bookTicker':
+            symbol_id = self._symbol(event['s'], ts)
+            buffer += RECORD.pack(ts, event.get('E', 0), KIND_BOOK_TICKER, 0, symbol_id, 0, event.get('u', 0),
+                                  float(event['b']), float(event['B']), float(event['a']), float(event['A']))
+            self.slots += 1
+        elif kind == 'depthUpdate' and len(event['b']) < 65536 and len(event['a']) < 65536:
+            symbol_id = self._symbol(event['s'], ts)
+            bids, asks = event['b'], event['a']
+            # Update ids stay exact as doubles up to 2**53
+            buffer += RECORD.pack(ts, event.get('E', 0), KIND_DEPTH, 0, symbol_id, len(bids) | len(asks) << 16,
+                                  event['u'], float(event['U']), float(event['pu']), float(event.get('T', 0)), 0.0)
+            for levels in (bids, asks):
+                values = [float(value) for level in levels for value in level]
+                values += [0.0] * (-len(values) % 8)
+                for i in range(0, len(values), 8):
+                    buffer += LEVELS.pack(*values[i:i + 8])
+            self.slots += 1 + _slots_for(len(bids) * 16) + _slots_for(len(asks) * 16)
+        else:
+            payload = json.dumps(event, separators=(',', ':')).encode()
+            buffer += RECORD.pack(ts, event.get('E', 0), KIND_JSON, 0, 0, len(payload), 0, 0.0, 0.0, 0.0, 0.0)
+            buffer += payload + bytes(-len(payload) % SLOT_SIZE)
+            self.slots += 1 + _slots_for(len(payload))
+
+
+def _decode_chunk(data: bytes) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (receive time ns, event) for every message in a chunk's slots"""
+    symbols: Dict[int, str] = {}
+    offset = 0
+    end = len(data)
+    unpack_record = RECORD.unpack_from
+    while offset < end:
+        ts, event_ms, kind, _, symbol_id, count, record_id, f0, f1, f2, f3 = unpack_record(data, offset)
+        offset += SLOT_SIZE
+        if kind == KIND_MARK:
+            yield ts, {'e': 'markPriceUpdate', 'E': event_ms, 's': symbols[symbol_id], 'p': _num(f0),
+                       'i': _num(f1), 'P': _num(f3), 'r': _num(f2), 'T': record_id}
+        elif kind == KIND_BOOK_TICKER:
+            yield ts, {'e': 'bookTicker', 'u': record_id, 'E': event_ms, 'T': event_ms, 's': symbols[symbol_id],
+                       'b': _num(f0), 'B': _num(f1), 'a': _num(f2), 'A': _num(f3)}
+        elif kind == KIND_DEPTH:
+            sides = []
+            for levels in (count & 0xFFFF, count >> 16):
+                slots = _slots_for(levels * 16)
+                values = struct.unpack_from(f'<{slots * 8}d', data, offset)
+                offset += slots * SLOT_SIZE
+                sides.append([[_num(values[i]), _num(values[i + 1])] for i in range(0, levels * 2, 2)])
+            yield ts, {'e': 'depthUpdate', 'E': event_ms, 'T': int(f2), 's': symbols[symbol_id], 'U': int(f0),
+                       'u': record_id, 'pu': int(f1), 'b': sides[0], 'a': sides[1]}
+        elif kind == KIND_JSON:
+            yield ts, json.loads(data[offset:offset + count])
+            offset += _slots_for(count) * SLOT_SIZE
+        elif kind == KIND_SYMBOL:
+            name = SYMBOL_RECORD.unpack_from(data, offset - SLOT_SIZE)[7]
+            symbols[symbol_id] = name[:count].decode()
+
+
+def _scan_chunks(f: Any, start: int) -> Tuple[List[Tuple[int, int, int]], int]:
+    """Read chunk headers from ``start``; returns the complete chunks and the offset after the last one"""
+    size = os.fstat(f.fileno()).st_size
+    chunks = []
+    offset = start
+    while offset + CHUNK_HEADER.size <= size:
+        f.seek(offset)
+        stored, _, first_ts, last_ts = CHUNK_HEADER.unpack(f.read(CHUNK_HEADER.size))
+        if offset + CHUNK_HEADER.size + stored > size:
+            break
+        chunks.append((first_ts, last_ts, offset))
+        offset += CHUNK_HEADER.size + stored
+    return chunks, offset
+
+
+class Recorder:
+    """Append-only binary recorder for stream messages"""
+
+    def __init__(self, path: str, compress: bool = Config.RECORD_COMPRESS,
+                 chunk_records: int = Config.RECORD_CHUNK_RECORDS,
+                 flush_interval: float = Config.RECORD_FLUSH_INTERVAL):
+        """Open (or create and append to) a recording
+
+        A chunk is written once it holds ``chunk_records`` slots, or after
+        ``flush_interval`` seconds. When an existing recording is reopened,
+        a chunk left incomplete by a crash is cut off.
+        """
+        self.path = path
+        self.chunk_records = chunk_records
+        self.flush_interval = flush_interval
+        self.messages = 0
+        self.logger = logging.getLogger('TradingBot')
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        if os.path.exists(path) and os.path.getsize(path) >= FILE_HEADER.size:
+            with open(path, 'r+b') as f:
+                magic, flags, slot_size = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+                if magic != MAGIC or slot_size != SLOT_SIZE:
+                    raise ValueError(f"{path} is not a stream recording")
+                chunks, end = _scan_chunks(f, FILE_HEADER.size)
+                f.truncate(end)
+            self.compress = bool(flags & FLAG_ZLIB)
+            with open(path + '.idx', 'wb') as index:
+                index.write(b''.join(INDEX_ENTRY.pack(*chunk) for chunk in chunks))
+        else:
+            self.compress = compress
+            with open(path, 'wb') as f:
+                f.write(FILE_HEADER.pack(MAGIC, FLAG_ZLIB if compress else 0, SLOT_SIZE))
+            open(path + '.idx', 'wb').close()
+
+        self._file = open(path, 'ab')
+        self._index = open(path + '.idx', 'ab')
+        self._encoder = _ChunkEncoder()
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name='Recorder', daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def record(self, message: Dict[str, Any], ts_ns: Optional[int] = None) -> None:
+        """Append one stream message (combined-stream wrapper or raw event)"""
+        event = message.get('data', message)
+        ts = ts_ns if ts_ns is not None else time.time_ns()
+        try:
+            with self._lock:
+                if self._closed:
+                    return
+                self._encoder.add(event, ts)
+                self.messages += 1
+                if self._encoder.slots >= self.chunk_records:
+                    self._queue.put(self._encoder)
+                    self._encoder = _ChunkEncoder()
+        except Exception as e:
+            self.logger.error(f"Error recording {event.get('e')} message: {e}")
+
+    def attach(self, stream: Any) -> None:
+        """Record every message of a ``market_data.WebSocketStream``"""
+        stream.add_message_listener(self.record)
+
+    def attach_price_stream(self, price_stream: Any) -> None:
+        """Record a ``PriceStream``'s markPrice and bookTicker messages"""
+        self.attach(price_stream.stream)
+
+    def attach_depth_book(self, depth_book: Any) -> None:
+        """Record a ``DepthBook``'s diffs and the REST snapshots it syncs from"""
+        symbol = depth_book.symbol
+
+        def on_snapshot(snapshot: Dict[str, Any]) -> None:
+            self.record({'e': 'depthSnapshot', 'E': int(time.time() * 1000), 's': symbol, **snapshot})
+
+        depth_book.on_snapshot = on_snapshot
+        self.attach(depth_book.stream)
+
+    def attach_user_stream(self, user_stream: Any) -> None:
+        """Record a started ``UserDataStream``'s order and account events"""
+        if user_stream.stream is None:
+            raise ValueError("Start the user data stream before attaching a recorder")
+        self.attach(user_stream.stream)
+
+    def flush(self) -> None:
+        """Hand the partially filled chunk to the writer"""
+        with self._lock:
+            if self._encoder.slots:
+                self._queue.put(self._encoder)
+                self._encoder = _ChunkEncoder()
+
+    def close(self) -> None:
+        """Write everything recorded so far and close the files"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._encoder.slots:
+                self._queue.put(self._encoder)
+            self._queue.put(None)
+        self._writer.join()
+        self._file.close()
+        self._index.close()
+        atexit.unregister(self.close)
+
+    def _write_loop(self) -> None:
+        while True:
+            try:
+                encoder = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self.flush()
+                continue
+            if encoder is None:
+                return
+            try:
+                self._write_chunk(encoder)
+            except Exception as e:
+                self.logger.error(f"Error writing recording chunk: {e}")
+
+    def _write_chunk(self, encoder: _ChunkEncoder) -> None:
+        payload = zlib.compress(bytes(encoder.buffer), 1) if self.compress else bytes(encoder.buffer)
+        offset = self._file.tell()
+        self._file.write(CHUNK_HEADER.pack(len(payload), encoder.slots, encoder.first_ts, encoder.last_ts))
+        self._file.write(payload)
+        self._file.flush()
+        # The index entry goes out only once its chunk is complete on disk
+        self._index.write(INDEX_ENTRY.pack(encoder.first_ts, encoder.last_ts, offset))
+        self._index.flush()
+
+
+class Replayer:
+    """Reads a recording and feeds it to stream consumers"""
+
+    def __init__(self, path: str):
+        """Open a recording and load its chunk index (rebuilt from the file if missing or stale)"""
+        self.path = path
+        self.logger = logging.getLogger('TradingBot')
+        self._consumers: List[Tuple[Callable[[Dict[str, Any]], Any], Optional[Tuple[str, ...]],
+                                    Optional[str]]] = []
+        with open(path, 'rb') as f:
+            magic, flags, slot_size = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+            if magic != MAGIC or slot_size != SLOT_SIZE:
+                raise ValueError(f"{path} is not a stream recording")
+            self.compressed = bool(flags & FLAG_ZLIB)
+
+            chunks: List[Tuple[int, int, int]] = []
+            start = FILE_HEADER.size
+            try:
+                with open(path + '.idx', 'rb') as index:
+                    data = index.read()
+                chunks = [INDEX_ENTRY.unpack_from(data, i)
+                          for i in range(0, len(data) - INDEX_ENTRY.size + 1, INDEX_ENTRY.size)]
+                if chunks:
+                    f.seek(chunks[-1][2])
+                    start = chunks[-1][2] + CHUNK_HEADER.size + CHUNK_HEADER.unpack(f.read(CHUNK_HEADER.size))[0]
+            except (OSError, struct.error):
+                chunks, start = [], FILE_HEADER.size
+            # Chunks written after the last index entry
+            tail, _ = _scan_chunks(f, start)
+            self.chunks = chunks + tail
+        self._last_ts = [chunk[1] for chunk in self.chunks]
+
+    @property
+    def start_ns(self) -> int:
+        return self.chunks[0][0] if self.chunks else 0
+
+    @property
+    def end_ns(self) -> int:
+        return self.chunks[-1][1] if self.chunks else 0
+
+    def messages(self, start_ns: Optional[int] = None,
+                 end_ns: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (receive time ns, event) in recorded order, optionally limited to a time range"""
+        first = bisect.bisect_left(self._last_ts, start_ns) if start_ns is not None else 0
+        with open(self.path, 'rb') as f:
+            for _, _, offset in self.chunks[first:]:
+                f.seek(offset)
+                stored, _, first_ts, _ = CHUNK_HEADER.unpack(f.read(CHUNK_HEADER.size))
+                if end_ns is not None and first_ts > end_ns:
+                    return
+                payload = f.read(stored)
+                for ts, event in _decode_chunk(zlib.decompress(payload) if self.compressed else payload):
+                    if start_ns is not None and ts < start_ns:
+                        continue
+                    if end_ns is not None and ts > end_ns:
+                        return
+                    yield ts, event
+
+    def add_consumer(self, callback: Callable[[Dict[str, Any]], Any], events: Optional[Tuple[str, ...]] = None,
+                     symbol: Optional[str] = None) -> None:
+        """Call ``callback(event)`` for replayed events, optionally only of some types and one symbol"""
+        self._consumers.append((callback, events, symbol))
+
+    def attach_price_stream(self, price_stream: Any) -> None:
+        """Feed markPrice and bookTicker events to a ``PriceStream`` (it need not be started)"""
+        self.add_consumer(price_stream.handle_message, PRICE_EVENTS)
+
+    def attach_depth_book(self, depth_book: Any) -> None:
+        """Feed a ``DepthBook`` its symbol's snapshots and diffs (it need not be started)"""
+        def consume(event: Dict[str, Any]) -> None:
+            if event['e'] == 'depthSnapshot':
+                depth_book.load_snapshot(event)
+            else:
+                depth_book.handle_message(event)
+
+        self.add_consumer(consume, DEPTH_EVENTS, depth_book.symbol)
+
+    def attach_user_stream(self, consumer: Any) -> None:
+        """Feed order and account events to a ``UserDataStream`` or ``OrderStateStore``"""
+        self.add_consumer(consumer.handle_message, USER_EVENTS)
+
+    def replay(self, speed: Optional[float] = None, start_ns: Optional[int] = None,
+               end_ns: Optional[int] = None) -> int:
+        """Replay into the consumers; returns the number of events replayed
+
+        ``speed`` None replays as fast as possible; 1.0 keeps the recorded
+        spacing between messages, 10.0 plays ten times faster.
+        """
+        consumers = self._consumers
+        replayed = 0
+        began = time.perf_counter()
+        first_ts = None
+        for ts, event in self.messages(start_ns, end_ns):
+            if speed:
+                if first_ts is None:
+                    first_ts = ts
+                delay = (ts - first_ts) / 1e9 / speed - (time.perf_counter() - began)
+                if delay > 0:
+                    time.sleep(delay)
+            kind = event.get('e')
+            for callback, events, symbol in consumers:
+                if (events is None or kind in events) and (symbol is None or event.get('s') == symbol):
+                    try:
+                        callback(event)
+                    except Exception as e:
+                        self.logger.error(f"Replay consumer error on {kind}: {e}")
+            replayed += 1
+        return replayed
+
+
+def recording_path(name: Optional[str] = None) -> str:
+    """Path for a new recording under Config.RECORD_DIR (timestamped by default)"""
+    name = name or time.strftime('%Y%m%d-%H%M%S')
+    return os.path.join(Config.RECORD_DIR, f"{name}.rec")
+
+
+def _synthetic_messages(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """A market-data mix like a few symbols' combined streams: 40% bookTicker, 40% depth, 19% mark, 1% orders"""
+    import random
+
+    rng = random.Random(seed)
+    symbols = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'ADAUSDT']
+    prices = {'BTCUSDT': 60000.0, 'ETHUSDT': 3000.0, 'SOLUSDT': 150.0, 'ADAUSDT': 0.45}
+    update_ids = {symbol: 1_000_000_000 for symbol in symbols}
+    messages = []
+    now = int(time.time() * 1000)
+    for i in range(count):
+        symbol = symbols[i % len(symbols)]
+        price = prices[symbol] = round(prices[symbol] * (1 + rng.gauss(0, 1e-4)), 2)
+        roll = rng.random()
+        event_ms = now + i
+        if roll < 0.4:
+            data = {'e': 'bookTicker', 'u': update_ids[symbol], 'E': event_ms, 'T': event_ms, 's': symbol,
+                    'b': f"{price - 0.1:.2f}", 'B': f"{rng.uniform(0, 5):.3f}",
+                    'a': f"{price + 0.1:.2f}", 'A': f"{rng.uniform(0, 5):.3f}"}
+            stream = f"{symbol.lower()}@bookTicker"
+        elif roll < 0.8:
+            first = update_ids[symbol] + 1
+            update_ids[symbol] += rng.randint(1, 20)
+            data = {'e': 'depthUpdate', 'E': event_ms, 'T': event_ms, 's': symbol, 'U': first,
+                    'u': update_ids[symbol], 'pu': first - 1,
+                    'b': [[f"{price - 0.1 * k:.2f}", f"{rng.uniform(0, 5):.3f}"] for k in range(1, 6)],
+                    'a': [[f"{price + 0.1 * k:.2f}", f"{rng.uniform(0, 5):.3f}"] for k in range(1, 6)]}
+            stream = f"{symbol.lower()}@depth@100ms"
+        elif roll < 0.99:
+            data = {'e': 'markPriceUpdate', 'E': event_ms, 's': symbol, 'p': f"{price:.8f}", 'P': f"{price:.8f}",
+                    'i': f"{price:.8f}", 'r': '0.00010000', 'T': now + 28_800_000}
+            stream = f"{symbol.lower()}@markPrice@1s"
+        else:
+            data = {'e': 'ORDER_TRADE_UPDATE', 'E': event_ms, 'T': event_ms, 'o': {
+                's': symbol, 'c': f"bb_{i}", 'S': 'BUY', 'o': 'LIMIT', 'f': 'GTC', 'q': '0.001', 'p': f"{price:.2f}",
+                'ap': '0', 'sp': '0', 'x': 'NEW', 'X': 'NEW', 'i': i, 'l': '0', 'z': '0', 'L': '0', 'T': event_ms}}
+            stream = None
+        messages.append({'stream': stream, 'data': data} if stream else data)
+    return messages
+
+
+def run_benchmark(count: int = 200_000) -> Dict[str, Dict[str, float]]:
+    """Record and replay a synthetic market-data mix, with and without compression
+
+    Reports the record cost per message on the calling (stream) thread,
+    the bytes per message against JSON lines, replay throughput into a
+    PriceStream, a DepthBook and an OrderStateStore, and the time to
+    start a replay from the middle of the file.
+    """
+    import tempfile
+    from market_data import PriceStream
+    from order_book import DepthBook
+    from user_stream import OrderStateStore
+
+    logging.getLogger('TradingBot').setLevel(logging.WARNING)
+    messages = _synthetic_messages(count)
+    json_bytes = sum(len(json.dumps(message)) + 1 for message in messages)
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for compress in (False, True):
+            path = os.path.join(work_dir, f"{'zlib' if compress else 'raw'}.rec")
+            recorder = Recorder(path, compress=compress)
+            began = time.perf_counter()
+            for message in messages:
+                recorder.record(message)
+            record_s = time.perf_counter() - began
+            recorder.close()
+
+            replayer = Replayer(path)
+            price_stream = PriceStream(['BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'ADAUSDT'])
+            depth_book = DepthBook(None, 'BTCUSDT')
+            # Synthetic diffs chain from here
+            depth_book.load_snapshot({'lastUpdateId': 1_000_000_001, 'bids': [], 'asks': []})
+            replayer.attach_price_stream(price_stream)
+            replayer.attach_depth_book(depth_book)
+            replayer.attach_user_stream(OrderStateStore())
+            began = time.perf_counter()
+            replayed = replayer.replay()
+            replay_s = time.perf_counter() - began
+
+            middle = (replayer.start_ns + replayer.end_ns) // 2
+            began = time.perf_counter()
+            next(replayer.messages(start_ns=middle))
+            seek_s = time.perf_counter() - began
+
+            size = os.path.getsize(path) + os.path.getsize(path + '.idx')
+            results['zlib' if compress else 'raw'] = {
+                'record_us': record_s / count * 1e6,
+                'bytes_per_msg': size / count,
+                'json_bytes_per_msg': json_bytes / count,
+                'replay_msgs_per_s': replayed / replay_s,
+                'seek_ms': seek_s * 1000,
+                'book_synced': depth_book.book.synced,
+            }
+    return results
+
+
+if __name__ == "__main__":
+    for mode, result in run_benchmark().items():
+        print(f"📊 {mode:>4}: record {result['record_us']:5.2f} µs/msg | {result['bytes_per_msg']:6.1f} B/msg "
+              f"(JSON lines {result['json_bytes_per_msg']:.1f}) | replay {result['replay_msgs_per_s']:9.0f} msg/s | "
+              f"seek to middle {result['seek_ms']:.2f} ms | book {'in sync' if result['book_synced'] else 'GAP'}")
@@ -0,0 +1,220 @@
+"""
+Pre-trade risk checks on the order hot path.
+
+``RiskEngine.check`` runs before every order leaves ``BasicBot`` and
+evaluates the limits in ``Config`` against in-memory state only: the
+reference price handed in by the bot, the ``Ledger`` totals and a
+sliding window of recent order times. A breach raises ``RiskRejected``.
+The kill switch blocks all new orders; ``BasicBot.kill_switch`` also
+cancels everything still open. It engages by itself when the session
+loss limit is hit.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict, Any, Optional, Callable, List, Tuple
+
+from config import Config
+
+
+class RiskRejected(ValueError):
+    """An order breached a pre-trade risk limit"""
+
+    def __init__(self, rule: str, message: str):
+        super().__init__(f"Risk check failed ({rule}): {message}")
+        self.rule = rule
+
+
+class RiskEngine:
+    """Pre-trade limits evaluated against the ledger and recent order flow"""
+
+    def __init__(self, ledger: Optional[Any] = None,
+                 max_order_notional: float = Config.RISK_MAX_ORDER_NOTIONAL,
+                 max_position_notional: float = Config.RISK_MAX_POSITION_NOTIONAL,
+                 max_leverage: float = Config.RISK_MAX_LEVERAGE,
+                 max_orders_per_second: int = Config.RISK_MAX_ORDERS_PER_SECOND,
+                 price_band_pct: float = Config.RISK_PRICE_BAND_PCT,
+                 max_loss: float = Config.RISK_MAX_LOSS):
+        """Initialize the engine
+
+        ``ledger`` (a ``ledger.Ledger``) supplies positions, margin balance
+        and PnL; without it only the per-order limits apply. A limit of 0
+        disables that check.
+        """
+        self.ledger = ledger
+        self.max_order_notional = max_order_notional
+        self.max_position_notional = max_position_notional
+        self.max_leverage = max_leverage
+        self.max_orders_per_second = max_orders_per_second
+        self.price_band = price_band_pct / 100
+        self.max_loss = max_loss
+        self.killed: Optional[str] = None
+        self.on_kill: Optional[Callable[[str], None]] = None
+        self.checks = 0
+        self.rejections: Dict[str, int] = {}
+        self.logger = logging.getLogger('TradingBot')
+        self._order_times: deque = deque()
+        self._lock = threading.Lock()
+
+    def _reject(self, rule: str, message: str) -> None:
+        self.rejections[rule] = self.rejections.get(rule, 0) + 1
+        raise RiskRejected(rule, message)
+
+    def check(self, symbol: str, side: str, quantity: float, price: Optional[float],
+              reference_price: float) -> None:
+        """Raise RiskRejected if the order would breach a limit; otherwise count it against the rate limit
+
+        ``price`` is the limit price (None for market orders) and
+        ``reference_price`` the current mark/last price.
+        """
+        try:
+            with self._lock:
+                self._check(symbol, side, quantity, price, reference_price)
+        except RiskRejected as e:
+            if e.rule == 'max_loss' and self.on_kill is not None:
+                # The loss limit fired on this order: cancel resting orders outside the lock
+                self.on_kill(self.killed)
+            raise
+
+    def check_batch(self, orders: List[Tuple[str, str, float, Optional[float], float]]) -> None:
+        """Check orders sent together; position and leverage limits see their combined exposure
+
+        Each order is ``(symbol, side, quantity, price, reference_price)``.
+        Raises RiskRejected for the first order that breaches a limit; the
+        orders only count against the rate limit once all of them pass.
+        """
+        pending: Dict[str, Any] = {'amounts': {}, 'gross': 0.0}
+        try:
+            with self._lock:
+                now = time.monotonic()
+                if self.max_orders_per_second:
+                    self._check_order_rate(now, len(orders))
+                for symbol, side, quantity, price, reference_price in orders:
+                    self._check(symbol, side, quantity, price, reference_price, pending)
+                if self.max_orders_per_second:
+                    self._order_times.extend([now] * len(orders))
+        except RiskRejected as e:
+            if e.rule == 'max_loss' and self.on_kill is not None:
+                self.on_kill(self.killed)
+            raise
+
+    def _check(self, symbol: str, side: str, quantity: float, price: Optional[float],
+               reference_price: float, pending: Optional[Dict[str, Any]] = None) -> None:
+        # ``pending`` carries the position and gross-notional changes of earlier orders in the same batch;
+        # check_batch handles the order rate of the whole batch itself
+        self.checks += 1
+        if self.killed is not None:
+            self._reject('kill_switch', f"trading halted: {self.killed}")
+
+        ledger = self.ledger
+        if ledger is not None and self.max_loss:
+            session_pnl = ledger.realized_pnl + ledger.unrealized_pnl - ledger.commission
+            if session_pnl < -self.max_loss:
+                self._engage(f"session loss {session_pnl:.2f} USDT beyond {self.max_loss} USDT")
+                self._reject('max_loss', self.killed)
+
+        if price is not None and self.price_band and reference_price:
+            deviation = abs(price / reference_price - 1)
+            if deviation > self.price_band:
+                self._reject('price_band', f"{symbol} price {price} is {deviation * 100:.2f}% from "
+                                           f"reference {reference_price}")
+
+        order_notional = quantity * (price or reference_price)
+        if self.max_order_notional and order_notional > self.max_order_notional:
+            self._reject('order_notional', f"{order_notional:.2f} USDT exceeds {self.max_order_notional}")
+
+        if ledger is not None:
+            position = ledger.positions.get((symbol, 'BOTH'))
+            amount = position.amount if position is not None else 0.0
+            if pending is not None:
+                amount += pending['amounts'].get(symbol, 0.0)
+            signed = quantity if side.upper() == 'BUY' else -quantity
+            # Only orders that grow the position are limited by exposure
+            added = (abs(amount + signed) - abs(amount)) * reference_price
+            if added > 0:
+                position_notional = abs(amount + signed) * reference_price
+                if self.max_position_notional and position_notional > self.max_position_notional:
+                    self._reject('position_notional', f"{symbol} position would be {position_notional:.2f} "
+                                                      f"USDT, limit {self.max_position_notional}")
+                if self.max_leverage:
+                    margin_balance = ledger.wallet_balance + ledger.unrealized_pnl
+                    gross = ledger.gross_notional + (pending['gross'] if pending is not None else 0.0)
+                    leverage = (gross + added) / margin_balance if margin_balance > 0 else float('inf')
+                    if leverage > self.max_leverage:
+                        self._reject('leverage', f"account leverage would be {leverage:.2f}x, "
+                                                 f"limit {self.max_leverage}x")
+
+        if pending is not None:
+            if ledger is not None:
+                pending['amounts'][symbol] = pending['amounts'].get(symbol, 0.0) + signed
+                pending['gross'] += added
+        elif self.max_orders_per_second:
+            now = time.monotonic()
+            self._check_order_rate(now, 1)
+            self._order_times.append(now)
+
+    def _check_order_rate(self, now: float, count: int) -> None:
+        order_times = self._order_times
+        while order_times and now - order_times[0] >= 1.0:
+            order_times.popleft()
+        if len(order_times) + count > self.max_orders_per_second:
+            self._reject('order_rate', f"more than {self.max_orders_per_second} orders per second")
+
+    def _engage(self, reason: str) -> None:
+        if self.killed is None:
+            self.killed = reason
+            self.logger.critical(f"Kill switch engaged: {reason}")
+
+    def engage_kill_switch(self, reason: str) -> None:
+        """Block all new orders"""
+        with self._lock:
+            self._engage(reason)
+
+    def reset_kill_switch(self) -> None:
+        """Allow new orders again"""
+        with self._lock:
+            if self.killed is not None:
+                self.logger.warning(f"Kill switch reset (was: {self.killed})")
+            self.killed = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Check and rejection counts"""
+        with self._lock:
+            return {'checks': self.checks, 'rejections': dict(self.rejections), 'killed': self.killed}
+
+
+def run_benchmark(orders: int = 100_000, positions: int = 50) -> Dict[str, float]:
+    """Time RiskEngine.check against a ledger holding ``positions`` open positions
+
+    Returns per-check latency percentiles in microseconds. The rate and
+    loss limits are left on but set high enough not to reject.
+    """
+    from ledger import Ledger
+    from metrics import LatencyHistogram
+
+    ledger = Ledger()
+    ledger.load_account({'totalWalletBalance': '1000000', 'positions': [
+        {'symbol': f"SYM{i}USDT", 'positionAmt': '1', 'entryPrice': '100', 'markPrice': '101', 'leverage': '10'}
+        for i in range(positions)
+    ]})
+    engine = RiskEngine(ledger, max_orders_per_second=orders * 10, max_loss=1e9)
+    histogram = LatencyHistogram()
+    perf_counter_ns = time.perf_counter_ns
+    for i in range(orders):
+        symbol = f"SYM{i % positions}USDT"
+        began = perf_counter_ns()
+        engine.check(symbol, 'BUY' if i % 2 else 'SELL', 0.5, 100.5, 101.0)
+        # Recorded in ns for sub-microsecond resolution
+        histogram.record(perf_counter_ns() - began)
+    return {'checks': histogram.count, 'mean_us': histogram.total / histogram.count / 1000,
+            'p50_us': histogram.percentile(0.5) / 1000, 'p99_us': histogram.percentile(0.99) / 1000,
+            'p999_us': histogram.percentile(0.999) / 1000, 'max_us': histogram.max / 1000}
+
+
+if __name__ == "__main__":
+    result = run_benchmark()
+    print(f"📊 {result['checks']} risk checks: p50 {result['p50_us']:.2f} µs, p99 {result['p99_us']:.2f} µs, "
+          f"p99.9 {result['p999_us']:.2f} µs, max {result['max_us']:.1f} µs")
+    print(f"{'✅' if result['p99_us'] < 50 else '❌'} p99 under the 50 µs budget")
@@ -0,0 +1,269 @@
+"""
+Whole-market price snapshots and vectorized screens.
+
+``MarketScanner`` fetches 24h statistics, book tickers and the premium
+index (mark price and funding) for every futures symbol. That is one
+all-symbols call per endpoint, and the three run in parallel. The result
+is kept as a ``MarketSnapshot`` of NumPy columns for a short TTL.
+``scan`` builds its screens (spread, 24h change, funding, volatility,
+volume) as boolean masks over those columns. A full-universe scan
+therefore costs three requests (weight 55) and a few array operations,
+rather than a request per symbol.
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Callable, Iterable
+import numpy as np
+
+from config import Config
+
+# Snapshot columns: (name, source endpoint, payload field)
+FIELDS = (
+    ('last', 'ticker', 'lastPrice'),
+    ('open', 'ticker', 'openPrice'),
+    ('high', 'ticker', 'highPrice'),
+    ('low', 'ticker', 'lowPrice'),
+    ('change_pct', 'ticker', 'priceChangePercent'),
+    ('volume', 'ticker', 'volume'),
+    ('quote_volume', 'ticker', 'quoteVolume'),
+    ('bid', 'book', 'bidPrice'),
+    ('bid_qty', 'book', 'bidQty'),
+    ('ask', 'book', 'askPrice'),
+    ('ask_qty', 'book', 'askQty'),
+    ('mark', 'premium', 'markPrice'),
+    ('index', 'premium', 'indexPrice'),
+    ('funding_rate', 'premium', 'lastFundingRate'),
+    ('next_funding_time', 'premium', 'nextFundingTime'),
+)
+
+# All-symbols client call per source endpoint
+ENDPOINTS = {
+    'ticker': 'futures_ticker',
+    'book': 'futures_orderbook_ticker',
+    'premium': 'futures_mark_price',
+}
+
+# Parkinson estimator scale: sigma = ln(high / low) / sqrt(4 ln 2)
+PARKINSON_SCALE = 1 / np.sqrt(4 * np.log(2))
+
+
+class MarketSnapshot:
+    """Per-symbol market data as NumPy columns aligned on ``symbols``
+
+    Values an endpoint did not return for a symbol are NaN, so screens
+    on them simply exclude that symbol.
+    """
+
+    def __init__(self, payloads: Dict[str, List[Dict[str, Any]]]):
+        """Build from the all-symbols payloads keyed like ENDPOINTS"""
+        names = sorted({row['symbol'] for rows in payloads.values() for row in rows})
+        self.symbols = np.array(names, dtype=str)
+        self.index = {symbol: i for i, symbol in enumerate(names)}
+        self.fetched_at = time.monotonic()
+        self.columns: Dict[str, np.ndarray] = {}
+
+        for source, rows in payloads.items():
+            positions = np.fromiter((self.index[row['symbol']] for row in rows), dtype=np.intp, count=len(rows))
+            for name, field_source, field in FIELDS:
+                if field_source != source:
+                    continue
+                column = np.full(len(names), np.nan)
+                column[positions] = np.array([row.get(field) or 'nan' for row in rows], dtype=np.float64)
+                self.columns[name] = column
+
+        for name, _, _ in FIELDS:
+            self.columns.setdefault(name, np.full(len(names), np.nan))
+        self._derive()
+
+    def _derive(self) -> None:
+        c = self.columns
+        with np.errstate(divide='ignore', invalid='ignore'):
+            c['mid'] = (c['bid'] + c['ask']) / 2
+            c['spread_bps'] = (c['ask'] - c['bid']) / c['mid'] * 1e4
+            c['basis_bps'] = (c['mark'] / c['index'] - 1) * 1e4
+            # Daily volatility from the 24h range (Parkinson)
+            c['volatility'] = np.log(c['high'] / c['low']) * PARKINSON_SCALE
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    def price(self, symbol: str) -> Optional[float]:
+        """Last traded price for a symbol, or None if it is not listed"""
+        i = self.index.get(symbol)
+        if i is None or np.isnan(self.columns['last'][i]):
+            return None
+        return float(self.columns['last'][i])
+
+    def rows(self, positions: Iterable[int]) -> List[Dict[str, Any]]:
+        """Rows at ``positions`` as dicts of plain floats"""
+        return [{'symbol': str(self.symbols[i]), **{name: float(column[i]) for name, column in self.columns.items()}}
+                for i in positions]
+
+
+class MarketScanner:
+    """All-symbols market snapshot with a TTL, and screens over it"""
+
+    def __init__(self, client: Any, ttl: float = Config.SCAN_TTL):
+        """Initialize the scanner
+
+        ``client`` is a ``binance.Client`` (or a fake with the same
+        methods). Snapshots younger than ``ttl`` seconds are reused.
+        """
+        self.client = client
+        self.ttl = ttl
+        self.logger = logging.getLogger('TradingBot')
+        self._snapshot: Optional[MarketSnapshot] = None
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=len(ENDPOINTS), thread_name_prefix='Scanner')
+
+    def snapshot(self, max_age: Optional[float] = None) -> MarketSnapshot:
+        """Return the cached snapshot, fetching a new one if it is older than ``max_age`` (default: the TTL)"""
+        max_age = self.ttl if max_age is None else max_age
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.age <= max_age:
+            return snapshot
+
+        with self._lock:
+            # Another thread may have fetched while we waited
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.age <= max_age:
+                return snapshot
+            try:
+                futures = {source: self._pool.submit(getattr(self.client, method))
+                           for source, method in ENDPOINTS.items()}
+                snapshot = MarketSnapshot({source: future.result() for source, future in futures.items()})
+            except Exception as e:
+                self.logger.error(f"Error fetching market snapshot: {e}")
+                raise
+            self._snapshot = snapshot
+        self.logger.info(f"Market snapshot loaded for {len(snapshot)} symbols")
+        return snapshot
+
+    def get_prices(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Last prices for ``symbols`` (every listed symbol by default); unlisted symbols are left out"""
+        snapshot = self.snapshot()
+        if symbols is None:
+            return dict(zip(snapshot.symbols.tolist(), snapshot['last'].tolist()))
+        prices = {}
+        for symbol in symbols:
+            price = snapshot.price(symbol)
+            if price is not None:
+                prices[symbol] = price
+        return prices
+
+    def scan(self, quote_asset: Optional[str] = 'USDT', min_quote_volume: Optional[float] = None,
+             max_spread_bps: Optional[float] = None, min_change_pct: Optional[float] = None,
+             max_change_pct: Optional[float] = None, min_abs_funding: Optional[float] = None,
+             min_volatility: Optional[float] = None, max_volatility: Optional[float] = None,
+             where: Optional[Callable[[MarketSnapshot], np.ndarray]] = None,
+             sort_by: str = 'quote_volume', descending: bool = True,
+             limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Screen every symbol at once and return the matches as row dicts, sorted
+
+        Each bound given must hold (``change_pct`` is in percent,
+        ``funding_rate`` and ``volatility`` are fractions). ``where``
+        receives the snapshot and returns an additional boolean mask.
+        """
+        snapshot = self.snapshot()
+        c = snapshot.columns
+        mask = np.ones(len(snapshot), dtype=bool)
+        with np.errstate(invalid='ignore'):
+            if quote_asset:
+                mask &= np.char.endswith(snapshot.symbols, quote_asset)
+            if min_quote_volume is not None:
+                mask &= c['quote_volume'] >= min_quote_volume
+            if max_spread_bps is not None:
+                mask &= c['spread_bps'] <= max_spread_bps
+            if min_change_pct is not None:
+                mask &= c['change_pct'] >= min_change_pct
+            if max_change_pct is not None:
+                mask &= c['change_pct'] <= max_change_pct
+            if min_abs_funding is not None:
+                mask &= np.abs(c['funding_rate']) >= min_abs_funding
+            if min_volatility is not None:
+                mask &= c['volatility'] >= min_volatility
+            if max_volatility is not None:
+                mask &= c['volatility'] <= max_volatility
+            if where is not None:
+                mask &= where(snapshot)
+
+        matches = np.flatnonzero(mask)
+        keys = c[sort_by][matches]
+        # NaNs sort last either way
+        order = np.argsort(-keys if descending else keys, kind='stable')
+        if limit is not None:
+            order = order[:limit]
+        return snapshot.rows(matches[order])
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
+
+
+def run_benchmark(symbols: int = 300, latency: float = 0.005, scans: int = 1000) -> Dict[str, float]:
+    """Time a full-universe price/scan pass against a local stand-in REST server
+
+    A ``FakeRestServer`` lists ``symbols`` perpetuals, and ``latency`` is
+    added to every request. The server is reached through a real
+    python-binance client. The per-symbol loop is what scanning by
+    ``get_symbol_price`` costs, and it fetches prices only. The snapshot
+    fetches 24h stats, book and funding for every symbol. Cached scans
+    are screens evaluated over a snapshot still inside its TTL.
+    """
+    from binance.client import BaseClient, Client
+    from fake_exchange import FakeExchange
+    from fake_server import FakeRestServer
+
+    names = ['BTCUSDT', 'ETHUSDT', 'ADAUSDT', 'SOLUSDT'] + [f"SYM{i:03d}USDT" for i in range(symbols - 4)]
+    exchange = FakeExchange(prices={name: 10.0 + i for i, name in enumerate(names)}, spread_bps=4.0)
+    server = FakeRestServer(exchange, latency=latency)
+    server.start()
+    try:
+        client = Client.__new__(Client)
+        BaseClient.__init__(client, testnet=True)
+        client.FUTURES_TESTNET_URL = f"{server.url}/fapi"
+
+        began = time.perf_counter()
+        for name in names:
+            float(client.futures_symbol_ticker(symbol=name)['price'])
+        sequential = time.perf_counter() - began
+
+        scanner = MarketScanner(client, ttl=60.0)
+        began = time.perf_counter()
+        scanner.snapshot()
+        snapshot_time = time.perf_counter() - began
+
+        began = time.perf_counter()
+        for _ in range(scans):
+            scanner.scan(min_quote_volume=1e6, max_spread_bps=10, min_abs_funding=1e-4, min_volatility=0.01,
+                         sort_by='change_pct', limit=20)
+        scan_time = (time.perf_counter() - began) / scans
+        scanner.close()
+        return {
+            'symbols': len(names),
+            'sequential_s': sequential,
+            'sequential_requests': len(names),
+            'snapshot_s': snapshot_time,
+            'snapshot_requests': len(ENDPOINTS),
+            'cached_scan_us': scan_time * 1e6,
+        }
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    results = run_benchmark()
+    print(f"📊 Per-symbol price loop: {results['sequential_s'] * 1000:.0f} ms "
+          f"({results['sequential_requests']} requests, {results['symbols']} symbols)")
+    print(f"📊 All-symbols snapshot:  {results['snapshot_s'] * 1000:.0f} ms "
+          f"({results['snapshot_requests']} requests, prices + 24h stats + book + funding)")
+    print(f"📊 Cached scan:           {results['cached_scan_us']:.0f} µs per screen over every symbol")
@@ -0,0 +1,212 @@
+"""
+Fast-start support for short-lived bot invocations.
+
+Importing python-binance takes most of a second, and constructing a
+``binance.Client`` pings the spot API. ``create_client`` builds a futures
+client without that ping and applies a cached server-time offset, and
+``LazyClient`` defers the import and construction until the first call,
+so a bot that never talks to the exchange never pays for either.
+``run_benchmark`` measures cold-start time of each mode in fresh
+processes against a local stand-in for the REST API.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import subprocess
+import statistics
+from typing import Dict, Any, Optional, Callable
+
+from config import Config
+
+
+def load_time_offset(path: Optional[str] = None, ttl: Optional[float] = None) -> Optional[int]:
+    """Return the cached server-time offset (ms), or None if missing or older than ``ttl``"""
+    path = path or Config.TIME_OFFSET_CACHE
+    ttl = Config.TIME_OFFSET_TTL if ttl is None else ttl
+    try:
+        with open(path, encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - cached.get('measured_at', 0) > ttl:
+        return None
+    return int(cached['offset_ms'])
+
+
+def save_time_offset(offset_ms: int, path: Optional[str] = None) -> None:
+    """Cache a server-time offset for later processes"""
+    path = path or Config.TIME_OFFSET_CACHE
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'offset_ms': offset_ms, 'measured_at': time.time()}, f)
+    os.replace(tmp_path, path)
+
+
+def measure_time_offset(client: Any) -> int:
+    """Server time minus local time in ms, taken at the midpoint of one futures_time() call"""
+    sent = time.time() * 1000
+    server_time = client.futures_time()['serverTime']
+    received = time.time() * 1000
+    return int(server_time - (sent + received) / 2)
+
+
+_client_class: Optional[type] = None
+
+
+def futures_client_class() -> type:
+    """``binance.Client`` subclass that keeps the last HTTP response per thread
+
+    python-binance stores every response on the client and then parses it
+    from there, so with calls on several threads one call could read
+    another's response (and the rate-limit governor another call's
+    headers).
+    """
+    global _client_class
+    if _client_class is None:
+        from binance.client import Client
+
+        class ThreadLocalResponseClient(Client):
+            @property
+            def response(self) -> Any:
+                return getattr(self.__dict__.setdefault('_responses', threading.local()), 'response', None)
+
+            @response.setter
+            def response(self, value: Any) -> None:
+                self.__dict__.setdefault('_responses', threading.local()).response = value
+
+        _client_class = ThreadLocalResponseClient
+    return _client_class
+
+
+def create_client(api_key: str, api_secret: str, testnet: bool = True) -> Any:
+    """Build a ``binance.Client`` for the futures API without the constructor's spot ping
+
+    Signed requests use the cached server-time offset, measured afresh
+    (one futures_time() call) when the cache is stale. Every request
+    times out after Config.ORDER_TIMEOUT seconds, and each thread sees
+    only its own last response.
+    """
+    from binance.client import BaseClient
+
+    # Client.__init__ is BaseClient.__init__ plus a ping of the spot API, which the bot never uses
+    client_class = futures_client_class()
+    client = client_class.__new__(client_class)
+    # Client-wide request timeout; endpoints such as batchOrders cannot take a per-call one
+    BaseClient.__init__(client, api_key=api_key, api_secret=api_secret, testnet=testnet,
+                        requests_params={'timeout': Config.ORDER_TIMEOUT})
+    if testnet:
+        client.FUTURES_TESTNET_URL = f"{Config.BASE_URL.rstrip('/')}/fapi"
+
+    offset = load_time_offset()
+    if offset is None:
+        offset = measure_time_offset(client)
+        try:
+            save_time_offset(offset)
+        except OSError:
+            pass
+    client.timestamp_offset = offset
+    return client
+
+
+class LazyClient:
+    """Proxy that builds the real client on first attribute access"""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.__dict__['_factory'] = factory
+        self.__dict__['_client'] = None
+        self.__dict__['_lock'] = threading.Lock()
+
+    def _get(self) -> Any:
+        client = self._client
+        if client is None:
+            with self._lock:
+                if self._client is None:
+                    self.__dict__['_client'] = self._factory()
+                client = self._client
+        return client
+
+    @property
+    def built(self) -> bool:
+        return self._client is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._get(), name, value)
+
+
+# Each mode runs in a fresh interpreter; 'legacy' reproduces the original eager startup
+_BENCHMARK_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+mode, base_url = sys.argv[1], sys.argv[2]
+if mode == 'legacy':
+    import binance
+    from binance import Client
+    Client.API_TESTNET_URL = base_url + '/api'
+    Client.FUTURES_TESTNET_URL = base_url + '/fapi'
+    client = Client('key', 'secret', testnet=True)
+    from bot import BasicBot
+    bot = BasicBot('key', 'secret', client=client)
+else:
+    from bot import BasicBot
+    bot = BasicBot('key', 'secret')
+ready = time.perf_counter()
+bot.get_symbol_price('BTCUSDT')
+first_call = time.perf_counter()
+print(ready - start, first_call - start)
+'''
+
+
+def run_benchmark(runs: int = 5, latency: float = 0.05) -> Dict[str, Dict[str, float]]:
+    """Cold-start time of the legacy, default and fast-start modes (median seconds)
+
+    Every run is a new interpreter constructing a BasicBot against a local
+    REST stand-in with ``latency`` seconds per request, then fetching one
+    price. Reports time until the bot is ready and until that first call
+    has returned. The time-offset cache is cleared before each mode, so
+    only its first run measures the offset.
+    """
+    from fake_exchange import FakeExchange
+    from fake_server import FakeRestServer
+
+    server = FakeRestServer(FakeExchange(), latency=latency)
+    server.start()
+    base_url = server.url
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    modes = {
+        'legacy': {},
+        'default': {},
+        'fast': {'BOT_FAST_START': '1'},
+    }
+    results = {}
+    try:
+        for mode, extra_env in modes.items():
+            env = dict(os.environ, BINANCE_FUTURES_BASE_URL=base_url, BOT_PRICE_STREAM='0',
+                       BOT_USER_STREAM='0', BOT_METRICS='0', **extra_env)
+            ready, first_call = [], []
+            try:
+                os.remove(os.path.join(cwd, Config.TIME_OFFSET_CACHE))
+            except OSError:
+                pass
+            for _ in range(runs):
+                output = subprocess.run([sys.executable, '-c', _BENCHMARK_SCRIPT, mode, base_url], cwd=cwd,
+                                        env=env, capture_output=True, text=True, check=True).stdout
+                ready_s, first_call_s = map(float, output.strip().splitlines()[-1].split())
+                ready.append(ready_s)
+                first_call.append(first_call_s)
+            results[mode] = {'ready_s': statistics.median(ready), 'first_call_s': statistics.median(first_call)}
+    finally:
+        server.stop()
+    return results
+
+
+if __name__ == "__main__":
+    for mode, result in run_benchmark().items():
+        print(f"📊 {mode:>7} start: ready in {result['ready_s'] * 1000:7.1f} ms, "
+              f"first price in {result['first_call_s'] * 1000:7.1f} ms")
@@ -0,0 +1,410 @@
+"""
+Headless strategy runtime for ``BasicBot``.
+
+Strategies subclass ``TradingStrategy`` and react to price, order-book
+and order events by returning ``OrderIntent`` objects. ``StrategyRunner``
+feeds events to the strategies on a single event thread. It batches the
+intents emitted while events are queued up, sends them through the
+bot's single or batch order methods on a bounded worker pool, and
+records tick-to-send and tick-to-ack latency per strategy.
+"""
+
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Iterable, Set
+
+from config import Config
+from bot import BATCH_ORDERS_MAX, BATCH_CANCEL_MAX, new_client_order_id
+from metrics import LatencyHistogram
+
+# Order states after which no further updates arrive
+TERMINAL_STATUSES = ('FILLED', 'CANCELED', 'EXPIRED', 'REJECTED')
+
+
+class OrderIntent:
+    """A strategy's request to place or cancel one order"""
+
+    __slots__ = ('action', 'symbol', 'side', 'type', 'quantity', 'price', 'stop_price', 'order_id',
+                 'client_order_id', 'strategy', 'tick_time', 'sent_time')
+
+    def __init__(self, action: str, symbol: str, side: Optional[str] = None, order_type: str = 'MARKET',
+                 quantity: float = 0.0, price: Optional[float] = None, stop_price: Optional[float] = None,
+                 order_id: Optional[int] = None):
+        self.action = action
+        self.symbol = symbol.upper()
+        self.side = side.upper() if side else None
+        self.type = order_type.upper()
+        self.quantity = quantity
+        self.price = price
+        self.stop_price = stop_price
+        self.order_id = order_id
+        self.client_order_id: Optional[str] = None
+        self.strategy: Optional[str] = None
+        self.tick_time = 0.0
+        self.sent_time = 0.0
+
+    @classmethod
+    def market(cls, symbol: str, side: str, quantity: float) -> 'OrderIntent':
+        return cls('NEW', symbol, side, 'MARKET', quantity)
+
+    @classmethod
+    def limit(cls, symbol: str, side: str, quantity: float, price: float) -> 'OrderIntent':
+        return cls('NEW', symbol, side, 'LIMIT', quantity, price)
+
+    @classmethod
+    def stop_loss_limit(cls, symbol: str, side: str, quantity: float, price: float,
+                        stop_price: float) -> 'OrderIntent':
+        return cls('NEW', symbol, side, 'STOP_LOSS_LIMIT', quantity, price, stop_price)
+
+    @classmethod
+    def cancel(cls, symbol: str, order_id: int) -> 'OrderIntent':
+        return cls('CANCEL', symbol, order_id=order_id)
+
+
+class TradingStrategy:
+    """Base class for runner strategies
+
+    Handlers run on the runner's event thread, one at a time, and may
+    return an iterable of ``OrderIntent`` (or None). ``symbols`` limits
+    which price and book events a strategy receives (None means all).
+    """
+
+    name = 'strategy'
+    symbols: Optional[Set[str]] = None
+
+    def on_start(self, runner: 'StrategyRunner') -> None:
+        pass
+
+    def on_stop(self, runner: 'StrategyRunner') -> None:
+        pass
+
+    def on_price(self, runner: 'StrategyRunner', symbol: str, price: float) -> Optional[Iterable[OrderIntent]]:
+        return None
+
+    def on_book(self, runner: 'StrategyRunner', symbol: str, depth_book: Any) -> Optional[Iterable[OrderIntent]]:
+        return None
+
+    def on_order(self, runner: 'StrategyRunner', order: Dict[str, Any]) -> Optional[Iterable[OrderIntent]]:
+        """An order of this strategy was acknowledged or updated"""
+        return None
+
+    def on_reject(self, runner: 'StrategyRunner', intent: OrderIntent, error: str) -> Optional[Iterable[OrderIntent]]:
+        """An intent was rejected locally or by the exchange"""
+        return None
+
+
+class StrategyRunner:
+    """Event loop that drives strategies and dispatches their intents through a BasicBot"""
+
+    def __init__(self, bot: Any, strategies: List[TradingStrategy],
+                 max_in_flight: int = Config.RUNNER_MAX_IN_FLIGHT,
+                 batch_window: float = Config.RUNNER_BATCH_WINDOW):
+        """Initialize the runner
+
+        At most ``max_in_flight`` order requests are outstanding at once;
+        further intents wait. Intents emitted while events are queued are
+        collected for up to ``batch_window`` seconds and sent together.
+        """
+        self.bot = bot
+        self.strategies = {strategy.name: strategy for strategy in strategies}
+        self.max_in_flight = max_in_flight
+        self.batch_window = batch_window
+        self.logger = logging.getLogger('TradingBot')
+        self.stats: Dict[str, Dict[str, Any]] = {
+            name: {'tick_to_send': LatencyHistogram(), 'tick_to_ack': LatencyHistogram(),
+                   'intents': 0, 'rejected': 0}
+            for name in self.strategies
+        }
+        self._events: queue.SimpleQueue = queue.SimpleQueue()
+        self._owners: Dict[str, str] = {}
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    # Event sources
+
+    def attach_price_stream(self, price_stream: Any) -> None:
+        """Receive updates from a market_data.PriceStream"""
+        price_stream.add_listener(lambda symbol, entry: self.publish_price(symbol, price_stream.get_price(symbol)))
+
+    def attach_order_book(self, depth_book: Any) -> None:
+        """Receive updates from an order_book.DepthBook"""
+        depth_book.add_listener(lambda book: self.publish_book(book.symbol, book))
+
+    def attach_order_store(self, order_store: Any) -> None:
+        """Receive order updates from a user_stream.OrderStateStore"""
+        order_store.add_listener(lambda event_type, payload: self.publish_order(payload)
+                                 if event_type == 'ORDER' else None)
+
+    def publish_price(self, symbol: str, price: Optional[float]) -> None:
+        if price is not None:
+            self._events.put(('PRICE', time.perf_counter(), symbol, price))
+
+    def publish_book(self, symbol: str, depth_book: Any) -> None:
+        self._events.put(('BOOK', time.perf_counter(), symbol, depth_book))
+
+    def publish_order(self, order: Dict[str, Any]) -> None:
+        self._events.put(('ORDER', time.perf_counter(), order, None))
+
+    # Lifecycle
+
+    def start(self) -> None:
+        """Start the event thread"""
+        self._stopping.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix='StrategyDispatch')
+        for strategy in self.strategies.values():
+            strategy.on_start(self)
+        self._thread = threading.Thread(target=self._run, name='StrategyRunner', daemon=True)
+        self._thread.start()
+        self.logger.info(f"Strategy runner started: {', '.join(self.strategies)}")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the event thread and wait for in-flight orders"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        for strategy in self.strategies.values():
+            strategy.on_stop(self)
+        self.logger.info("Strategy runner stopped")
+
+    def drain(self, timeout: float = 10.0) -> bool:
+        """Wait until all queued events are handled and no order is in flight"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._events.empty() and self._idle():
+                return True
+            time.sleep(0.001)
+        return False
+
+    def _idle(self) -> bool:
+        acquired = 0
+        try:
+            while acquired < self.max_in_flight and self._slots.acquire(blocking=False):
+                acquired += 1
+            return acquired == self.max_in_flight
+        finally:
+            for _ in range(acquired):
+                self._slots.release()
+
+    def latency_report(self) -> Dict[str, Dict[str, Any]]:
+        """Per-strategy tick-to-send / tick-to-ack percentiles (µs) and intent counts"""
+        return {
+            name: {'tick_to_send': stats['tick_to_send'].snapshot(),
+                   'tick_to_ack': stats['tick_to_ack'].snapshot(),
+                   'intents': stats['intents'], 'rejected': stats['rejected']}
+            for name, stats in self.stats.items()
+        }
+
+    # Event thread
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                event = self._events.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            # Collect intents from everything already queued, up to the batch window
+            intents: List[OrderIntent] = []
+            deadline = time.perf_counter() + self.batch_window
+            while True:
+                try:
+                    self._handle(event, intents)
+                except Exception as e:
+                    self.logger.error(f"Strategy event error: {e}")
+                if time.perf_counter() >= deadline:
+                    break
+                try:
+                    event = self._events.get_nowait()
+                except queue.Empty:
+                    break
+
+            if intents:
+                self._dispatch(intents)
+
+    def _handle(self, event: tuple, intents: List[OrderIntent]) -> None:
+        kind, tick_time, first, second = event
+        if kind == 'PRICE':
+            for strategy in self.strategies.values():
+                if strategy.symbols is None or first in strategy.symbols:
+                    self._collect(strategy, strategy.on_price(self, first, second), tick_time, intents)
+        elif kind == 'BOOK':
+            for strategy in self.strategies.values():
+                if strategy.symbols is None or first in strategy.symbols:
+                    self._collect(strategy, strategy.on_book(self, first, second), tick_time, intents)
+        elif kind == 'ORDER':
+            client_order_id = first.get('clientOrderId')
+            # Terminal updates are the last for the order, so its owner is forgotten
+            if first.get('status') in TERMINAL_STATUSES:
+                owner = self._owners.pop(client_order_id, None)
+            else:
+                owner = self._owners.get(client_order_id)
+            strategy = self.strategies.get(owner)
+            if strategy is not None:
+                self._collect(strategy, strategy.on_order(self, first), tick_time, intents)
+        elif kind == 'REJECT':
+            if first.client_order_id is not None:
+                self._owners.pop(first.client_order_id, None)
+            strategy = self.strategies[first.strategy]
+            self._collect(strategy, strategy.on_reject(self, first, second), tick_time, intents)
+
+    def _collect(self, strategy: TradingStrategy, emitted: Optional[Iterable[OrderIntent]], tick_time: float,
+                 intents: List[OrderIntent]) -> None:
+        for intent in emitted or ():
+            intent.strategy = strategy.name
+            intent.tick_time = tick_time
+            stats = self.stats[strategy.name]
+            stats['intents'] += 1
+            if intent.action == 'NEW':
+                if not self.bot._validate_order_params(intent.symbol, intent.side or '', intent.type,
+                                                       intent.quantity, intent.price):
+                    stats['rejected'] += 1
+                    self._collect(strategy, strategy.on_reject(self, intent, "Invalid order parameters"),
+                                  tick_time, intents)
+                    continue
+                intent.client_order_id = new_client_order_id()
+                self._owners[intent.client_order_id] = strategy.name
+            intents.append(intent)
+
+    # Dispatch
+
+    def _dispatch(self, intents: List[OrderIntent]) -> None:
+        orders = [intent for intent in intents if intent.action == 'NEW']
+        cancels: Dict[str, List[OrderIntent]] = {}
+        for intent in intents:
+            if intent.action == 'CANCEL':
+                cancels.setdefault(intent.symbol, []).append(intent)
+
+        jobs = [orders[i:i + BATCH_ORDERS_MAX] for i in range(0, len(orders), BATCH_ORDERS_MAX)]
+        jobs += [cancels[symbol][i:i + BATCH_CANCEL_MAX]
+                 for symbol in cancels for i in range(0, len(cancels[symbol]), BATCH_CANCEL_MAX)]
+        for job in jobs:
+            # Back-pressure: the event thread waits while max_in_flight requests are outstanding
+            self._slots.acquire()
+            self._executor.submit(self._send, job)
+
+    def _send(self, job: List[OrderIntent]) -> None:
+        try:
+            sent = time.perf_counter()
+            for intent in job:
+                intent.sent_time = sent
+            try:
+                results = self._send_job(job)
+            except Exception as e:
+                results = [{'code': getattr(e, 'code', -1), 'msg': str(e)} for _ in job]
+            acked = time.perf_counter()
+
+            for intent, result in zip(job, results):
+                stats = self.stats[intent.strategy]
+                stats['tick_to_send'].record((intent.sent_time - intent.tick_time) * 1e6)
+                stats['tick_to_ack'].record((acked - intent.tick_time) * 1e6)
+                if 'orderId' in result:
+                    self._events.put(('ORDER', acked, result, None))
+                else:
+                    stats['rejected'] += 1
+                    self._events.put(('REJECT', acked, intent, result.get('msg', '')))
+        finally:
+            self._slots.release()
+
+    def _send_job(self, job: List[OrderIntent]) -> List[Dict[str, Any]]:
+        first = job[0]
+        if first.action == 'CANCEL':
+            if len(job) == 1:
+                return [self.bot.cancel_order(first.symbol, first.order_id)]
+            return self.bot.cancel_orders_batch(first.symbol, [intent.order_id for intent in job])
+
+        if len(job) == 1:
+            if first.type == 'MARKET':
+                return [self.bot.place_market_order(first.symbol, first.side, first.quantity,
+                                                    client_order_id=first.client_order_id)]
+            if first.type == 'LIMIT':
+                return [self.bot.place_limit_order(first.symbol, first.side, first.quantity, first.price,
+                                                   client_order_id=first.client_order_id)]
+            return [self.bot.place_stop_loss_limit_order(first.symbol, first.side, first.quantity, first.price,
+                                                         first.stop_price, client_order_id=first.client_order_id)]
+
+        return self.bot.place_orders_batch([
+            {'symbol': intent.symbol, 'side': intent.side, 'type': intent.type, 'quantity': intent.quantity,
+             'price': intent.price, 'stop_price': intent.stop_price, 'client_order_id': intent.client_order_id}
+            for intent in job
+        ])
+
+
+class QuoteStrategy(TradingStrategy):
+    """Example: keep one resting buy limit a fixed distance under the price, re-quoting on moves"""
+
+    def __init__(self, symbol: str, quantity: float, offset_bps: float = 20.0, requote_bps: float = 5.0,
+                 name: str = 'quote'):
+        self.name = name
+        self.symbols = {symbol.upper()}
+        self.quantity = quantity
+        self.offset = offset_bps / 1e4
+        self.requote = requote_bps / 1e4
+        self.quoted_at: Optional[float] = None
+        self.order_id: Optional[int] = None
+        self.pending = False
+
+    def on_price(self, runner: StrategyRunner, symbol: str, price: float) -> Optional[Iterable[OrderIntent]]:
+        if self.pending or (self.quoted_at is not None and abs(price / self.quoted_at - 1) < self.requote):
+            return None
+        intents = []
+        if self.order_id is not None:
+            intents.append(OrderIntent.cancel(symbol, self.order_id))
+            self.order_id = None
+        self.quoted_at = price
+        self.pending = True
+        intents.append(OrderIntent.limit(symbol, 'BUY', self.quantity, round(price * (1 - self.offset), 1)))
+        return intents
+
+    def on_order(self, runner: StrategyRunner, order: Dict[str, Any]) -> Optional[Iterable[OrderIntent]]:
+        if order['status'] == 'NEW':
+            self.order_id = order['orderId']
+        self.pending = False
+        return None
+
+    def on_reject(self, runner: StrategyRunner, intent: OrderIntent, error: str) -> Optional[Iterable[OrderIntent]]:
+        if intent.action == 'NEW':
+            self.pending = False
+        return None
+
+
+def run_benchmark(ticks: int = 2000, strategies: int = 2, latency: float = 0.005) -> Dict[str, Dict[str, Any]]:
+    """Drive QuoteStrategy instances with synthetic ticks against the fake exchange
+
+    Ticks arrive every millisecond and move the price 0.25 bps. Strategy
+    ``i`` re-quotes (cancel + new order) after a ``20 + 10 * i`` bps move
+    (every 80, 120, ... ticks), so the strategies mostly send in separate
+    jobs, staying inside the order rate limits. Returns the runner's latency report; tick-to-ack
+    includes the fake client's ``latency`` seconds of simulated round trip.
+    """
+    from bot import BasicBot
+    from fake_exchange import FakeFuturesClient
+
+    bot = BasicBot('fake', 'fake', client=FakeFuturesClient(latency=latency))
+    bot.logger.setLevel(logging.WARNING)
+    runner = StrategyRunner(bot, [QuoteStrategy('BTCUSDT', 0.01, requote_bps=20.0 + 10.0 * i, name=f"quote_{i}")
+                                  for i in range(strategies)])
+    runner.start()
+    price = 60000.0
+    for i in range(ticks):
+        # Trend up then down so quotes are cancelled and replaced regularly
+        price *= 1.000025 if (i // 200) % 2 == 0 else 0.999975
+        runner.publish_price('BTCUSDT', price)
+        time.sleep(0.001)
+    runner.drain()
+    runner.stop()
+    return runner.latency_report()
+
+
+if __name__ == "__main__":
+    for name, report in run_benchmark().items():
+        send, ack = report['tick_to_send'], report['tick_to_ack']
+        print(f"📊 {name}: {report['intents']} intents, {report['rejected']} rejected | "
+              f"tick->send p50 {send['p50']} µs p99 {send['p99']} µs | "
+              f"tick->ack p50 {ack['p50']} µs p99 {ack['p99']} µs")
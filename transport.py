@@ -0,0 +1,464 @@
+"""
+Lean REST transport for the futures endpoints on the bot's hot path.
+
+python-binance handles every call the same generic way. It copies and
+sorts the params, builds the query string twice (once to sign, once to
+send), creates a new HMAC from the secret, and goes through
+``requests``, which adds its own per-request overhead.
+
+``FuturesTransport`` avoids most of that:
+- it keeps one keep-alive HTTP/1.1 connection per thread (``http.client``);
+- it encodes the params once, in the order given, and percent-encodes
+  only the values that need it;
+- it signs that exact string with an HMAC whose key schedule is
+  precomputed, or with an Ed25519 key;
+- it keeps the server-time offset fresh from a background thread, and
+  resyncs when a request is rejected for its timestamp.
+
+``LeanFuturesClient`` offers the ``binance.Client`` methods the bot
+calls when trading on top of this transport. Any other attribute goes to
+a regular python-binance client, built on first use.
+"""
+
+import re
+import hmac
+import json
+import time
+import base64
+import socket
+import hashlib
+import logging
+import threading
+import http.client
+from urllib.parse import urlsplit, quote
+from typing import Dict, Any, Optional, List, Callable
+
+from config import Config
+from startup import load_time_offset, save_time_offset, LazyClient
+
+# Query values containing anything else are percent-encoded
+_NEEDS_QUOTE = re.compile(r'[^A-Za-z0-9._~-]').search
+
+MAINNET_URL = 'https://fapi.binance.com'
+
+# API error code for "Timestamp for this request is outside of the recvWindow"
+TIMESTAMP_ERROR_CODE = -1021
+
+# Failures of a reused keep-alive connection (typically closed by the server while idle)
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                           ConnectionResetError, BrokenPipeError)
+
+
+def _value(value: Any) -> str:
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, float):
+        text = repr(value)
+        # The API rejects exponent notation
+        return text if 'e' not in text else format(value, '.16f').rstrip('0').rstrip('.')
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, separators=(',', ':'))
+    return str(value)
+
+
+def encode_params(params: Dict[str, Any]) -> str:
+    """Query string of ``params`` in the order given, skipping None values"""
+    parts = []
+    for key, value in params.items():
+        if value is None:
+            continue
+        value = _value(value)
+        if _NEEDS_QUOTE(value):
+            value = quote(value, safe='')
+        parts.append(f"{key}={value}")
+    return '&'.join(parts)
+
+
+class TransportAPIError(Exception):
+    """Non-2xx API answer, shaped like ``binance.exceptions.BinanceAPIException``"""
+
+    def __init__(self, response: Any, status_code: int, text: str):
+        self.response = response
+        self.status_code = status_code
+        self.code = 0
+        self.message = text
+        try:
+            body = json.loads(text)
+            self.code = body.get('code', 0)
+            self.message = body.get('msg', text)
+        except ValueError:
+            pass
+        super().__init__(f"APIError(code={self.code}): {self.message}")
+
+
+class HmacSigner:
+    """HMAC-SHA256 signatures with the key schedule computed once"""
+
+    def __init__(self, secret: str):
+        self._mac = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+    def sign(self, payload: bytes) -> str:
+        mac = self._mac.copy()
+        mac.update(payload)
+        return mac.hexdigest()
+
+
+class Ed25519Signer:
+    """Ed25519 signatures (needs the ``cryptography`` package)"""
+
+    def __init__(self, private_key: bytes, password: Optional[bytes] = None):
+        """Load a PEM-encoded Ed25519 private key"""
+        try:
+            from cryptography.hazmat.primitives.serialization import load_pem_private_key
+            from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+        except ImportError as e:
+            raise ImportError("Ed25519 API keys need the 'cryptography' package") from e
+        key = load_pem_private_key(private_key, password)
+        if not isinstance(key, Ed25519PrivateKey):
+            raise ValueError("Private key is not an Ed25519 key")
+        self._key = key
+
+    def sign(self, payload: bytes) -> str:
+        # Base64 has '+', '/' and '=', so the signature goes out percent-encoded
+        return quote(base64.b64encode(self._key.sign(payload)).decode(), safe='')
+
+
+class FuturesTransport:
+    """Signed and public futures REST requests over per-thread keep-alive connections"""
+
+    def __init__(self, base_url: str, api_key: str = '', api_secret: Optional[str] = None,
+                 private_key: Optional[bytes] = None, private_key_password: Optional[bytes] = None,
+                 timeout: float = Config.ORDER_TIMEOUT, recv_window: int = Config.TRANSPORT_RECV_WINDOW,
+                 idle_timeout: float = Config.TRANSPORT_IDLE_TIMEOUT):
+        """Initialize the transport
+
+        ``base_url`` is the futures host, e.g. ``https://fapi.binance.com``.
+        Requests are signed with ``private_key`` (Ed25519 PEM) when given,
+        otherwise with ``api_secret`` (HMAC-SHA256). Connections idle for
+        longer than ``idle_timeout`` seconds are reopened rather than reused.
+        """
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.recv_window = recv_window
+        self.idle_timeout = idle_timeout
+        self.time_offset: Optional[int] = None
+        self.logger = logging.getLogger('TradingBot')
+
+        if private_key is not None:
+            self.signer = Ed25519Signer(private_key, private_key_password)
+        elif api_secret:
+            self.signer = HmacSigner(api_secret)
+        else:
+            self.signer = None
+
+        self._headers = {'X-MBX-APIKEY': api_key}
+        self._form_headers = {'X-MBX-APIKEY': api_key, 'Content-Type': 'application/x-www-form-urlencoded'}
+        self._local = threading.local()
+        self._connections: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._sync_stop = threading.Event()
+        self._sync_thread: Optional[threading.Thread] = None
+
+    # Connections
+
+    def _connect(self) -> http.client.HTTPConnection:
+        connection_class = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        connection = connection_class(self.host, self.port, timeout=self.timeout)
+        connection.connect()
+        # Headers and body are written separately; do not let Nagle hold the body back
+        connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self._lock:
+            self._connections.append(connection)
+        self._local.connection = connection
+        self._local.last_used = time.monotonic()
+        return connection
+
+    def _drop(self, connection: http.client.HTTPConnection) -> None:
+        connection.close()
+        with self._lock:
+            if connection in self._connections:
+                self._connections.remove(connection)
+        self._local.connection = None
+
+    def close(self) -> None:
+        """Close every connection and stop the time sync"""
+        self._sync_stop.set()
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+
+    # Requests
+
+    def request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None, signed: bool = False,
+                timeout: Optional[float] = None) -> Any:
+        """Send one request and return the decoded JSON body; raises TransportAPIError on non-2xx
+
+        Params are sent in the query string, or as a form body for POST
+        and PUT. A signed request rejected for its timestamp is re-signed
+        after a time sync and sent once more.
+        """
+        query = encode_params(params) if params else ''
+        if not signed:
+            return self._send(method, path, query, timeout)
+        if self.signer is None:
+            raise ValueError("API secret or private key required for signed endpoints")
+        if self.time_offset is None:
+            self.sync_time()
+        try:
+            return self._send(method, path, self._sign(query), timeout)
+        except TransportAPIError as e:
+            if e.code != TIMESTAMP_ERROR_CODE:
+                raise
+            self.logger.warning(f"Request timestamp rejected, resyncing server time: {e}")
+            self.sync_time()
+            return self._send(method, path, self._sign(query), timeout)
+
+    def _sign(self, query: str) -> str:
+        timestamp = int(time.time() * 1000) + self.time_offset
+        query = (f"{query}&" if query else '') + f"recvWindow={self.recv_window}&timestamp={timestamp}"
+        return f"{query}&signature={self.signer.sign(query.encode())}"
+
+    def _send(self, method: str, path: str, query: str, timeout: Optional[float]) -> Any:
+        if method in ('POST', 'PUT'):
+            url, body, headers = self.prefix + path, query.encode(), self._form_headers
+        else:
+            url, body, headers = (f"{self.prefix}{path}?{query}" if query else self.prefix + path), None, self._headers
+
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and time.monotonic() - self._local.last_used > self.idle_timeout:
+            self._drop(connection)
+            connection = None
+        reused = connection is not None
+        if connection is None:
+            connection = self._connect()
+
+        try:
+            connection.sock.settimeout(timeout or self.timeout)
+            connection.request(method, url, body, headers)
+            response = connection.getresponse()
+            text = response.read().decode()
+        except STALE_CONNECTION_ERRORS as e:
+            self._drop(connection)
+            # Only a read may be repeated; the caller resolves a write with an unknown outcome
+            if reused and method == 'GET':
+                return self._send(method, path, query, timeout)
+            raise ConnectionError(f"Connection lost during {method} {path}: {e}") from e
+        except OSError:
+            # Timeouts and socket errors leave the connection in an unknown state
+            self._drop(connection)
+            raise
+        self._local.last_used = time.monotonic()
+        if response.will_close:
+            self._drop(connection)
+
+        self._local.response = response
+        if not 200 <= response.status < 300:
+            raise TransportAPIError(response, response.status, text)
+        return json.loads(text)
+
+    @property
+    def response(self) -> Optional[http.client.HTTPResponse]:
+        """Last HTTP response on the calling thread"""
+        return getattr(self._local, 'response', None)
+
+    # Server time
+
+    def sync_time(self) -> int:
+        """Measure the server-time offset (ms) from one /fapi/v1/time round trip and cache it"""
+        sent = time.time() * 1000
+        server_time = self._send('GET', '/fapi/v1/time', '', None)['serverTime']
+        received = time.time() * 1000
+        self.time_offset = int(server_time - (sent + received) / 2)
+        try:
+            save_time_offset(self.time_offset)
+        except OSError:
+            pass
+        return self.time_offset
+
+    def start_time_sync(self, interval: float = Config.TRANSPORT_TIME_SYNC_INTERVAL) -> None:
+        """Resync the server-time offset every ``interval`` seconds on a background thread"""
+        if self._sync_thread is not None:
+            return
+
+        def run() -> None:
+            while not self._sync_stop.wait(interval):
+                try:
+                    self.sync_time()
+                except Exception as e:
+                    self.logger.warning(f"Server time sync failed: {e}")
+
+        self._sync_thread = threading.Thread(target=run, name='TimeSync', daemon=True)
+        self._sync_thread.start()
+
+
+class LeanFuturesClient:
+    """``binance.Client`` stand-in serving the bot's trading endpoints from a FuturesTransport
+
+    Other attributes are passed through to ``fallback`` (e.g. a
+    ``startup.LazyClient`` around a python-binance client).
+    """
+
+    def __init__(self, transport: FuturesTransport, fallback: Optional[Any] = None):
+        self.transport = transport
+        self._fallback = fallback
+
+    @property
+    def response(self) -> Any:
+        """Last HTTP response on the calling thread, for the rate-limit governor's header sync"""
+        return self.transport.response
+
+    def __getattr__(self, name: str) -> Any:
+        fallback = self.__dict__.get('_fallback')
+        if fallback is None:
+            raise AttributeError(f"{type(self).__name__} has no attribute {name!r}")
+        return getattr(fallback, name)
+
+    def _call(self, method: str, path: str, params: Dict[str, Any], signed: bool = True) -> Any:
+        requests_params = params.pop('requests_params', None)
+        timeout = requests_params.get('timeout') if requests_params else None
+        return self.transport.request(method, path, params, signed, timeout)
+
+    def futures_ping(self) -> Dict[str, Any]:
+        return self.transport.request('GET', '/fapi/v1/ping')
+
+    def futures_time(self) -> Dict[str, Any]:
+        return self.transport.request('GET', '/fapi/v1/time')
+
+    def futures_symbol_ticker(self, **params) -> Any:
+        return self._call('GET', '/fapi/v1/ticker/price', params, signed=False)
+
+    def futures_account(self, **params) -> Dict[str, Any]:
+        return self._call('GET', '/fapi/v2/account', params)
+
+    def futures_create_order(self, **params) -> Dict[str, Any]:
+        return self._call('POST', '/fapi/v1/order', params)
+
+    def futures_cancel_order(self, **params) -> Dict[str, Any]:
+        return self._call('DELETE', '/fapi/v1/order', params)
+
+    def futures_get_order(self, **params) -> Dict[str, Any]:
+        return self._call('GET', '/fapi/v1/order', params)
+
+    def futures_get_open_orders(self, **params) -> List[Dict[str, Any]]:
+        return self._call('GET', '/fapi/v1/openOrders', params)
+
+    def futures_get_all_orders(self, **params) -> List[Dict[str, Any]]:
+        return self._call('GET', '/fapi/v1/allOrders', params)
+
+    def futures_place_batch_order(self, **params) -> List[Dict[str, Any]]:
+        return self._call('POST', '/fapi/v1/batchOrders', params)
+
+    def futures_cancel_orders(self, **params) -> List[Dict[str, Any]]:
+        return self._call('DELETE', '/fapi/v1/batchOrders', params)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+def create_lean_client(api_key: str, api_secret: str, testnet: bool = True,
+                       private_key_file: Optional[str] = None) -> LeanFuturesClient:
+    """Build a LeanFuturesClient with a python-binance fallback for everything else
+
+    Nothing is sent until the first call. The cached server-time offset
+    is used when fresh, and kept current by a background sync.
+    ``private_key_file`` (default: Config.API_PRIVATE_KEY_FILE) selects
+    Ed25519 signing; ``api_key`` is then the key registered for it.
+    """
+    from startup import create_client
+
+    private_key_file = private_key_file if private_key_file is not None else Config.API_PRIVATE_KEY_FILE
+    private_key = None
+    if private_key_file:
+        with open(private_key_file, 'rb') as f:
+            private_key = f.read()
+
+    base_url = Config.BASE_URL if testnet else MAINNET_URL
+    transport = FuturesTransport(base_url, api_key, api_secret, private_key)
+    transport.time_offset = load_time_offset()
+    transport.start_time_sync()
+    return LeanFuturesClient(transport, LazyClient(lambda: create_client(api_key, api_secret, testnet)))
+
+
+def run_benchmark(calls: int = 2000) -> Dict[str, Dict[str, float]]:
+    """Time the bot's hot calls through python-binance and the lean transport against a local server
+
+    Both clients talk to the same ``FakeRestServer``, which checks
+    HMAC signatures. ``signing_us`` is the time to build and sign one
+    order request without sending it. The remaining figures are medians
+    of full round trips (µs).
+    """
+    import statistics
+    from fake_exchange import FakeExchange
+    from fake_server import FakeRestServer
+    from startup import create_client
+
+    secret = 'benchmark-secret'
+    exchange = FakeExchange(spread_bps=2.0)
+    server = FakeRestServer(exchange, api_secret=secret)
+    server.start()
+    saved = (Config.BASE_URL, Config.TIME_OFFSET_CACHE)
+    Config.TIME_OFFSET_CACHE = 'logs/benchmark_time_offset.json'
+    try:
+        Config.BASE_URL = server.url
+        clients = {
+            'python-binance': create_client('key', secret, testnet=True),
+            'lean': LeanFuturesClient(FuturesTransport(server.url, 'key', secret)),
+        }
+        order = {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'LIMIT', 'timeInForce': 'GTC',
+                 'quantity': 0.001, 'price': 50000.0, 'newClientOrderId': 'bb_' + '0' * 32}
+
+        results = {}
+        for name, client in clients.items():
+            # Warms up the connection (and gives the lean client its time offset)
+            if name == 'lean':
+                client.transport.sync_time()
+            else:
+                client.futures_time()
+
+            began = time.perf_counter()
+            for _ in range(calls):
+                if name == 'lean':
+                    client.transport._sign(encode_params(order))
+                else:
+                    client._get_request_kwargs('post', True, data=dict(order))
+            signing = (time.perf_counter() - began) / calls
+
+            def timed(call: Callable[[], Any]) -> float:
+                samples = []
+                for _ in range(calls):
+                    began = time.perf_counter()
+                    call()
+                    samples.append(time.perf_counter() - began)
+                return statistics.median(samples) * 1e6
+
+            def place_and_cancel() -> None:
+                placed = client.futures_create_order(**dict(order, newClientOrderId=None))
+                client.futures_cancel_order(symbol='BTCUSDT', orderId=placed['orderId'])
+
+            results[name] = {
+                'signing_us': signing * 1e6,
+                'ticker_us': timed(lambda: client.futures_symbol_ticker(symbol='BTCUSDT')),
+                'open_orders_us': timed(lambda: client.futures_get_open_orders(symbol='BTCUSDT')),
+                'order_cancel_us': timed(place_and_cancel),
+            }
+        results['server'] = {'requests': server.requests, 'bad_signatures': server.bad_signatures}
+        return results
+    finally:
+        Config.BASE_URL, Config.TIME_OFFSET_CACHE = saved
+        server.stop()
+
+
+if __name__ == "__main__":
+    results = run_benchmark()
+    server = results.pop('server')
+    for name, stats in results.items():
+        print(f"📊 {name:>14}: sign {stats['signing_us']:6.1f} µs | ticker {stats['ticker_us']:6.0f} µs | "
+              f"open orders {stats['open_orders_us']:6.0f} µs | order + cancel {stats['order_cancel_us']:6.0f} µs")
+    print(f"📊 Server: {server['requests']} requests, {server['bad_signatures']} bad signatures")
@@ -0,0 +1,316 @@
+"""
+User-data stream for order, position and balance state.
+
+``UserDataStream`` holds a futures listenKey (with keepalive) and feeds
+``ORDER_TRADE_UPDATE`` and ``ACCOUNT_UPDATE`` events into an
+``OrderStateStore``. Once attached with ``BasicBot.attach_user_stream``,
+``get_order_status``, ``get_open_orders`` and ``get_account_info`` read
+from the store instead of polling REST.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Callable
+
+from config import Config
+from market_data import WebSocketStream, stream_base_url
+
+OPEN_STATUSES = ('NEW', 'PARTIALLY_FILLED')
+
+
+def order_from_event(o: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert an ORDER_TRADE_UPDATE ``o`` payload to the REST order shape"""
+    return {
+        'orderId': o['i'],
+        'symbol': o['s'],
+        'status': o['X'],
+        'clientOrderId': o['c'],
+        'price': o['p'],
+        'avgPrice': o['ap'],
+        'origQty': o['q'],
+        'executedQty': o['z'],
+        'timeInForce': o['f'],
+        'type': o['o'],
+        'side': o['S'],
+        'stopPrice': o['sp'],
+        'reduceOnly': o.get('R', False),
+        'positionSide': o.get('ps', 'BOTH'),
+        'updateTime': o['T'],
+        # Execution details of this event
+        'executionType': o['x'],
+        'lastFilledQty': o['l'],
+        'lastFilledPrice': o['L'],
+        'commission': o.get('n', '0'),
+        'commissionAsset': o.get('N'),
+        'realizedProfit': o.get('rp', '0'),
+    }
+
+
+class OrderStateStore:
+    """In-memory order, position and balance state kept current by the user-data stream"""
+
+    def __init__(self, max_closed_orders: int = Config.ORDER_STORE_MAX_CLOSED):
+        """Initialize an empty store"""
+        self.orders: 'OrderedDict[int, Dict[str, Any]]' = OrderedDict()
+        self.positions: Dict[tuple, Dict[str, Any]] = {}
+        self.balances: Dict[str, Dict[str, float]] = {}
+        self.account: Optional[Dict[str, Any]] = None
+        self.synced = False
+        self.max_closed_orders = max_closed_orders
+        self._closed = 0
+        self._snapshot_wallet: Dict[str, float] = {}
+        self._listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        self._lock = threading.RLock()
+        self.logger = logging.getLogger('TradingBot')
+
+    def add_listener(self, callback: Callable[[str, Dict[str, Any]], None]) -> None:
+        """Call ``callback(event_type, payload)`` after every applied event
+
+        ``event_type`` is ``'ORDER'`` (payload: order dict) or ``'ACCOUNT'``
+        (payload: the raw ``a`` section of ACCOUNT_UPDATE).
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, Dict[str, Any]], None]) -> None:
+        self._listeners.remove(callback)
+
+    def _notify(self, event_type: str, payload: Dict[str, Any]) -> None:
+        for callback in self._listeners:
+            try:
+                callback(event_type, payload)
+            except Exception as e:
+                self.logger.error(f"Order state listener error: {e}")
+
+    def handle_message(self, message: Dict[str, Any]) -> None:
+        """Apply one user-data stream message"""
+        data = message.get('data', message)
+        event = data.get('e')
+        if event == 'ORDER_TRADE_UPDATE':
+            self._notify('ORDER', self.record_order(order_from_event(data['o'])))
+        elif event == 'ACCOUNT_UPDATE':
+            self.apply_account_update(data['a'])
+            self._notify('ACCOUNT', data['a'])
+
+    def record_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert or update an order, ignoring updates older than what is stored"""
+        order_id = order['orderId']
+        with self._lock:
+            current = self.orders.get(order_id)
+            if current is not None:
+                if order.get('updateTime', 0) < current.get('updateTime', 0):
+                    return current
+                was_open = current['status'] in OPEN_STATUSES
+                current.update(order)
+                order = current
+            else:
+                was_open = True
+                self.orders[order_id] = order
+
+            if was_open and order['status'] not in OPEN_STATUSES:
+                self._closed += 1
+                if self._closed > self.max_closed_orders:
+                    self._prune_closed()
+        return order
+
+    def _prune_closed(self) -> None:
+        # Drop the oldest terminal orders; open orders are always kept
+        excess = self._closed - self.max_closed_orders // 2
+        for order_id in list(self.orders):
+            if excess <= 0:
+                break
+            if self.orders[order_id]['status'] not in OPEN_STATUSES:
+                del self.orders[order_id]
+                excess -= 1
+        self._closed = sum(1 for o in self.orders.values() if o['status'] not in OPEN_STATUSES)
+
+    def apply_account_update(self, update: Dict[str, Any]) -> None:
+        """Apply the ``a`` section of an ACCOUNT_UPDATE event"""
+        with self._lock:
+            for balance in update.get('B', []):
+                self.balances[balance['a']] = {
+                    'walletBalance': float(balance['wb']),
+                    'crossWalletBalance': float(balance['cw']),
+                }
+            for position in update.get('P', []):
+                self.positions[(position['s'], position.get('ps', 'BOTH'))] = {
+                    'symbol': position['s'],
+                    'positionSide': position.get('ps', 'BOTH'),
+                    'positionAmt': position['pa'],
+                    'entryPrice': position['ep'],
+                    'unrealizedProfit': position['up'],
+                    'marginType': position.get('mt'),
+                }
+
+    def load_account(self, account: Dict[str, Any]) -> None:
+        """Seed balances and positions from a futures_account() payload"""
+        with self._lock:
+            self.account = account
+            self.balances = {
+                asset['asset']: {
+                    'walletBalance': float(asset['walletBalance']),
+                    'crossWalletBalance': float(asset.get('crossWalletBalance', asset['walletBalance'])),
+                }
+                for asset in account.get('assets', [])
+            }
+            self._snapshot_wallet = {asset: b['walletBalance'] for asset, b in self.balances.items()}
+            self.positions = {
+                (p['symbol'], p.get('positionSide', 'BOTH')): {
+                    'symbol': p['symbol'],
+                    'positionSide': p.get('positionSide', 'BOTH'),
+                    'positionAmt': p['positionAmt'],
+                    'entryPrice': p.get('entryPrice', '0'),
+                    'unrealizedProfit': p.get('unrealizedProfit', '0'),
+                    'marginType': 'isolated' if p.get('isolated') else 'cross',
+                }
+                for p in account.get('positions', []) if float(p['positionAmt'])
+            }
+
+    def load_open_orders(self, orders: List[Dict[str, Any]]) -> List[int]:
+        """Replace the open-order set with a REST snapshot
+
+        Returns the ids of orders the store thought were open but the
+        exchange no longer lists; their final state must be fetched.
+        """
+        with self._lock:
+            listed = {order['orderId'] for order in orders}
+            missing = [order_id for order_id, order in self.orders.items()
+                       if order['status'] in OPEN_STATUSES and order_id not in listed]
+            for order in orders:
+                self.record_order(dict(order))
+        return missing
+
+    def get_order(self, order_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            order = self.orders.get(order_id)
+            return dict(order) if order is not None else None
+
+    def open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(o) for o in self.orders.values()
+                    if o['status'] in OPEN_STATUSES and (symbol is None or o['symbol'] == symbol)]
+
+    def account_info(self) -> Optional[Dict[str, Any]]:
+        """Return a futures_account()-shaped view, or None before the first snapshot
+
+        Wallet balances come from the latest ACCOUNT_UPDATE; the available
+        balance is the snapshot value moved by the same wallet delta.
+        """
+        with self._lock:
+            if self.account is None:
+                return None
+
+            usdt = self.balances.get('USDT', {'walletBalance': float(self.account['totalWalletBalance'])})
+            wallet_delta = usdt['walletBalance'] - self._snapshot_wallet.get('USDT', usdt['walletBalance'])
+            unrealized = sum(float(p['unrealizedProfit']) for p in self.positions.values())
+
+            account = dict(self.account)
+            account['totalWalletBalance'] = str(usdt['walletBalance'])
+            account['availableBalance'] = str(float(self.account['availableBalance']) + wallet_delta)
+            account['totalUnrealizedProfit'] = str(unrealized)
+            account['positions'] = [dict(p) for p in self.positions.values()]
+            return account
+
+
+class UserDataStream:
+    """Futures user-data stream with listenKey keepalive and REST reconcile"""
+
+    def __init__(self, client: Any, store: Optional[OrderStateStore] = None, testnet: bool = True,
+                 base_url: Optional[str] = None, reconcile: bool = True,
+                 keepalive_interval: float = Config.LISTEN_KEY_KEEPALIVE):
+        """Initialize the stream
+
+        ``client`` is a ``binance.Client`` (e.g. ``BasicBot.client``). With
+        ``reconcile`` the store is refreshed from REST on every (re)connect,
+        covering any events missed while disconnected. ``store.synced`` is
+        set once a reconcile completes and cleared whenever the stream drops,
+        so readers fall back to REST while the store may be stale; without
+        ``reconcile`` it is never set.
+        """
+        self.client = client
+        self.store = store or OrderStateStore()
+        self.base_url = (base_url or stream_base_url(testnet)).rstrip('/')
+        self.reconcile_on_connect = reconcile
+        self.keepalive_interval = keepalive_interval
+        self.listen_key: Optional[str] = None
+        self.stream: Optional[WebSocketStream] = None
+        self.logger = logging.getLogger('TradingBot')
+        self._stop_event = threading.Event()
+        self._keepalive_thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Obtain a listenKey and start streaming"""
+        self.listen_key = self.client.futures_stream_get_listen_key()
+        self.stream = WebSocketStream(f"{self.base_url}/ws/{self.listen_key}", self.handle_message,
+                                      on_connect=self._on_connect, on_disconnect=self._on_disconnect)
+        self.stream.start()
+
+        self._stop_event.clear()
+        self._keepalive_thread = threading.Thread(target=self._keepalive_loop, name='ListenKeyKeepalive',
+                                                  daemon=True)
+        self._keepalive_thread.start()
+        self.logger.info("User data stream started")
+
+    def stop(self) -> None:
+        """Stop streaming and release the listenKey"""
+        self._stop_event.set()
+        if self.stream is not None:
+            self.stream.stop()
+        self.store.synced = False
+        if self.listen_key is not None:
+            try:
+                self.client.futures_stream_close(listenKey=self.listen_key)
+            except Exception as e:
+                self.logger.warning(f"Error closing listen key: {e}")
+        self.logger.info("User data stream stopped")
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """Block until the stream is connected (and reconciled, if enabled)"""
+        return self.stream.wait_connected(timeout)
+
+    def handle_message(self, message: Dict[str, Any]) -> None:
+        """Apply one user-data message"""
+        if message.get('e') == 'listenKeyExpired':
+            self.logger.warning("Listen key expired, renewing")
+            threading.Thread(target=self._renew_listen_key, daemon=True).start()
+            return
+        self.store.handle_message(message)
+
+    def _renew_listen_key(self) -> None:
+        try:
+            self.listen_key = self.client.futures_stream_get_listen_key()
+        except Exception as e:
+            self.logger.error(f"Error renewing listen key: {e}")
+            return
+        self.stream.url = f"{self.base_url}/ws/{self.listen_key}"
+        self.stream.reconnect()
+
+    def _keepalive_loop(self) -> None:
+        while not self._stop_event.wait(self.keepalive_interval):
+            try:
+                self.client.futures_stream_keepalive(listenKey=self.listen_key)
+                self.logger.info("Listen key keepalive sent")
+            except Exception as e:
+                self.logger.warning(f"Listen key keepalive failed: {e}")
+                self._renew_listen_key()
+
+    def _on_connect(self) -> None:
+        if self.reconcile_on_connect:
+            self.reconcile()
+
+    def _on_disconnect(self) -> None:
+        # Events may be missed until the next reconcile
+        self.store.synced = False
+
+    def reconcile(self) -> None:
+        """Refresh open orders and the account snapshot from REST"""
+        try:
+            missing = self.store.load_open_orders(self.client.futures_get_open_orders())
+            for order_id in missing:
+                order = self.store.get_order(order_id)
+                self.store.record_order(self.client.futures_get_order(symbol=order['symbol'], orderId=order_id))
+            self.store.load_account(self.client.futures_account())
+            self.store.synced = True
+            self.logger.info(f"Order state reconciled ({len(missing)} orders closed while offline)")
+        except Exception as e:
+            self.logger.error(f"Error reconciling order state: {e}")